@@ -0,0 +1,166 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Benchmarks of decompaction, grid sampling, dynamic topography sampling and paleo bathymetry.
+
+The benchmarks follow the `asv <https://asv.readthedocs.io>`_ conventions:
+
+- each benchmark class has optional ``params`` (a list of parameter lists) and ``param_names``,
+- ``setup`` is called (with one combination of parameters) before timing, and
+- each method starting with ``time_`` is timed (with the same parameters as ``setup``).
+
+If ``setup`` raises ``NotImplementedError`` then the benchmark is skipped (eg, if GMT is not available).
+
+The wells, grids and models are synthetic (see :mod:`pybacktrack.testing`), so the benchmarks do not need the bundled grids,
+and they scale deterministically with the number of units, points and time steps.
+
+Run them with ``python benchmarks/run_benchmarks.py`` (see ``benchmarks/README.md``).
+"""
+
+
+import shutil
+import tempfile
+import numpy as np
+import pybacktrack
+import pybacktrack.testing
+
+
+# A region (longitude/latitude bounds in degrees) of the synthetic Earth containing the ocean and submerged continental shelves
+# (see 'pybacktrack.testing').
+PALEO_BATHYMETRY_REGION = (-80.0, 80.0, -30.0, 30.0)
+
+
+def _require_gmt():
+    # Skip the benchmark if the GMT executable is not available (it's used to sample grids).
+    if shutil.which('gmt') is None:
+        raise NotImplementedError('GMT is not installed')
+
+
+def _generate_region_lon_lat_points(grid_spacing_degrees, region=PALEO_BATHYMETRY_REGION):
+    # Generate a global grid of points and keep only those inside the longitude/latitude region.
+    min_lon, max_lon, min_lat, max_lat = region
+    return [(lon, lat) for lon, lat in pybacktrack.generate_lon_lat_points(grid_spacing_degrees)
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat]
+
+
+class _SyntheticDataDir(object):
+    # Base class of benchmarks that write synthetic grids (and models) to a temporary directory in 'setup'.
+    
+    def setup(self, *params):
+        self.synthetic_data_dir = tempfile.mkdtemp(prefix='pybacktrack_benchmark_')
+    
+    def teardown(self, *params):
+        shutil.rmtree(self.synthetic_data_dir, ignore_errors=True)
+
+
+class Decompact(object):
+    """Decompact synthetic wells at the age of each unit, and at regular times (including an ensemble of 10 samples)."""
+
+    params = [[10, 100, 1000]]
+    param_names = ['num_units']
+
+    def setup(self, num_units):
+        self.well = pybacktrack.testing.create_synthetic_well(num_units)
+        # Decompact at 100 regular times from present day to the bottom of the well.
+        self.times = np.linspace(0.0, self.well.stratigraphic_units[-1].bottom_age, 100, endpoint=False)
+
+    def time_decompact(self, num_units):
+        self.well.decompact()
+
+    def time_decompact_at_times(self, num_units):
+        self.well.decompact_at_times(self.times)
+
+    def time_decompact_ensemble(self, num_units):
+        self.well.decompact_ensemble(self.times, 10)
+
+
+class GenerateLonLatPoints(object):
+    """Generate global grids of points at various spacings."""
+
+    params = [[5.0, 1.0, 0.5]]
+    param_names = ['grid_spacing_degrees']
+
+    def time_generate_lon_lat_points(self, grid_spacing_degrees):
+        pybacktrack.generate_lon_lat_points(grid_spacing_degrees)
+
+
+class ReadGrid(_SyntheticDataDir):
+    """Sample a synthetic grid at global grids of points at various spacings."""
+
+    params = [[10.0, 5.0, 2.0]]
+    param_names = ['grid_spacing_degrees']
+
+    def setup(self, grid_spacing_degrees):
+        _require_gmt()
+        super(ReadGrid, self).setup(grid_spacing_degrees)
+        self.grid_filename = pybacktrack.testing.write_synthetic_grids(self.synthetic_data_dir)['crustal_thickness_filename']
+        self.points = pybacktrack.generate_lon_lat_points(grid_spacing_degrees)
+
+    def time_read_grid(self, grid_spacing_degrees):
+        # Note: This is a private function, but it's where all paleo bathymetry grid sampling happens.
+        pybacktrack.paleo_bathymetry._read_grid(self.points, self.grid_filename)
+
+
+class DynamicTopographySample(_SyntheticDataDir):
+    """Sample a synthetic dynamic topography model at global grids of points (reconstructed to various times)."""
+
+    params = [[10.0, 5.0, 2.0], [0.0, 55.0]]
+    param_names = ['grid_spacing_degrees', 'time']
+
+    def setup(self, grid_spacing_degrees, time):
+        _require_gmt()
+        super(DynamicTopographySample, self).setup(grid_spacing_degrees, time)
+        grid_list_filename, static_polygon_filename, rotation_filenames = pybacktrack.testing.write_synthetic_dynamic_topography_model(
+            self.synthetic_data_dir, oldest_time=100.0, time_increment=10.0)
+
+        longitudes, latitudes = zip(*pybacktrack.generate_lon_lat_points(grid_spacing_degrees))
+        self.dynamic_topography = pybacktrack.DynamicTopography(
+            grid_list_filename, static_polygon_filename, rotation_filenames, longitudes, latitudes,
+            # Use a static polygon raster to partition the points (otherwise that dominates the setup time).
+            static_polygon_raster_grid_spacing=0.1)
+
+    def time_sample(self, grid_spacing_degrees, time):
+        self.dynamic_topography.sample(time)
+
+
+class ReconstructBacktrackBathymetry(_SyntheticDataDir):
+    """Reconstruct paleo bathymetry of the synthetic Earth in a region (at various point spacings and time steps) using a single CPU and all CPUs."""
+
+    params = [[4.0, 2.0], [10, 50], [False, True]]
+    param_names = ['grid_spacing_degrees', 'num_time_steps', 'use_all_cpus']
+
+    # Only time a single run (each run can take seconds).
+    number = 1
+    repeat = 3
+
+    def setup(self, grid_spacing_degrees, num_time_steps, use_all_cpus):
+        _require_gmt()
+        super(ReconstructBacktrackBathymetry, self).setup(grid_spacing_degrees, num_time_steps, use_all_cpus)
+        self.grid_filenames = pybacktrack.testing.write_synthetic_grids(self.synthetic_data_dir)
+        self.reconstruction_model = pybacktrack.testing.write_synthetic_reconstruction_model(self.synthetic_data_dir)
+        self.points = _generate_region_lon_lat_points(grid_spacing_degrees)
+
+    def time_reconstruct_backtrack_bathymetry(self, grid_spacing_degrees, num_time_steps, use_all_cpus):
+        pybacktrack.reconstruct_backtrack_bathymetry(
+            self.points,
+            oldest_time=float(num_time_steps),
+            time_increment=1.0,
+            # The builtin rift grids do not match the synthetic Earth.
+            rifting_period=(150.0, 120.0),
+            use_all_cpus=use_all_cpus,
+            **self.grid_filenames,
+            **self.reconstruction_model)
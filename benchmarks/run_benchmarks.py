@@ -0,0 +1,347 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Run the pyBacktrack benchmarks, write a JSON report and optionally compare it with a report from another commit.
+
+For example, to benchmark two commits and compare them:
+
+    git checkout <old_commit>
+    python benchmarks/run_benchmarks.py -o old.json
+    git checkout <new_commit>
+    python benchmarks/run_benchmarks.py -o new.json --compare old.json
+
+Or to compare two existing reports (without running any benchmarks):
+
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+
+import argparse
+import datetime
+import inspect
+import itertools
+import json
+import math
+import os
+import os.path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+
+
+# Version of the JSON report format.
+REPORT_FORMAT_VERSION = 1
+
+# Default number of timing samples per benchmark.
+DEFAULT_REPEAT = 5
+
+# Each timing sample calls the benchmark enough times to take at least this many seconds
+# (unless the benchmark class specifies 'number').
+DEFAULT_MIN_SAMPLE_TIME = 0.2
+
+# By default a benchmark is reported as a regression if its median time increased by more than 10%.
+DEFAULT_REGRESSION_THRESHOLD = 1.1
+
+
+def discover_benchmarks(benchmark_module, name_filter=None):
+    """
+    Find the benchmark classes in 'benchmark_module' and return a list of (name, class, method name, params) tuples.
+
+    There is one tuple per combination of benchmark method and parameters
+    (and 'name' is unique, such as "Decompact.time_decompact(num_units=100)").
+    """
+
+    benchmarks = []
+    for class_name, benchmark_class in inspect.getmembers(benchmark_module, inspect.isclass):
+        # Only include classes defined in the benchmark module (not imported into it).
+        if benchmark_class.__module__ != benchmark_module.__name__:
+            continue
+
+        method_names = sorted(name for name in dir(benchmark_class) if name.startswith('time_'))
+        if not method_names:
+            continue
+
+        params = getattr(benchmark_class, 'params', [])
+        param_names = getattr(benchmark_class, 'param_names', ['param{0}'.format(index + 1) for index in range(len(params))])
+
+        for method_name in method_names:
+            for param_values in itertools.product(*params):
+                name = '{0}.{1}({2})'.format(
+                    class_name,
+                    method_name,
+                    ', '.join('{0}={1!r}'.format(param_name, param_value) for param_name, param_value in zip(param_names, param_values)))
+
+                if name_filter and name_filter not in name:
+                    continue
+
+                benchmarks.append((name, benchmark_class, method_name, dict(zip(param_names, param_values))))
+
+    return benchmarks
+
+
+def run_benchmark(benchmark_class, method_name, params, repeat=DEFAULT_REPEAT, min_sample_time=DEFAULT_MIN_SAMPLE_TIME):
+    """
+    Time one benchmark method (with one combination of parameters) and return its result (a dict).
+
+    The result 'status' is 'ok', 'skipped' (if 'setup' raised NotImplementedError) or 'failed' (if any other exception was raised).
+    """
+
+    param_values = tuple(params.values())
+
+    benchmark = benchmark_class()
+    try:
+        if hasattr(benchmark, 'setup'):
+            benchmark.setup(*param_values)
+    except NotImplementedError as error:
+        return {'status': 'skipped', 'reason': str(error), 'params': params}
+    except Exception:
+        return {'status': 'failed', 'reason': traceback.format_exc(), 'params': params}
+
+    try:
+        benchmark_method = getattr(benchmark, method_name)
+
+        # Each timing sample calls the benchmark method 'number' times.
+        number = getattr(benchmark_class, 'number', None)
+        repeat = getattr(benchmark_class, 'repeat', repeat)
+        if number is None:
+            # Call the benchmark once (as a warmup) and use its time to estimate how many calls fill a sample.
+            start_time = time.perf_counter()
+            benchmark_method(*param_values)
+            warmup_time = time.perf_counter() - start_time
+            number = max(1, int(math.ceil(min_sample_time / max(warmup_time, 1e-9))))
+
+        # The time per call of each sample.
+        sample_times = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for _ in range(number):
+                benchmark_method(*param_values)
+            sample_times.append((time.perf_counter() - start_time) / number)
+    except Exception:
+        return {'status': 'failed', 'reason': traceback.format_exc(), 'params': params}
+    finally:
+        if hasattr(benchmark, 'teardown'):
+            benchmark.teardown(*param_values)
+
+    return {
+        'status': 'ok',
+        'params': params,
+        'number': number,
+        'repeat': repeat,
+        'times': sample_times,
+        'min': min(sample_times),
+        'median': statistics.median(sample_times),
+        'mean': statistics.mean(sample_times),
+        'stdev': statistics.stdev(sample_times) if len(sample_times) > 1 else 0.0}
+
+
+def get_environment():
+    """
+    Return a dict describing the machine, software versions and git commit (so reports can be compared meaningfully).
+    """
+
+    import numpy
+    import pybacktrack
+
+    environment = {
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pybacktrack': pybacktrack.__version__,
+        'pybacktrack_path': os.path.dirname(os.path.abspath(pybacktrack.__file__)),
+    }
+
+    # The versions of optional/heavy dependencies (if they can be imported).
+    for module_name in ('scipy', 'pygplates'):
+        try:
+            module = __import__(module_name)
+            environment[module_name] = str(getattr(module, '__version__', 'unknown'))
+        except ImportError:
+            environment[module_name] = None
+
+    # The git commit (and whether there are uncommitted changes) of the benchmarked source code.
+    try:
+        source_dir = environment['pybacktrack_path']
+        environment['git_commit'] = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=source_dir, stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+        environment['git_dirty'] = bool(subprocess.check_output(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=source_dir, stderr=subprocess.DEVNULL, universal_newlines=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        environment['git_commit'] = None
+        environment['git_dirty'] = None
+
+    return environment
+
+
+def compare_reports(base_report, new_report, regression_threshold=DEFAULT_REGRESSION_THRESHOLD, output=sys.stdout):
+    """
+    Print the ratio of new to base median times of benchmarks in both reports.
+
+    Returns the names of benchmarks that regressed (new median time more than 'regression_threshold' times base median time).
+    """
+
+    base_results = base_report['results']
+    new_results = new_report['results']
+
+    print('Base: {0}'.format(_describe_report(base_report)), file=output)
+    print('New:  {0}'.format(_describe_report(new_report)), file=output)
+    print('', file=output)
+
+    regressions = []
+    name_width = max((len(name) for name in new_results), default=0)
+    for name, new_result in new_results.items():
+        base_result = base_results.get(name)
+        if (base_result is None or
+            base_result['status'] != 'ok' or
+            new_result['status'] != 'ok'):
+            print('{0:<{1}}  {2}'.format(
+                name, name_width, 'not compared (base: {0}, new: {1})'.format(
+                    base_result['status'] if base_result else 'missing', new_result['status'])), file=output)
+            continue
+
+        ratio = new_result['median'] / base_result['median']
+        if ratio > regression_threshold:
+            change = 'SLOWER'
+            regressions.append(name)
+        elif ratio < 1.0 / regression_threshold:
+            change = 'faster'
+        else:
+            change = ''
+
+        print('{0:<{1}}  {2:>12}  {3:>12}  {4:6.2f}x  {5}'.format(
+            name, name_width,
+            _format_time(base_result['median']), _format_time(new_result['median']),
+            ratio, change), file=output)
+
+    return regressions
+
+
+def _describe_report(report):
+    environment = report['environment']
+    return '{0}{1} (pybacktrack {2}, python {3}, {4})'.format(
+        environment.get('git_commit') or 'unknown commit',
+        ' with uncommitted changes' if environment.get('git_dirty') else '',
+        environment.get('pybacktrack'),
+        environment.get('python'),
+        environment.get('date'))
+
+
+def _format_time(seconds):
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{0:.3f} {1}'.format(seconds / scale, unit)
+    return '{0:.3f} ns'.format(seconds / 1e-9)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument(
+        '-o', '--output', type=str, metavar='report_filename',
+        help='Write the benchmark results to this JSON file.')
+    parser.add_argument(
+        '-k', '--filter', type=str, metavar='substring',
+        help='Only run benchmarks whose name contains this substring (eg, "Decompact" or "num_units=100").')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+        help='Number of timing samples per benchmark (unless the benchmark specifies its own). Defaults to {0}.'.format(DEFAULT_REPEAT))
+    parser.add_argument(
+        '--min-sample-time', type=float, default=DEFAULT_MIN_SAMPLE_TIME, metavar='seconds',
+        help='Minimum time of each timing sample (unless the benchmark specifies the number of calls per sample). '
+             'Defaults to {0} seconds.'.format(DEFAULT_MIN_SAMPLE_TIME))
+    parser.add_argument(
+        '-l', '--list', action='store_true',
+        help='List the benchmarks (and exit without running them).')
+    parser.add_argument(
+        '-c', '--compare', type=str, nargs='+', metavar='report_filename',
+        help='Compare with a base report (after running benchmarks). '
+             'If two reports are specified then compare them (without running benchmarks). '
+             'Exits with a non-zero status if any benchmark regressed.')
+    parser.add_argument(
+        '-t', '--regression-threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+        help='A benchmark regressed if its median time increased by more than this factor. Defaults to {0}.'.format(DEFAULT_REGRESSION_THRESHOLD))
+
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error('--compare accepts one or two report filenames')
+
+    # Compare two existing reports.
+    if args.compare and len(args.compare) == 2:
+        base_report, new_report = (_read_report(filename) for filename in args.compare)
+        regressions = compare_reports(base_report, new_report, args.regression_threshold)
+        sys.exit(1 if regressions else 0)
+
+    # Import the benchmarks (in the same directory as this script).
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import benchmarks as benchmark_module
+
+    benchmarks = discover_benchmarks(benchmark_module, args.filter)
+
+    if args.list:
+        for name, _, _, _ in benchmarks:
+            print(name)
+        return
+
+    results = {}
+    for name, benchmark_class, method_name, params in benchmarks:
+        result = run_benchmark(benchmark_class, method_name, params, args.repeat, args.min_sample_time)
+        results[name] = result
+
+        if result['status'] == 'ok':
+            print('{0}: {1} (median of {2} samples)'.format(name, _format_time(result['median']), result['repeat']), flush=True)
+        else:
+            print('{0}: {1} ({2})'.format(name, result['status'], result['reason'].strip().splitlines()[-1]), flush=True)
+
+    report = {
+        'format_version': REPORT_FORMAT_VERSION,
+        'environment': get_environment(),
+        'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if args.compare:
+        print('')
+        regressions = compare_reports(_read_report(args.compare[0]), report, args.regression_threshold)
+        if regressions:
+            sys.exit(1)
+
+
+def _read_report(report_filename):
+    with open(report_filename, 'r') as report_file:
+        report = json.load(report_file)
+
+    if report.get('format_version') != REPORT_FORMAT_VERSION:
+        raise ValueError('Benchmark report "{0}" has an unsupported format version.'.format(report_filename))
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -2,112 +2,147 @@
 # Public API
 #
 
-from .backtrack import \
-    backtrack_well, \
-    write_well as write_backtrack_well, \
-    backtrack_and_write_well, \
-    DEFAULT_DECOMPACTED_COLUMNS as BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS, \
-    COLUMN_AGE as BACKTRACK_COLUMN_AGE, \
-    COLUMN_DECOMPACTED_THICKNESS as BACKTRACK_COLUMN_DECOMPACTED_THICKNESS, \
-    COLUMN_DECOMPACTED_DENSITY as BACKTRACK_COLUMN_DECOMPACTED_DENSITY, \
-    COLUMN_TECTONIC_SUBSIDENCE as BACKTRACK_COLUMN_TECTONIC_SUBSIDENCE, \
-    COLUMN_WATER_DEPTH as BACKTRACK_COLUMN_WATER_DEPTH, \
-    COLUMN_COMPACTED_THICKNESS as BACKTRACK_COLUMN_COMPACTED_THICKNESS, \
-    COLUMN_LITHOLOGY as BACKTRACK_COLUMN_LITHOLOGY, \
-    COLUMN_COMPACTED_DEPTH as BACKTRACK_COLUMN_COMPACTED_DEPTH, \
-    COLUMN_DECOMPACTED_SEDIMENT_RATE as BACKTRACK_COLUMN_DECOMPACTED_SEDIMENT_RATE, \
-    COLUMN_DECOMPACTED_DEPTH as BACKTRACK_COLUMN_DECOMPACTED_DEPTH, \
-    COLUMN_DYNAMIC_TOPOGRAPHY as BACKTRACK_COLUMN_DYNAMIC_TOPOGRAPHY, \
-    COLUMN_PALEO_LONGITUDE as BACKTRACK_COLUMN_PALEO_LONGITUDE, \
-    COLUMN_PALEO_LATITUDE as BACKTRACK_COLUMN_PALEO_LATITUDE, \
-    COLUMN_SEA_LEVEL as BACKTRACK_COLUMN_SEA_LEVEL
+import importlib
 
-from .backstrip import \
-    backstrip_well, \
-    write_well as write_backstrip_well, \
-    backstrip_and_write_well, \
-    DEFAULT_DECOMPACTED_COLUMNS as BACKSTRIP_DEFAULT_DECOMPACTED_COLUMNS, \
-    COLUMN_AGE as BACKSTRIP_COLUMN_AGE, \
-    COLUMN_DECOMPACTED_THICKNESS as BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS, \
-    COLUMN_DECOMPACTED_DENSITY as BACKSTRIP_COLUMN_DECOMPACTED_DENSITY, \
-    COLUMN_AVERAGE_TECTONIC_SUBSIDENCE as BACKSTRIP_COLUMN_AVERAGE_TECTONIC_SUBSIDENCE, \
-    COLUMN_MIN_TECTONIC_SUBSIDENCE as BACKSTRIP_COLUMN_MIN_TECTONIC_SUBSIDENCE, \
-    COLUMN_MAX_TECTONIC_SUBSIDENCE as BACKSTRIP_COLUMN_MAX_TECTONIC_SUBSIDENCE, \
-    COLUMN_AVERAGE_WATER_DEPTH as BACKSTRIP_COLUMN_AVERAGE_WATER_DEPTH, \
-    COLUMN_MIN_WATER_DEPTH as BACKSTRIP_COLUMN_MIN_WATER_DEPTH, \
-    COLUMN_MAX_WATER_DEPTH as BACKSTRIP_COLUMN_MAX_WATER_DEPTH, \
-    COLUMN_COMPACTED_THICKNESS as BACKSTRIP_COLUMN_COMPACTED_THICKNESS, \
-    COLUMN_LITHOLOGY as BACKSTRIP_COLUMN_LITHOLOGY, \
-    COLUMN_COMPACTED_DEPTH as BACKSTRIP_COLUMN_COMPACTED_DEPTH, \
-    COLUMN_DECOMPACTED_SEDIMENT_RATE as BACKSTRIP_COLUMN_DECOMPACTED_SEDIMENT_RATE, \
-    COLUMN_DECOMPACTED_DEPTH as BACKSTRIP_COLUMN_DECOMPACTED_DEPTH, \
-    COLUMN_PALEO_LONGITUDE as BACKSTRIP_COLUMN_PALEO_LONGITUDE, \
-    COLUMN_PALEO_LATITUDE as BACKSTRIP_COLUMN_PALEO_LATITUDE, \
-    COLUMN_SEA_LEVEL as BACKSTRIP_COLUMN_SEA_LEVEL
-
-from .paleo_bathymetry import \
-    reconstruct_backtrack_bathymetry as reconstruct_paleo_bathymetry, \
-    generate_lon_lat_points, \
-    write_bathymetry_grids as write_paleo_bathymetry_grids, \
-    reconstruct_backtrack_bathymetry_and_write_grids as reconstruct_paleo_bathymetry_grids, \
-    DEFAULT_LITHOLOGY_NAME as DEFAULT_PALEO_BATHYMETRY_LITHOLOGY_NAME
-
-from .lithology import \
-    Lithology, \
-    read_lithologies_file, \
-    read_lithologies_files, \
-    create_lithology, \
-    create_lithology_from_components, \
-    DEFAULT_BASE_LITHOLOGY_NAME
-
-from .well import \
-    StratigraphicUnit, \
-    Well, \
-    DecompactedStratigraphicUnit, \
-    DecompactedWell, \
-    read_well_file, \
-    write_well_file, \
-    write_well_metadata
-
-from .age_to_depth import \
-    convert_age_to_depth, \
-    convert_age_to_depth_files, \
-    MODEL_GDH1 as AGE_TO_DEPTH_MODEL_GDH1, \
-    MODEL_CROSBY_2007 as AGE_TO_DEPTH_MODEL_CROSBY_2007, \
-    MODEL_RHCW18 as AGE_TO_DEPTH_MODEL_RHCW18, \
-    DEFAULT_MODEL as AGE_TO_DEPTH_DEFAULT_MODEL
-
-from .stratigraphic_depth_to_age import \
-    convert_stratigraphic_depth_to_age, \
-    convert_stratigraphic_depth_to_age_files
-
-from .rifting import \
-    estimate_beta as estimate_rift_beta, \
-    total_subsidence as total_rift_subsidence, \
-    syn_rift_subsidence, \
-    post_rift_subsidence
-
-from .dynamic_topography import \
-    DynamicTopography, \
-    InterpolateDynamicTopography
-
-from .sea_level import \
-    SeaLevel
-
-from .util.interpolate import \
-    read_curve_function as read_interpolate_function, \
-    interpolate_file
+# The public API is loaded lazily (when first accessed) so that importing 'pybacktrack' is fast.
+#
+# For example, 'pybacktrack.backtrack_well' imports the 'backtrack' module (and pygplates) when it is first accessed.
+# This avoids importing slow-to-import modules (like pygplates and scipy) when they're not needed
+# (such as by the 'age_to_depth_cli' and 'stratigraphic_depth_to_age_cli' command-line scripts).
+#
+# Maps each public attribute name to the (relative) name of the module containing it and its name in that module.
+_LAZY_ATTRIBUTES = {
+    # From backtrack module...
+    'backtrack_well': ('backtrack', 'backtrack_well'),
+    'backtrack_wells': ('backtrack', 'backtrack_wells'),
+    'backtrack_well_ensemble': ('backtrack', 'backtrack_well_ensemble'),
+    'write_backtrack_well': ('backtrack', 'write_well'),
+    'write_backtrack_wells': ('backtrack', 'write_wells'),
+    'backtrack_and_write_well': ('backtrack', 'backtrack_and_write_well'),
+    'BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS': ('backtrack', 'DEFAULT_DECOMPACTED_COLUMNS'),
+    'BACKTRACK_COLUMN_AGE': ('backtrack', 'COLUMN_AGE'),
+    'BACKTRACK_COLUMN_DECOMPACTED_THICKNESS': ('backtrack', 'COLUMN_DECOMPACTED_THICKNESS'),
+    'BACKTRACK_COLUMN_DECOMPACTED_DENSITY': ('backtrack', 'COLUMN_DECOMPACTED_DENSITY'),
+    'BACKTRACK_COLUMN_TECTONIC_SUBSIDENCE': ('backtrack', 'COLUMN_TECTONIC_SUBSIDENCE'),
+    'BACKTRACK_COLUMN_WATER_DEPTH': ('backtrack', 'COLUMN_WATER_DEPTH'),
+    'BACKTRACK_COLUMN_COMPACTED_THICKNESS': ('backtrack', 'COLUMN_COMPACTED_THICKNESS'),
+    'BACKTRACK_COLUMN_LITHOLOGY': ('backtrack', 'COLUMN_LITHOLOGY'),
+    'BACKTRACK_COLUMN_COMPACTED_DEPTH': ('backtrack', 'COLUMN_COMPACTED_DEPTH'),
+    'BACKTRACK_COLUMN_DECOMPACTED_SEDIMENT_RATE': ('backtrack', 'COLUMN_DECOMPACTED_SEDIMENT_RATE'),
+    'BACKTRACK_COLUMN_DECOMPACTED_DEPTH': ('backtrack', 'COLUMN_DECOMPACTED_DEPTH'),
+    'BACKTRACK_COLUMN_DYNAMIC_TOPOGRAPHY': ('backtrack', 'COLUMN_DYNAMIC_TOPOGRAPHY'),
+    'BACKTRACK_COLUMN_PALEO_LONGITUDE': ('backtrack', 'COLUMN_PALEO_LONGITUDE'),
+    'BACKTRACK_COLUMN_PALEO_LATITUDE': ('backtrack', 'COLUMN_PALEO_LATITUDE'),
+    'BACKTRACK_COLUMN_SEA_LEVEL': ('backtrack', 'COLUMN_SEA_LEVEL'),
+    # From backstrip module...
+    'backstrip_well': ('backstrip', 'backstrip_well'),
+    'backstrip_wells': ('backstrip', 'backstrip_wells'),
+    'write_backstrip_well': ('backstrip', 'write_well'),
+    'write_backstrip_wells': ('backstrip', 'write_wells'),
+    'backstrip_and_write_well': ('backstrip', 'backstrip_and_write_well'),
+    'backstrip_and_write_wells': ('backstrip', 'backstrip_and_write_wells'),
+    'BACKSTRIP_DEFAULT_DECOMPACTED_COLUMNS': ('backstrip', 'DEFAULT_DECOMPACTED_COLUMNS'),
+    'BACKSTRIP_COLUMN_AGE': ('backstrip', 'COLUMN_AGE'),
+    'BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS': ('backstrip', 'COLUMN_DECOMPACTED_THICKNESS'),
+    'BACKSTRIP_COLUMN_DECOMPACTED_DENSITY': ('backstrip', 'COLUMN_DECOMPACTED_DENSITY'),
+    'BACKSTRIP_COLUMN_AVERAGE_TECTONIC_SUBSIDENCE': ('backstrip', 'COLUMN_AVERAGE_TECTONIC_SUBSIDENCE'),
+    'BACKSTRIP_COLUMN_MIN_TECTONIC_SUBSIDENCE': ('backstrip', 'COLUMN_MIN_TECTONIC_SUBSIDENCE'),
+    'BACKSTRIP_COLUMN_MAX_TECTONIC_SUBSIDENCE': ('backstrip', 'COLUMN_MAX_TECTONIC_SUBSIDENCE'),
+    'BACKSTRIP_COLUMN_AVERAGE_WATER_DEPTH': ('backstrip', 'COLUMN_AVERAGE_WATER_DEPTH'),
+    'BACKSTRIP_COLUMN_MIN_WATER_DEPTH': ('backstrip', 'COLUMN_MIN_WATER_DEPTH'),
+    'BACKSTRIP_COLUMN_MAX_WATER_DEPTH': ('backstrip', 'COLUMN_MAX_WATER_DEPTH'),
+    'BACKSTRIP_COLUMN_COMPACTED_THICKNESS': ('backstrip', 'COLUMN_COMPACTED_THICKNESS'),
+    'BACKSTRIP_COLUMN_LITHOLOGY': ('backstrip', 'COLUMN_LITHOLOGY'),
+    'BACKSTRIP_COLUMN_COMPACTED_DEPTH': ('backstrip', 'COLUMN_COMPACTED_DEPTH'),
+    'BACKSTRIP_COLUMN_DECOMPACTED_SEDIMENT_RATE': ('backstrip', 'COLUMN_DECOMPACTED_SEDIMENT_RATE'),
+    'BACKSTRIP_COLUMN_DECOMPACTED_DEPTH': ('backstrip', 'COLUMN_DECOMPACTED_DEPTH'),
+    'BACKSTRIP_COLUMN_PALEO_LONGITUDE': ('backstrip', 'COLUMN_PALEO_LONGITUDE'),
+    'BACKSTRIP_COLUMN_PALEO_LATITUDE': ('backstrip', 'COLUMN_PALEO_LATITUDE'),
+    'BACKSTRIP_COLUMN_SEA_LEVEL': ('backstrip', 'COLUMN_SEA_LEVEL'),
+    # From paleo_bathymetry module...
+    'reconstruct_paleo_bathymetry': ('paleo_bathymetry', 'reconstruct_backtrack_bathymetry'),
+    'generate_lon_lat_points': ('paleo_bathymetry', 'generate_lon_lat_points'),
+    'write_paleo_bathymetry_grids': ('paleo_bathymetry', 'write_bathymetry_grids'),
+    'reconstruct_paleo_bathymetry_grids': ('paleo_bathymetry', 'reconstruct_backtrack_bathymetry_and_write_grids'),
+    'DEFAULT_PALEO_BATHYMETRY_LITHOLOGY_NAME': ('paleo_bathymetry', 'DEFAULT_LITHOLOGY_NAME'),
+    # From lithology module...
+    'Lithology': ('lithology', 'Lithology'),
+    'read_lithologies_file': ('lithology', 'read_lithologies_file'),
+    'read_lithologies_files': ('lithology', 'read_lithologies_files'),
+    'create_lithology': ('lithology', 'create_lithology'),
+    'create_lithology_from_components': ('lithology', 'create_lithology_from_components'),
+    'DEFAULT_BASE_LITHOLOGY_NAME': ('lithology', 'DEFAULT_BASE_LITHOLOGY_NAME'),
+    # From well module...
+    'StratigraphicUnit': ('well', 'StratigraphicUnit'),
+    'Well': ('well', 'Well'),
+    'DecompactedStratigraphicUnit': ('well', 'DecompactedStratigraphicUnit'),
+    'DecompactedWell': ('well', 'DecompactedWell'),
+    'WellArrays': ('well', 'WellArrays'),
+    'DecompactedWellArrays': ('well', 'DecompactedWellArrays'),
+    'read_well_file': ('well', 'read_well_file'),
+    'write_well_file': ('well', 'write_well_file'),
+    'write_well_metadata': ('well', 'write_well_metadata'),
+    'read_well_arrays_file': ('well', 'read_well_arrays_file'),
+    'read_well_arrays_binary_file': ('well', 'read_well_arrays_binary_file'),
+    'write_well_arrays_binary_file': ('well', 'write_well_arrays_binary_file'),
+    # From well_store module...
+    'WellStore': ('well_store', 'WellStore'),
+    # From age_to_depth module...
+    'convert_age_to_depth': ('age_to_depth', 'convert_age_to_depth'),
+    'convert_age_to_depth_files': ('age_to_depth', 'convert_age_to_depth_files'),
+    'AGE_TO_DEPTH_MODEL_GDH1': ('age_to_depth', 'MODEL_GDH1'),
+    'AGE_TO_DEPTH_MODEL_CROSBY_2007': ('age_to_depth', 'MODEL_CROSBY_2007'),
+    'AGE_TO_DEPTH_MODEL_RHCW18': ('age_to_depth', 'MODEL_RHCW18'),
+    'AGE_TO_DEPTH_DEFAULT_MODEL': ('age_to_depth', 'DEFAULT_MODEL'),
+    # From stratigraphic_depth_to_age module...
+    'convert_stratigraphic_depth_to_age': ('stratigraphic_depth_to_age', 'convert_stratigraphic_depth_to_age'),
+    'convert_stratigraphic_depth_to_age_files': ('stratigraphic_depth_to_age', 'convert_stratigraphic_depth_to_age_files'),
+    # From rifting module...
+    'estimate_rift_beta': ('rifting', 'estimate_beta'),
+    'total_rift_subsidence': ('rifting', 'total_subsidence'),
+    'syn_rift_subsidence': ('rifting', 'syn_rift_subsidence'),
+    'post_rift_subsidence': ('rifting', 'post_rift_subsidence'),
+    # From dynamic_topography module...
+    'DynamicTopography': ('dynamic_topography', 'DynamicTopography'),
+    'InterpolateDynamicTopography': ('dynamic_topography', 'InterpolateDynamicTopography'),
+    # From sea_level module...
+    'SeaLevel': ('sea_level', 'SeaLevel'),
+    # From interpolate module...
+    'read_interpolate_function': ('util.interpolate', 'read_curve_function'),
+    'interpolate_file': ('util.interpolate', 'interpolate_file'),
+    # From reconstruction_cache module...
+    'get_rotation_model': ('util.reconstruction_cache', 'get_rotation_model'),
+    'get_static_polygons': ('util.reconstruction_cache', 'get_static_polygons'),
+    'get_plate_partitioner': ('util.reconstruction_cache', 'get_plate_partitioner'),
+    'get_static_polygon_raster': ('util.reconstruction_cache', 'get_static_polygon_raster'),
+    'clear_reconstruction_cache': ('util.reconstruction_cache', 'clear_cache'),
+    'get_reconstruction_cache_size': ('util.reconstruction_cache', 'get_cache_size'),
+    'set_reconstruction_cache_max_size': ('util.reconstruction_cache', 'set_max_cache_size'),
+    # From result_cache module...
+    'enable_result_cache': ('util.result_cache', 'enable_result_cache'),
+    'disable_result_cache': ('util.result_cache', 'disable_result_cache'),
+    'clear_result_cache': ('util.result_cache', 'clear_result_cache'),
+    'get_result_cache_size': ('util.result_cache', 'get_result_cache_size'),
+    # From static_polygon_raster module...
+    'StaticPolygonRaster': ('util.static_polygon_raster', 'StaticPolygonRaster'),
+    # From call_system_command module...
+    'start_system_command_trace': ('util.call_system_command', 'start_system_command_trace'),
+    'stop_system_command_trace': ('util.call_system_command', 'stop_system_command_trace'),
+    'get_system_command_trace': ('util.call_system_command', 'get_system_command_trace'),
+    'summarize_system_command_trace': ('util.call_system_command', 'summarize_system_command_trace'),
+    # From serve module...
+    'create_backtrack_server': ('serve', 'create_backtrack_server'),
+    'send_backtrack_server_request': ('serve', 'send_backtrack_server_request'),
+    # From install_examples and install_supplementary modules...
+    'install_examples': ('install_examples', 'install'),
+    'install_supplementary': ('install_supplementary', 'install'),
+}
 
 # From bundle_data module.
 #
 # Importing all since there are only module variables prefixed with 'BUNDLE_' in 'bundle_data' module.
 from .bundle_data import *
 
-# Installing examples from pybacktrack package.
-from .install_examples import install as install_examples
-# Installing supplementary script from pybacktrack package.
-from .install_supplementary import install as install_supplementary
-
 from .version import __version__, VERSION
 
 
@@ -115,7 +150,10 @@ from .version import __version__, VERSION
 __all__ = [
     # From backtrack module...
     'backtrack_well',
+    'backtrack_wells',
+    'backtrack_well_ensemble',
     'write_backtrack_well',
+    'write_backtrack_wells',
     'backtrack_and_write_well',
     'BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS',
     'BACKTRACK_COLUMN_AGE',
@@ -134,8 +172,11 @@ __all__ = [
     'BACKTRACK_COLUMN_SEA_LEVEL',
     # From backstrip module...
     'backstrip_well',
+    'backstrip_wells',
     'write_backstrip_well',
+    'write_backstrip_wells',
     'backstrip_and_write_well',
+    'backstrip_and_write_wells',
     'BACKSTRIP_DEFAULT_DECOMPACTED_COLUMNS',
     'BACKSTRIP_COLUMN_AGE',
     'BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS',
@@ -172,9 +213,16 @@ __all__ = [
     'Well',
     'DecompactedStratigraphicUnit',
     'DecompactedWell',
+    'WellArrays',
+    'DecompactedWellArrays',
     'read_well_file',
     'write_well_file',
     'write_well_metadata',
+    'read_well_arrays_file',
+    'read_well_arrays_binary_file',
+    'write_well_arrays_binary_file',
+    # From well_store module...
+    'WellStore',
     # From age_to_depth module...
     'convert_age_to_depth',
     'convert_age_to_depth_files',
@@ -198,6 +246,29 @@ __all__ = [
     # From interpolate module...
     'read_interpolate_function',
     'interpolate_file',
+    # From reconstruction_cache module...
+    'get_rotation_model',
+    'get_static_polygons',
+    'get_plate_partitioner',
+    'get_static_polygon_raster',
+    'clear_reconstruction_cache',
+    'get_reconstruction_cache_size',
+    'set_reconstruction_cache_max_size',
+    # From result_cache module...
+    'enable_result_cache',
+    'disable_result_cache',
+    'clear_result_cache',
+    'get_result_cache_size',
+    # From static_polygon_raster module...
+    'StaticPolygonRaster',
+    # From call_system_command module...
+    'start_system_command_trace',
+    'stop_system_command_trace',
+    'get_system_command_trace',
+    'summarize_system_command_trace',
+    # From serve module...
+    'create_backtrack_server',
+    'send_backtrack_server_request',
     # From bundle_data module...
     'BUNDLE_SEA_LEVEL_MODELS',
     'BUNDLE_PATH',
@@ -222,3 +293,30 @@ __all__ = [
     '__version__',
     'VERSION'
 ]
+
+
+def __getattr__(name):
+    """Import a public attribute (or a submodule) of 'pybacktrack' when it is first accessed."""
+    
+    lazy_attribute = _LAZY_ATTRIBUTES.get(name)
+    if lazy_attribute is not None:
+        module_name, attribute_name = lazy_attribute
+        value = getattr(importlib.import_module('.' + module_name, __name__), attribute_name)
+        # Cache in the module namespace so '__getattr__()' is not called again for this attribute.
+        globals()[name] = value
+        return value
+    
+    # Support accessing submodules (eg, 'pybacktrack.backtrack') without explicitly importing them.
+    if not name.startswith('_'):
+        try:
+            return importlib.import_module('.' + name, __name__)
+        except ModuleNotFoundError as error:
+            # Only ignore the error if it's the submodule itself that doesn't exist (not a module that it imports).
+            if error.name != __name__ + '.' + name:
+                raise
+    
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -18,7 +18,7 @@
 
 """Convert ocean basin ages (Ma) to basement depth (metres) using different age/depth models.
 
-:func:`pybacktrack.convert_age_to_depth` converts a single ocean basin age to basement depth.
+:func:`pybacktrack.convert_age_to_depth` converts a single ocean basin age (or an array of ages) to basement depth.
 
 :func:`pybacktrack.convert_age_to_depth_files` converts a sequence of ages (read from an input file) to depths (and writes both ages and depths to an output file).
 """
@@ -26,11 +26,15 @@
 
 import argparse
 import math
+import numpy as np
 import pybacktrack.bundle_data
+import pybacktrack.util.cache
+import pybacktrack.util.profiling as profiling
 import pybacktrack.version
 from pybacktrack.util.interpolate import read_curve_function
 import sys
 import warnings
+import weakref
 
 
 #
@@ -61,42 +65,282 @@ DEFAULT_MODEL = MODEL_RHCW18
 
 def convert_age_to_depth(
         age,
-        model=DEFAULT_MODEL):
-    """convert_age_to_depth(age, model=pybacktrack.AGE_TO_DEPTH_DEFAULT_MODEL)
+        model=DEFAULT_MODEL,
+        *,
+        tabulated=False):
+    """convert_age_to_depth(age, model=pybacktrack.AGE_TO_DEPTH_DEFAULT_MODEL, *, tabulated=False)
     Convert ocean basin age to basement depth using a specified age/depth model.
     
     Parameters
     ----------
-    age : float
-        The age in Ma.
+    age : float or array_like of float
+        The age in Ma (or a sequence/array of ages).
     model : {pybacktrack.AGE_TO_DEPTH_MODEL_RHCW18, pybacktrack.AGE_TO_DEPTH_MODEL_CROSBY_2007, pybacktrack.AGE_TO_DEPTH_MODEL_GDH1} or function, optional
         The model to use when converting ocean age to basement depth.
         It can be one of the enumerated values, or a callable function accepting a single non-negative age parameter and returning depth (in metres).
+    tabulated : bool or {'auto'}, optional
+        Whether to interpolate a dense precomputed age-to-depth table of the model (instead of evaluating the model at each age).
+        This is faster when the model is expensive to evaluate (such as ``pybacktrack.AGE_TO_DEPTH_MODEL_CROSBY_2007`` or a Python function)
+        and many ages are converted. The interpolation error is verified to be less than 1 centimetre (otherwise the model is evaluated instead).
+        If ``'auto'`` then the built-in models are tabulated, but a function is only tabulated if its table has already been built
+        or if enough ages are converted (in this call) to repay the cost of building its table.
+        Defaults to ``False``.
     
     Returns
     -------
-    float
+    float or numpy.ndarray
         Depth (in metres) as a positive number.
+        If ``age`` is a sequence/array then returns an array of depths (with the same shape as ``age``).
     
     Raises
     ------
     ValueError
-        If `age` is negative.
+        If `age` is negative (or any age is negative).
     TypeError
         If `model` is not a recognised model, or a function accepting a single parameter.
+    
+    Notes
+    -----
+    All the built-in models are vectorized, so converting an array of ages in one call is much faster than
+    converting each age in a separate call.
+    
+    If `model` is a function and ``age`` is an array then the function is first called with the entire array of ages
+    (in case it supports arrays, such as a function using NumPy operations). If that fails, or does not return one depth per age,
+    then the function is called separately for each age.
+    
+    If ``tabulated`` is ``True`` then the age-to-depth table of the model is built (and verified) the first time it's needed.
+    Building the table of a function calls it about twenty thousand times (to evaluate it at every table age, and verify the interpolation error),
+    so ``tabulated='auto'`` only builds the table of a function when converting at least that many ages.
+    The tables of the built-in models are also cached on disk (so they are only built once, rather than once per process).
+    The table of a function is only cached in memory, and assumes the function always returns the same depth for the same age.
+    The ``pybacktrack.AGE_TO_DEPTH_MODEL_GDH1`` and ``pybacktrack.AGE_TO_DEPTH_MODEL_RHCW18`` models are always evaluated directly
+    since they are already cheap to evaluate (and exact).
+    
+    .. versionchanged:: 1.5
+        ``age`` can be a sequence/array of ages. Added ``tabulated`` argument.
     """
     
-    if age < 0:
+    if tabulated == 'auto':
+        tabulated = _is_worth_tabulating(model, np.size(age))
+    
+    if np.ndim(age) == 0:
+        # A single age.
+        if age < 0:
+            raise ValueError('Age must be non-negative')
+        
+        if tabulated:
+            age_to_depth_table = _get_age_to_depth_table(model)
+            if age_to_depth_table is not None:
+                return float(_interpolate_age_to_depth_table(np.asarray(age, dtype=float), model, age_to_depth_table))
+        
+        if model == MODEL_GDH1:
+            return float(_age_to_depth_GDH1(age))
+        elif model == MODEL_CROSBY_2007:
+            return float(_age_to_depth_CROSBY_2007(age))
+        elif model == MODEL_RHCW18:
+            return float(_age_to_depth_RHCW18(age))
+        else:
+            return model(age)
+    
+    # An array of ages.
+    ages = np.asarray(age, dtype=float)
+    if np.any(ages < 0):
         raise ValueError('Age must be non-negative')
     
+    if tabulated:
+        age_to_depth_table = _get_age_to_depth_table(model)
+        if age_to_depth_table is not None:
+            return _interpolate_age_to_depth_table(ages, model, age_to_depth_table)
+    
+    return _evaluate_model(ages, model)
+
+
+def _evaluate_model(ages, model):
+    """
+    Evaluate an age-to-depth model (enumerated model or function) at an array of non-negative ages, and return an array of depths.
+    """
+    
     if model == MODEL_GDH1:
-        return _age_to_depth_GDH1(age)
+        return _age_to_depth_GDH1(ages)
     elif model == MODEL_CROSBY_2007:
-        return _age_to_depth_CROSBY_2007(age)
+        return _age_to_depth_CROSBY_2007(ages)
     elif model == MODEL_RHCW18:
-        return _age_to_depth_RHCW18(age)
+        return _age_to_depth_RHCW18(ages)
     else:
-        return model(age)
+        return _call_model_function(model, ages)
+
+
+def _call_model_function(model, ages):
+    """
+    Call a user-provided age-to-depth function with an array of ages, and return an array of depths.
+    
+    First try calling the function with the entire array (in case it's array-aware),
+    otherwise fall back to calling it once per age.
+    """
+    
+    try:
+        depths = np.asarray(model(ages), dtype=float)
+        if depths.shape == ages.shape:
+            return depths
+    except (TypeError, ValueError):
+        # Function does not support arrays (eg, uses 'math' functions or 'if' statements on the age).
+        pass
+    
+    return np.array([model(float(age)) for age in ages.flat], dtype=float).reshape(ages.shape)
+
+
+#
+# Dense precomputed age-to-depth tables.
+#
+# Ocean depth varies like the square root of age near the ridge (half-space cooling), so linearly interpolating a table that is
+# uniformly spaced in *age* has large errors at young ages (about 7 metres near zero age even with a 0.01 My spacing).
+# Instead the table is uniformly spaced in the *square root* of age, where depth is smooth (and close to linear near the ridge).
+#
+
+# Ages beyond this (in Ma) are evaluated using the model (instead of the table).
+_TABLE_MAX_AGE = 300.0
+# Number of table entries (uniformly spaced in square root of age from 0 to '_TABLE_MAX_AGE').
+# This corresponds to an age spacing of about 0.03 My at '_TABLE_MAX_AGE' (and much finer at younger ages).
+_TABLE_NUM_ENTRIES = 10001
+# Building a table evaluates the model at every table age and at every midpoint between them (to verify the interpolation error).
+# So the table of a function is only built automatically (with "tabulated='auto'") when converting at least this many ages.
+_MIN_NUM_AGES_TO_TABULATE_FUNCTION = 2 * _TABLE_NUM_ENTRIES - 1
+# A table is only used if its linear interpolation error (in metres) is verified to be less than this.
+_TABLE_MAX_INTERPOLATION_ERROR = 0.01
+# Increment this whenever a change invalidates the tables cached on disk (eg, a change to a built-in model).
+_TABLE_VERSION = 1
+
+# The square roots of the table ages (the same for all tables).
+_TABLE_SQRT_AGES = np.linspace(0.0, math.sqrt(_TABLE_MAX_AGE), _TABLE_NUM_ENTRIES)
+
+# Tables of built-in models (indexed by model enumeration).
+# The expensive built-in models are also cached on disk (so they don't have to be rebuilt in each process).
+_TABULATED_BUILT_IN_MODEL_NAMES = {MODEL_CROSBY_2007: 'CROSBY_2007'}
+_built_in_model_tables = {}
+# Tables of user-provided model functions (indexed by function).
+# These are only cached in memory since there's no reliable way to identify a function across processes.
+# Weak references are used so that a table is released when its function is released.
+_model_function_tables = weakref.WeakKeyDictionary()
+
+
+def _is_worth_tabulating(model, num_ages):
+    """
+    Return True if converting 'num_ages' ages using the age-to-depth table of 'model' is likely faster than evaluating 'model' directly.
+    
+    The built-in models are always worth tabulating (their tables are cached on disk, and GDH1 and RHCW18 are never tabulated anyway).
+    A function is only worth tabulating if its table has already been built, or if 'num_ages' is at least the number of
+    function evaluations needed to build (and verify) its table.
+    """
+    
+    if model == MODEL_GDH1 or model == MODEL_CROSBY_2007 or model == MODEL_RHCW18:
+        return True
+    
+    try:
+        if model in _model_function_tables:
+            return True
+    except TypeError:
+        # Cannot create a weak reference to the function, so it won't be tabulated anyway.
+        return False
+    
+    return num_ages >= _MIN_NUM_AGES_TO_TABULATE_FUNCTION
+
+
+def _get_age_to_depth_table(model):
+    """
+    Return the depths in the age-to-depth table of 'model' (at the ages in '_TABLE_SQRT_AGES' squared), building it if necessary.
+    
+    Returns None if the model should not be tabulated (it's cheap to evaluate directly), or the model could not be tabulated
+    accurately enough (its interpolation error exceeds '_TABLE_MAX_INTERPOLATION_ERROR'), or the model raised an error when building the table.
+    """
+    
+    # GDH1 and RHCW18 are cheap to evaluate (and exact), so don't tabulate them.
+    if model == MODEL_GDH1 or model == MODEL_RHCW18:
+        return None
+    
+    if model in _TABULATED_BUILT_IN_MODEL_NAMES:
+        if model not in _built_in_model_tables:
+            _built_in_model_tables[model] = _load_or_build_built_in_model_table(model)
+        return _built_in_model_tables[model]
+    
+    # A user-provided model function.
+    try:
+        return _model_function_tables[model]
+    except KeyError:
+        pass
+    except TypeError:
+        # Cannot create a weak reference to the function (eg, a built-in function), so evaluate it directly (instead of tabulating).
+        return None
+    
+    age_to_depth_table = _build_age_to_depth_table(model)
+    _model_function_tables[model] = age_to_depth_table
+    return age_to_depth_table
+
+
+def _load_or_build_built_in_model_table(model):
+    """
+    Load the age-to-depth table of a built-in model from the on-disk cache, otherwise build it (and store it in the on-disk cache).
+    """
+    
+    cache_filename = 'age_to_depth_{0}_v{1}_{2}Ma_{3}.npy'.format(
+        _TABULATED_BUILT_IN_MODEL_NAMES[model], _TABLE_VERSION, _TABLE_MAX_AGE, _TABLE_NUM_ENTRIES)
+    
+    age_to_depth_table = pybacktrack.util.cache.read_cached_array(cache_filename)
+    # Only use the cached table if it looks valid (otherwise rebuild it).
+    if (age_to_depth_table is not None and
+        age_to_depth_table.shape == _TABLE_SQRT_AGES.shape and
+        np.all(np.isfinite(age_to_depth_table))):
+        return age_to_depth_table
+    
+    age_to_depth_table = _build_age_to_depth_table(model)
+    if age_to_depth_table is not None:
+        pybacktrack.util.cache.write_cached_array(cache_filename, age_to_depth_table)
+    
+    return age_to_depth_table
+
+
+def _build_age_to_depth_table(model):
+    """
+    Evaluate 'model' at the table ages and verify the interpolation error of the table.
+    
+    The interpolation error is measured at the midpoint of every table interval (where the linear interpolation error is largest).
+    
+    Returns None if the interpolation error exceeds '_TABLE_MAX_INTERPOLATION_ERROR', or if the model raised an error or returned non-finite depths.
+    """
+    
+    sqrt_mid_ages = 0.5 * (_TABLE_SQRT_AGES[1:] + _TABLE_SQRT_AGES[:-1])
+    try:
+        age_to_depth_table = _evaluate_model(_TABLE_SQRT_AGES * _TABLE_SQRT_AGES, model)
+        mid_age_depths = _evaluate_model(sqrt_mid_ages * sqrt_mid_ages, model)
+    except Exception:
+        # The model could not be evaluated over the entire table age range (eg, it only supports a limited age range).
+        # So evaluate it directly (only at the ages requested by the caller).
+        return None
+    
+    if not (np.all(np.isfinite(age_to_depth_table)) and np.all(np.isfinite(mid_age_depths))):
+        return None
+    
+    interpolation_errors = np.abs(0.5 * (age_to_depth_table[1:] + age_to_depth_table[:-1]) - mid_age_depths)
+    if np.max(interpolation_errors) > _TABLE_MAX_INTERPOLATION_ERROR:
+        return None
+    
+    return age_to_depth_table
+
+
+def _interpolate_age_to_depth_table(ages, model, age_to_depth_table):
+    """
+    Interpolate the age-to-depth table of 'model' at an array of non-negative ages.
+    
+    Ages beyond the table age range are evaluated using the model.
+    """
+    
+    depths = np.array(np.interp(np.sqrt(np.minimum(ages, _TABLE_MAX_AGE)), _TABLE_SQRT_AGES, age_to_depth_table), dtype=float)
+    
+    # Evaluate the model at any ages beyond the table.
+    ages_beyond_table = ages > _TABLE_MAX_AGE
+    if np.any(ages_beyond_table):
+        depths[ages_beyond_table] = _evaluate_model(ages[ages_beyond_table], model)
+    
+    return depths
 
 
 def convert_age_to_depth_files(
@@ -137,16 +381,9 @@ def convert_age_to_depth_files(
         Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
     """
     
-    with open(input_filename, 'r') as input_file, open(output_filename, 'w') as output_file:
-
-        # Write the column header.
-        if reverse_output_columns:
-            column_header = 'depth', 'age'
-        else:
-            column_header = 'age', 'depth'
-        output_file.write('{}\n'.format(
-                '# {0:<20}{1:<20}'.format(*column_header).rstrip(' ')))
-
+    # Read all the ages from the input file (so they can be converted to depths in a single call).
+    ages = []
+    with open(input_filename, 'r') as input_file:
         for line_number, line in enumerate(input_file):
             
             # Make line number 1-based instead of 0-based.
@@ -177,7 +414,22 @@ def convert_age_to_depth_files(
                 raise ValueError('Cannot read age value at line {0} of input file {1}.'.format(
                                  line_number, input_filename))
             
-            depth = convert_age_to_depth(age, model)
+            ages.append(age)
+    
+    # Convert all ages to depths (in bulk).
+    depths = convert_age_to_depth(ages, model).tolist()
+    
+    with open(output_filename, 'w') as output_file:
+        
+        # Write the column header.
+        if reverse_output_columns:
+            column_header = 'depth', 'age'
+        else:
+            column_header = 'age', 'depth'
+        output_file.write('{}\n'.format(
+                '# {0:<20}{1:<20}'.format(*column_header).rstrip(' ')))
+        
+        for age, depth in zip(ages, depths):
             
             if reverse_output_columns:
                 output_row = depth, age
@@ -195,12 +447,17 @@ def convert_age_to_depth_files(
 
 def _age_to_depth_GDH1(age):
     
-    if age < 0:
+    # Note: Works with a single age or an array of ages.
+    age = np.asarray(age, dtype=float)
+    if np.any(age < 0):
         raise ValueError('Age must be non-negative')
-    elif age < 20:
-        return 2600.0 + 365.0 * math.sqrt(age)
-    else:
-        return 5651.0 - 2473.0 * math.exp(-0.0278 * age)
+    
+    # Avoid warnings from evaluating both branches for all ages (only one branch is selected per age).
+    young_age = np.minimum(age, 20.0)
+    return np.where(
+        age < 20,
+        2600.0 + 365.0 * np.sqrt(young_age),
+        5651.0 - 2473.0 * np.exp(-0.0278 * age))
 
 
 ###################################################################################################
@@ -232,30 +489,40 @@ _CROSBY_2007_PERT_E = 30.0
 _CROSBY_2007_FTOL = 1.0e-6
 
 
-def _CROSBY_2007_subs(age):
+# Number of (odd) terms summed explicitly in the plate model series (the remaining terms are approximated by an integral).
+_CROSBY_2007_NUM_SERIES_TERMS = 50
 
-    # Calculates the expected subsidence for a given age and plate model
 
-    age *= 1.0e6 * 365.25 * 24.0 * 3600.0
-        
-    i = 1.0
-    oldsum = 0.0
-    
-    while True:
-
-        sum = math.exp(-i * i * math.pi * math.pi * _CROSBY_2007_KAPPA * age / (_CROSBY_2007_PTHICK * _CROSBY_2007_PTHICK))
-        sum /= (i * i)
-        sum *= -2.0
-        sum += oldsum
+def _CROSBY_2007_subs(age):
 
-        fdiff = math.fabs((sum - oldsum) / sum)
- 
-        oldsum = sum
-        
-        i += 2.0
+    # Calculates the expected subsidence for a given age and plate model.
+    #
+    # Note: Works with a single age or an array of ages.
+    #
+    # The original C program summed the series (over odd 'i') until the relative change was within '_CROSBY_2007_FTOL'.
+    # That converges very slowly for young ages (and is not vectorizable since the number of terms depends on age).
+    # Instead we sum a fixed number of terms and approximate the sum of the remaining terms by an integral
+    # (midpoint rule, since the odd terms are spaced 2 apart). This is accurate to well within a centimetre for all ages
+    # (whereas the original iteration was inaccurate by up to about a metre and a half for very young ages).
+    
+    # Import here (rather than at module level) since SciPy is slow to import and only this age-to-depth model needs it.
+    import scipy.special
+    
+    age = np.asarray(age, dtype=float) * (1.0e6 * 365.25 * 24.0 * 3600.0)
+    
+    c = math.pi * math.pi * _CROSBY_2007_KAPPA * age / (_CROSBY_2007_PTHICK * _CROSBY_2007_PTHICK)
+    
+    # Sum the explicit terms exp(-i*i*c) / (i*i) for odd 'i'.
+    sum = np.zeros(c.shape)
+    for i in range(1, 2 * _CROSBY_2007_NUM_SERIES_TERMS, 2):
+        sum += np.exp(-i * i * c) / (i * i)
     
-        if fdiff <= _CROSBY_2007_FTOL:
-            break
+    # Approximate the remaining terms (odd i >= X+1) by half the integral of exp(-c*x*x) / (x*x) from X to infinity.
+    X = 2.0 * _CROSBY_2007_NUM_SERIES_TERMS
+    sqrt_c = np.sqrt(c)
+    sum += 0.5 * (np.exp(-c * X * X) / X - math.sqrt(math.pi) * sqrt_c * scipy.special.erfc(sqrt_c * X))
+    
+    sum *= -2.0
 
     w = sum * 2.0 * _CROSBY_2007_TM * _CROSBY_2007_PTHICK / (math.pi * math.pi)
     w += _CROSBY_2007_TM * _CROSBY_2007_PTHICK / 2.0
@@ -266,10 +533,13 @@ def _CROSBY_2007_subs(age):
 
 def _CROSBY_2007_pert(age):
 
+    # Note: Works with a single age or an array of ages.
+    age = np.asarray(age, dtype=float)
+    
     ptb = (age - _CROSBY_2007_PERT_D) / _CROSBY_2007_PERT_E
     ptb *= ptb
-    ptb = math.exp(-ptb)
-    ptb *= math.sin((age / _CROSBY_2007_PERT_B) - _CROSBY_2007_PERT_C)
+    ptb = np.exp(-ptb)
+    ptb *= np.sin((age / _CROSBY_2007_PERT_B) - _CROSBY_2007_PERT_C)
     ptb *= _CROSBY_2007_PERT_A
 
     return ptb
@@ -280,17 +550,25 @@ def _CROSBY_2007_pert(age):
 # "Structure and dynamics of the oceanic lithosphere-asthenosphere system". #
 #############################################################################
 
-_RHCW18_age_to_depth_function = None
+# The RHCW18 age-to-depth curve (ages and depths sorted by age), loaded the first time it's needed.
+_RHCW18_ages = None
+_RHCW18_depths = None
 
 def _age_to_depth_RHCW18(age):
 
-    # Create the model function the first time we're called.
-    global _RHCW18_age_to_depth_function
-    if _RHCW18_age_to_depth_function is None:
+    # Load the model curve the first time we're called.
+    global _RHCW18_ages, _RHCW18_depths
+    if _RHCW18_ages is None:
         # Read the age-to-depth curve depth=function(age) from age-to-depth data file.
-        _RHCW18_age_to_depth_function, _, _ = read_curve_function(pybacktrack.bundle_data.BUNDLE_AGE_TO_DEPTH_MODEL_RHCW18_FILENAME)
-
-    return _RHCW18_age_to_depth_function(age)
+        _, ages, depths = read_curve_function(pybacktrack.bundle_data.BUNDLE_AGE_TO_DEPTH_MODEL_RHCW18_FILENAME)
+        sort_indices = np.argsort(ages, kind='stable')
+        _RHCW18_depths = np.asarray(depths, dtype=float)[sort_indices]
+        _RHCW18_ages = np.asarray(ages, dtype=float)[sort_indices]
+    
+    # Linearly interpolate the curve (clamping to the boundary depths outside the age range of the curve).
+    #
+    # Note: Works with a single age or an array of ages.
+    return np.interp(age, _RHCW18_ages, _RHCW18_depths)
 
 
 model_dict = dict((model_name, model) for model, model_name, _ in ALL_MODELS)
@@ -396,9 +674,16 @@ def main():
         metavar='output_filename',
         help='The output filename containing the converted "depth" values (and associated age values).')
     
+    # Optionally profile the script (and any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    
     # Parse command-line options.
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
     convert_age_to_depth_files(
         args.input_filename,
         args.output_filename,
@@ -20,23 +20,48 @@
 
 :func:`pybacktrack.backstrip_well` finds decompacted total sediment thickness and tectonic subsidence for each age in a well.
 
+:func:`pybacktrack.backstrip_wells` does the same for many wells (sharing the loaded models across all wells).
+
 :func:`pybacktrack.write_backstrip_well` writes decompacted parameters as columns in a text file.
 """
 
 
+import glob
+import multiprocessing
+import os
 import pybacktrack.bundle_data
 from pybacktrack.lithology import read_lithologies_file, read_lithologies_files, DEFAULT_BASE_LITHOLOGY_NAME
 from pybacktrack.sea_level import SeaLevel
-from pybacktrack.util.call_system_command import call_system_command
+from pybacktrack.util.call_system_command import start_system_command_trace
+import pybacktrack.util.column_output as column_output
+import pybacktrack.util.profiling as profiling
+import pybacktrack.util.reconstruction_cache as reconstruction_cache
+import pybacktrack.util.result_cache as result_cache
+import pybacktrack.util.well_processing as well_processing
 import pybacktrack.version
-from pybacktrack.well import read_well_file, write_well_file, write_well_metadata
+from pybacktrack.well import Well, read_well_file, write_well_file, write_well_metadata
 import math
 import numpy as np
-import pygplates
 import sys
 import warnings
 
 
+@result_cache.cache_results({
+    'well_filename': result_cache.file_contents_identifier,
+    'times': result_cache.value_identifier,
+    'lithology_filenames': result_cache.file_contents_identifier,
+    'total_sediment_thickness_filename': result_cache.files_identifier,
+    'sea_level_model': result_cache.sea_level_model_identifier,
+    'base_lithology_name': result_cache.value_identifier,
+    'rotation_filenames': result_cache.files_identifier,
+    'static_polygon_filename': result_cache.files_identifier,
+    'anchor_plate_id': result_cache.value_identifier,
+    'well_location': result_cache.value_identifier,
+    'well_bottom_age_column': result_cache.value_identifier,
+    'well_bottom_depth_column': result_cache.value_identifier,
+    'well_min_water_depth_column': result_cache.value_identifier,
+    'well_max_water_depth_column': result_cache.value_identifier,
+    'well_lithology_column': result_cache.value_identifier})
 def backstrip_well(
         well_filename,
         times=None,
@@ -165,6 +190,7 @@ def backstrip_well(
           present day well location through time (as new :attr:`DecompactedWell.paleo_longitude` and :attr:`DecompactedWell.paleo_latitude` attributes).
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
         - Now returns tuple (``well``, ``decompacted_wells``). Previously returned nothing.
+        - Results can be cached on disk (see :func:`pybacktrack.enable_result_cache`).
     """
     
     # Read the lithologies from one or more text files.
@@ -179,6 +205,288 @@ def backstrip_well(
         # So if the first and second files have the same lithology then the second lithology is used.
         lithologies = read_lithologies_files(lithology_filenames)
     
+    # Read the well from a text file.
+    well = _load_well(
+        well_filename,
+        lithologies,
+        well_location=well_location,
+        well_bottom_age_column=well_bottom_age_column,
+        well_bottom_depth_column=well_bottom_depth_column,
+        well_min_water_depth_column=well_min_water_depth_column,
+        well_max_water_depth_column=well_max_water_depth_column,
+        well_lithology_column=well_lithology_column)
+    # There should be at least one stratigraphic unit - if not then return empty decompaction list.
+    if not well.stratigraphic_units:
+        return []
+    
+    if total_sediment_thickness_filename:
+        # Sample total sediment thickness grid at well location.
+        total_sediment_thickness = well_processing.sample_grid(well.longitude, well.latitude, total_sediment_thickness_filename)
+    else:
+        # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid
+        # (so they specified None for 'total_sediment_thickness_filename').
+        total_sediment_thickness = None
+    
+    # Add a base stratigraphic unit from the bottom of the well to basement if the stratigraphic units
+    # in the well do not record the total sediment thickness.
+    _add_stratigraphic_unit_to_basement(
+        well,
+        total_sediment_thickness,
+        lithologies,
+        base_lithology_name)
+    
+    # Decompact the well.
+    well, decompacted_wells = _decompact_well(well, times)
+    
+    # Calculate sea level (relative to present day) for each decompaction age (unpacking of stratigraphic units)
+    # that is an average over the decompacted surface layer's period of deposition.
+    if sea_level_model:
+        # Create sea level object for integrating sea level over time periods.
+        sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
+        
+        well_processing.add_sea_level(well, decompacted_wells, sea_level)
+    
+    # Rotation model and static polygons for reconstructing the well location through time.
+    #
+    # These are shared with other runs using the same files (and the rotation model caches a reconstruction tree per decompaction age).
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=len(decompacted_wells))
+    plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames, anchor_plate_id)
+    
+    # Reconstruct the present day location of the well to the age of each decompacted well.
+    well_processing.add_paleo_locations(
+        well,
+        decompacted_wells,
+        rotation_model,
+        plate_partitioner,
+        anchor_plate_id)
+    
+    return well, decompacted_wells
+
+
+def backstrip_wells(
+        well_filenames,
+        times=None,
+        *,
+        lithology_filenames=[pybacktrack.bundle_data.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=pybacktrack.bundle_data.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,
+        sea_level_model=None,
+        base_lithology_name=DEFAULT_BASE_LITHOLOGY_NAME,
+        rotation_filenames=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,
+        static_polygon_filename=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        anchor_plate_id=0,
+        well_bottom_age_column=0,
+        well_bottom_depth_column=1,
+        well_min_water_depth_column=2,
+        well_max_water_depth_column=3,
+        well_lithology_column=4,
+        use_all_cpus=False):
+    # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
+    # the expanded values of the bundle filenames.
+    """backstrip_wells(\
+        well_filenames,\
+        times=None,\
+        *,\
+        lithology_filenames=[pybacktrack.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],\
+        total_sediment_thickness_filename=pybacktrack.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,\
+        sea_level_model=None,\
+        base_lithology_name=pybacktrack.DEFAULT_BASE_LITHOLOGY_NAME,\
+        rotation_filenames=pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,\
+        static_polygon_filename=pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,\
+        anchor_plate_id=0,\
+        well_bottom_age_column=0,\
+        well_bottom_depth_column=1,\
+        well_min_water_depth_column=2,\
+        well_max_water_depth_column=3,\
+        well_lithology_column=4,\
+        use_all_cpus=False)
+    Same as :func:`pybacktrack.backstrip_well` but backstrips many wells, sharing the loaded models across all wells.
+    
+    Parameters
+    ----------
+    well_filenames : sequence of string or :class:`pybacktrack.Well`
+        Names of the well text files.
+        The location of each well must be provided inside its well file
+        (as ``# SiteLongitude = <longitude>`` and ``# SiteLatitude = <latitude>``).
+        Wells (such as those returned by :meth:`pybacktrack.WellStore.query_wells`) can also be specified instead of filenames
+        (and are then amended, like the wells read from files, rather than copied). Their stratigraphic units must have
+        ``min_water_depth`` and ``max_water_depth`` attributes.
+    times : list of float, optional
+        A list of times to decompact sediment (the same times are used for all wells).
+        Defaults to the ages of the top of each stratigraphic unit in each well.
+    use_all_cpus : bool or int, optional
+        If ``False`` (or zero) then use a single CPU.
+        If ``True`` then distribute decompaction of the wells across all CPUs (cores).
+        If a positive integer then use that many CPUs (cores).
+        Defaults to ``False`` (single CPU).
+    
+    All other parameters are the same as :func:`pybacktrack.backstrip_well` (except there is no ``well_location`` parameter).
+    
+    Yields
+    ------
+    tuple
+        One result per well (in the same order as ``well_filenames``).
+        Each result is the same as that returned by :func:`pybacktrack.backstrip_well`, that is (``well``, ``decompacted_wells``).
+        
+        .. note:: Like :func:`pybacktrack.backstrip_well`, an empty list is yielded for a well without any stratigraphic units.
+    
+    Raises
+    ------
+    ValueError
+        If ``well_lithology_column`` is not the largest column number (must be last column).
+    ValueError
+        If the location of any well was not extracted from its well file.
+    TypeError
+        If ``use_all_cpus`` is neither a bool nor a positive integer.
+    
+    Notes
+    -----
+    The lithologies, sea level model, rotation model and static polygons are each loaded once (rather than once per well),
+    and the total sediment thickness grid is sampled at all well locations with a single grid sampling (rather than once per well).
+    All wells are read (and the grid sampled) before the first result is yielded.
+    
+    The results are then yielded one well at a time, so the backstripped wells do not all need to be held in memory at once.
+    
+    .. versionadded:: 1.5
+    """
+    
+    #
+    # Determine number of CPUs to use.
+    #
+    if use_all_cpus:
+        # If 'use_all_cpus' is a bool (and therefore is True) then use all available CPUs...
+        if isinstance(use_all_cpus, bool):
+            try:
+                num_cpus = multiprocessing.cpu_count()
+            except NotImplementedError:
+                num_cpus = 1
+        # else 'use_all_cpus' is a positive integer specifying the number of CPUs to use...
+        elif isinstance(use_all_cpus, int) and use_all_cpus > 0:
+            num_cpus = use_all_cpus
+        else:
+            raise TypeError('{} is neither a bool nor a positive integer'.format(use_all_cpus))
+    else:
+        num_cpus = 1
+    
+    # Read the lithologies from one or more text files (once for all wells).
+    #
+    # It used to be a single filename (instead of a list) so handle that case to be backward compatible.
+    if isinstance(lithology_filenames, str):
+        lithology_filename = lithology_filenames
+        lithologies = read_lithologies_file(lithology_filename)
+    else:
+        # Read all the lithology files and merge their dicts.
+        # Subsequently specified files override previous files in the list.
+        # So if the first and second files have the same lithology then the second lithology is used.
+        lithologies = read_lithologies_files(lithology_filenames)
+    
+    # Read all the wells (and their locations) up front so that the total sediment thickness grid can be sampled at all well locations at once.
+    wells = [
+        _load_well(
+            well_filename,
+            lithologies,
+            well_bottom_age_column=well_bottom_age_column,
+            well_bottom_depth_column=well_bottom_depth_column,
+            well_min_water_depth_column=well_min_water_depth_column,
+            well_max_water_depth_column=well_max_water_depth_column,
+            well_lithology_column=well_lithology_column)
+        for well_filename in well_filenames]
+    
+    # Only wells containing at least one stratigraphic unit get backstripped.
+    wells_to_backstrip = [well for well in wells if well.stratigraphic_units]
+    
+    if total_sediment_thickness_filename:
+        # Sample total sediment thickness grid at all well locations.
+        total_sediment_thicknesses = well_processing.sample_grid_at_locations(
+            [(well.longitude, well.latitude) for well in wells_to_backstrip],
+            total_sediment_thickness_filename)
+    else:
+        # Caller knows the well sites were drilled to basement depth and wants to ignore the total sediment thickness grid.
+        total_sediment_thicknesses = [None] * len(wells_to_backstrip)
+    
+    # Add a base stratigraphic unit from the bottom of each well to basement if the stratigraphic units
+    # in the well do not record the total sediment thickness.
+    for well, total_sediment_thickness in zip(wells_to_backstrip, total_sediment_thicknesses):
+        _add_stratigraphic_unit_to_basement(
+            well,
+            total_sediment_thickness,
+            lithologies,
+            base_lithology_name)
+    
+    # Create sea level object for integrating sea level over time periods (once for all wells).
+    if sea_level_model:
+        sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
+    else:
+        sea_level = None
+    
+    # Rotation model and static polygons for reconstructing the well locations through time (once for all wells).
+    #
+    # These are shared with other runs using the same files, and the rotation model caches a reconstruction tree
+    # for each distinct decompaction age (of all wells) so that no reconstruction tree is created more than once.
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=well_processing.get_num_decompaction_times(wells_to_backstrip, times))
+    plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames, anchor_plate_id)
+    
+    # Decompact the wells (distributed across CPUs if requested).
+    # This returns an iterator over the decompacted wells in the same order as 'wells_to_backstrip'.
+    decompactions = well_processing.decompact_wells(_decompact_well, wells_to_backstrip, times, num_cpus)
+    
+    for well in wells:
+        # There should be at least one stratigraphic unit - if not then yield empty decompaction list (like 'backstrip_well()').
+        if not well.stratigraphic_units:
+            yield []
+            continue
+        
+        # Note: Decompaction can happen in another process, so the returned well (a copy) replaces the original well.
+        well, decompacted_wells = next(decompactions)
+        
+        # Calculate sea level (relative to present day) for each decompaction age (unpacking of stratigraphic units)
+        # that is an average over the decompacted surface layer's period of deposition.
+        if sea_level:
+            well_processing.add_sea_level(well, decompacted_wells, sea_level)
+        
+        # Reconstruct the present day location of the well to the age of each decompacted well.
+        well_processing.add_paleo_locations(
+            well,
+            decompacted_wells,
+            rotation_model,
+            plate_partitioner,
+            anchor_plate_id)
+        
+        yield well, decompacted_wells
+
+
+def _load_well(
+        well_filename,
+        lithologies,
+        *,
+        well_location=None,
+        well_bottom_age_column=0,
+        well_bottom_depth_column=1,
+        well_min_water_depth_column=2,
+        well_max_water_depth_column=3,
+        well_lithology_column=4):
+    """
+    Read the well file and its backstripping metadata (well location).
+    
+    well_filename: Name of well text file, or a well.Well (such as one returned by a well.WellStore query) to use instead of reading a file.
+                   A Well is used as is (it's not copied), but its stratigraphic units must have min/max water depths.
+    
+    well_location: Optional location of well. If not provided then is extracted from 'well_filename' file.
+                   If specified then overrides value in well file.
+                   If specified then must be a 2-tuple (longitude, latitude) in degrees.
+    
+    Returns: Well
+    
+    Raises ValueError if 'lithology_column' is not the largest column number (must be last column).
+    Raises ValueError if the well has stratigraphic units, but 'well_location' is not specified *and*
+    the well location was not extracted from the well file.
+    """
+    
     def read_longitude(string):
         longitude = float(string)
         if longitude < -360 or longitude > 360:
@@ -191,25 +499,38 @@ def backstrip_well(
             raise ValueError('Latitude {0} is not a number in range [-90, 90]'.format(latitude))
         return latitude
     
-    # Read the well from a text file.
-    well = read_well_file(
-        well_filename,
-        lithologies,
-        bottom_age_column=well_bottom_age_column,
-        bottom_depth_column=well_bottom_depth_column,
-        lithology_column=well_lithology_column,
-        # Extra columns to read into attributes 'well.StratigraphicUnit.min_water_depth' and
-        # 'well.StratigraphicUnit.max_water_depth' for each row (returned in well.Well)...
-        other_columns={
-            'min_water_depth': well_min_water_depth_column,
-            'max_water_depth': well_max_water_depth_column},
-        # Attributes to read from file into returned well object...
-        well_attributes={
-            'SiteLongitude': ('longitude', read_longitude),
-            'SiteLatitude': ('latitude', read_latitude)})
-    # There should be at least one stratigraphic unit - if not then return empty decompaction list.
+    # Use the well if one was provided (instead of a well filename).
+    if isinstance(well_filename, Well):
+        well = well_filename
+        # The well location not stored in the well defaults to None (like metadata not found in a well file).
+        for well_attribute_name in ('longitude', 'latitude'):
+            if not hasattr(well, well_attribute_name):
+                setattr(well, well_attribute_name, None)
+        # Backstripping needs the min/max water depths of each stratigraphic unit.
+        for stratigraphic_unit in well.stratigraphic_units:
+            if (getattr(stratigraphic_unit, 'min_water_depth', None) is None or
+                getattr(stratigraphic_unit, 'max_water_depth', None) is None):
+                raise ValueError('Stratigraphic units of a backstripped well must have min and max water depths.')
+    else:
+        # Read the well from a text file.
+        well = read_well_file(
+            well_filename,
+            lithologies,
+            bottom_age_column=well_bottom_age_column,
+            bottom_depth_column=well_bottom_depth_column,
+            lithology_column=well_lithology_column,
+            # Extra columns to read into attributes 'well.StratigraphicUnit.min_water_depth' and
+            # 'well.StratigraphicUnit.max_water_depth' for each row (returned in well.Well)...
+            other_columns={
+                'min_water_depth': well_min_water_depth_column,
+                'max_water_depth': well_max_water_depth_column},
+            # Attributes to read from file into returned well object...
+            well_attributes={
+                'SiteLongitude': ('longitude', read_longitude),
+                'SiteLatitude': ('latitude', read_latitude)})
+    # A well without any stratigraphic units doesn't get backstripped (so it doesn't need a location).
     if not well.stratigraphic_units:
-        return []
+        return well
     
     # If the well location was specified then override the location read from the well file (if a location was read).
     if well_location is not None:
@@ -218,17 +539,29 @@ def backstrip_well(
     if well.longitude is None or well.latitude is None:
         raise ValueError('Well location was not extracted from well file and was not specified by user.')
     
+    return well
+
+
+def _add_stratigraphic_unit_to_basement(
+        well,
+        total_sediment_thickness,
+        lithologies,
+        base_lithology_name):
+    """
+    Add a base stratigraphic unit from the bottom of the well to basement if the stratigraphic units
+    in the well do not record the total sediment thickness.
+    
+    total_sediment_thickness: Total sediment thickness sampled at the well location, or None if the total
+                              sediment thickness grid should be ignored (in which case the well depth is used instead).
+    """
+    
     # The stratigraphic units in the well might not record the total sediment thickness.
     # The well depth/thickness is the bottom depth of the deepest stratigraphic unit (they are sorted from youngest to oldest).
     deepest_well_unit = well.stratigraphic_units[-1]
     well_sediment_thickness = deepest_well_unit.bottom_depth
     
-    if total_sediment_thickness_filename:
-        # Sample total sediment thickness grid at well location.
-        total_sediment_thickness = _sample_grid(well.longitude, well.latitude, total_sediment_thickness_filename)
-    else:
-        # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid
-        # (so they specified None for 'total_sediment_thickness_filename').
+    if total_sediment_thickness is None:
+        # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid.
         # Use the well depth in place of the total sediment thickness.
         total_sediment_thickness = well_sediment_thickness
     
@@ -275,80 +608,32 @@ def backstrip_well(
         base_unit_top_depth, base_unit_bottom_depth,
         base_unit_lithology_components, lithologies,
         base_unit_other_attributes)
+
+
+def _decompact_well(
+        well,
+        times=None):
+    """
+    Decompact a well at the top age of each stratigraphic unit (if 'times' is None) or at each time in 'times'.
+    
+    Returns 2-tuple (well, decompacted_wells).
+    
+    The well is also returned because this function can be called in another process (via 'multiprocessing'),
+    in which case the returned decompacted wells reference the stratigraphic units of a copy of 'well' (rather than 'well' itself).
+    """
     
     if times is None:
         # Each decompacted well (in returned list) represents decompaction at the top age of a stratigraphic unit in the well.
         decompacted_wells = well.decompact()
     else:
         # Each decompacted well (in the list) represents decompaction at a specific time (requested by caller).
-        decompacted_wells = [well.decompact(time) for time in times]
-    
-    # Calculate sea level (relative to present day) for each decompaction age (unpacking of stratigraphic units)
-    # that is an average over the decompacted surface layer's period of deposition.
-    if sea_level_model:
-        # Create sea level object for integrating sea level over time periods.
-        sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
-        
-        # The sea level (relative to present day) is integrated over the period of deposition of each
-        # stratigraphic layer (in decompacted wells) and added as a 'sea_level' attribute to each decompacted well.
-        for decompacted_well in decompacted_wells:
-            decompacted_well.sea_level = sea_level.get_average_level(
-                decompacted_well.surface_unit.bottom_age,
-                decompacted_well.surface_unit.top_age)
-
-    # Present day well location and rotation model for reconstructing its position through time.
-    present_day_well_location = pygplates.PointOnSphere(well.latitude, well.longitude)
-    rotation_model = pygplates.RotationModel(rotation_filenames)
-    
-    # Find the plate ID of the static polygon containing the well location (or anchor plate if not in any plates).
-    #
-    plate_partitioner = pygplates.PlatePartitioner(static_polygon_filename, rotation_model)
-    plate_containing_well_location = plate_partitioner.partition_point(present_day_well_location)
-    if plate_containing_well_location:
-        well_reconstruction_plate_id = plate_containing_well_location.get_feature().get_reconstruction_plate_id()
-    else:
-        # Shouldn't really get here if static polygons have global coverage at present day.
-        well_reconstruction_plate_id = anchor_plate_id
-    
-    # Reconstruct the present day location of the well to the age of each decompacted well (the top age of its surface unit).
-    # And add as 'paleo_longitude' and 'paleo_latitude' attributes of each decompacted well.
-    #
-    for decompacted_well in decompacted_wells:
-        # The current decompaction time (age of the surface of the current decompacted column of the well).
-        well_decompaction_time = decompacted_well.get_age()
-        # Get rotation from present day to current decompaction time using the reconstruction plate ID of the well location.
         #
-        # NOTE: We specify 'from_time=0' since there could be a non-zero finite rotation at present day (generally there shouldn't be) and
-        #       we don't want our present day well location to move when 'well_decompaction_time' is zero (or have this offset for non-zero times).
-        rotation = rotation_model.get_rotation(well_decompaction_time, well_reconstruction_plate_id, from_time=0, anchor_plate_id=anchor_plate_id)
-        # Reconstruct well location to current decompaction time.
-        reconstructed_well_location = rotation * present_day_well_location
-        # Store reconstructed well location as attributes in the current decompacted well.
-        decompacted_well.paleo_latitude, decompacted_well.paleo_longitude = reconstructed_well_location.to_lat_lon()
+        # Decompacting all times together (using arrays) is faster than decompacting each time separately.
+        decompacted_wells = well.decompact_at_times(times).create_decompacted_wells(well)
     
     return well, decompacted_wells
 
 
-def _sample_grid(longitude, latitude, grid_filename):
-    """
-    Samples the grid file 'grid_filename' at the longitude/latitude location (in degrees).
-    
-    Returns sampled float value (which can be NaN if location is in a masked region of grid).
-    """
-    
-    location_data = '{0} {1}\n'.format(longitude, latitude)
-
-    # The command-line strings to execute GMT 'grdtrack'.
-    grdtrack_command_line = ["gmt", "grdtrack", "-G{0}".format(grid_filename)]
-    
-    # Call the system command.
-    stdout_data = call_system_command(grdtrack_command_line, stdin=location_data, return_stdout=True)
-    
-    # GMT grdtrack returns a single line containing "longitude latitude sampled_value".
-    # Note that if GMT returns "NaN" then we'll return float('nan').
-    return float(stdout_data.split()[2])
-
-
 # Enumerations for the 'decompacted_columns' argument in 'write_well()'.
 COLUMN_AGE = 0
 COLUMN_DECOMPACTED_THICKNESS = 1
@@ -399,15 +684,17 @@ def write_well(
         well,
         *,
         well_attributes=None,
-        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS):
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        output_format='text'):
     """write_backstrip_well(\
         decompacted_wells,\
         decompacted_wells_filename,\
         well,\
         *,\
         well_attributes=None,\
-        decompacted_columns=pybacktrack.BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS)
-    Write decompacted parameters as columns in a text file.
+        decompacted_columns=pybacktrack.BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS,\
+        output_format='text')
+    Write decompacted parameters as columns in a text file (or a CSV, NumPy or NetCDF file).
     
     Parameters
     ----------
@@ -445,11 +732,23 @@ def write_well(
         * pybacktrack.BACKSTRIP_COLUMN_MAX_WATER_DEPTH
         * pybacktrack.BACKSTRIP_COLUMN_SEA_LEVEL
         * pybacktrack.BACKSTRIP_COLUMN_LITHOLOGY
+    output_format : {'text', 'csv', 'npz', 'netcdf'}, optional
+        The format of the output file:
+        
+        * ``text``: A text file with fixed-width columns and the well metadata in commented lines (the default).
+        * ``csv``: A CSV file with a header row of column names (but no well metadata).
+        * ``npz``: A compressed NumPy file with an array for each column (named after the column), and the well metadata
+          in the ``metadata_names`` and ``metadata_values`` arrays.
+        * ``netcdf``: A NetCDF (version 3) file with a variable for each column (named after the column),
+          and the well metadata in global attributes.
+        
+        In all formats except ``text`` the lithology column contains the lithology names and fractions in a single string
+        (eg, ``Shale 0.50 Sand 0.50``), and the columns are written as whole arrays (which is faster for many rows).
     
     Raises
     ------
     ValueError
-        If an unrecognised value is encountered in ``decompacted_columns``.
+        If an unrecognised value is encountered in ``decompacted_columns`` or ``output_format``.
     ValueError
         If ``pybacktrack.BACKSTRIP_COLUMN_LITHOLOGY`` is specified in ``decompacted_columns`` but is not the last column.
 
@@ -460,6 +759,7 @@ def write_well(
 
         - Added ``pybacktrack.BACKSTRIP_COLUMN_PALEO_LONGITUDE``, ``pybacktrack.BACKSTRIP_COLUMN_PALEO_LATITUDE`` and ``pybacktrack.BACKSTRIP_COLUMN_SEA_LEVEL`` to available columns for ``decompacted_columns``.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
+        - Added optional ``output_format`` argument.
     """
     
     # If 'COLUMN_LITHOLOGY' is specified then it must be the last column.
@@ -467,6 +767,26 @@ def write_well(
         decompacted_columns.index(COLUMN_LITHOLOGY) != len(decompacted_columns) - 1):
         raise ValueError('Lithology columns must be the last column in the decompacted well file.')
     
+    column_output.check_output_format(output_format)
+    
+    # Write CSV, NumPy and NetCDF formats as whole columns.
+    if output_format != 'text':
+        column_output.write_decompacted_wells_file(
+            decompacted_wells_filename,
+            output_format,
+            [decompacted_wells],
+            [well],
+            decompacted_columns,
+            _DECOMPACTED_COLUMN_NAMES_DICT,
+            _get_decompacted_column_array,
+            well_attributes)
+        return
+    
+    # Get the values of each column (except the lithology column which is formatted separately below).
+    column_arrays = [
+        _get_decompacted_column_array(decompacted_wells, decompacted_column) if decompacted_column != COLUMN_LITHOLOGY else None
+        for decompacted_column in decompacted_columns]
+    
     with open(decompacted_wells_filename, 'w') as file:
         
         # Write the same metadata that comes from the original well file.
@@ -495,7 +815,7 @@ def write_well(
         file.write('\n')
         
         # Each decompacted well (ie, at the top age of a stratigraphic unit) is written as a separate row.
-        for decompacted_well in decompacted_wells:
+        for row_index, decompacted_well in enumerate(decompacted_wells):
             
             for column_index, decompacted_column in enumerate(decompacted_columns):
                 if column_index == 0:
@@ -507,64 +827,147 @@ def write_well(
                     column_str_format_string = ' ' + str_format_string
                 column_width = column_widths[column_index]
                 
-                if decompacted_column == COLUMN_AGE:
-                    column_str = column_float_format_string.format(decompacted_well.get_age(), width=column_width)
-                elif decompacted_column == COLUMN_PALEO_LONGITUDE:
-                    column_str = column_float_format_string.format(decompacted_well.paleo_longitude, width=column_width)
-                elif decompacted_column == COLUMN_PALEO_LATITUDE:
-                    column_str = column_float_format_string.format(decompacted_well.paleo_latitude, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_THICKNESS:
-                    column_str = column_float_format_string.format(decompacted_well.total_decompacted_thickness, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_DENSITY:
-                    average_decompacted_density = decompacted_well.get_average_decompacted_density()
-                    column_str = column_float_format_string.format(average_decompacted_density, width=column_width)
-                elif decompacted_column == COLUMN_AVERAGE_TECTONIC_SUBSIDENCE:
-                    min_tectonic_subsidence, max_tectonic_subsidence = decompacted_well.get_min_max_tectonic_subsidence()
-                    average_tectonic_subsidence = (min_tectonic_subsidence + max_tectonic_subsidence) / 2.0
-                    column_str = column_float_format_string.format(average_tectonic_subsidence, width=column_width)
-                elif decompacted_column == COLUMN_MIN_TECTONIC_SUBSIDENCE:
-                    min_tectonic_subsidence, max_tectonic_subsidence = decompacted_well.get_min_max_tectonic_subsidence()
-                    column_str = column_float_format_string.format(min_tectonic_subsidence, width=column_width)
-                elif decompacted_column == COLUMN_MAX_TECTONIC_SUBSIDENCE:
-                    min_tectonic_subsidence, max_tectonic_subsidence = decompacted_well.get_min_max_tectonic_subsidence()
-                    column_str = column_float_format_string.format(max_tectonic_subsidence, width=column_width)
-                elif decompacted_column == COLUMN_AVERAGE_WATER_DEPTH:
-                    # Use extra attributes (min/max water depth) loaded into original well...
-                    average_water_depth = (decompacted_well.surface_unit.min_water_depth + decompacted_well.surface_unit.max_water_depth) / 2.0
-                    column_str = column_float_format_string.format(average_water_depth, width=column_width)
-                elif decompacted_column == COLUMN_MIN_WATER_DEPTH:
-                    # Use extra attributes (min/max water depth) loaded into original well...
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.min_water_depth, width=column_width)
-                elif decompacted_column == COLUMN_MAX_WATER_DEPTH:
-                    # Use extra attributes (min/max water depth) loaded into original well...
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.max_water_depth, width=column_width)
-                elif decompacted_column == COLUMN_SEA_LEVEL:
-                    column_str = column_float_format_string.format(decompacted_well.get_sea_level(), width=column_width)
-                elif decompacted_column == COLUMN_COMPACTED_THICKNESS:
-                    column_str = column_float_format_string.format(decompacted_well.total_compacted_thickness, width=column_width)
-                elif decompacted_column == COLUMN_LITHOLOGY:
+                if decompacted_column == COLUMN_LITHOLOGY:
                     # Write the original lithology components of the surface stratigraphic unit.
                     lithology_string = ''.join('{0:<15} {1:<10.2f} '.format(lithology_name, fraction)
                                                for lithology_name, fraction in decompacted_well.surface_unit.lithology_components)
                     column_str = column_str_format_string.format(lithology_string, width=column_width)
-                elif decompacted_column == COLUMN_COMPACTED_DEPTH:
-                    # Depth of the top of the first/surface stratigraphic unit.
-                    # This matches the age (which is also the top of the first/surface stratigraphic unit).
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.top_depth, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_SEDIMENT_RATE:
-                    # Get sediment rate of surface stratigraphic unit.
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.get_decompacted_sediment_rate(), width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_DEPTH:
-                    # Get fully decompacted depth (assumes overlying stratigraphic units are also fully decompacted).
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.decompacted_top_depth, width=column_width)
                 else:
-                    raise ValueError('Unrecognised value for "decompacted_columns".')
+                    column_str = column_float_format_string.format(column_arrays[column_index][row_index], width=column_width)
                 
                 file.write(column_str)
             
             file.write('\n')
 
 
+def write_wells(
+        decompacted_wells_list,
+        decompacted_wells_filename,
+        wells,
+        well_names,
+        *,
+        well_attributes=None,
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        output_format='csv'):
+    """write_backstrip_wells(\
+        decompacted_wells_list,\
+        decompacted_wells_filename,\
+        wells,\
+        well_names,\
+        *,\
+        well_attributes=None,\
+        decompacted_columns=pybacktrack.BACKSTRIP_DEFAULT_DECOMPACTED_COLUMNS,\
+        output_format='csv')
+    Write decompacted parameters of many wells to a single file indexed by well.
+    
+    Parameters
+    ----------
+    decompacted_wells_list : sequence of sequence of :class:`pybacktrack.DecompactedWell`
+        The decompacted wells returned by :func:`pybacktrack.backstrip_well` (or :func:`pybacktrack.backstrip_wells`) for each well.
+    decompacted_wells_filename : string
+        Name of output file.
+    wells : sequence of :class:`pybacktrack.Well`
+        The wells to extract metadata from (one per sequence in ``decompacted_wells_list``).
+    well_names : sequence of str
+        The name of each well (such as its well filename).
+    well_attributes : dict, optional
+        Optional attributes in :class:`pybacktrack.Well` objects to write as metadata (see :func:`pybacktrack.write_backstrip_well`).
+    decompacted_columns : list of columns, optional
+        The decompacted columns (and their order) to output (see :func:`pybacktrack.write_backstrip_well`).
+    output_format : {'csv', 'npz', 'netcdf'}, optional
+        The format of the output file (see :func:`pybacktrack.write_backstrip_well`).
+        Defaults to ``csv``.
+    
+    Raises
+    ------
+    ValueError
+        If an unrecognised value is encountered in ``decompacted_columns`` or ``output_format``.
+    ValueError
+        If the numbers of decompacted well sequences, wells and well names are not the same (or are zero).
+    
+    Notes
+    -----
+    In a CSV file the first column, ``well``, contains the well name of each row.
+    In a NumPy ``.npz`` file the ``well_names`` array contains the well names and the rows of well ``i`` are
+    ``well_row_offsets[i]`` to ``well_row_offsets[i+1]`` (in each column array).
+    A NetCDF file uses the contiguous ragged array representation of the CF conventions
+    (with a ``well_name`` variable and a ``row_size`` variable containing the number of rows of each well).
+    
+    .. versionadded:: 1.5
+    """
+    
+    column_output.write_decompacted_wells_file(
+        decompacted_wells_filename,
+        output_format,
+        decompacted_wells_list,
+        wells,
+        decompacted_columns,
+        _DECOMPACTED_COLUMN_NAMES_DICT,
+        _get_decompacted_column_array,
+        well_attributes,
+        well_names)
+
+
+def _get_decompacted_column_array(decompacted_wells, decompacted_column):
+    """
+    Return an array containing the values of a decompacted column at each decompacted well.
+    
+    The lithology column is an array of strings (each containing lithology names and fractions), otherwise arrays are float.
+    """
+    
+    if decompacted_column == COLUMN_AGE:
+        column_values = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_PALEO_LONGITUDE:
+        column_values = [decompacted_well.paleo_longitude for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_PALEO_LATITUDE:
+        column_values = [decompacted_well.paleo_latitude for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_THICKNESS:
+        column_values = [decompacted_well.total_decompacted_thickness for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_DENSITY:
+        column_values = [decompacted_well.get_average_decompacted_density() for decompacted_well in decompacted_wells]
+    elif decompacted_column in (COLUMN_AVERAGE_TECTONIC_SUBSIDENCE, COLUMN_MIN_TECTONIC_SUBSIDENCE, COLUMN_MAX_TECTONIC_SUBSIDENCE):
+        # A 2D array of (min, max) tectonic subsidence (one row per decompacted well).
+        min_max_tectonic_subsidence = np.array(
+            [decompacted_well.get_min_max_tectonic_subsidence() for decompacted_well in decompacted_wells],
+            dtype=float).reshape(-1, 2)
+        if decompacted_column == COLUMN_MIN_TECTONIC_SUBSIDENCE:
+            return min_max_tectonic_subsidence[:, 0]
+        elif decompacted_column == COLUMN_MAX_TECTONIC_SUBSIDENCE:
+            return min_max_tectonic_subsidence[:, 1]
+        return (min_max_tectonic_subsidence[:, 0] + min_max_tectonic_subsidence[:, 1]) / 2.0
+    elif decompacted_column in (COLUMN_AVERAGE_WATER_DEPTH, COLUMN_MIN_WATER_DEPTH, COLUMN_MAX_WATER_DEPTH):
+        # Use extra attributes (min/max water depth) loaded into original well...
+        min_max_water_depth = np.array(
+            [(decompacted_well.surface_unit.min_water_depth, decompacted_well.surface_unit.max_water_depth) for decompacted_well in decompacted_wells],
+            dtype=float).reshape(-1, 2)
+        if decompacted_column == COLUMN_MIN_WATER_DEPTH:
+            return min_max_water_depth[:, 0]
+        elif decompacted_column == COLUMN_MAX_WATER_DEPTH:
+            return min_max_water_depth[:, 1]
+        return (min_max_water_depth[:, 0] + min_max_water_depth[:, 1]) / 2.0
+    elif decompacted_column == COLUMN_SEA_LEVEL:
+        column_values = [decompacted_well.get_sea_level() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_COMPACTED_THICKNESS:
+        column_values = [decompacted_well.total_compacted_thickness for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_LITHOLOGY:
+        # The original lithology components of the surface stratigraphic unit.
+        return column_output.get_lithology_column_array(decompacted_wells)
+    elif decompacted_column == COLUMN_COMPACTED_DEPTH:
+        # Depth of the top of the first/surface stratigraphic unit.
+        # This matches the age (which is also the top of the first/surface stratigraphic unit).
+        column_values = [decompacted_well.surface_unit.top_depth for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_SEDIMENT_RATE:
+        # Get sediment rate of surface stratigraphic unit.
+        column_values = [decompacted_well.surface_unit.get_decompacted_sediment_rate() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_DEPTH:
+        # Get fully decompacted depth (assumes overlying stratigraphic units are also fully decompacted).
+        column_values = [decompacted_well.surface_unit.decompacted_top_depth for decompacted_well in decompacted_wells]
+    else:
+        raise ValueError('Unrecognised value for "decompacted_columns".')
+    
+    return np.array(column_values, dtype=float)
+
+
 def backstrip_and_write_well(
         decompacted_output_filename,
         well_filename,
@@ -584,7 +987,8 @@ def backstrip_and_write_well(
         well_min_water_depth_column=2,
         well_max_water_depth_column=3,
         well_lithology_column=4,
-        ammended_well_output_filename=None):
+        ammended_well_output_filename=None,
+        decompacted_output_format='text'):
     # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
     # the expanded values of the bundle filenames.
     """backstrip_and_write_well(\
@@ -606,7 +1010,8 @@ def backstrip_and_write_well(
         well_min_water_depth_column=2,\
         well_max_water_depth_column=3,\
         well_lithology_column=4,\
-        ammended_well_output_filename=None)
+        ammended_well_output_filename=None,\
+        decompacted_output_format='text')
     Same as :func:`pybacktrack.backstrip_well` but also writes decompacted results to a text file.
     
     Also optionally write amended well data (ie, including extra stratigraphic base unit from well bottom to basement)
@@ -691,6 +1096,8 @@ def backstrip_and_write_well(
         The column of well file containing lithology(s). Defaults to 4.
     ammended_well_output_filename: string, optional
         Amended well data filename. Useful if an extra stratigraphic base unit is added from well bottom to basement.
+    decompacted_output_format : {'text', 'csv', 'npz', 'netcdf'}, optional
+        The format of the decompacted output file (see :func:`pybacktrack.write_backstrip_well`). Defaults to ``text``.
     
     Returns
     -------
@@ -726,6 +1133,7 @@ def backstrip_and_write_well(
         - Added ``pybacktrack.BACKSTRIP_COLUMN_PALEO_LONGITUDE``, ``pybacktrack.BACKSTRIP_COLUMN_PALEO_LATITUDE`` and ``pybacktrack.BACKSTRIP_COLUMN_SEA_LEVEL`` to available columns for ``decompacted_columns``.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
         - Now returns tuple (``well``, ``decompacted_wells``). Previously returned nothing.
+        - Added optional ``decompacted_output_format`` argument.
     """
     
     # Decompact the well.
@@ -746,17 +1154,221 @@ def backstrip_and_write_well(
         well_max_water_depth_column=well_max_water_depth_column,
         well_lithology_column=well_lithology_column)
     
-    # Attributes of well object to write to file as metadata.
-    well_attributes = {'longitude': 'SiteLongitude', 'latitude': 'SiteLatitude'}
+    # Write the decompacted wells (and amended well if requested).
+    _write_backstripped_well(
+        well,
+        decompacted_wells,
+        decompacted_output_filename,
+        decompacted_columns,
+        ammended_well_output_filename,
+        decompacted_output_format)
+    
+    return well, decompacted_wells
+
+
+def backstrip_and_write_wells(
+        decompacted_output_filename,
+        well_filenames,
+        times=None,
+        *,
+        lithology_filenames=[pybacktrack.bundle_data.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=pybacktrack.bundle_data.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,
+        sea_level_model=None,
+        base_lithology_name=DEFAULT_BASE_LITHOLOGY_NAME,
+        rotation_filenames=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,
+        static_polygon_filename=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        anchor_plate_id=0,
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        well_bottom_age_column=0,
+        well_bottom_depth_column=1,
+        well_min_water_depth_column=2,
+        well_max_water_depth_column=3,
+        well_lithology_column=4,
+        ammended_well_output_filename=None,
+        use_all_cpus=False,
+        decompacted_output_format='text',
+        combine_output_wells=False):
+    # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
+    # the expanded values of the bundle filenames.
+    """backstrip_and_write_wells(\
+        decompacted_output_filename,\
+        well_filenames,\
+        times=None,\
+        *,\
+        lithology_filenames=[pybacktrack.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],\
+        total_sediment_thickness_filename=pybacktrack.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,\
+        sea_level_model=None,\
+        base_lithology_name=pybacktrack.DEFAULT_BASE_LITHOLOGY_NAME,\
+        rotation_filenames=pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,\
+        static_polygon_filename=pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,\
+        anchor_plate_id=0,\
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,\
+        well_bottom_age_column=0,\
+        well_bottom_depth_column=1,\
+        well_min_water_depth_column=2,\
+        well_max_water_depth_column=3,\
+        well_lithology_column=4,\
+        ammended_well_output_filename=None,\
+        use_all_cpus=False,\
+        decompacted_output_format='text',\
+        combine_output_wells=False)
+    Same as :func:`pybacktrack.backstrip_wells` but also writes the decompacted results of each well to its own text file
+    (or all wells to a single file if ``combine_output_wells`` is ``True``).
+    
+    Also optionally write amended well data (ie, including extra stratigraphic base unit from well bottom to basement)
+    of each well if ``ammended_well_output_filename`` is specified.
+    
+    Parameters
+    ----------
+    decompacted_output_filename : string
+        Used to generate the name of the text file to write the decompacted results of each well to.
+        If it contains the ``${well}`` template identifier (eg, ``${well}_decompacted.txt``) then each well's output filename
+        replaces the identifier with the well filename (excluding directory and extension).
+        Otherwise each well's output filename appends ``_<well_filename>`` (excluding directory).
+        If ``combine_output_wells`` is ``True`` then this is the name of the single file that all wells are written to.
+    well_filenames : string or sequence of string
+        One or more well text files, directories or glob patterns (eg, ``wells/*.txt``).
+        A directory expands to all files directly inside it and a glob pattern expands to all files matching it
+        (in both cases sorted by filename).
+        The location of each well must be provided inside its well file.
+    ammended_well_output_filename: string, optional
+        Used to generate the amended well data filename of each well (in the same way as ``decompacted_output_filename``).
+    use_all_cpus : bool or int, optional
+        If ``False`` (or zero) then use a single CPU.
+        If ``True`` then distribute decompaction of the wells across all CPUs (cores).
+        If a positive integer then use that many CPUs (cores).
+        Defaults to ``False`` (single CPU).
+    decompacted_output_format : {'text', 'csv', 'npz', 'netcdf'}, optional
+        The format of the decompacted output file(s) (see :func:`pybacktrack.write_backstrip_well`). Defaults to ``text``.
+    combine_output_wells : bool, optional
+        Whether to write the decompacted results of all wells to a single file indexed by well
+        (see :func:`pybacktrack.write_backstrip_wells`), instead of one file per well.
+        The well names in the file are the well filenames.
+        Requires ``decompacted_output_format`` to be ``csv``, ``npz`` or ``netcdf``.
+        Defaults to ``False``.
+    
+    All other parameters are the same as :func:`pybacktrack.backstrip_and_write_well` (except there is no ``well_location`` parameter).
+    
+    Returns
+    -------
+    list of tuple
+        A 2-tuple (``well_filename``, ``decompacted_output_filename``) for each well written
+        (in the order the well files were expanded).
+        If ``combine_output_wells`` is ``True`` then ``decompacted_output_filename`` is the same for each well.
+        Wells without any stratigraphic units are skipped (with a warning).
+    
+    Raises
+    ------
+    ValueError
+        If ``well_lithology_column`` is not the largest column number (must be last column).
+    ValueError
+        If the location of any well was not extracted from its well file.
+    ValueError
+        If ``well_filenames`` expands to no well files.
+    ValueError
+        If ``combine_output_wells`` is ``True`` and ``decompacted_output_format`` is ``text``.
+    TypeError
+        If ``use_all_cpus`` is neither a bool nor a positive integer.
+    
+    .. versionadded:: 1.5
+    """
+    
+    if combine_output_wells and decompacted_output_format == 'text':
+        raise ValueError('Cannot combine output wells into a "text" file.')
+    column_output.check_output_format(decompacted_output_format)
+    
+    # Expand any directories and glob patterns into well filenames.
+    well_filenames = _expand_well_filenames(well_filenames)
+    if not well_filenames:
+        raise ValueError('No well files found')
+    
+    # Backstrip the wells (one well at a time is returned).
+    backstrip_wells_output = backstrip_wells(
+        well_filenames,
+        times=times,
+        lithology_filenames=lithology_filenames,
+        total_sediment_thickness_filename=total_sediment_thickness_filename,
+        sea_level_model=sea_level_model,
+        base_lithology_name=base_lithology_name,
+        rotation_filenames=rotation_filenames,
+        static_polygon_filename=static_polygon_filename,
+        anchor_plate_id=anchor_plate_id,
+        well_bottom_age_column=well_bottom_age_column,
+        well_bottom_depth_column=well_bottom_depth_column,
+        well_min_water_depth_column=well_min_water_depth_column,
+        well_max_water_depth_column=well_max_water_depth_column,
+        well_lithology_column=well_lithology_column,
+        use_all_cpus=use_all_cpus)
+    
+    # When combining output wells, collect the decompacted wells and write them all to a single file at the end.
+    combined_wells = []
+    combined_decompacted_wells_list = []
+    
+    # Write output data of each well as soon as it's been backstripped (unless combining output wells).
+    written_wells = []
+    for well_filename, backstrip_well_output in zip(well_filenames, backstrip_wells_output):
+        # Skip wells that have no stratigraphic units.
+        if not backstrip_well_output:
+            warnings.warn('Skipping well "{0}" since it has no stratigraphic units.'.format(well_filename))
+            continue
+        
+        well, decompacted_wells = backstrip_well_output
+        
+        if combine_output_wells:
+            combined_wells.append(well)
+            combined_decompacted_wells_list.append(decompacted_wells)
+            
+            # Write out amended well data (ie, extra stratigraphic base unit) if requested.
+            if ammended_well_output_filename:
+                _write_backstripped_amended_well(well, well_processing.get_well_output_filename(ammended_well_output_filename, well_filename))
+            
+            written_wells.append((well_filename, decompacted_output_filename))
+            continue
+        
+        well_decompacted_output_filename = well_processing.get_well_output_filename(decompacted_output_filename, well_filename)
+        _write_backstripped_well(
+            well,
+            decompacted_wells,
+            well_decompacted_output_filename,
+            decompacted_columns,
+            well_processing.get_well_output_filename(ammended_well_output_filename, well_filename) if ammended_well_output_filename else None,
+            decompacted_output_format)
+        
+        written_wells.append((well_filename, well_decompacted_output_filename))
+    
+    # Write all wells to a single file (indexed by well) if requested.
+    if combined_wells:
+        write_wells(
+            combined_decompacted_wells_list,
+            decompacted_output_filename,
+            combined_wells,
+            [well_filename for well_filename, _ in written_wells],
+            well_attributes=_OUTPUT_WELL_ATTRIBUTES,
+            decompacted_columns=decompacted_columns,
+            output_format=decompacted_output_format)
+    
+    return written_wells
+
+
+# Attributes of well object to write to output files as metadata.
+_OUTPUT_WELL_ATTRIBUTES = {'longitude': 'SiteLongitude', 'latitude': 'SiteLatitude'}
+
+
+def _write_backstripped_well(
+        well,
+        decompacted_wells,
+        decompacted_output_filename,
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        ammended_well_output_filename=None,
+        decompacted_output_format='text'):
+    """
+    Write decompacted wells to 'decompacted_output_filename' (in 'decompacted_output_format'), and optionally write amended well data
+    (ie, including extra stratigraphic base unit) to 'ammended_well_output_filename' (if specified).
+    """
     
     # Write out amended well data (ie, extra stratigraphic base unit) if requested.
     if ammended_well_output_filename:
-        write_well_file(
-            well,
-            ammended_well_output_filename,
-            other_column_attribute_names=['min_water_depth', 'max_water_depth'],
-            # Attributes of well object to write to file as metadata...
-            well_attributes=well_attributes)
+        _write_backstripped_amended_well(well, ammended_well_output_filename)
     
     # Write the decompactions of the well at the ages of its stratigraphic units.
     write_well(
@@ -764,10 +1376,48 @@ def backstrip_and_write_well(
         decompacted_output_filename,
         well,
         # Attributes of well object to write to file as metadata...
-        well_attributes=well_attributes,
-        decompacted_columns=decompacted_columns)
+        well_attributes=_OUTPUT_WELL_ATTRIBUTES,
+        decompacted_columns=decompacted_columns,
+        output_format=decompacted_output_format)
+
+
+def _write_backstripped_amended_well(well, ammended_well_output_filename):
+    """
+    Write amended well data (ie, including extra stratigraphic base unit) to 'ammended_well_output_filename'.
+    """
     
-    return well, decompacted_wells
+    write_well_file(
+        well,
+        ammended_well_output_filename,
+        other_column_attribute_names=['min_water_depth', 'max_water_depth'],
+        # Attributes of well object to write to file as metadata...
+        well_attributes=_OUTPUT_WELL_ATTRIBUTES)
+
+
+def _expand_well_filenames(well_filenames):
+    """
+    Expand a well filename, directory or glob pattern (or a sequence of them) into a list of well filenames.
+    
+    A directory expands to the files directly inside it, and a glob pattern expands to the files matching it
+    (in both cases sorted by filename). Any other string is a well filename (and is not checked for existence).
+    """
+    
+    if isinstance(well_filenames, str):
+        well_filenames = [well_filenames]
+    
+    expanded_well_filenames = []
+    for well_filename in well_filenames:
+        if os.path.isdir(well_filename):
+            expanded_well_filenames.extend(sorted(
+                os.path.join(well_filename, filename) for filename in os.listdir(well_filename)
+                    if os.path.isfile(os.path.join(well_filename, filename))))
+        elif glob.has_magic(well_filename):
+            expanded_well_filenames.extend(sorted(
+                filename for filename in glob.glob(well_filename) if os.path.isfile(filename)))
+        else:
+            expanded_well_filenames.append(well_filename)
+    
+    return expanded_well_filenames
 
 
 #
@@ -829,10 +1479,20 @@ def main():
     will write age to the first column and decompacted thickness to the second column.
     If lithology is specified then it must be the last column.
     
+    Many wells can be backstripped in a single run by specifying their well files, directories and/or glob patterns
+    with the '-wl' option (instead of a single well file with the '-w' option). This loads the lithologies, sea level,
+    rotations and static polygons only once (for all wells) and samples the total sediment thickness grid at all well locations at once.
+    In this case the output filename is used to generate an output filename for each well (see 'output_filename' below),
+    and the location of each well must be provided inside its well file.
+    
     NOTE: Separate the positional and optional arguments with '--' (workaround for bug in argparse module).
     For example...
 
     python -m pybacktrack.backstrip_cli -w well.xy -l lithologies.txt -s tot_sed_thickness.nc -c 0 1 2 3 6 -d age decompacted_thickness -- decompacted_well.xy
+    
+    ...or, to backstrip all wells in the "wells" directory (writing to "wells_decompacted/<well>_decompacted.xy")...
+    
+    python -m pybacktrack.backstrip_cli -wl wells --use_all_cpus -d age decompacted_thickness -- 'wells_decompacted/${{well}}_decompacted.xy'
     """.format(''.join('        {0}\n'.format(column_name) for column_name in _DECOMPACTED_COLUMN_NAMES))
 
     import argparse
@@ -894,11 +1554,22 @@ def main():
         
         return filename
     
-    parser.add_argument(
-        '-w', '--well_filename', type=parse_unicode, required=True,
+    # Can specify a single well or many wells (but not both).
+    well_filename_argument_group = parser.add_mutually_exclusive_group(required=True)
+    well_filename_argument_group.add_argument(
+        '-w', '--well_filename', type=parse_unicode,
         metavar='well_filename',
         help='The well filename containing age, present day thickness, paleo water depth and lithology(s) '
                 'for each stratigraphic unit in a single well.')
+    well_filename_argument_group.add_argument(
+        '-wl', '--well_filenames', type=parse_unicode, nargs='+',
+        metavar='well_filename',
+        help='Multiple wells to backstrip in a single run. Each can be a well filename (containing a single well), '
+             'a directory (containing well files) or a quoted glob pattern (eg, "wells/*.txt"). '
+             'The lithologies, sea level, rotations and static polygons are loaded only once (for all wells) '
+             'and the total sediment thickness grid is sampled at all well locations at once. '
+             'The location of each well must be provided inside its well file. '
+             'See "output_filename" for how the output filename of each well is generated.')
     
     # Allow user to override the default lithology filename, and also specify bundled lithologies.
     parser.add_argument(
@@ -980,6 +1651,17 @@ def main():
         
         return value
     
+    def parse_positive_integer(value_string):
+        try:
+            value = int(value_string)
+        except ValueError:
+            raise argparse.ArgumentTypeError("%s is not an integer" % value_string)
+        
+        if value <= 0:
+            raise argparse.ArgumentTypeError("%g is not a positive integer" % value)
+        
+        return value
+    
     parser.add_argument('--anchor', type=parse_non_negative_integer, default=0,
             dest='anchor_plate_id',
             help='Anchor plate id used to reconstruct the well location. Defaults to zero.')
@@ -1071,14 +1753,68 @@ def main():
                  '(eg, "40, 100, 10" represents the interval from 40 Ma to 100 Ma inclusive, in 10 Myr intervals). '
                  'If no times are specified (either here or with "--time_list") then defaults to the top ages of the stratigraphic units in the well.')
     
+    parser.add_argument(
+        '--use_all_cpus', nargs='?', type=parse_positive_integer,
+        const=True, default=False,
+        metavar='NUM_CPUS',
+        help='Only used when backstripping multiple wells (with "--well_filenames"). '
+             'Use all CPUs (cores), or if an optional integer is also specified then use the specified number of CPUs. '
+             'Defaults to using a single CPU.')
+    
+    parser.add_argument(
+        '--decompacted_output_format', type=str, default='text',
+        choices=column_output.OUTPUT_FORMATS,
+        help='The format of the decompacted output file(s). '
+             'Choices are "text" (columns of fixed width, and well metadata, in a text file), '
+             '"csv" (a CSV file with a header row of column names), '
+             '"npz" (a compressed NumPy file with an array per column) and '
+             '"netcdf" (a NetCDF file with a variable per column). '
+             'Defaults to "text".')
+    
+    parser.add_argument(
+        '--combine_output_wells', action='store_true',
+        help='Only used when backstripping multiple wells (with "--well_filenames"). '
+             'Write the decompacted output of all wells to a single file (the output filename) indexed by well, '
+             'instead of one file per well. Requires a "--decompacted_output_format" other than "text".')
+    
     parser.add_argument(
         'output_filename', type=parse_unicode,
         metavar='output_filename',
-        help='The output filename used to store the decompacted total sediment thickness and tectonic subsidence through time.')
+        help='The output filename used to store the decompacted total sediment thickness and tectonic subsidence through time. '
+             'When backstripping multiple wells (with "--well_filenames") the output filename of each well is generated by appending '
+             '"_<well_filename>" to this (where <well_filename> excludes the directory), '
+             'unless "--combine_output_wells" is specified (in which case all wells are written to this output filename). '
+             'Alternatively, this can be a template string containing the "${well}" identifier (eg, "${well}_decompacted.txt") '
+             'in which case each output filename is generated by replacing the well identifier with the well filename '
+             '(excluding the directory and the filename extension). '
+             'The same applies to the output well filename ("--output_well_filename"), if specified.')
+    
+    # Optionally profile the script, and trace the system commands it calls (including in any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    parser.add_argument(
+        '--trace_system_commands', action='store_true',
+        help='Print a summary of the system commands (such as GMT) called by the script (including those called by any worker processes when using multiple CPUs) when the script finishes.')
+    parser.add_argument(
+        '--cache_results', action='store_true',
+        help='Cache the result of backstripping a single well (with "--well_filename") on disk, and reuse it when the same well is backstripped again '
+             'with the same inputs (well and lithology files, grids, models and parameters). '
+             'The cache directory can be set with the PYBACKTRACK_CACHE_DIR environment variable.')
     
     # Parse command-line options.
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
+    # Start tracing system commands (if requested). A summary is printed when the script exits.
+    if args.trace_system_commands:
+        start_system_command_trace(print_summary_at_exit=True)
+    
+    # Enable caching of results (if requested).
+    if args.cache_results:
+        result_cache.enable_result_cache()
+    
     # Convert output column names to enumerations.
     try:
         decompacted_columns = []
@@ -1114,6 +1850,42 @@ def main():
     else:
         times = None
     
+    if args.combine_output_wells:
+        if not args.well_filenames:
+            raise ValueError('Can only combine output wells when backstripping multiple wells (with "--well_filenames")')
+        if args.decompacted_output_format == 'text':
+            raise ValueError('Cannot combine output wells into a "text" file (specify a different "--decompacted_output_format")')
+    
+    # If backstripping multiple wells.
+    if args.well_filenames:
+        if args.well_location is not None:
+            raise ValueError('Cannot specify a well location when backstripping multiple wells (add the location to each well file instead)')
+        
+        # Backstrip and write output data of each well.
+        backstrip_and_write_wells(
+            args.output_filename,
+            args.well_filenames,
+            times=times,
+            lithology_filenames=args.lithology_filenames,
+            total_sediment_thickness_filename=total_sediment_thickness_filename,
+            sea_level_model=sea_level_model,
+            base_lithology_name=args.base_lithology_name,
+            rotation_filenames=args.rotation_filenames,
+            static_polygon_filename=args.static_polygon_filename,
+            anchor_plate_id=args.anchor_plate_id,
+            decompacted_columns=decompacted_columns,
+            well_bottom_age_column=args.well_columns[0],
+            well_bottom_depth_column=args.well_columns[1],
+            well_min_water_depth_column=args.well_columns[2],
+            well_max_water_depth_column=args.well_columns[3],
+            well_lithology_column=args.well_columns[4],
+            ammended_well_output_filename=args.output_well_filename,
+            use_all_cpus=args.use_all_cpus,
+            decompacted_output_format=args.decompacted_output_format,
+            combine_output_wells=args.combine_output_wells)
+        
+        return
+    
     # Backstrip and write output data.
     backstrip_and_write_well(
         args.output_filename,
@@ -1133,7 +1905,8 @@ def main():
         well_min_water_depth_column=args.well_columns[2],
         well_max_water_depth_column=args.well_columns[3],
         well_lithology_column=args.well_columns[4],
-        ammended_well_output_filename=args.output_well_filename)
+        ammended_well_output_filename=args.output_well_filename,
+        decompacted_output_format=args.decompacted_output_format)
 
 
 if __name__ == '__main__':
@@ -20,6 +20,8 @@
 
 :func:`pybacktrack.backtrack_well` finds decompacted total sediment thickness and water depth for each age in a well.
 
+:func:`pybacktrack.backtrack_wells` backtracks many wells (sharing the loaded models across all wells).
+
 :func:`pybacktrack.write_backtrack_well` writes decompacted parameters as columns in a text file.
 
 :func:`pybacktrack.backtrack_and_write_well` both backtracks well and writes decompacted data.
@@ -27,6 +29,7 @@
 
 
 import math
+import multiprocessing
 import numpy as np
 import pybacktrack.age_to_depth as age_to_depth
 import pybacktrack.bundle_data
@@ -34,10 +37,14 @@ from pybacktrack.dynamic_topography import DynamicTopography
 from pybacktrack.lithology import read_lithologies_file, read_lithologies_files, DEFAULT_BASE_LITHOLOGY_NAME
 import pybacktrack.rifting as rifting
 from pybacktrack.sea_level import SeaLevel
-from pybacktrack.util.call_system_command import call_system_command
+from pybacktrack.util.call_system_command import start_system_command_trace
+import pybacktrack.util.column_output as column_output
+import pybacktrack.util.profiling as profiling
+import pybacktrack.util.reconstruction_cache as reconstruction_cache
+import pybacktrack.util.result_cache as result_cache
+import pybacktrack.util.well_processing as well_processing
 import pybacktrack.version
-from pybacktrack.well import read_well_file, write_well_file, write_well_metadata
-import pygplates
+from pybacktrack.well import Well, read_well_file, write_well_file, write_well_metadata
 import sys
 import warnings
 
@@ -52,6 +59,29 @@ _DENSITY_MANTLE = 3330.0
 _MAX_TECTONIC_SUBSIDENCE_RIFTING_RESIDUAL_ERROR = 100
 
 
+@result_cache.cache_results({
+    'well_filename': result_cache.file_contents_identifier,
+    'times': result_cache.value_identifier,
+    'lithology_filenames': result_cache.file_contents_identifier,
+    'age_grid_filename': result_cache.files_identifier,
+    'topography_filename': result_cache.files_identifier,
+    'total_sediment_thickness_filename': result_cache.files_identifier,
+    'crustal_thickness_filename': result_cache.files_identifier,
+    'dynamic_topography_model': result_cache.dynamic_topography_model_identifier,
+    'sea_level_model': result_cache.sea_level_model_identifier,
+    'base_lithology_name': result_cache.value_identifier,
+    'ocean_age_to_depth_model': result_cache.value_identifier,
+    'rifting_period': result_cache.value_identifier,
+    'output_rift_stretching_factor': result_cache.value_identifier,
+    'rotation_filenames': result_cache.files_identifier,
+    'static_polygon_filename': result_cache.files_identifier,
+    'anchor_plate_id': result_cache.value_identifier,
+    'well_location': result_cache.value_identifier,
+    'well_bottom_age_column': result_cache.value_identifier,
+    'well_bottom_depth_column': result_cache.value_identifier,
+    'well_lithology_column': result_cache.value_identifier},
+    # The builtin rift start/end grids are sampled when the well is on continental crust (and no rifting period is provided).
+    implicit_filenames=(pybacktrack.bundle_data.BUNDLE_RIFTING_START_FILENAME, pybacktrack.bundle_data.BUNDLE_RIFTING_END_FILENAME))
 def backtrack_well(
         well_filename,
         times=None,
@@ -235,6 +265,7 @@ def backtrack_well(
         - Added optional ``output_rift_stretching_factor`` argument (and corresponding optional ``rift_stretching_factor`` return value).
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
         - Now returns tuple (``well``, ``decompacted_wells``, and optionally ``rift_stretching_factor``). Previously returned nothing.
+        - Results can be cached on disk (see :func:`pybacktrack.enable_result_cache`).
     """
     
     # Read the lithologies from one or more text files.
@@ -264,7 +295,7 @@ def backtrack_well(
     
     if age_grid_filename:
         # Sample age grid at well location.
-        age = _sample_grid(well.longitude, well.latitude, age_grid_filename)
+        age = well_processing.sample_grid(well.longitude, well.latitude, age_grid_filename)
         # If sampled outside age grid then well is on continental crust near a passive margin.
         # In this case we'll using passive margin rifting to calculate tectonic subsidence instead of
         # ocean floor age-to-depth models.
@@ -278,67 +309,32 @@ def backtrack_well(
     # If well is on continental passive margin then rift end age needs to be specified by user or
     # obtained from well file or from builtin rift start/end grids (prioritized in that order).
     if age is None:
-        # If the rifting period was specified then override the value read from the well file (if read) and builtin grids.
-        # The rift end time must be provided but the rift start time is optional.
-        if rifting_period is not None:
-            rift_start_age, rift_end_age = rifting_period
-            if rift_end_age is None:
-                raise ValueError('If rifting period is specified then rifting end time must not be None')
-            well.rift_start_age, well.rift_end_age = rift_start_age, rift_end_age
-        elif well.rift_start_age is not None or well.rift_end_age is not None:
-            # The well file has provided the rift end time (and optional rift start time).
-            if well.rift_end_age is None:
-                raise ValueError('Well file provides a rift start age but not a rift end age')
-        else:
-            # Attempt to get rift start/end from builtin rift start/end grids.
-            rift_end_age = _sample_grid(well.longitude, well.latitude, pybacktrack.bundle_data.BUNDLE_RIFTING_END_FILENAME)
-            if math.isnan(rift_end_age):
-                rift_end_age = None
-            if rift_end_age is None:
-                # Note: This should no longer happen since the builtin rift start/end grids now have global coverage (starting with pyBacktrack 1.5).
-                raise ValueError('Well is on continental passive margin but rift end age was not specified by user and was not extracted from well file, '
-                                'and well location was not inside rifting region of builtin rift start/end grids. '
-                                'Either specify rift end age (on command-line) or add RiftEndAge to the well file.')
-            rift_start_age = _sample_grid(well.longitude, well.latitude, pybacktrack.bundle_data.BUNDLE_RIFTING_START_FILENAME)
-            if math.isnan(rift_start_age):
-                rift_start_age = None
-            well.rift_start_age, well.rift_end_age = rift_start_age, rift_end_age
+        _set_well_rifting_period(
+            well,
+            rifting_period,
+            # Sample builtin rift start/end grids at well location (only if needed)...
+            lambda rift_grid_filename: well_processing.sample_grid(well.longitude, well.latitude, rift_grid_filename))
     
     # Sample topography grid at well location.
-    present_day_topography = _sample_grid(well.longitude, well.latitude, topography_filename)
-    # If sampled outside topography grid then set topography to zero.
-    # Shouldn't happen since topography grid is not masked anywhere.
-    if math.isnan(present_day_topography):
-        present_day_topography = 0.0
-    
-    # Topography is negative in ocean but water depth is positive.
-    present_day_water_depth = -present_day_topography
-    # Clamp water depth so it's below sea level (ie, must be >= 0).
-    present_day_water_depth = max(0, present_day_water_depth)
+    present_day_topography = well_processing.sample_grid(well.longitude, well.latitude, topography_filename)
     
     if total_sediment_thickness_filename:
         # Sample total sediment thickness grid at well location.
-        present_day_total_sediment_thickness = _sample_grid(well.longitude, well.latitude, total_sediment_thickness_filename)
+        present_day_total_sediment_thickness = well_processing.sample_grid(well.longitude, well.latitude, total_sediment_thickness_filename)
     else:
         # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid
         # (so they specified None for 'total_sediment_thickness_filename').
-        # Use the well depth in place of the total sediment thickness.
-        # The well depth/thickness is the bottom depth of the deepest stratigraphic unit (they are sorted from youngest to oldest).
-        present_day_total_sediment_thickness = well.stratigraphic_units[-1].bottom_depth
-    
-    # If sampled outside total sediment thickness grid then set total sediment thickness to zero.
-    # This will result in a base stratigraphic layer not getting added underneath the well to fill
-    # in the total sediment thickness (but the well is probably close to the coastlines where it's shallow
-    # and hence probably includes all layers in the total sediment thickness anyway).
-    if math.isnan(present_day_total_sediment_thickness):
-        present_day_total_sediment_thickness = 0.0
+        present_day_total_sediment_thickness = None
     
     # Sample crustal thickness grid at well location.
-    present_day_crustal_thickness = _sample_grid(well.longitude, well.latitude, crustal_thickness_filename)
-    # If sampled outside crustal thickness then set crustal thickness to zero.
-    # Shouldn't happen since crustal thickness grid is not masked anywhere.
-    if math.isnan(present_day_crustal_thickness):
-        present_day_crustal_thickness = 0.0
+    present_day_crustal_thickness = well_processing.sample_grid(well.longitude, well.latitude, crustal_thickness_filename)
+    
+    # Convert the grid samples to present day water depth, total sediment thickness and crustal thickness.
+    present_day_water_depth, present_day_total_sediment_thickness, present_day_crustal_thickness = _get_present_day_well_values(
+        well,
+        present_day_topography,
+        present_day_total_sediment_thickness,
+        present_day_crustal_thickness)
     
     # Add a base stratigraphic unit from the bottom of the well to basement if the stratigraphic units
     # in the well do not record the total sediment thickness.
@@ -349,41 +345,17 @@ def backtrack_well(
         base_lithology_name,
         age)
     
-    if times is None:
-        # Each decompacted well (in returned list) represents decompaction at the top age of a stratigraphic unit in the well.
-        decompacted_wells = well.decompact()
-    else:
-        # Each decompacted well (in the list) represents decompaction at a specific time (requested by caller).
-        decompacted_wells = [well.decompact(time) for time in times]
+    # Decompact the well (and get the present-day isostatic correction for total sediment thickness).
+    _, decompacted_wells, present_day_total_sediment_isostatic_correction = _decompact_well(well, times)
     
     # Calculate sea level (relative to present day) for each decompaction age (unpacking of stratigraphic units)
     # that is an average over the decompacted surface layer's period of deposition.
     if sea_level_model:
-        _add_sea_level(
+        well_processing.add_sea_level(
             well,
             decompacted_wells,
             # Create sea level object for integrating sea level over time periods...
-            sea_level_model)
-    
-    # Isostatic correction for total sediment thickness.
-    #
-    # For ocean floor we could use a simple formula using only total sediment thickness based on Sykes et al. 1996
-    # (although we'd still need something for continental crust). Note that this would be:
-    #     present_day_total_sediment_isostatic_correction = _calc_ocean_total_sediment_thickness_isostatic_correction(present_day_total_sediment_thickness)
-    #
-    # However the present-day decompaction of the well contains an isostatic correction based on its lithology units which
-    # is more accurate so we'll use that instead. It also means the decompacted water depth at age zero (ie, top of well)
-    # will match the water depth we obtained from topography above.
-    #
-    # If we already have a present-day decompaction of the well then use that, otherwise explicitly decompact the well at present day.
-    for decompacted_well in decompacted_wells:
-        if decompacted_well.get_age() == 0:
-            present_day_decompacted_well = decompacted_well
-            break
-    else:
-        present_day_decompacted_well = well.decompact(0.0)
-    # Get the present-day isostatic correction.
-    present_day_total_sediment_isostatic_correction = present_day_decompacted_well.get_sediment_isostatic_correction()
+            SeaLevel.create_from_model_or_bundled_model_name(sea_level_model))
     
     # Unload the sediment to get unloaded water depth.
     # Note that sea level variations don't apply here because they are zero at present day.
@@ -397,67 +369,846 @@ def backtrack_well(
     
     # Calculate tectonic subsidence (unloaded water depth) at each decompaction age (unpacking of stratigraphic units).
     # The tectonic subsidence curve can later be used to calculate paleo (loaded) water depths.
-    if age is not None:
-        # Oceanic crust.
-        _add_oceanic_tectonic_subsidence(
+    rift_stretching_factor = _add_tectonic_subsidence(
+        well,
+        decompacted_wells,
+        present_day_tectonic_subsidence,
+        present_day_crustal_thickness,
+        ocean_age_to_depth_model,
+        age,
+        dynamic_topography)
+    
+    # Rotation model and static polygons for reconstructing the well location through time.
+    #
+    # These are shared with other runs using the same files (and the rotation model caches a reconstruction tree per decompaction age).
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=len(decompacted_wells))
+    plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames, anchor_plate_id)
+    
+    # Reconstruct the present day location of the well to the age of each decompacted well (the top age of its surface unit).
+    well_processing.add_paleo_locations(
+        well,
+        decompacted_wells,
+        rotation_model,
+        plate_partitioner,
+        anchor_plate_id)
+    
+    if output_rift_stretching_factor:
+        return well, decompacted_wells, rift_stretching_factor
+    else:
+        return well, decompacted_wells
+    
+    
+def backtrack_wells(
+        well_filenames,
+        times=None,
+        *,
+        lithology_filenames=[pybacktrack.bundle_data.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],
+        age_grid_filename=pybacktrack.bundle_data.BUNDLE_AGE_GRID_FILENAME,
+        topography_filename=pybacktrack.bundle_data.BUNDLE_TOPOGRAPHY_FILENAME,
+        total_sediment_thickness_filename=pybacktrack.bundle_data.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,
+        crustal_thickness_filename=pybacktrack.bundle_data.BUNDLE_CRUSTAL_THICKNESS_FILENAME,
+        dynamic_topography_model=None,
+        sea_level_model=None,
+        base_lithology_name=DEFAULT_BASE_LITHOLOGY_NAME,
+        ocean_age_to_depth_model=age_to_depth.DEFAULT_MODEL,
+        rifting_period=None,
+        output_rift_stretching_factor=False,
+        rotation_filenames=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,
+        static_polygon_filename=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        anchor_plate_id=0,
+        well_bottom_age_column=0,
+        well_bottom_depth_column=1,
+        well_lithology_column=2,
+        use_all_cpus=False):
+    # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
+    # the expanded values of the bundle filenames.
+    """backtrack_wells(\
+        well_filenames,\
+        times=None,\
+        *,\
+        lithology_filenames=[pybacktrack.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],\
+        age_grid_filename=pybacktrack.BUNDLE_AGE_GRID_FILENAME,\
+        topography_filename=pybacktrack.BUNDLE_TOPOGRAPHY_FILENAME,\
+        total_sediment_thickness_filename=pybacktrack.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,\
+        crustal_thickness_filename=pybacktrack.BUNDLE_CRUSTAL_THICKNESS_FILENAME,\
+        dynamic_topography_model=None,\
+        sea_level_model=None,\
+        base_lithology_name=pybacktrack.DEFAULT_BASE_LITHOLOGY_NAME,\
+        ocean_age_to_depth_model=pybacktrack.AGE_TO_DEPTH_DEFAULT_MODEL,\
+        rifting_period=None,\
+        output_rift_stretching_factor=False,\
+        rotation_filenames=pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,\
+        static_polygon_filename=pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,\
+        anchor_plate_id=0,\
+        well_bottom_age_column=0,\
+        well_bottom_depth_column=1,\
+        well_lithology_column=2,\
+        use_all_cpus=False)
+    Same as :func:`pybacktrack.backtrack_well` but backtracks many wells, sharing the loaded models across all wells.
+    
+    Parameters
+    ----------
+    well_filenames : sequence of string or :class:`pybacktrack.Well`
+        Names of the well text files.
+        The location of each well must be provided inside its well file
+        (as ``# SiteLongitude = <longitude>`` and ``# SiteLatitude = <latitude>``).
+        Wells (such as those returned by :meth:`pybacktrack.WellStore.query_wells`) can also be specified instead of filenames
+        (and are then amended, like the wells read from files, rather than copied).
+    times : list of float, optional
+        A list of times to decompact sediment (the same times are used for all wells).
+        Defaults to the ages of the top of each stratigraphic unit in each well.
+    use_all_cpus : bool or int, optional
+        If ``False`` (or zero) then use a single CPU.
+        If ``True`` then distribute decompaction of the wells across all CPUs (cores).
+        If a positive integer then use that many CPUs (cores).
+        Defaults to ``False`` (single CPU).
+    
+    All other parameters are the same as :func:`pybacktrack.backtrack_well` (except there is no ``well_location`` parameter).
+    
+    Yields
+    ------
+    tuple
+        One result per well (in the same order as ``well_filenames``).
+        Each result is the same as that returned by :func:`pybacktrack.backtrack_well`, that is
+        (``well``, ``decompacted_wells``) or, if ``output_rift_stretching_factor`` is ``True``,
+        (``well``, ``decompacted_wells``, ``rift_stretching_factor``).
+        
+        .. note:: Like :func:`pybacktrack.backtrack_well`, an empty list is yielded for a well without any stratigraphic units.
+    
+    Raises
+    ------
+    ValueError
+        If ``lithology_column`` is not the largest column number (must be last column).
+    ValueError
+        If the location of any well was not extracted from its well file.
+    TypeError
+        If ``use_all_cpus`` is neither a bool nor a positive integer.
+    
+    Notes
+    -----
+    The lithologies, sea level model, dynamic topography model, rotation model and static polygons are each loaded once
+    (rather than once per well), and each grid is sampled at all well locations with a single grid sampling
+    (rather than once per well). All wells are read (and all grids sampled) before the first result is yielded.
+    
+    The results are then yielded one well at a time, so the backtracked wells do not all need to be held in memory at once.
+    
+    .. versionadded:: 1.5
+    """
+    
+    #
+    # Determine number of CPUs to use.
+    #
+    if use_all_cpus:
+        # If 'use_all_cpus' is a bool (and therefore is True) then use all available CPUs...
+        if isinstance(use_all_cpus, bool):
+            try:
+                num_cpus = multiprocessing.cpu_count()
+            except NotImplementedError:
+                num_cpus = 1
+        # else 'use_all_cpus' is a positive integer specifying the number of CPUs to use...
+        elif isinstance(use_all_cpus, int) and use_all_cpus > 0:
+            num_cpus = use_all_cpus
+        else:
+            raise TypeError('{} is neither a bool nor a positive integer'.format(use_all_cpus))
+    else:
+        num_cpus = 1
+    
+    # Read the lithologies from one or more text files (once for all wells).
+    #
+    # It used to be a single filename (instead of a list) so handle that case to be backward compatible.
+    if isinstance(lithology_filenames, str):
+        lithology_filename = lithology_filenames
+        lithologies = read_lithologies_file(lithology_filename)
+    else:
+        # Read all the lithology files and merge their dicts.
+        # Subsequently specified files override previous files in the list.
+        # So if the first and second files have the same lithology then the second lithology is used.
+        lithologies = read_lithologies_files(lithology_filenames)
+    
+    # Read all the wells (and their locations) up front so that each grid can be sampled at all well locations at once.
+    wells = [
+        load_well(
+            well_filename,
+            lithologies,
+            well_bottom_age_column=well_bottom_age_column,
+            well_bottom_depth_column=well_bottom_depth_column,
+            well_lithology_column=well_lithology_column)
+        for well_filename in well_filenames]
+    
+    well_locations = [(well.longitude, well.latitude) for well in wells]
+    
+    # Only wells containing at least one stratigraphic unit get backtracked.
+    backtrack_well_indices = [well_index for well_index, well in enumerate(wells) if well.stratigraphic_units]
+    
+    if age_grid_filename:
+        # Sample age grid at all well locations.
+        # If sampled outside age grid then well is on continental crust near a passive margin.
+        ages = [None if math.isnan(age) else age for age in well_processing.sample_grid_at_locations(well_locations, age_grid_filename)]
+    else:
+        # Caller knows the well sites are on continental crust and wants to ignore the age grid.
+        ages = [None] * len(wells)
+    
+    # Sample the builtin rift start/end grids, but only at continental wells that don't have a rifting period
+    # (specified by the user or in the well file).
+    builtin_rift_well_indices = [
+        well_index for well_index in backtrack_well_indices
+            if (ages[well_index] is None and
+                rifting_period is None and
+                wells[well_index].rift_start_age is None and
+                wells[well_index].rift_end_age is None)]
+    builtin_rift_grid_samples = {}
+    if builtin_rift_well_indices:
+        for rift_grid_filename in (pybacktrack.bundle_data.BUNDLE_RIFTING_END_FILENAME, pybacktrack.bundle_data.BUNDLE_RIFTING_START_FILENAME):
+            rift_grid_samples = well_processing.sample_grid_at_locations(
+                [well_locations[well_index] for well_index in builtin_rift_well_indices],
+                rift_grid_filename)
+            builtin_rift_grid_samples[rift_grid_filename] = dict(zip(builtin_rift_well_indices, rift_grid_samples))
+    
+    # Sample topography, total sediment thickness and crustal thickness grids at all well locations.
+    present_day_topographies = well_processing.sample_grid_at_locations(well_locations, topography_filename)
+    if total_sediment_thickness_filename:
+        present_day_total_sediment_thicknesses = well_processing.sample_grid_at_locations(well_locations, total_sediment_thickness_filename)
+    else:
+        # Caller knows the well sites were drilled to basement depth and wants to ignore the total sediment thickness grid.
+        present_day_total_sediment_thicknesses = [None] * len(wells)
+    present_day_crustal_thicknesses = well_processing.sample_grid_at_locations(well_locations, crustal_thickness_filename)
+    
+    present_day_water_depths = [None] * len(wells)
+    for well_index in backtrack_well_indices:
+        well = wells[well_index]
+        
+        # If well is on continental passive margin then rift end age needs to be specified by user or
+        # obtained from well file or from builtin rift start/end grids (prioritized in that order).
+        if ages[well_index] is None:
+            _set_well_rifting_period(
+                well,
+                rifting_period,
+                lambda rift_grid_filename: builtin_rift_grid_samples[rift_grid_filename][well_index])
+        
+        # Convert the grid samples to present day water depth, total sediment thickness and crustal thickness.
+        (present_day_water_depths[well_index],
+         present_day_total_sediment_thickness,
+         present_day_crustal_thicknesses[well_index]) = _get_present_day_well_values(
             well,
-            decompacted_wells,
-            present_day_tectonic_subsidence,
-            ocean_age_to_depth_model,
-            age,
-            dynamic_topography)
-        # There's no rifting with oceanic subsidence.
-        if output_rift_stretching_factor:
-            rift_stretching_factor = None
+            present_day_topographies[well_index],
+            present_day_total_sediment_thicknesses[well_index],
+            present_day_crustal_thicknesses[well_index])
+        
+        # Add a base stratigraphic unit from the bottom of the well to basement if the stratigraphic units
+        # in the well do not record the total sediment thickness.
+        _add_stratigraphic_unit_to_basement(
+            well,
+            present_day_total_sediment_thickness,
+            lithologies,
+            base_lithology_name,
+            ages[well_index])
+    
+    # Create sea level object for integrating sea level over time periods (once for all wells).
+    if sea_level_model:
+        sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
+    else:
+        sea_level = None
+    
+    # Rotation model and static polygons for reconstructing the well locations through time (once for all wells).
+    #
+    # These are shared with other runs using the same files, and the rotation model caches a reconstruction tree
+    # for each distinct decompaction age (of all wells) so that no reconstruction tree is created more than once.
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=well_processing.get_num_decompaction_times([wells[well_index] for well_index in backtrack_well_indices], times))
+    plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames, anchor_plate_id)
+    
+    # Create time-dependent grid objects for sampling dynamic topography (if requested).
+    #
+    # There's one for the oceanic wells (which have an age) and one for the continental wells (which don't),
+    # and each samples all its wells needing a particular time with a single grid sampling.
+    dynamic_topographies = [None] * len(wells)
+    if dynamic_topography_model:
+        for well_indices in (
+                [well_index for well_index in backtrack_well_indices if ages[well_index] is not None],  # oceanic
+                [well_index for well_index in backtrack_well_indices if ages[well_index] is None]):  # continental
+            if not well_indices:
+                continue
+            batch_dynamic_topography = _BatchDynamicTopography(
+                DynamicTopography.create_from_model_or_bundled_model_name(
+                    dynamic_topography_model,
+                    [wells[well_index].longitude for well_index in well_indices],
+                    [wells[well_index].latitude for well_index in well_indices],
+                    # Use the age of the containing static polygons for continental wells...
+                    None if ages[well_indices[0]] is None else [ages[well_index] for well_index in well_indices]))
+            for point_index, well_index in enumerate(well_indices):
+                dynamic_topographies[well_index] = _BatchDynamicTopographyPoint(batch_dynamic_topography, point_index)
+    
+    # Decompact the wells (distributed across CPUs if requested).
+    # This returns an iterator over the decompacted wells in the same order as 'backtrack_well_indices'.
+    decompactions = well_processing.decompact_wells(
+        _decompact_well,
+        [wells[well_index] for well_index in backtrack_well_indices],
+        times,
+        num_cpus)
+    
+    # Process the wells in chunks so that dynamic topography can be sampled for all wells in a chunk at once
+    # (without having to hold the decompacted wells of *all* wells in memory at once).
+    for chunk_start_well_index in range(0, len(wells), _BACKTRACK_WELLS_CHUNK_SIZE):
+        chunk_well_indices = range(chunk_start_well_index, min(chunk_start_well_index + _BACKTRACK_WELLS_CHUNK_SIZE, len(wells)))
+        
+        # Get the decompactions of those wells in the current chunk that have stratigraphic units.
+        #
+        # Note: Decompaction can happen in another process, so the returned well (a copy) replaces the original well.
+        chunk_decompactions = {}
+        for well_index in chunk_well_indices:
+            if wells[well_index].stratigraphic_units:
+                chunk_decompactions[well_index] = next(decompactions)
+        
+        # Sample dynamic topography at all the times needed by all wells in the current chunk.
+        if dynamic_topography_model:
+            for well_index, (well, decompacted_wells, _) in chunk_decompactions.items():
+                dynamic_topography = dynamic_topographies[well_index]
+                # Present day.
+                dynamic_topography.request(0.0)
+                # Rift start (continental crust only).
+                if ages[well_index] is None:
+                    dynamic_topography.request(well.rift_start_age if well.rift_start_age is not None else well.rift_end_age)
+                # Decompaction times.
+                for decompacted_well in decompacted_wells:
+                    dynamic_topography.request(decompacted_well.get_age())
+            for batch_dynamic_topography in set(dynamic_topographies[well_index].batch_dynamic_topography for well_index in chunk_decompactions):
+                batch_dynamic_topography.sample_requested()
+        
+        for well_index in chunk_well_indices:
+            if well_index not in chunk_decompactions:
+                # There should be at least one stratigraphic unit - if not then yield empty decompaction list (like 'backtrack_well()').
+                yield []
+                continue
+            
+            well, decompacted_wells, present_day_total_sediment_isostatic_correction = chunk_decompactions[well_index]
+            
+            # Calculate sea level (relative to present day) for each decompaction age (unpacking of stratigraphic units)
+            # that is an average over the decompacted surface layer's period of deposition.
+            if sea_level:
+                well_processing.add_sea_level(well, decompacted_wells, sea_level)
+            
+            # Unload the sediment to get unloaded water depth.
+            # Note that sea level variations don't apply here because they are zero at present day.
+            present_day_tectonic_subsidence = present_day_water_depths[well_index] + present_day_total_sediment_isostatic_correction
+            
+            # Calculate tectonic subsidence (unloaded water depth) at each decompaction age (unpacking of stratigraphic units).
+            rift_stretching_factor = _add_tectonic_subsidence(
+                well,
+                decompacted_wells,
+                present_day_tectonic_subsidence,
+                present_day_crustal_thicknesses[well_index],
+                ocean_age_to_depth_model,
+                ages[well_index],
+                dynamic_topographies[well_index])
+            
+            # Reconstruct the present day location of the well to the age of each decompacted well.
+            well_processing.add_paleo_locations(
+                well,
+                decompacted_wells,
+                rotation_model,
+                plate_partitioner,
+                anchor_plate_id)
+            
+            if output_rift_stretching_factor:
+                yield well, decompacted_wells, rift_stretching_factor
+            else:
+                yield well, decompacted_wells
+        
+        # Release the dynamic topography samples of the current chunk.
+        if dynamic_topography_model:
+            for well_index in chunk_decompactions:
+                dynamic_topographies[well_index].batch_dynamic_topography.clear()
+
+
+# Number of wells processed together by 'backtrack_wells()' before yielding their results.
+_BACKTRACK_WELLS_CHUNK_SIZE = 64
+
+
+class _BatchDynamicTopography(object):
+    """
+    Samples dynamic topography at many well locations, where all wells requesting the same time are sampled together
+    (rather than sampling each well separately).
+    """
+    
+    def __init__(self, dynamic_topography):
+        self.dynamic_topography = dynamic_topography
+        # Point indices requested (but not yet sampled) at each time.
+        self._requested_point_indices = {}
+        # Sampled values keyed by (time, point_index).
+        self._samples = {}
+    
+    def request(self, time, point_index):
+        if (time, point_index) not in self._samples:
+            self._requested_point_indices.setdefault(time, set()).add(point_index)
+    
+    def sample_requested(self):
+        # Sample each requested time once (at all points requesting that time).
+        for time, point_indices in self._requested_point_indices.items():
+            point_indices = sorted(point_indices)
+            sampled_values = self.dynamic_topography.sample_points(time, point_indices)
+            for point_index, sampled_value in zip(point_indices, sampled_values):
+                self._samples[(time, point_index)] = sampled_value
+        self._requested_point_indices = {}
+    
+    def sample(self, time, point_index):
+        return self._samples[(time, point_index)]
+    
+    def clear(self):
+        self._requested_point_indices = {}
+        self._samples = {}
+
+
+class _BatchDynamicTopographyPoint(object):
+    """
+    Dynamic topography at a single well location in a '_BatchDynamicTopography'.
+    
+    This has the same 'sample(time)' method as DynamicTopography (constructed with a single location) but
+    each time must first be requested (and sampled by the batch).
+    """
+    
+    def __init__(self, batch_dynamic_topography, point_index):
+        self.batch_dynamic_topography = batch_dynamic_topography
+        self.point_index = point_index
+    
+    def request(self, time):
+        self.batch_dynamic_topography.request(time, self.point_index)
+    
+    def sample(self, time):
+        return self.batch_dynamic_topography.sample(time, self.point_index)
+
+
+def backtrack_well_ensemble(
+        well_filename,
+        num_samples,
+        times=None,
+        *,
+        lithology_filenames=[pybacktrack.bundle_data.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],
+        age_grid_filename=pybacktrack.bundle_data.BUNDLE_AGE_GRID_FILENAME,
+        topography_filename=pybacktrack.bundle_data.BUNDLE_TOPOGRAPHY_FILENAME,
+        total_sediment_thickness_filename=pybacktrack.bundle_data.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,
+        crustal_thickness_filename=pybacktrack.bundle_data.BUNDLE_CRUSTAL_THICKNESS_FILENAME,
+        dynamic_topography_model=None,
+        sea_level_model=None,
+        base_lithology_name=DEFAULT_BASE_LITHOLOGY_NAME,
+        ocean_age_to_depth_model=age_to_depth.DEFAULT_MODEL,
+        rifting_period=None,
+        rotation_filenames=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,
+        static_polygon_filename=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        anchor_plate_id=0,
+        well_location=None,
+        well_bottom_age_column=0,
+        well_bottom_depth_column=1,
+        well_lithology_column=2,
+        density_uncertainty=0.0,
+        surface_porosity_uncertainty=0.0,
+        porosity_decay_uncertainty=0.0,
+        age_uncertainty=0.0,
+        total_sediment_thickness_uncertainty=0.0,
+        percentiles=(5.0, 50.0, 95.0),
+        random_seed=None):
+    # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
+    # the expanded values of the bundle filenames.
+    """backtrack_well_ensemble(\
+        well_filename,\
+        num_samples,\
+        times=None,\
+        *,\
+        lithology_filenames=[pybacktrack.DEFAULT_BUNDLE_LITHOLOGY_FILENAME],\
+        age_grid_filename=pybacktrack.BUNDLE_AGE_GRID_FILENAME,\
+        topography_filename=pybacktrack.BUNDLE_TOPOGRAPHY_FILENAME,\
+        total_sediment_thickness_filename=pybacktrack.BUNDLE_TOTAL_SEDIMENT_THICKNESS_FILENAME,\
+        crustal_thickness_filename=pybacktrack.BUNDLE_CRUSTAL_THICKNESS_FILENAME,\
+        dynamic_topography_model=None,\
+        sea_level_model=None,\
+        base_lithology_name=pybacktrack.DEFAULT_BASE_LITHOLOGY_NAME,\
+        ocean_age_to_depth_model=pybacktrack.AGE_TO_DEPTH_DEFAULT_MODEL,\
+        rifting_period=None,\
+        rotation_filenames=pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,\
+        static_polygon_filename=pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,\
+        anchor_plate_id=0,\
+        well_location=None,\
+        well_bottom_age_column=0,\
+        well_bottom_depth_column=1,\
+        well_lithology_column=2,\
+        density_uncertainty=0.0,\
+        surface_porosity_uncertainty=0.0,\
+        porosity_decay_uncertainty=0.0,\
+        age_uncertainty=0.0,\
+        total_sediment_thickness_uncertainty=0.0,\
+        percentiles=(5.0, 50.0, 95.0),\
+        random_seed=None)
+    Same as :func:`pybacktrack.backtrack_well` but also backtracks an ensemble of randomly perturbed versions of the well
+    to obtain uncertainty bands (percentile curves) of decompacted thickness, tectonic subsidence and water depth.
+    
+    Parameters
+    ----------
+    well_filename : string
+        Name of well text file.
+    num_samples : int
+        Number of ensemble members (randomly perturbed versions of the well).
+    times : list of float, optional
+        A list of times to decompact sediment.
+        Defaults to the ages of the top of each stratigraphic unit in the well.
+    density_uncertainty : float, optional
+        Relative uncertainty (one standard deviation) of the lithology density of each stratigraphic unit.
+        For example, 0.05 is roughly a 5% uncertainty. Defaults to zero (no uncertainty).
+    surface_porosity_uncertainty : float, optional
+        Relative uncertainty (one standard deviation) of the lithology surface porosity of each stratigraphic unit.
+        Perturbed surface porosities are clamped to a maximum of 0.99. Defaults to zero (no uncertainty).
+    porosity_decay_uncertainty : float, optional
+        Relative uncertainty (one standard deviation) of the lithology porosity decay of each stratigraphic unit.
+        Defaults to zero (no uncertainty).
+    age_uncertainty : float, optional
+        Uncertainty (one standard deviation, in My) of the age of each stratigraphic unit boundary.
+        Defaults to zero (no uncertainty).
+    total_sediment_thickness_uncertainty : float, optional
+        Uncertainty (one standard deviation, in metres) of the total sediment thickness (the bottom depth of the base unit).
+        Defaults to zero (no uncertainty).
+    percentiles : sequence of float, optional
+        The percentiles (each in the range [0, 100]) of the ensemble to return at each age.
+        Defaults to the 5th, 50th (median) and 95th percentiles.
+    random_seed : int, optional
+        Seed for the random perturbations (to make the ensemble reproducible).
+        Defaults to a different ensemble each call.
+    
+    All other parameters are the same as :func:`pybacktrack.backtrack_well`.
+    
+    Returns
+    -------
+    well : :class:`pybacktrack.Well`
+        The well read from ``well_filename`` (same as returned by :func:`pybacktrack.backtrack_well`).
+    decompacted_wells : list of :class:`pybacktrack.DecompactedWell`
+        The decompacted wells of the unperturbed well (same as returned by :func:`pybacktrack.backtrack_well`).
+    percentile_curves : dict
+        Maps ``'decompacted_thickness'``, ``'tectonic_subsidence'`` and ``'water_depth'`` to a ``numpy.ndarray`` of
+        shape (len(``percentiles``), len(``decompacted_wells``)) containing the ensemble percentiles at the age of each decompacted well.
+        If the well is on continental crust then it also maps ``'rift_stretching_factor'`` to a ``numpy.ndarray`` of
+        shape (len(``percentiles``),) containing the ensemble percentiles of the rift stretching factor (beta).
+        
+        .. note:: For a well without any stratigraphic units, ``decompacted_wells`` is an empty list and ``percentile_curves`` is an empty dict.
+    
+    Raises
+    ------
+    ValueError
+        If ``lithology_column`` is not the largest column number (must be last column).
+    ValueError
+        If ``well_location`` is not specified *and* the well location was not extracted from the well file.
+    
+    Notes
+    -----
+    The grids are sampled, and the sea level, dynamic topography, rotation and static polygon models are loaded,
+    only once for the entire ensemble. The decompaction and subsidence of all ensemble members are then calculated
+    together using NumPy arrays (see :meth:`pybacktrack.Well.decompact_ensemble`).
+    
+    Each ensemble member perturbs the density, surface porosity and porosity decay of each stratigraphic unit independently
+    (using a log-normal distribution with a median of the unperturbed value), and perturbs the stratigraphic unit boundary ages
+    and the total sediment thickness (using a normal distribution with a mean of the unperturbed value).
+    
+    The sea level of each ensemble member is the same as the unperturbed well.
+    
+    .. versionadded:: 1.5
+    """
+    
+    # Read the lithologies from one or more text files.
+    #
+    # It used to be a single filename (instead of a list) so handle that case to be backward compatible.
+    if isinstance(lithology_filenames, str):
+        lithology_filename = lithology_filenames
+        lithologies = read_lithologies_file(lithology_filename)
+    else:
+        # Read all the lithology files and merge their dicts.
+        # Subsequently specified files override previous files in the list.
+        # So if the first and second files have the same lithology then the second lithology is used.
+        lithologies = read_lithologies_files(lithology_filenames)
+    
+    # Read the well from a file.
+    well = load_well(
+        well_filename,
+        lithologies,
+        well_location=well_location,
+        well_bottom_age_column=well_bottom_age_column,
+        well_bottom_depth_column=well_bottom_depth_column,
+        well_lithology_column=well_lithology_column)
+    
+    # There should be at least one stratigraphic unit - if not then return empty decompaction list (and no percentile curves).
+    if not well.stratigraphic_units:
+        return well, [], {}
+    
+    if age_grid_filename:
+        # Sample age grid at well location.
+        age = well_processing.sample_grid(well.longitude, well.latitude, age_grid_filename)
+        # If sampled outside age grid then well is on continental crust near a passive margin.
+        if math.isnan(age):
+            age = None
+    else:
+        # Caller knows the well site is on continental crust and wants to ignore the age grid.
+        age = None
+    
+    # If well is on continental passive margin then rift end age needs to be specified by user or
+    # obtained from well file or from builtin rift start/end grids (prioritized in that order).
+    if age is None:
+        _set_well_rifting_period(
+            well,
+            rifting_period,
+            # Sample builtin rift start/end grids at well location (only if needed)...
+            lambda rift_grid_filename: well_processing.sample_grid(well.longitude, well.latitude, rift_grid_filename))
+    
+    # Sample topography, total sediment thickness and crustal thickness grids at well location (once for the entire ensemble).
+    present_day_topography = well_processing.sample_grid(well.longitude, well.latitude, topography_filename)
+    if total_sediment_thickness_filename:
+        present_day_total_sediment_thickness = well_processing.sample_grid(well.longitude, well.latitude, total_sediment_thickness_filename)
     else:
-        # Continental crust.
-        continent_output = _add_continental_tectonic_subsidence(
+        # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid.
+        present_day_total_sediment_thickness = None
+    present_day_crustal_thickness = well_processing.sample_grid(well.longitude, well.latitude, crustal_thickness_filename)
+    
+    # Convert the grid samples to present day water depth, total sediment thickness and crustal thickness.
+    present_day_water_depth, present_day_total_sediment_thickness, present_day_crustal_thickness = _get_present_day_well_values(
+        well,
+        present_day_topography,
+        present_day_total_sediment_thickness,
+        present_day_crustal_thickness)
+    
+    # Add a base stratigraphic unit from the bottom of the well to basement if the stratigraphic units
+    # in the well do not record the total sediment thickness.
+    _add_stratigraphic_unit_to_basement(
+        well,
+        present_day_total_sediment_thickness,
+        lithologies,
+        base_lithology_name,
+        age)
+    
+    #
+    # Backtrack the unperturbed well (same as 'backtrack_well()').
+    #
+    
+    _, decompacted_wells, present_day_total_sediment_isostatic_correction = _decompact_well(well, times)
+    
+    if sea_level_model:
+        well_processing.add_sea_level(
             well,
             decompacted_wells,
-            present_day_tectonic_subsidence,
-            present_day_crustal_thickness,
-            dynamic_topography,
-            output_rift_stretching_factor)
-        # The return value of '_add_continental_tectonic_subsidence()' can be a rift stretching factor.
-        if output_rift_stretching_factor:
-            rift_stretching_factor = continent_output
-
-    # Present day well location and rotation model for reconstructing its position through time.
-    present_day_well_location = pygplates.PointOnSphere(well.latitude, well.longitude)
-    rotation_model = pygplates.RotationModel(rotation_filenames)
-    
-    # Find the plate ID of the static polygon containing the well location (or anchor plate if not in any plates).
+            SeaLevel.create_from_model_or_bundled_model_name(sea_level_model))
+    
+    # Create time-dependent grid object for sampling dynamic topography (if requested).
     #
-    plate_partitioner = pygplates.PlatePartitioner(static_polygon_filename, rotation_model)
-    plate_containing_well_location = plate_partitioner.partition_point(present_day_well_location)
-    if plate_containing_well_location:
-        well_reconstruction_plate_id = plate_containing_well_location.get_feature().get_reconstruction_plate_id()
+    # Each time is only sampled once (and then shared by the unperturbed well and all ensemble members).
+    if dynamic_topography_model:
+        dynamic_topography = _DynamicTopographySampleCache(
+            DynamicTopography.create_from_model_or_bundled_model_name(dynamic_topography_model, well.longitude, well.latitude, age))
     else:
-        # Shouldn't really get here if static polygons have global coverage at present day.
-        well_reconstruction_plate_id = anchor_plate_id
+        dynamic_topography = None
+    
+    _add_tectonic_subsidence(
+        well,
+        decompacted_wells,
+        present_day_water_depth + present_day_total_sediment_isostatic_correction,
+        present_day_crustal_thickness,
+        ocean_age_to_depth_model,
+        age,
+        dynamic_topography)
+    
+    # The ensemble members are perturbations of the present day well location, so they share the same paleo locations.
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=len(decompacted_wells))
+    plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames, anchor_plate_id)
+    well_processing.add_paleo_locations(
+        well,
+        decompacted_wells,
+        rotation_model,
+        plate_partitioner,
+        anchor_plate_id)
     
-    # Reconstruct the present day location of the well to the age of each decompacted well (the top age of its surface unit).
-    # And add as 'paleo_longitude' and 'paleo_latitude' attributes of each decompacted well.
     #
-    for decompacted_well in decompacted_wells:
-        # The current decompaction time (age of the surface of the current decompacted column of the well).
-        well_decompaction_time = decompacted_well.get_age()
-        # Get rotation from present day to current decompaction time using the reconstruction plate ID of the well location.
+    # Backtrack the ensemble (all members at once).
+    #
+    
+    random_number_generator = np.random.default_rng(random_seed)
+    num_units = len(well.stratigraphic_units)
+    
+    def sample_lithology_scales(relative_uncertainty):
+        if not relative_uncertainty:
+            return None
+        # Log-normal so that scale factors are always positive (with a median of one).
+        return np.exp(relative_uncertainty * random_number_generator.standard_normal((num_samples, num_units)))
+    
+    density_scales = sample_lithology_scales(density_uncertainty)
+    surface_porosity_scales = sample_lithology_scales(surface_porosity_uncertainty)
+    if surface_porosity_scales is not None:
+        # Clamp the perturbed surface porosities to a maximum of 0.99.
+        surface_porosities = np.array([unit.lithology.surface_porosity for unit in well.stratigraphic_units])
+        surface_porosity_scales = np.minimum(
+            surface_porosity_scales,
+            np.divide(0.99, surface_porosities, out=np.full(num_units, np.inf), where=(surface_porosities > 0.0)))
+    porosity_decay_scales = sample_lithology_scales(porosity_decay_uncertainty)
+    
+    if age_uncertainty:
+        age_offsets = age_uncertainty * random_number_generator.standard_normal((num_samples, num_units + 1))
+    else:
+        age_offsets = None
+    
+    if total_sediment_thickness_uncertainty:
+        total_sediment_thickness_offsets = total_sediment_thickness_uncertainty * random_number_generator.standard_normal(num_samples)
+    else:
+        total_sediment_thickness_offsets = None
+    
+    # Decompact all ensemble members at the decompaction ages (and at present day for the present-day isostatic correction).
+    decompaction_ages = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    total_decompacted_thicknesses, _, sediment_isostatic_corrections = well.decompact_ensemble(
+        decompaction_ages + [0.0],
+        num_samples,
+        density_scales=density_scales,
+        surface_porosity_scales=surface_porosity_scales,
+        porosity_decay_scales=porosity_decay_scales,
+        age_offsets=age_offsets,
+        total_sediment_thickness_offsets=total_sediment_thickness_offsets)
+    present_day_total_sediment_isostatic_corrections = sediment_isostatic_corrections[:, -1]
+    total_decompacted_thicknesses = total_decompacted_thicknesses[:, :-1]
+    sediment_isostatic_corrections = sediment_isostatic_corrections[:, :-1]
+    
+    # Unload the sediment of each ensemble member to get its unloaded water depth at present day.
+    tectonic_subsidences, rift_stretching_factors = _calc_ensemble_tectonic_subsidence(
+        well,
+        decompaction_ages,
+        present_day_water_depth + present_day_total_sediment_isostatic_corrections,
+        present_day_crustal_thickness,
+        ocean_age_to_depth_model,
+        age,
+        dynamic_topography)
+    
+    # Water depth from tectonic subsidence, sediment isostatic correction and sea level
+    # (see 'DecompactedWell.get_water_depth_from_tectonic_subsidence()').
+    sea_levels = np.array([decompacted_well.get_sea_level() for decompacted_well in decompacted_wells])
+    water_depths = (tectonic_subsidences - sediment_isostatic_corrections +
+                    sea_levels * (_DENSITY_MANTLE / (_DENSITY_MANTLE - _DENSITY_WATER)))
+    
+    percentile_curves = {
+        'decompacted_thickness': np.percentile(total_decompacted_thicknesses, percentiles, axis=0),
+        'tectonic_subsidence': np.percentile(tectonic_subsidences, percentiles, axis=0),
+        'water_depth': np.percentile(water_depths, percentiles, axis=0)}
+    if rift_stretching_factors is not None:
+        percentile_curves['rift_stretching_factor'] = np.percentile(rift_stretching_factors, percentiles)
+    
+    return well, decompacted_wells, percentile_curves
+
+
+class _DynamicTopographySampleCache(object):
+    """
+    Dynamic topography at a single well location, where each time is only sampled once.
+    
+    This has the same 'sample(time)' method as DynamicTopography (constructed with a single location).
+    """
+    
+    def __init__(self, dynamic_topography):
+        self.dynamic_topography = dynamic_topography
+        self._samples = {}
+    
+    def sample(self, time):
+        if time not in self._samples:
+            self._samples[time] = self.dynamic_topography.sample(time)
+        return self._samples[time]
+
+
+def _calc_ensemble_tectonic_subsidence(
+        well,
+        decompaction_ages,
+        present_day_tectonic_subsidences,
+        present_day_crustal_thickness,
+        ocean_age_to_depth_model,
+        age,
+        dynamic_topography=None):
+    """
+    Calculate tectonic subsidence of each ensemble member of a well on oceanic crust (if 'age' is not None) or
+    continental passive margin (if 'age' is None).
+    
+    This is the same as '_add_oceanic_tectonic_subsidence()' and '_add_continental_tectonic_subsidence()' except for an ensemble
+    of present day tectonic subsidences (one per ensemble member).
+    
+    Returns 2-tuple (tectonic_subsidences, rift_stretching_factors) where 'tectonic_subsidences' is an array of shape
+    (number of ensemble members, number of decompaction ages), and 'rift_stretching_factors' is an array with one
+    stretching factor (beta) per ensemble member for continental crust (otherwise None).
+    """
+    
+    present_day_tectonic_subsidences = np.asarray(present_day_tectonic_subsidences, dtype=float)
+    
+    if dynamic_topography:
+        dynamic_topography_at_present_day = dynamic_topography.sample(0.0)
+        dynamic_topography_at_decompaction_ages = np.array([
+            dynamic_topography.sample(decompaction_age) for decompaction_age in decompaction_ages])
+    
+    if age is not None:
+        # Oceanic crust.
         #
-        # NOTE: We specify 'from_time=0' since there could be a non-zero finite rotation at present day (generally there shouldn't be) and
-        #       we don't want our present day well location to move when 'well_decompaction_time' is zero (or have this offset for non-zero times).
-        rotation = rotation_model.get_rotation(well_decompaction_time, well_reconstruction_plate_id, from_time=0, anchor_plate_id=anchor_plate_id)
-        # Reconstruct well location to current decompaction time.
-        reconstructed_well_location = rotation * present_day_well_location
-        # Store reconstructed well location as attributes in the current decompacted well.
-        decompacted_well.paleo_latitude, decompacted_well.paleo_longitude = reconstructed_well_location.to_lat_lon()
+        # The age-to-depth model is the same for all ensemble members (only the constant offset between the
+        # age-to-depth model and unloaded water depth at present day differs).
+        present_day_tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(age, ocean_age_to_depth_model, tabulated='auto')
+        tectonic_subsidences_from_model = age_to_depth.convert_age_to_depth(
+            np.maximum(0.0, age - np.asarray(decompaction_ages, dtype=float)),
+            ocean_age_to_depth_model,
+            tabulated='auto')
+        
+        tectonic_subsidences = (
+            tectonic_subsidences_from_model[np.newaxis, :] +
+            (present_day_tectonic_subsidences - present_day_tectonic_subsidence_from_model)[:, np.newaxis])
+        
+        # Dynamic topography is elevation but we want depth (subsidence) so subtract (instead of add).
+        if dynamic_topography:
+            tectonic_subsidences -= dynamic_topography_at_decompaction_ages - dynamic_topography_at_present_day
+        
+        # There's no rifting with oceanic subsidence.
+        return tectonic_subsidences, None
     
-    if output_rift_stretching_factor:
-        return well, decompacted_wells, rift_stretching_factor
-    else:
-        return well, decompacted_wells
+    # Continental crust.
+    
+    # Remove contribution of dynamic topography (between rift start and present day) to subsidence at present day.
+    if dynamic_topography:
+        if well.rift_start_age is not None:
+            rift_start_age = well.rift_start_age
+        else:
+            rift_start_age = well.rift_end_age
+        
+        dynamic_topography_at_rift_start = dynamic_topography.sample(rift_start_age)
+        
+        present_day_tectonic_subsidences = present_day_tectonic_subsidences + (dynamic_topography_at_present_day - dynamic_topography_at_rift_start)
+    
+    # Estimate the rifting stretching factor (beta) of all ensemble members (in a single vectorized call).
+    rift_stretching_factors, subsidence_residuals = rifting.estimate_beta(
+        present_day_tectonic_subsidences,
+        present_day_crustal_thickness,
+        well.rift_end_age)
+    
+    # Warn once for the entire ensemble (rather than once per ensemble member).
+    num_inaccurate_rift_stretching_factors = np.count_nonzero(
+        np.abs(subsidence_residuals) > _MAX_TECTONIC_SUBSIDENCE_RIFTING_RESIDUAL_ERROR)
+    if num_inaccurate_rift_stretching_factors:
+        warnings.warn('Unable to accurately estimate rifting stretching factor (beta) at well location ({0}, {1}) '
+                      'for {2} of {3} ensemble members. '
+                      'Tectonic subsidence estimates of those ensemble members will be inaccurate.'.format(
+                          well.longitude, well.latitude,
+                          num_inaccurate_rift_stretching_factors, len(present_day_tectonic_subsidences)))
+    
+    # Calculate rifting subsidence of each ensemble member at each decompaction time (in a single vectorized call).
+    tectonic_subsidences = rifting.total_subsidence(
+        rift_stretching_factors[:, np.newaxis],
+        rift_stretching_factors[:, np.newaxis] * present_day_crustal_thickness,
+        np.asarray(decompaction_ages, dtype=float)[np.newaxis, :],
+        well.rift_end_age,
+        well.rift_start_age)
     
+    # Account for any change in dynamic topography between rift start and each decompaction time.
+    if dynamic_topography:
+        tectonic_subsidences -= dynamic_topography_at_decompaction_ages - dynamic_topography_at_rift_start
     
+    return tectonic_subsidences, rift_stretching_factors
+
+
 def load_well(
         well_filename,
         lithologies,
@@ -469,7 +1220,8 @@ def load_well(
     """
     Read the well file and its backtracking metadata.
     
-    well_filename: Name of well text file.
+    well_filename: Name of well text file, or a well.Well (such as one returned by a well.WellStore query) to use instead of reading a file.
+                   A Well is used as is (it's not copied), except its missing backtracking attributes are set to None.
     
     lithologies: a dict mapping lithology names to lithology.Lithology objects.
     
@@ -516,19 +1268,27 @@ def load_well(
             raise ValueError('Depth {0} cannot be negative'.format(depth))
         return depth
     
-    # Read the well from a text file.
-    well = read_well_file(
-        well_filename,
-        lithologies,
-        bottom_age_column=well_bottom_age_column,
-        bottom_depth_column=well_bottom_depth_column,
-        lithology_column=well_lithology_column,
-        # Attributes to read from file metadata into returned well object...
-        well_attributes={
-            'SiteLongitude': ('longitude', read_longitude),
-            'SiteLatitude': ('latitude', read_latitude),
-            'RiftStartAge': ('rift_start_age', read_age),
-            'RiftEndAge': ('rift_end_age', read_age)})
+    # Use the well if one was provided (instead of a well filename).
+    if isinstance(well_filename, Well):
+        well = well_filename
+        # Backtracking metadata not stored in the well defaults to None (like metadata not found in a well file).
+        for well_attribute_name in ('longitude', 'latitude', 'rift_start_age', 'rift_end_age'):
+            if not hasattr(well, well_attribute_name):
+                setattr(well, well_attribute_name, None)
+    else:
+        # Read the well from a text file.
+        well = read_well_file(
+            well_filename,
+            lithologies,
+            bottom_age_column=well_bottom_age_column,
+            bottom_depth_column=well_bottom_depth_column,
+            lithology_column=well_lithology_column,
+            # Attributes to read from file metadata into returned well object...
+            well_attributes={
+                'SiteLongitude': ('longitude', read_longitude),
+                'SiteLatitude': ('latitude', read_latitude),
+                'RiftStartAge': ('rift_start_age', read_age),
+                'RiftEndAge': ('rift_end_age', read_age)})
     
     # If the well location was specified then override the location read from the well file (if a location was read).
     if well_location is not None:
@@ -540,6 +1300,97 @@ def load_well(
     return well
 
 
+def _set_well_rifting_period(
+        well,
+        rifting_period,
+        sample_builtin_rift_grid):
+    """
+    Set the rift start and end ages of a well on continental passive margin (outside age grid).
+    
+    The rifting period is specified by user (rifting_period) or obtained from well file or from builtin rift start/end grids
+    (prioritized in that order).
+    
+    rifting_period: Optional 2-tuple (rift_start_age, rift_end_age) where rift_start_age can be None.
+    
+    sample_builtin_rift_grid: A callable accepting a builtin rift start/end grid filename and returning the grid value at the well location
+                              (or NaN if outside grid). It is only called if the rifting period is not provided by the user or well file.
+    
+    Raises ValueError if the rift end age cannot be determined.
+    """
+    
+    # If the rifting period was specified then override the value read from the well file (if read) and builtin grids.
+    # The rift end time must be provided but the rift start time is optional.
+    if rifting_period is not None:
+        rift_start_age, rift_end_age = rifting_period
+        if rift_end_age is None:
+            raise ValueError('If rifting period is specified then rifting end time must not be None')
+        well.rift_start_age, well.rift_end_age = rift_start_age, rift_end_age
+    elif well.rift_start_age is not None or well.rift_end_age is not None:
+        # The well file has provided the rift end time (and optional rift start time).
+        if well.rift_end_age is None:
+            raise ValueError('Well file provides a rift start age but not a rift end age')
+    else:
+        # Attempt to get rift start/end from builtin rift start/end grids.
+        rift_end_age = sample_builtin_rift_grid(pybacktrack.bundle_data.BUNDLE_RIFTING_END_FILENAME)
+        if math.isnan(rift_end_age):
+            rift_end_age = None
+        if rift_end_age is None:
+            # Note: This should no longer happen since the builtin rift start/end grids now have global coverage (starting with pyBacktrack 1.5).
+            raise ValueError('Well is on continental passive margin but rift end age was not specified by user and was not extracted from well file, '
+                            'and well location was not inside rifting region of builtin rift start/end grids. '
+                            'Either specify rift end age (on command-line) or add RiftEndAge to the well file.')
+        rift_start_age = sample_builtin_rift_grid(pybacktrack.bundle_data.BUNDLE_RIFTING_START_FILENAME)
+        if math.isnan(rift_start_age):
+            rift_start_age = None
+        well.rift_start_age, well.rift_end_age = rift_start_age, rift_end_age
+
+
+def _get_present_day_well_values(
+        well,
+        present_day_topography,
+        present_day_total_sediment_thickness,
+        present_day_crustal_thickness):
+    """
+    Convert the topography, total sediment thickness and crustal thickness grids (sampled at well location) to
+    present day water depth, total sediment thickness and crustal thickness.
+    
+    present_day_total_sediment_thickness: None if the total sediment thickness grid should be ignored
+                                          (in which case the well depth is used instead).
+    
+    Returns 3-tuple (present_day_water_depth, present_day_total_sediment_thickness, present_day_crustal_thickness).
+    """
+    
+    # If sampled outside topography grid then set topography to zero.
+    # Shouldn't happen since topography grid is not masked anywhere.
+    if math.isnan(present_day_topography):
+        present_day_topography = 0.0
+    
+    # Topography is negative in ocean but water depth is positive.
+    present_day_water_depth = -present_day_topography
+    # Clamp water depth so it's below sea level (ie, must be >= 0).
+    present_day_water_depth = max(0, present_day_water_depth)
+    
+    if present_day_total_sediment_thickness is None:
+        # Caller knows the well site was drilled to basement depth and wants to ignore the total sediment thickness grid.
+        # Use the well depth in place of the total sediment thickness.
+        # The well depth/thickness is the bottom depth of the deepest stratigraphic unit (they are sorted from youngest to oldest).
+        present_day_total_sediment_thickness = well.stratigraphic_units[-1].bottom_depth
+    
+    # If sampled outside total sediment thickness grid then set total sediment thickness to zero.
+    # This will result in a base stratigraphic layer not getting added underneath the well to fill
+    # in the total sediment thickness (but the well is probably close to the coastlines where it's shallow
+    # and hence probably includes all layers in the total sediment thickness anyway).
+    if math.isnan(present_day_total_sediment_thickness):
+        present_day_total_sediment_thickness = 0.0
+    
+    # If sampled outside crustal thickness then set crustal thickness to zero.
+    # Shouldn't happen since crustal thickness grid is not masked anywhere.
+    if math.isnan(present_day_crustal_thickness):
+        present_day_crustal_thickness = 0.0
+    
+    return present_day_water_depth, present_day_total_sediment_thickness, present_day_crustal_thickness
+
+
 def _add_stratigraphic_unit_to_basement(
         well,
         present_day_total_sediment_thickness,
@@ -602,24 +1453,87 @@ def _add_stratigraphic_unit_to_basement(
         base_unit_lithology_components, lithologies)
 
 
-def _add_sea_level(
+def _decompact_well(
         well,
-        decompacted_wells,
-        sea_level_model):
+        times=None):
     """
-    Calculate average sea levels (relative to present day) for the stratigraphic layers in a well.
+    Decompact a well at the top age of each stratigraphic unit (if 'times' is None) or at each time in 'times'.
+    
+    Returns 3-tuple (well, decompacted_wells, present_day_total_sediment_isostatic_correction).
     
-    The sea level (relative to present day) is integrated over the period of deposition of each
-    stratigraphic layer (in decompacted wells) and added as a 'sea_level' attribute to each decompacted well.
+    The well is also returned because this function can be called in another process (via 'multiprocessing'),
+    in which case the returned decompacted wells reference the stratigraphic units of a copy of 'well' (rather than 'well' itself).
     """
     
-    # Create sea level object for integrating sea level over time periods.
-    sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
+    if times is None:
+        # Each decompacted well (in returned list) represents decompaction at the top age of a stratigraphic unit in the well.
+        decompacted_wells = well.decompact()
+    else:
+        # Each decompacted well (in the list) represents decompaction at a specific time (requested by caller).
+        #
+        # Decompacting all times together (using arrays) is faster than decompacting each time separately.
+        decompacted_wells = well.decompact_at_times(times).create_decompacted_wells(well)
     
+    # Isostatic correction for total sediment thickness.
+    #
+    # For ocean floor we could use a simple formula using only total sediment thickness based on Sykes et al. 1996
+    # (although we'd still need something for continental crust). Note that this would be:
+    #     present_day_total_sediment_isostatic_correction = _calc_ocean_total_sediment_thickness_isostatic_correction(present_day_total_sediment_thickness)
+    #
+    # However the present-day decompaction of the well contains an isostatic correction based on its lithology units which
+    # is more accurate so we'll use that instead. It also means the decompacted water depth at age zero (ie, top of well)
+    # will match the water depth we obtained from topography above.
+    #
+    # If we already have a present-day decompaction of the well then use that, otherwise explicitly decompact the well at present day.
     for decompacted_well in decompacted_wells:
-        decompacted_well.sea_level = sea_level.get_average_level(
-            decompacted_well.surface_unit.bottom_age,
-            decompacted_well.surface_unit.top_age)
+        if decompacted_well.get_age() == 0:
+            present_day_decompacted_well = decompacted_well
+            break
+    else:
+        present_day_decompacted_well = well.decompact(0.0)
+    # Get the present-day isostatic correction.
+    present_day_total_sediment_isostatic_correction = present_day_decompacted_well.get_sediment_isostatic_correction()
+    
+    return well, decompacted_wells, present_day_total_sediment_isostatic_correction
+
+
+def _add_tectonic_subsidence(
+        well,
+        decompacted_wells,
+        present_day_tectonic_subsidence,
+        present_day_crustal_thickness,
+        ocean_age_to_depth_model,
+        age,
+        dynamic_topography=None):
+    """
+    Calculate tectonic subsidence for a well on oceanic crust (if 'age' is not None) or continental passive margin (if 'age' is None).
+    
+    The tectonic subsidence at each age (of decompacted wells) is added as a 'tectonic_subsidence' attribute
+    to each decompacted well.
+    
+    Returns the rift stretching factor for continental crust, otherwise None.
+    """
+    
+    if age is not None:
+        # Oceanic crust.
+        _add_oceanic_tectonic_subsidence(
+            well,
+            decompacted_wells,
+            present_day_tectonic_subsidence,
+            ocean_age_to_depth_model,
+            age,
+            dynamic_topography)
+        # There's no rifting with oceanic subsidence.
+        return None
+    
+    # Continental crust.
+    return _add_continental_tectonic_subsidence(
+        well,
+        decompacted_wells,
+        present_day_tectonic_subsidence,
+        present_day_crustal_thickness,
+        dynamic_topography,
+        output_rift_stretching_factor=True)
 
 
 def _add_oceanic_tectonic_subsidence(
@@ -637,7 +1551,10 @@ def _add_oceanic_tectonic_subsidence(
     """
     
     # Present-day tectonic subsidence calculated from age-to-depth model.
-    present_day_tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(age, ocean_age_to_depth_model)
+    #
+    # Note: We use the model's dense precomputed age-to-depth table (if it's expensive to evaluate), except for a user-provided
+    #       model function whose table has not been built yet (since building it costs far more than the few ages converted here).
+    present_day_tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(age, ocean_age_to_depth_model, tabulated='auto')
     
     # NOT NEEDED: Initially the idea was to determine contribution of dynamic topography to
     # present-day subsidence (compared to contribution of anomalous ocean crustal thickness) and
@@ -668,16 +1585,17 @@ def _add_oceanic_tectonic_subsidence(
     if dynamic_topography:
         dynamic_topography_at_present_day = dynamic_topography.sample(0.0)
     
-    for decompacted_well in decompacted_wells:
+    # Age of the ocean basin at well location when it's decompacted to each decompaction age.
+    paleo_ages_of_crust_at_decompaction_times = [max(0, age - decompacted_well.get_age()) for decompacted_well in decompacted_wells]
+    
+    # Use age-to-depth model to lookup depths given the ages (all ages in a single vectorized call).
+    tectonic_subsidences_from_model = age_to_depth.convert_age_to_depth(
+        paleo_ages_of_crust_at_decompaction_times, ocean_age_to_depth_model, tabulated='auto')
+    
+    for decompacted_well, tectonic_subsidence_from_model in zip(decompacted_wells, tectonic_subsidences_from_model.tolist()):
         # The current decompaction time (age of the surface of the current decompacted column of the well).
         decompaction_time = decompacted_well.get_age()
         
-        # Age of the ocean basin at well location when it's decompacted to the current decompaction age.
-        paleo_age_of_crust_at_decompaction_time = max(0, age - decompaction_time)
-        
-        # Use age-to-depth model to lookup depth given the age.
-        tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(paleo_age_of_crust_at_decompaction_time, ocean_age_to_depth_model)
-        
         # We add in the constant offset between the age-to-depth model (at age of well) and unloaded water depth at present day.
         decompacted_well.tectonic_subsidence = tectonic_subsidence_from_model + tectonic_subsidence_model_adjustment
         
@@ -774,26 +1692,6 @@ def _add_continental_tectonic_subsidence(
     # else returning nothing means returning None
 
 
-def _sample_grid(longitude, latitude, grid_filename):
-    """
-    Samples the grid file 'grid_filename' at the longitude/latitude location (in degrees).
-    
-    Returns sampled float value (which can be NaN if location is in a masked region of grid).
-    """
-    
-    location_data = '{0} {1}\n'.format(longitude, latitude)
-
-    # The command-line strings to execute GMT 'grdtrack'.
-    grdtrack_command_line = ["gmt", "grdtrack", "-G{0}".format(grid_filename)]
-    
-    # Call the system command.
-    stdout_data = call_system_command(grdtrack_command_line, stdin=location_data, return_stdout=True)
-    
-    # GMT grdtrack returns a single line containing "longitude latitude sampled_value".
-    # Note that if GMT returns "NaN" then we'll return float('nan').
-    return float(stdout_data.split()[2])
-
-
 def _calc_ocean_total_sediment_thickness_isostatic_correction(total_sediment_thickness):
     """
     Calculate isostatic correction for total (compacted) sediment thickness (in metres) for oceanic crust.
@@ -855,15 +1753,17 @@ def write_well(
         well,
         *,
         well_attributes=None,
-        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS):
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        output_format='text'):
     """write_backtrack_well(\
         decompacted_wells,\
         decompacted_wells_filename,\
         well,\
         *,\
         well_attributes=None,\
-        decompacted_columns=pybacktrack.BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS)
-    Write decompacted parameters as columns in a text file.
+        decompacted_columns=pybacktrack.BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS,\
+        output_format='text')
+    Write decompacted parameters as columns in a text file (or a CSV, NumPy or NetCDF file).
     
     Parameters
     ----------
@@ -898,11 +1798,23 @@ def write_well(
         * pybacktrack.BACKTRACK_COLUMN_WATER_DEPTH
         * pybacktrack.BACKTRACK_COLUMN_SEA_LEVEL
         * pybacktrack.BACKTRACK_COLUMN_LITHOLOGY
+    output_format : {'text', 'csv', 'npz', 'netcdf'}, optional
+        The format of the output file:
+        
+        * ``text``: A text file with fixed-width columns and the well metadata in commented lines (the default).
+        * ``csv``: A CSV file with a header row of column names (but no well metadata).
+        * ``npz``: A compressed NumPy file with an array for each column (named after the column), and the well metadata
+          in the ``metadata_names`` and ``metadata_values`` arrays.
+        * ``netcdf``: A NetCDF (version 3) file with a variable for each column (named after the column),
+          and the well metadata in global attributes.
+        
+        In all formats except ``text`` the lithology column contains the lithology names and fractions in a single string
+        (eg, ``Shale 0.50 Sand 0.50``), and the columns are written as whole arrays (which is faster for many rows).
     
     Raises
     ------
     ValueError
-        If an unrecognised value is encountered in ``decompacted_columns``.
+        If an unrecognised value is encountered in ``decompacted_columns`` or ``output_format``.
     ValueError
         If ``pybacktrack.BACKTRACK_COLUMN_LITHOLOGY`` is specified in ``decompacted_columns`` but is not the last column.
 
@@ -913,6 +1825,7 @@ def write_well(
 
         - Added ``pybacktrack.BACKTRACK_COLUMN_PALEO_LONGITUDE``, ``pybacktrack.BACKTRACK_COLUMN_PALEO_LATITUDE`` and ``pybacktrack.BACKTRACK_COLUMN_SEA_LEVEL`` to available columns for ``decompacted_columns``.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
+        - Added optional ``output_format`` argument.
     """
     
     # If 'COLUMN_LITHOLOGY' is specified then it must be the last column.
@@ -920,6 +1833,26 @@ def write_well(
         decompacted_columns.index(COLUMN_LITHOLOGY) != len(decompacted_columns) - 1):
         raise ValueError('Lithology columns must be the last column in the decompacted well file.')
     
+    column_output.check_output_format(output_format)
+    
+    # Write CSV, NumPy and NetCDF formats as whole columns.
+    if output_format != 'text':
+        column_output.write_decompacted_wells_file(
+            decompacted_wells_filename,
+            output_format,
+            [decompacted_wells],
+            [well],
+            decompacted_columns,
+            _DECOMPACTED_COLUMN_NAMES_DICT,
+            _get_decompacted_column_array,
+            well_attributes)
+        return
+    
+    # Get the values of each column (except the lithology column which is formatted separately below).
+    column_arrays = [
+        _get_decompacted_column_array(decompacted_wells, decompacted_column) if decompacted_column != COLUMN_LITHOLOGY else None
+        for decompacted_column in decompacted_columns]
+    
     with open(decompacted_wells_filename, 'w') as file:
         
         # Write the same metadata that comes from the original well file.
@@ -948,7 +1881,7 @@ def write_well(
         file.write('\n')
         
         # Each decompacted well (ie, at the top age of a stratigraphic unit) is written as a separate row.
-        for decompacted_well in decompacted_wells:
+        for row_index, decompacted_well in enumerate(decompacted_wells):
             
             for column_index, decompacted_column in enumerate(decompacted_columns):
                 if column_index == 0:
@@ -960,52 +1893,134 @@ def write_well(
                     column_str_format_string = ' ' + str_format_string
                 column_width = column_widths[column_index]
                 
-                if decompacted_column == COLUMN_AGE:
-                    column_str = column_float_format_string.format(decompacted_well.get_age(), width=column_width)
-                elif decompacted_column == COLUMN_PALEO_LONGITUDE:
-                    column_str = column_float_format_string.format(decompacted_well.paleo_longitude, width=column_width)
-                elif decompacted_column == COLUMN_PALEO_LATITUDE:
-                    column_str = column_float_format_string.format(decompacted_well.paleo_latitude, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_THICKNESS:
-                    column_str = column_float_format_string.format(decompacted_well.total_decompacted_thickness, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_DENSITY:
-                    average_decompacted_density = decompacted_well.get_average_decompacted_density()
-                    column_str = column_float_format_string.format(average_decompacted_density, width=column_width)
-                elif decompacted_column == COLUMN_TECTONIC_SUBSIDENCE:
-                    column_str = column_float_format_string.format(decompacted_well.get_tectonic_subsidence(), width=column_width)
-                elif decompacted_column == COLUMN_WATER_DEPTH:
-                    water_depth = decompacted_well.get_water_depth()
-                    column_str = column_float_format_string.format(water_depth, width=column_width)
-                elif decompacted_column == COLUMN_SEA_LEVEL:
-                    column_str = column_float_format_string.format(decompacted_well.get_sea_level(), width=column_width)
-                elif decompacted_column == COLUMN_COMPACTED_THICKNESS:
-                    column_str = column_float_format_string.format(decompacted_well.total_compacted_thickness, width=column_width)
-                elif decompacted_column == COLUMN_LITHOLOGY:
+                if decompacted_column == COLUMN_LITHOLOGY:
                     # Write the original lithology components of the surface stratigraphic unit.
                     lithology_string = ''.join('{0:<15} {1:<10.2f} '.format(lithology_name, fraction)
                                                for lithology_name, fraction in decompacted_well.surface_unit.lithology_components)
                     column_str = column_str_format_string.format(lithology_string, width=column_width)
-                elif decompacted_column == COLUMN_COMPACTED_DEPTH:
-                    # Depth of the top of the first/surface stratigraphic unit.
-                    # This matches the age (which is also the top of the first/surface stratigraphic unit).
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.top_depth, width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_SEDIMENT_RATE:
-                    # Get sediment rate of surface stratigraphic unit.
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.get_decompacted_sediment_rate(), width=column_width)
-                elif decompacted_column == COLUMN_DECOMPACTED_DEPTH:
-                    # Get fully decompacted depth (assumes overlying stratigraphic units are also fully decompacted).
-                    column_str = column_float_format_string.format(decompacted_well.surface_unit.decompacted_top_depth, width=column_width)
-                elif decompacted_column == COLUMN_DYNAMIC_TOPOGRAPHY:
-                    # Get the change in dynamic topography relative to present day.
-                    column_str = column_float_format_string.format(decompacted_well.get_dynamic_topography(), width=column_width)
                 else:
-                    raise ValueError('Unrecognised value for "decompacted_columns".')
-            
+                    column_str = column_float_format_string.format(column_arrays[column_index][row_index], width=column_width)
+                
                 file.write(column_str)
             
             file.write('\n')
 
 
+def write_wells(
+        decompacted_wells_list,
+        decompacted_wells_filename,
+        wells,
+        well_names,
+        *,
+        well_attributes=None,
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        output_format='csv'):
+    """write_backtrack_wells(\
+        decompacted_wells_list,\
+        decompacted_wells_filename,\
+        wells,\
+        well_names,\
+        *,\
+        well_attributes=None,\
+        decompacted_columns=pybacktrack.BACKTRACK_DEFAULT_DECOMPACTED_COLUMNS,\
+        output_format='csv')
+    Write decompacted parameters of many wells to a single file indexed by well.
+    
+    Parameters
+    ----------
+    decompacted_wells_list : sequence of sequence of :class:`pybacktrack.DecompactedWell`
+        The decompacted wells returned by :func:`pybacktrack.backtrack_well` (or :func:`pybacktrack.backtrack_wells`) for each well.
+    decompacted_wells_filename : string
+        Name of output file.
+    wells : sequence of :class:`pybacktrack.Well`
+        The wells to extract metadata from (one per sequence in ``decompacted_wells_list``).
+    well_names : sequence of str
+        The name of each well (such as its well filename).
+    well_attributes : dict, optional
+        Optional attributes in :class:`pybacktrack.Well` objects to write as metadata (see :func:`pybacktrack.write_backtrack_well`).
+    decompacted_columns : list of columns, optional
+        The decompacted columns (and their order) to output (see :func:`pybacktrack.write_backtrack_well`).
+    output_format : {'csv', 'npz', 'netcdf'}, optional
+        The format of the output file (see :func:`pybacktrack.write_backtrack_well`).
+        Defaults to ``csv``.
+    
+    Raises
+    ------
+    ValueError
+        If an unrecognised value is encountered in ``decompacted_columns`` or ``output_format``.
+    ValueError
+        If the numbers of decompacted well sequences, wells and well names are not the same (or are zero).
+    
+    Notes
+    -----
+    In a CSV file the first column, ``well``, contains the well name of each row.
+    In a NumPy ``.npz`` file the ``well_names`` array contains the well names and the rows of well ``i`` are
+    ``well_row_offsets[i]`` to ``well_row_offsets[i+1]`` (in each column array).
+    A NetCDF file uses the contiguous ragged array representation of the CF conventions
+    (with a ``well_name`` variable and a ``row_size`` variable containing the number of rows of each well).
+    
+    .. versionadded:: 1.5
+    """
+    
+    column_output.write_decompacted_wells_file(
+        decompacted_wells_filename,
+        output_format,
+        decompacted_wells_list,
+        wells,
+        decompacted_columns,
+        _DECOMPACTED_COLUMN_NAMES_DICT,
+        _get_decompacted_column_array,
+        well_attributes,
+        well_names)
+
+
+def _get_decompacted_column_array(decompacted_wells, decompacted_column):
+    """
+    Return an array containing the values of a decompacted column at each decompacted well.
+    
+    The lithology column is an array of strings (each containing lithology names and fractions), otherwise arrays are float.
+    """
+    
+    if decompacted_column == COLUMN_AGE:
+        column_values = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_PALEO_LONGITUDE:
+        column_values = [decompacted_well.paleo_longitude for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_PALEO_LATITUDE:
+        column_values = [decompacted_well.paleo_latitude for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_THICKNESS:
+        column_values = [decompacted_well.total_decompacted_thickness for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_DENSITY:
+        column_values = [decompacted_well.get_average_decompacted_density() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_TECTONIC_SUBSIDENCE:
+        column_values = [decompacted_well.get_tectonic_subsidence() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_WATER_DEPTH:
+        column_values = [decompacted_well.get_water_depth() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_SEA_LEVEL:
+        column_values = [decompacted_well.get_sea_level() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_COMPACTED_THICKNESS:
+        column_values = [decompacted_well.total_compacted_thickness for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_LITHOLOGY:
+        # The original lithology components of the surface stratigraphic unit.
+        return column_output.get_lithology_column_array(decompacted_wells)
+    elif decompacted_column == COLUMN_COMPACTED_DEPTH:
+        # Depth of the top of the first/surface stratigraphic unit.
+        # This matches the age (which is also the top of the first/surface stratigraphic unit).
+        column_values = [decompacted_well.surface_unit.top_depth for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_SEDIMENT_RATE:
+        # Get sediment rate of surface stratigraphic unit.
+        column_values = [decompacted_well.surface_unit.get_decompacted_sediment_rate() for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DECOMPACTED_DEPTH:
+        # Get fully decompacted depth (assumes overlying stratigraphic units are also fully decompacted).
+        column_values = [decompacted_well.surface_unit.decompacted_top_depth for decompacted_well in decompacted_wells]
+    elif decompacted_column == COLUMN_DYNAMIC_TOPOGRAPHY:
+        # Get the change in dynamic topography relative to present day.
+        column_values = [decompacted_well.get_dynamic_topography() for decompacted_well in decompacted_wells]
+    else:
+        raise ValueError('Unrecognised value for "decompacted_columns".')
+    
+    return np.array(column_values, dtype=float)
+
+
 def backtrack_and_write_well(
         decompacted_output_filename,
         well_filename,
@@ -1030,7 +2045,8 @@ def backtrack_and_write_well(
         well_bottom_age_column=0,
         well_bottom_depth_column=1,
         well_lithology_column=2,
-        ammended_well_output_filename=None):
+        ammended_well_output_filename=None,
+        decompacted_output_format='text'):
     # Adding function signature on first line of docstring otherwise Sphinx autodoc will print out
     # the expanded values of the bundle filenames.
     """backtrack_and_write_well(\
@@ -1057,7 +2073,8 @@ def backtrack_and_write_well(
         well_bottom_age_column=0,\
         well_bottom_depth_column=1,\
         well_lithology_column=2,\
-        ammended_well_output_filename=None)
+        ammended_well_output_filename=None,\
+        decompacted_output_format='text')
     Same as :func:`pybacktrack.backtrack_well` but also writes decompacted results to a text file.
     
     Also optionally write amended well data (ie, including extra stratigraphic base unit from well bottom to basement)
@@ -1184,6 +2201,8 @@ def backtrack_and_write_well(
         The column of well file containing lithology(s). Defaults to 2.
     ammended_well_output_filename: string, optional
         Amended well data filename. Useful if an extra stratigraphic base unit is added from well bottom to basement.
+    decompacted_output_format : {'text', 'csv', 'npz', 'netcdf'}, optional
+        The format of the decompacted output file (see :func:`pybacktrack.write_backtrack_well`). Defaults to ``text``.
     
     Returns
     -------
@@ -1222,6 +2241,7 @@ def backtrack_and_write_well(
         - Added ``pybacktrack.BACKTRACK_COLUMN_PALEO_LONGITUDE``, ``pybacktrack.BACKTRACK_COLUMN_PALEO_LATITUDE`` and ``pybacktrack.BACKTRACK_COLUMN_SEA_LEVEL`` to available columns for ``decompacted_columns``.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
         - Now returns tuple (``well``, ``decompacted_wells``, and optionally ``rift_stretching_factor``). Previously returned nothing.
+        - Added optional ``decompacted_output_format`` argument.
     """
     
     # Decompact the well.
@@ -1253,12 +2273,43 @@ def backtrack_and_write_well(
     else:
         well, decompacted_wells = backtrack_well_output
     
+    # Write the decompacted well (and optionally the amended well).
+    _write_backtracked_well(
+        well,
+        decompacted_wells,
+        decompacted_output_filename,
+        decompacted_columns,
+        ammended_well_output_filename,
+        decompacted_output_format)
+    
+    if output_rift_stretching_factor:
+        return well, decompacted_wells, rift_stretching_factor
+    else:
+        return well, decompacted_wells
+
+
+# Attributes of well object to write to output files as metadata.
+_OUTPUT_WELL_ATTRIBUTES = {
+    'longitude': 'SiteLongitude',
+    'latitude': 'SiteLatitude',
+    'rift_start_age': 'RiftStartAge',
+    'rift_end_age': 'RiftEndAge'}
+
+
+def _write_backtracked_well(
+        well,
+        decompacted_wells,
+        decompacted_output_filename,
+        decompacted_columns=DEFAULT_DECOMPACTED_COLUMNS,
+        ammended_well_output_filename=None,
+        decompacted_output_format='text'):
+    """
+    Write decompacted wells to 'decompacted_output_filename' (in 'decompacted_output_format'), and optionally write amended well data
+    (ie, including extra stratigraphic base unit) to 'ammended_well_output_filename' (if specified).
+    """
+    
     # Attributes of well object to write to file as metadata.
-    well_attributes = {
-        'longitude': 'SiteLongitude',
-        'latitude': 'SiteLatitude',
-        'rift_start_age': 'RiftStartAge',
-        'rift_end_age': 'RiftEndAge'}
+    well_attributes = _OUTPUT_WELL_ATTRIBUTES
     
     # Write out amended well data (ie, extra stratigraphic base unit) if requested.
     if ammended_well_output_filename:
@@ -1275,12 +2326,8 @@ def backtrack_and_write_well(
         well,
         # Attributes of well object to write to file as metadata...
         well_attributes=well_attributes,
-        decompacted_columns=decompacted_columns)
-    
-    if output_rift_stretching_factor:
-        return well, decompacted_wells, rift_stretching_factor
-    else:
-        return well, decompacted_wells
+        decompacted_columns=decompacted_columns,
+        output_format=decompacted_output_format)
 
 
 #
@@ -1345,10 +2392,20 @@ def main():
     will write age to the first column and decompacted thickness to the second column.
     If lithology is specified then it must be the last column.
     
+    Many wells can be backtracked in a single run by specifying their well files with the '-wl' option
+    (instead of a single well file with the '-w' option). This loads the lithologies, sea level, dynamic topography,
+    rotations and static polygons only once (for all wells) and samples each grid at all well locations at once.
+    In this case the output filename is used to generate an output filename for each well (see 'output_filename' below),
+    and the location of each well must be provided inside its well file.
+    
     NOTE: Separate the positional and optional arguments with '--' (workaround for bug in argparse module).
     For example...
 
     python -m pybacktrack.backtrack_cli ... -w well.xy -c 0 1 4 -d age decompacted_thickness -- decompacted_well.xy
+    
+    ...or, to backtrack many wells (writing to "decompacted_well1.xy", "decompacted_well2.xy", etc)...
+    
+    python -m pybacktrack.backtrack_cli ... -wl well1.xy well2.xy well3.xy --use_all_cpus -- decompacted
     """.format(''.join('        {0}\n'.format(column_name) for column_name in _DECOMPACTED_COLUMN_NAMES))
 
     import argparse
@@ -1377,6 +2434,17 @@ def main():
         
         return value
         
+    def parse_positive_integer(value_string):
+        try:
+            value = int(value_string)
+        except ValueError:
+            raise argparse.ArgumentTypeError("%s is not an integer" % value_string)
+        
+        if value <= 0:
+            raise argparse.ArgumentTypeError("%g is not a positive integer" % value)
+        
+        return value
+        
     def parse_positive_float(value_string):
         try:
             value = float(value_string)
@@ -1445,11 +2513,21 @@ def main():
     
     parser.add_argument('--version', action='version', version=pybacktrack.version.__version__)
     
-    parser.add_argument(
-        '-w', '--well_filename', type=str, required=True,
+    # Can specify a single well or many wells (but not both).
+    well_filename_argument_group = parser.add_mutually_exclusive_group(required=True)
+    well_filename_argument_group.add_argument(
+        '-w', '--well_filename', type=str,
         metavar='well_filename',
         help='The well filename containing age, present day thickness, paleo water depth and lithology(s) '
              'for each stratigraphic unit in a single well.')
+    well_filename_argument_group.add_argument(
+        '-wl', '--well_filenames', type=str, nargs='+',
+        metavar='well_filename',
+        help='Multiple well filenames (each containing a single well) to backtrack in a single run. '
+             'The lithologies, sea level, dynamic topography, rotations and static polygons are loaded only once (for all wells) '
+             'and each grid is sampled at all well locations at once. '
+             'The location of each well must be provided inside its well file. '
+             'See "output_filename" for how the output filename of each well is generated.')
     
     # Allow user to override the default lithology filename, and also specify bundled lithologies.
     parser.add_argument(
@@ -1693,17 +2771,71 @@ def main():
                  '(eg, "40, 100, 10" represents the interval from 40 Ma to 100 Ma inclusive, in 10 Myr intervals). '
                  'If no times are specified (either here or with "--time_list") then defaults to the top ages of the stratigraphic units in the well.')
     
+    parser.add_argument(
+        '--use_all_cpus', nargs='?', type=parse_positive_integer,
+        const=True, default=False,
+        metavar='NUM_CPUS',
+        help='Only used when backtracking multiple wells (with "--well_filenames"). '
+             'Use all CPUs (cores), or if an optional integer is also specified then use the specified number of CPUs. '
+             'Defaults to using a single CPU.')
+    
+    parser.add_argument(
+        '--decompacted_output_format', type=str, default='text',
+        choices=column_output.OUTPUT_FORMATS,
+        help='The format of the decompacted output file(s). '
+             'Choices are "text" (columns of fixed width, and well metadata, in a text file), '
+             '"csv" (a CSV file with a header row of column names), '
+             '"npz" (a compressed NumPy file with an array per column) and '
+             '"netcdf" (a NetCDF file with a variable per column). '
+             'Defaults to "text".')
+    
+    parser.add_argument(
+        '--combine_output_wells', action='store_true',
+        help='Only used when backtracking multiple wells (with "--well_filenames"). '
+             'Write the decompacted output of all wells to a single file (the output filename) indexed by well, '
+             'instead of one file per well. Requires a "--decompacted_output_format" other than "text".')
+    
     parser.add_argument(
         'output_filename', type=str,
         metavar='output_filename',
         help='The output filename used to store the decompacted total sediment thickness and '
-             'water depth through time.')
+             'water depth through time. '
+             'When backtracking multiple wells (with "--well_filenames") the output filename of each well is generated by appending '
+             '"_<well_filename>" to this (where <well_filename> excludes the directory), '
+             'unless "--combine_output_wells" is specified (in which case all wells are written to this output filename). '
+             'Alternatively, this can be a template string containing the "${well}" identifier (eg, "${well}_decompacted.txt") '
+             'in which case each output filename is generated by replacing the well identifier with the well filename '
+             '(excluding the directory and the filename extension). '
+             'The same applies to the output well filename ("--output_well_filename"), if specified.')
+    
+    # Optionally profile the script, and trace the system commands it calls (including in any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    parser.add_argument(
+        '--trace_system_commands', action='store_true',
+        help='Print a summary of the system commands (such as GMT) called by the script (including those called by any worker processes when using multiple CPUs) when the script finishes.')
+    parser.add_argument(
+        '--cache_results', action='store_true',
+        help='Cache the result of backtracking a single well (with "--well_filename") on disk, and reuse it when the same well is backtracked again '
+             'with the same inputs (well and lithology files, grids, models and parameters). '
+             'The cache directory can be set with the PYBACKTRACK_CACHE_DIR environment variable.')
     
     #
     # Parse command-line options.
     #
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
+    # Start tracing system commands (if requested). A summary is printed when the script exits.
+    if args.trace_system_commands:
+        start_system_command_trace(print_summary_at_exit=True)
+    
+    # Enable caching of results (if requested).
+    if args.cache_results:
+        result_cache.enable_result_cache()
+    
     #
     # Do any necessary post-processing/validation of parsed options.
     #
@@ -1772,6 +2904,93 @@ def main():
     else:
         times = None
     
+    if args.combine_output_wells:
+        if not args.well_filenames:
+            raise ValueError('Can only combine output wells when backtracking multiple wells (with "--well_filenames")')
+        if args.decompacted_output_format == 'text':
+            raise ValueError('Cannot combine output wells into a "text" file (specify a different "--decompacted_output_format")')
+    
+    # If backtracking multiple wells.
+    if args.well_filenames:
+        if args.well_location is not None:
+            raise ValueError('Cannot specify a well location when backtracking multiple wells (add the location to each well file instead)')
+        
+        # Backtrack the wells (one well at a time is returned).
+        backtrack_wells_output = backtrack_wells(
+            args.well_filenames,
+            times=times,
+            lithology_filenames=args.lithology_filenames,
+            age_grid_filename=age_grid_filename,
+            topography_filename=args.topography_filename,
+            total_sediment_thickness_filename=total_sediment_thickness_filename,
+            crustal_thickness_filename=args.crustal_thickness_filename,
+            dynamic_topography_model=dynamic_topography_model,
+            sea_level_model=sea_level_model,
+            base_lithology_name=args.base_lithology_name,
+            ocean_age_to_depth_model=args.ocean_age_to_depth_model,
+            rifting_period=rifting_period,
+            output_rift_stretching_factor=args.print_rift_stretching_factor,
+            rotation_filenames=args.rotation_filenames,
+            static_polygon_filename=args.static_polygon_filename,
+            anchor_plate_id=args.anchor_plate_id,
+            well_bottom_age_column=args.well_columns[0],
+            well_bottom_depth_column=args.well_columns[1],
+            well_lithology_column=args.well_columns[2],
+            use_all_cpus=args.use_all_cpus)
+        
+        # When combining output wells, collect the decompacted wells and write them all to a single file at the end.
+        combined_well_filenames = []
+        combined_wells = []
+        combined_decompacted_wells_list = []
+        
+        # Write output data of each well as soon as it's been backtracked (unless combining output wells).
+        for well_filename, backtrack_well_output in zip(args.well_filenames, backtrack_wells_output):
+            # Skip wells that have no stratigraphic units.
+            if not backtrack_well_output:
+                warnings.warn('Skipping well "{0}" since it has no stratigraphic units.'.format(well_filename))
+                continue
+            
+            # The yielded value can be a 3-tuple (adding the rift stretching factor, or None).
+            well, decompacted_wells = backtrack_well_output[:2]
+            
+            if args.combine_output_wells:
+                combined_well_filenames.append(well_filename)
+                combined_wells.append(well)
+                combined_decompacted_wells_list.append(decompacted_wells)
+                
+                # Write out amended well data (ie, extra stratigraphic base unit) if requested.
+                if args.output_well_filename:
+                    write_well_file(
+                        well,
+                        well_processing.get_well_output_filename(args.output_well_filename, well_filename),
+                        well_attributes=_OUTPUT_WELL_ATTRIBUTES)
+            else:
+                _write_backtracked_well(
+                    well,
+                    decompacted_wells,
+                    well_processing.get_well_output_filename(args.output_filename, well_filename),
+                    decompacted_columns,
+                    well_processing.get_well_output_filename(args.output_well_filename, well_filename) if args.output_well_filename else None,
+                    args.decompacted_output_format)
+            
+            # If we've been requested to print the optimal rift stretching (beta) factor.
+            if args.print_rift_stretching_factor:
+                _, _, rift_stretching_factor = backtrack_well_output
+                print('{0}: Optimal rift stretching (beta) factor: {1}'.format(well_filename, rift_stretching_factor), file=sys.stdout)
+        
+        # Write all wells to a single file (indexed by well) if requested.
+        if combined_wells:
+            write_wells(
+                combined_decompacted_wells_list,
+                args.output_filename,
+                combined_wells,
+                combined_well_filenames,
+                well_attributes=_OUTPUT_WELL_ATTRIBUTES,
+                decompacted_columns=decompacted_columns,
+                output_format=args.decompacted_output_format)
+        
+        return
+    
     # Backtrack and write output data.
     backtrack_well_output = backtrack_and_write_well(
         args.output_filename,
@@ -1796,7 +3015,8 @@ def main():
         well_bottom_age_column=args.well_columns[0],
         well_bottom_depth_column=args.well_columns[1],
         well_lithology_column=args.well_columns[2],
-        ammended_well_output_filename=args.output_well_filename)
+        ammended_well_output_filename=args.output_well_filename,
+        decompacted_output_format=args.decompacted_output_format)
     
     # If we've been requested to print the optimal rift stretching (beta) factor.
     if args.print_rift_stretching_factor:
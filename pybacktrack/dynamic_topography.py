@@ -28,7 +28,9 @@ import math
 import numpy as np
 import os.path
 import pybacktrack.bundle_data
-from pybacktrack.util.call_system_command import call_system_command
+from pybacktrack.util.call_system_command import call_system_command, start_system_command_trace
+import pybacktrack.util.profiling as profiling
+import pybacktrack.util.reconstruction_cache as reconstruction_cache
 import pygplates
 import sys
 import warnings
@@ -57,7 +59,7 @@ class DynamicTopography(object):
         So ``longitude``, ``latitude`` and ``age`` can all have either a single value or multiple values (same number for each).
     """
     
-    def __init__(self, grid_list_filename, static_polygon_filename, rotation_filenames, longitude, latitude, age=None):
+    def __init__(self, grid_list_filename, static_polygon_filename, rotation_filenames, longitude, latitude, age=None, *, reconstruction_plate_id=None, static_polygon_raster_grid_spacing=None):
         """
         Load dynamic topography grid filenames and associated ages from grid list file 'grid_list_filename'.
         
@@ -76,13 +78,21 @@ class DynamicTopography(object):
         age : float or list of float, optional
             The age of the crust that the point location is on, or list of ages (if multiple point locations).
             If not specified then the appearance age(s) of the static polygon(s) containing the point(s) is used.
+        reconstruction_plate_id : int or sequence of int, optional
+            The plate ID of the static polygon containing the point location, or sequence of plate IDs (if multiple point locations),
+            such as a NumPy integer array. If not specified then the point(s) are partitioned into the static polygons to find the plate ID(s).
+        static_polygon_raster_grid_spacing : float, optional
+            If specified then the point(s) are partitioned into the static polygons using a raster of the static polygons with
+            this grid spacing (in degrees), which is faster for many points (see :class:`pybacktrack.StaticPolygonRaster`).
+            By default each point is partitioned directly into the static polygons. Both give the same result.
         
         Raises
         ------
         ValueError
             If any ``age`` is negative (if specified).
         ValueError
-            If ``longitude`` and ``latitude`` (and ``age`` if specified) are all not a single value or all not a sequence (of same length).
+            If ``longitude`` and ``latitude`` (and ``age`` and ``reconstruction_plate_id`` if specified) are all not a single value or
+            all not a sequence (of same length).
         ValueError
             If ``grid_list_filename`` does not contain a grid at present day, or
             ``grid_list_filename`` contains fewer than two grids, or
@@ -101,21 +111,25 @@ class DynamicTopography(object):
         Each present day location is also assigned a plate ID using the static polygons,
         and the rotations are used to reconstruct each location when sampling the grids at a reconstructed time.
         
+        If both ``age`` and ``reconstruction_plate_id`` are specified then the static polygons are not used at all
+        (avoiding partitioning each point location into the static polygons). This is useful when the caller has already
+        partitioned the point locations using the same static polygons and rotations.
+        
         .. versionchanged:: 1.4
            The following changes were made:
 
            - Added ability to specify a list of point locations (as an alternative to specifying a single location).
            - Raises ``ValueError`` if there's no present day grid or if any age is negative.
+        
+        .. versionchanged:: 1.5
+           Added optional ``reconstruction_plate_id`` and ``static_polygon_raster_grid_spacing`` arguments.
         """
         
         # For interpolating dynamic topography grids at reconstructed locations.
         self.interpolate_dynamic_topography = InterpolateDynamicTopography(grid_list_filename)
 
-        # Rotation model for reconstructing locations.
-        self.rotation_model = pygplates.RotationModel(rotation_filenames)
-        
-        # Find the plate ID of the static polygon containing the location (or zero if not in any plates).
-        plate_partitioner = pygplates.PlatePartitioner(static_polygon_filename, self.rotation_model)
+        # Rotation model for reconstructing locations (shared with other objects using the same rotation files).
+        self.rotation_model = reconstruction_cache.get_rotation_model(rotation_filenames)
 
         # See if we've been provided a single location or a sequence of locations (by seeing if we can iterate over longitude or not).
         try:
@@ -146,6 +160,17 @@ class DynamicTopography(object):
                 if not self.is_sequence_of_locations:
                     raise ValueError('longitude and latitude are single values but age is a sequence')
         
+        # Make sure reconstruction plate ID (if specified) is the same type as longitude and latitude (ie, a sequence or a single value).
+        if reconstruction_plate_id is not None:
+            try:
+                iter(reconstruction_plate_id)
+            except TypeError: # reconstruction plate ID is a single value ...
+                if self.is_sequence_of_locations:
+                    raise ValueError('longitude and latitude are sequences but reconstruction_plate_id is a single value')
+            else: # reconstruction plate ID is a sequence ...
+                if not self.is_sequence_of_locations:
+                    raise ValueError('longitude and latitude are single values but reconstruction_plate_id is a sequence')
+        
         # If sequences, make sure longitude, latitude and optional age are the same length.
         if self.is_sequence_of_locations:
             if len(longitude) != len(latitude):
@@ -153,6 +178,9 @@ class DynamicTopography(object):
             if age is not None:
                 if len(longitude) != len(age):
                     raise ValueError('age sequence is not same length as longitude and latitude sequences')
+            if reconstruction_plate_id is not None:
+                if len(longitude) != len(reconstruction_plate_id):
+                    raise ValueError('reconstruction_plate_id sequence is not same length as longitude and latitude sequences')
 
         # Create a sequence of pygplates.PointOnSphere for use with reconstructing.
         if self.is_sequence_of_locations:
@@ -173,24 +201,54 @@ class DynamicTopography(object):
                 # Turn into a sequence of ages (a sequence containing a single age).
                 self._ages = [age]
 
-        self.reconstruction_plate_id =  []
+        # Create a sequence of plate IDs (in self.reconstruction_plate_id).
+        if reconstruction_plate_id is None:
+            # We'll initialise the plate ID(s) below.
+            self.reconstruction_plate_id = []
+        elif self.is_sequence_of_locations:
+            # Convert to a list of Python integers (eg, in case it's a NumPy array).
+            self.reconstruction_plate_id = [int(plate_id) for plate_id in reconstruction_plate_id]
+        else:
+            # Turn into a sequence of plate IDs (a sequence containing a single plate ID).
+            self.reconstruction_plate_id = [int(reconstruction_plate_id)]
 
-        # Assign a plate ID to each location (and optionally an age if not already provided).
-        for point in self._locations:
-            partitioning_plate = plate_partitioner.partition_point(point)
-            if partitioning_plate:
-                reconstruction_plate_id = partitioning_plate.get_feature().get_reconstruction_plate_id()
-            else:
-                reconstruction_plate_id = 0
-            self.reconstruction_plate_id.append(reconstruction_plate_id)
-        
-            # Use the age of the containing static polygon if age not provided (eg, if outside age grid).
+        # Assign a plate ID to each location and/or an age (if not already provided).
+        #
+        # Note: If both were provided then there's no need to partition the locations into the static polygons.
+        if (reconstruction_plate_id is None or age is None) and static_polygon_raster_grid_spacing is not None:
+            # Find the plate ID and appearance age of the static polygon containing each location using a raster of the static polygons.
+            static_polygon_raster = reconstruction_cache.get_static_polygon_raster(
+                static_polygon_filename, rotation_filenames, static_polygon_raster_grid_spacing)
+            partitioned_plate_ids, partitioned_appearance_ages = static_polygon_raster.partition_points(
+                [point.to_lat_lon()[1] for point in self._locations],
+                [point.to_lat_lon()[0] for point in self._locations])
+            
+            # Locations not in any static polygon get plate ID zero and appearance age zero (same as partitioning directly below).
+            if reconstruction_plate_id is None:
+                self.reconstruction_plate_id = [max(int(plate_id), 0) for plate_id in partitioned_plate_ids]
             if age is None:
-                if partitioning_plate:
-                    time_of_appearance, _ = partitioning_plate.get_feature().get_valid_time()
-                else:
-                    time_of_appearance = 0.0
-                self._ages.append(time_of_appearance)
+                self._ages = [0.0 if math.isnan(appearance_age) else float(appearance_age) for appearance_age in partitioned_appearance_ages]
+        elif reconstruction_plate_id is None or age is None:
+            # Find the plate ID of the static polygon containing the location (or zero if not in any plates).
+            plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames)
+            
+            for point in self._locations:
+                partitioning_plate = plate_partitioner.partition_point(point)
+                
+                if reconstruction_plate_id is None:
+                    if partitioning_plate:
+                        plate_id = partitioning_plate.get_feature().get_reconstruction_plate_id()
+                    else:
+                        plate_id = 0
+                    self.reconstruction_plate_id.append(plate_id)
+                
+                # Use the age of the containing static polygon if age not provided (eg, if outside age grid).
+                if age is None:
+                    if partitioning_plate:
+                        time_of_appearance, _ = partitioning_plate.get_feature().get_valid_time()
+                    else:
+                        time_of_appearance = 0.0
+                    self._ages.append(time_of_appearance)
         
         if any(a < 0 for a in self._ages):
             raise ValueError('Dynamic topography: age values must not be negative')
@@ -254,8 +312,8 @@ class DynamicTopography(object):
         return dynamic_topography_list_filename, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames
     
     @staticmethod
-    def create_from_bundled_model(dynamic_topography_model_name, longitude, latitude, age=None):
-        """create_from_bundled_model(dynamic_topography_model_name, longitude, latitude, age=None)
+    def create_from_bundled_model(dynamic_topography_model_name, longitude, latitude, age=None, *, reconstruction_plate_id=None, static_polygon_raster_grid_spacing=None):
+        """create_from_bundled_model(dynamic_topography_model_name, longitude, latitude, age=None, *, reconstruction_plate_id=None, static_polygon_raster_grid_spacing=None)
         Create a DynamicTopography instance from a bundled dynamic topography model name.
         
         Parameters
@@ -270,6 +328,12 @@ class DynamicTopography(object):
         age : float or list of float, optional
             The age of the crust that the point location is on, or list of ages (if multiple point locations).
             If not specified then the appearance age(s) of the static polygon(s) containing the point(s) is used.
+        reconstruction_plate_id : int or sequence of int, optional
+            The plate ID of the static polygon (of the dynamic topography model) containing the point location, or sequence of plate IDs
+            (if multiple point locations). If not specified then the point(s) are partitioned into the static polygons to find the plate ID(s).
+        static_polygon_raster_grid_spacing : float, optional
+            If specified then the point(s) are partitioned into the static polygons using a raster of the static polygons with
+            this grid spacing (in degrees), which is faster for many points (see :class:`pybacktrack.StaticPolygonRaster`).
         
         Returns
         -------
@@ -287,6 +351,9 @@ class DynamicTopography(object):
         
         .. versionchanged:: 1.4
            Added ability to specify a list of point locations (as an alternative to specifying a single location).
+        
+        .. versionchanged:: 1.5
+           Added optional ``reconstruction_plate_id`` and ``static_polygon_raster_grid_spacing`` arguments.
         """
         
         # Get the bundled model files.
@@ -294,11 +361,13 @@ class DynamicTopography(object):
         
         return DynamicTopography(
             dynamic_topography_list_filename, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames,
-            longitude, latitude, age)
+            longitude, latitude, age,
+            reconstruction_plate_id=reconstruction_plate_id,
+            static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)
     
     @staticmethod
-    def create_from_model_or_bundled_model_name(dynamic_topography_model_or_bundled_model_name, longitude, latitude, age=None):
-        """create_from_model_or_bundled_model_name(dynamic_topography_model_or_bundled_model_name, longitude, latitude, age=None)
+    def create_from_model_or_bundled_model_name(dynamic_topography_model_or_bundled_model_name, longitude, latitude, age=None, *, reconstruction_plate_id=None, static_polygon_raster_grid_spacing=None):
+        """create_from_model_or_bundled_model_name(dynamic_topography_model_or_bundled_model_name, longitude, latitude, age=None, *, reconstruction_plate_id=None, static_polygon_raster_grid_spacing=None)
         Create a DynamicTopography instance from a user-provided model or from a bundled model.
         
         Parameters
@@ -314,6 +383,12 @@ class DynamicTopography(object):
         age : float or list of float, optional
             The age of the crust that the point location is on, or list of ages (if multiple point locations).
             If not specified then the appearance age(s) of the static polygon(s) containing the point(s) is used.
+        reconstruction_plate_id : int or sequence of int, optional
+            The plate ID of the static polygon (of the dynamic topography model) containing the point location, or sequence of plate IDs
+            (if multiple point locations). If not specified then the point(s) are partitioned into the static polygons to find the plate ID(s).
+        static_polygon_raster_grid_spacing : float, optional
+            If specified then the point(s) are partitioned into the static polygons using a raster of the static polygons with
+            this grid spacing (in degrees), which is faster for many points (see :class:`pybacktrack.StaticPolygonRaster`).
         
         Returns
         -------
@@ -323,11 +398,17 @@ class DynamicTopography(object):
         Notes
         -----
         .. versionadded:: 1.4
+        
+        .. versionchanged:: 1.5
+           Added optional ``reconstruction_plate_id`` and ``static_polygon_raster_grid_spacing`` arguments.
         """
         
         # If a dynamic topography *bundled model name* was specified then create it from a bundled dynamic topography model.
         if isinstance(dynamic_topography_model_or_bundled_model_name, str):
-            return DynamicTopography.create_from_bundled_model(dynamic_topography_model_or_bundled_model_name, longitude, latitude, age)
+            return DynamicTopography.create_from_bundled_model(
+                dynamic_topography_model_or_bundled_model_name, longitude, latitude, age,
+                reconstruction_plate_id=reconstruction_plate_id,
+                static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)
         else:
             # Otherwise we're expecting a user-provided dynamic topography model.
             def is_dynamic_topography_model(dynamic_topography_model):
@@ -342,7 +423,11 @@ class DynamicTopography(object):
                     ', '.join(pybacktrack.bundle_data.BUNDLE_DYNAMIC_TOPOGRAPHY_MODEL_NAMES)))
 
             dynamic_topography_list_filename, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames = dynamic_topography_model_or_bundled_model_name
-            return DynamicTopography(dynamic_topography_list_filename, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames, longitude, latitude, age)
+            return DynamicTopography(
+                dynamic_topography_list_filename, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames,
+                longitude, latitude, age,
+                reconstruction_plate_id=reconstruction_plate_id,
+                static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)
     
     def sample(self, time, fallback=True):
         """
@@ -402,12 +487,49 @@ class DynamicTopography(object):
              ...note that there is no difference *at* grid times (only between grid times).
         """
 
-        grid_sample = [float('nan')] * len(self._locations)
+        grid_sample = self.sample_points(time, range(len(self._locations)), fallback)
+        
+        # If constructed with a single location then return a single grid value, otherwise return a sequence.
+        if self.is_sequence_of_locations:
+            return grid_sample
+        else:
+            return grid_sample[0]
+    
+    def sample_points(self, time, point_indices, fallback=True):
+        """
+        Same as :meth:`sample` but only samples some of the point locations.
+        
+        Parameters
+        ----------
+        time : float
+            Time to sample dynamic topography.
+        point_indices : sequence of int
+            Indices of the point locations to sample (indices into the point locations specified in the constructor).
+        fallback : bool
+            Whether to fall back to a non-optimal sampling if neccessary (see :meth:`sample`).
+            Defaults to ``True``.
+        
+        Returns
+        -------
+        list of float
+            The sampled dynamic topography values (one per point index, in the same order as ``point_indices``).
+            This is a list even if constructed with a single location.
+        
+        Notes
+        -----
+        This is useful when many point locations were specified in the constructor (for example, to share a single
+        rotation model and plate partitioning) but only some of them need sampling at ``time``.
+        
+        .. versionadded:: 1.5
+        """
+
+        point_indices = list(point_indices)
+        grid_sample = [float('nan')] * len(point_indices)
 
         # Reconstruct the present day locations to 'time'.
         gmt_reconstructed_locations = []
-        location_point_indices = []  # Keep track of where to write sampled locations back to.
-        for point_index in range(len(self._locations)):
+        location_sample_indices = []  # Keep track of where to write sampled locations back to.
+        for sample_index, point_index in enumerate(point_indices):
             if not fallback:
                 # Fallback is disabled so we should not reconstruct to times earlier than the location's appearance age.
                 # Skip locations that appear after 'time' (leave them as NaN to indicate this).
@@ -425,7 +547,7 @@ class DynamicTopography(object):
             gmt_reconstructed_latitude, gmt_reconstructed_longitude = reconstructed_location.to_lat_lon()
 
             gmt_reconstructed_locations.append((gmt_reconstructed_longitude, gmt_reconstructed_latitude))
-            location_point_indices.append(point_index)
+            location_sample_indices.append(sample_index)
 
         # If there are no reconstructed locations to sample.
         if not gmt_reconstructed_locations:
@@ -440,16 +562,12 @@ class DynamicTopography(object):
             return grid_sample  # All NaNs.
 
         # Extract the sampled values (and write them back to correct index in returned grid sample).
-        for sample_index, sampled_value in enumerate(sampled_values):
+        for reconstructed_location_index, sampled_value in enumerate(sampled_values):
             # The output sampled values should be in the same order as the input reconstructed locations.
-            point_index = location_point_indices[sample_index]
-            grid_sample[point_index] = sampled_value
+            sample_index = location_sample_indices[reconstructed_location_index]
+            grid_sample[sample_index] = sampled_value
         
-        # If constructed with a single location then return a single grid value, otherwise return a sequence.
-        if self.is_sequence_of_locations:
-            return grid_sample
-        else:
-            return grid_sample[0]
+        return grid_sample
 
 
 class InterpolateDynamicTopography(object):
@@ -910,8 +1028,22 @@ def main():
         metavar='oldest_time',
         help='Output is generated from present day back to the oldest time (in Ma). Value must not be negative.')
     
+    # Optionally profile the script, and trace the system commands it calls (including in any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    parser.add_argument(
+        '--trace_system_commands', action='store_true',
+        help='Print a summary of the system commands (such as GMT) called by the script (including those called by any worker processes when using multiple CPUs) when the script finishes.')
+    
     # Parse command-line options.
     args = parser.parse_args()
+    
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+   
+    # Start tracing system commands (if requested). A summary is printed when the script exits.
+    if args.trace_system_commands:
+        start_system_command_trace(print_summary_at_exit=True)
    
     # Create times from present day to the oldest requested time in the requested time increments.
     # Note: Using 1e-6 to ensure the oldest time gets included (if it's an exact multiple of the time increment, which it likely will be).
@@ -31,7 +31,9 @@
 
 
 import argparse
+import functools
 import pybacktrack.bundle_data
+from pybacktrack.util.cache import get_files_key
 import os.path
 import warnings
 
@@ -40,11 +42,24 @@ DEFAULT_BASE_LITHOLOGY_NAME = 'Shale'
 """Default name of the lithology of the stratigraphic unit at the base of the well (the undrilled portion)."""
 
 
+# Maximum number of mixed lithologies (created from weighted lithology components) to cache.
+_MAX_MIXED_LITHOLOGY_CACHE_SIZE = 1024
+
+
 class Lithology(object):
     """
     Class containing lithology data.
+    
+    Notes
+    -----
+    .. versionchanged:: 1.5
+       Lithologies are immutable (so they can be shared, for example, by all stratigraphic units with the same lithology components).
+       Two lithologies compare equal if they have the same density, surface porosity and porosity decay.
     """
     
+    # Avoid a per-instance '__dict__' (there can be many lithologies).
+    __slots__ = ('density', 'surface_porosity', 'porosity_decay')
+    
     def __init__(self, density, surface_porosity, porosity_decay):
         """
         Create a lithology from density, surface porosity and porosity decay.
@@ -59,9 +74,28 @@ class Lithology(object):
             Porosity decay (in metres).
         """
         
-        self.density = density
-        self.surface_porosity = surface_porosity
-        self.porosity_decay = porosity_decay
+        # Bypass our '__setattr__' (which prevents modification).
+        object.__setattr__(self, 'density', density)
+        object.__setattr__(self, 'surface_porosity', surface_porosity)
+        object.__setattr__(self, 'porosity_decay', porosity_decay)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError('Lithology is immutable (cannot set attribute "{0}").'.format(name))
+    
+    def __delattr__(self, name):
+        raise AttributeError('Lithology is immutable (cannot delete attribute "{0}").'.format(name))
+    
+    def __eq__(self, other):
+        if not isinstance(other, Lithology):
+            return NotImplemented
+        return (self.density, self.surface_porosity, self.porosity_decay) == (other.density, other.surface_porosity, other.porosity_decay)
+    
+    def __hash__(self):
+        return hash((self.density, self.surface_porosity, self.porosity_decay))
+    
+    def __reduce__(self):
+        # Pickle (eg, when sending wells to other processes) and copy using the constructor (since '__setattr__' is disabled).
+        return (Lithology, (self.density, self.surface_porosity, self.porosity_decay))
 
 
 def read_lithologies_file(lithologies_filename):
@@ -86,9 +120,22 @@ def read_lithologies_file(lithologies_filename):
     #. density
     #. surface_porosity
     #. porosity_decay
+    
+    .. versionchanged:: 1.5
+       Lithology files are only parsed once (unless modified). Subsequent calls return a new dictionary
+       containing the same (immutable) :class:`pybacktrack.Lithology` objects.
     """
     
+    # Return the cached lithologies if the file has already been read (and has not been modified since).
+    lithologies_file_key = get_files_key(lithologies_filename)
+    cached_lithologies = _lithologies_file_cache.get(lithologies_file_key) if lithologies_file_key is not None else None
+    if cached_lithologies is not None:
+        # Return a copy of the dict in case caller modifies it.
+        return dict(cached_lithologies)
+    
     lithologies = {}
+    # Only cache files that read without warnings (so that the warnings are emitted each time they're read).
+    read_without_warnings = True
     with open(lithologies_filename, 'r') as lithologies_file:
         for line_number, line in enumerate(lithologies_file):
 
@@ -110,6 +157,7 @@ def read_lithologies_file(lithologies_filename):
                 (len(line_string_list) > 4 and not line_string_list[4].startswith('#'))):
                 warnings.warn('Line {0} of "{1}": Ignoring lithology: line does not have 4 white-space '
                               'separated strings.'.format(line_number, lithologies_filename))
+                read_without_warnings = False
                 continue
                 
             # Attempt to read/convert the strings.
@@ -121,13 +169,21 @@ def read_lithologies_file(lithologies_filename):
             except ValueError:
                 warnings.warn('Line {0} of "{1}": Ignoring lithology: cannot read name/density/porosity/decay '
                               'values.'.format(line_number, lithologies_filename))
+                read_without_warnings = False
                 continue
 
             lithologies[name] = Lithology(density, surface_porosity, porosity_decay)
     
+    if lithologies_file_key is not None and read_without_warnings:
+        _lithologies_file_cache[lithologies_file_key] = dict(lithologies)
+    
     return lithologies
 
 
+# Lithologies read from lithology files (keyed by the path, size and modification time of each file).
+_lithologies_file_cache = {}
+
+
 def read_lithologies_files(lithologies_filenames):
     """
     Reads each lithologies text file in the sequence and merges their lithologies.
@@ -216,26 +272,52 @@ def create_lithology_from_components(components, lithologies):
         If all fractions do not add up to 1.0.
     KeyError
         If a lithology name is not found in ``lithologies``.
+    
+    Notes
+    -----
+    .. versionchanged:: 1.5
+       The same (immutable) combined lithology is returned for the same components (and the same component lithologies).
+       And a single component (with a fraction of one) returns its lithology (rather than a copy).
     """
     
-    density = 0
-    surface_porosity = 0
-    porosity_decay = 0
+    # Look up the lithology of each component (so that the cache key depends on the lithology values, not just their names).
+    weighted_lithologies = []
     total_fraction = 0
     for name, fraction in components:
         lithology = lithologies.get(name)
         if not lithology:
             raise KeyError('Lithology name "{0}" does not exist in lithology dictionary.'.format(name))
         
-        density += fraction * lithology.density
-        surface_porosity += fraction * lithology.surface_porosity
-        porosity_decay += fraction * lithology.porosity_decay
+        weighted_lithologies.append((lithology, fraction))
         total_fraction += fraction
     
     # Make sure total fraction adds up to one.
     if total_fraction < 1 - 1e-6 or total_fraction > 1 + 1e-6:
         raise ValueError('Lithology fractions do not add up to one for {0}.'.format(components))
     
+    return _create_lithology_from_weighted_lithologies(tuple(weighted_lithologies))
+
+
+@functools.lru_cache(maxsize=_MAX_MIXED_LITHOLOGY_CACHE_SIZE)
+def _create_lithology_from_weighted_lithologies(weighted_lithologies):
+    """
+    Creates a combined lithology from a tuple of (lithology, fraction) tuples (with fractions adding up to one).
+    
+    This is cached so that stratigraphic units with the same components share the same combined lithology.
+    """
+    
+    # A single lithology (the most common case) doesn't need combining.
+    if len(weighted_lithologies) == 1 and weighted_lithologies[0][1] == 1:
+        return weighted_lithologies[0][0]
+    
+    density = 0
+    surface_porosity = 0
+    porosity_decay = 0
+    for lithology, fraction in weighted_lithologies:
+        density += fraction * lithology.density
+        surface_porosity += fraction * lithology.surface_porosity
+        porosity_decay += fraction * lithology.porosity_decay
+    
     return Lithology(density, surface_porosity, porosity_decay)
 
 
@@ -41,7 +41,9 @@ from pybacktrack.dynamic_topography import DynamicTopography
 from pybacktrack.lithology import read_lithologies_files
 import pybacktrack.rifting as rifting
 from pybacktrack.sea_level import SeaLevel
-from pybacktrack.util.call_system_command import call_system_command
+from pybacktrack.util.call_system_command import call_system_command, start_system_command_trace
+import pybacktrack.util.profiling as profiling
+import pybacktrack.util.reconstruction_cache as reconstruction_cache
 import pybacktrack.version
 from pybacktrack.well import Well
 import pygplates
@@ -102,6 +104,7 @@ def reconstruct_backtrack_bathymetry(
         rifting_period=None,
         exclude_distances_to_trenches_kms=None,
         region_plate_ids=None,
+        static_polygon_raster_grid_spacing=None,
         anchor_plate_id=0,
         output_positive_bathymetry_below_sea_level=False,
         output_rift_stretching_factors=False,
@@ -128,6 +131,7 @@ def reconstruct_backtrack_bathymetry(
         rifting_period=None,\
         exclude_distances_to_trenches_kms=None,\
         region_plate_ids=None,\
+        static_polygon_raster_grid_spacing=None,\
         anchor_plate_id=0,\
         output_positive_bathymetry_below_sea_level=False,\
         output_rift_stretching_factors=False,\
@@ -216,6 +220,10 @@ def reconstruct_backtrack_bathymetry(
     region_plate_ids : list of int, optional
         Plate IDs of one or more plates to restrict paleobathymetry reconstruction to.
         Defaults to global.
+    static_polygon_raster_grid_spacing : float, optional
+        If specified then plate IDs are assigned to the grid points using a raster of the static polygons with this grid spacing (in degrees),
+        which is faster than partitioning each grid point into the static polygons (and gives the same result).
+        The raster is cached on disk (see :class:`pybacktrack.StaticPolygonRaster`). Default is to partition each grid point.
     anchor_plate_id : int, optional
         The anchor plate id used when reconstructing paleobathymetry grid points. Defaults to zero.
     output_positive_bathymetry_below_sea_level : bool, optional
@@ -264,6 +272,7 @@ def reconstruct_backtrack_bathymetry(
         - Added optional ``youngest_time`` argument.
         - Added optional ``rifting_period`` argument.
         - Added optional ``output_rift_stretching_factors`` argument (and corresponding optional ``rift_stretching_factors`` return value).
+        - Added optional ``static_polygon_raster_grid_spacing`` argument.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
     """
    
@@ -323,8 +332,12 @@ def reconstruct_backtrack_bathymetry(
     #
     if num_cpus == 1:
         grid_samples = _assign_reconstruction_plate_ids(
-                grid_samples, static_polygon_filename, rotation_filenames, region_plate_ids)
+                grid_samples, static_polygon_filename, rotation_filenames, region_plate_ids, static_polygon_raster_grid_spacing)
     else:
+        # If using a static polygon raster then create it now (so that it's cached on disk, instead of each process creating it).
+        if static_polygon_raster_grid_spacing is not None:
+            reconstruction_cache.get_static_polygon_raster(static_polygon_filename, rotation_filenames, static_polygon_raster_grid_spacing)
+        
         # Divide the grid samples into a number of groups equal to twice the number of CPUs in case some groups of samples take longer to process than others.
         num_grid_sample_groups = 2 * num_cpus
         num_grid_samples_per_group = math.ceil(float(len(grid_samples)) / num_grid_sample_groups)
@@ -332,11 +345,12 @@ def reconstruct_backtrack_bathymetry(
         # Distribute the groups of grid samples across the multiprocessing pool.
         with multiprocessing.Pool(num_cpus) as pool:
             grid_samples_list = pool.map(
-                    partial(
+                    profiling.profile_pool_function(partial(
                         _assign_reconstruction_plate_ids,
                         static_polygon_filename=static_polygon_filename,
                         rotation_filenames=rotation_filenames,
-                        region_plate_ids=region_plate_ids),
+                        region_plate_ids=region_plate_ids,
+                        static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)),
                     (
                         grid_samples[
                             grid_sample_group_index * num_grid_samples_per_group :
@@ -344,6 +358,7 @@ def reconstruct_backtrack_bathymetry(
                                     for grid_sample_group_index in range(num_grid_sample_groups)
                     ),
                     1) # chunksize
+            profiling.join_pool(pool)
         
         # Merge output lists back into one list.
         grid_samples = list(itertools.chain.from_iterable(grid_samples_list))
@@ -362,11 +377,11 @@ def reconstruct_backtrack_bathymetry(
         # Distribute the groups of grid samples across the multiprocessing pool.
         with multiprocessing.Pool(num_cpus) as pool:
             grid_samples_list = pool.map(
-                    partial(
+                    profiling.profile_pool_function(partial(
                         _exclude_grid_samples_near_trenches,
                         trench_filename=pybacktrack.bundle_data.BUNDLE_TRENCHES_FILENAME,
                         subducting_boundary_filename=pybacktrack.bundle_data.BUNDLE_SUBDUCTING_BOUNDARIES_FILENAME,
-                        threshold_distances_to_trenches_kms=exclude_distances_to_trenches_kms),
+                        threshold_distances_to_trenches_kms=exclude_distances_to_trenches_kms)),
                     (
                         grid_samples[
                             grid_sample_group_index * num_grid_samples_per_group :
@@ -374,6 +389,7 @@ def reconstruct_backtrack_bathymetry(
                                     for grid_sample_group_index in range(num_grid_sample_groups)
                     ),
                     1) # chunksize
+            profiling.join_pool(pool)
         
         # Merge output lists back into one list.
         grid_samples = list(itertools.chain.from_iterable(grid_samples_list))
@@ -483,10 +499,18 @@ def reconstruct_backtrack_bathymetry(
         _sea_level = SeaLevel.create_from_model_or_bundled_model_name(sea_level_model)
         # Calculate sea level (relative to present day) that is an average over each time increment in the requested time period.
         # This is a dict indexed by time.
-        sea_levels = {time : _sea_level.get_average_level(time + time_increment, time) for time in time_range}
+        sea_levels = dict(zip(
+            time_range,
+            _sea_level.get_average_levels([time + time_increment for time in time_range], time_range).tolist()))
     else:
         sea_levels = None
 
+    # If the dynamic topography model uses the same static polygons and rotations as the reconstruction then the plate IDs
+    # assigned above can be re-used by the dynamic topography model (instead of partitioning the points again).
+    use_reconstruction_plate_ids_for_dynamic_topography = (
+        dynamic_topography_model and
+        _is_dynamic_topography_model_using_reconstruction_model(dynamic_topography_model, static_polygon_filename, rotation_filenames))
+    
     # If using a single CPU then just process all ocean/continent points in one call.
     if num_cpus == 1:
         oceanic_paleo_bathymetry = _reconstruct_backtrack_oceanic_bathymetry(
@@ -499,7 +523,9 @@ def reconstruct_backtrack_bathymetry(
                 sea_levels,
                 rotation_filenames,
                 anchor_plate_id,
-                output_positive_bathymetry_below_sea_level)
+                output_positive_bathymetry_below_sea_level,
+                use_reconstruction_plate_ids_for_dynamic_topography,
+                static_polygon_raster_grid_spacing)
         
         continental_paleo_bathymetry = _reconstruct_backtrack_continental_bathymetry(
                 continental_grid_samples,
@@ -511,7 +537,9 @@ def reconstruct_backtrack_bathymetry(
                 rotation_filenames,
                 anchor_plate_id,
                 output_positive_bathymetry_below_sea_level,
-                output_rift_stretching_factors)
+                output_rift_stretching_factors,
+                use_reconstruction_plate_ids_for_dynamic_topography,
+                static_polygon_raster_grid_spacing)
         # The return value of each call to '_reconstruct_backtrack_continental_bathymetry()' can be a 2-tuple (adding rift stretching factors).
         if output_rift_stretching_factors:
             continental_paleo_bathymetry, rift_stretching_factors = continental_paleo_bathymetry
@@ -534,7 +562,7 @@ def reconstruct_backtrack_bathymetry(
     # Distribute the groups of oceanic points across the multiprocessing pool.
     with multiprocessing.Pool(num_cpus) as pool:
         oceanic_paleo_bathymetry_dict_list = pool.map(
-                partial(
+                profiling.profile_pool_function(partial(
                     _reconstruct_backtrack_oceanic_bathymetry,
                     time_range=time_range,
                     ocean_age_to_depth_model=ocean_age_to_depth_model,
@@ -544,7 +572,9 @@ def reconstruct_backtrack_bathymetry(
                     sea_levels=sea_levels,
                     rotation_filenames=rotation_filenames,
                     anchor_plate_id=anchor_plate_id,
-                    output_positive_bathymetry_below_sea_level=output_positive_bathymetry_below_sea_level),
+                    output_positive_bathymetry_below_sea_level=output_positive_bathymetry_below_sea_level,
+                    use_reconstruction_plate_ids_for_dynamic_topography=use_reconstruction_plate_ids_for_dynamic_topography,
+                    static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)),
                 (
                     oceanic_grid_samples[
                         oceanic_grid_sample_group_index * num_oceanic_grid_samples_per_group :
@@ -552,6 +582,7 @@ def reconstruct_backtrack_bathymetry(
                                 for oceanic_grid_sample_group_index in range(num_oceanic_grid_sample_groups)
                 ),
                 1) # chunksize
+        profiling.join_pool(pool)
     
     # Divide the continental grid samples into a number of groups equal to twice the number of CPUs in case some groups of samples take longer to process than others.
     num_continental_grid_sample_groups = 2 * num_cpus
@@ -560,7 +591,7 @@ def reconstruct_backtrack_bathymetry(
     # Distribute the groups of continental points across the multiprocessing pool.
     with multiprocessing.Pool(num_cpus) as pool:
         continental_paleo_bathymetry_dict_list = pool.map(
-                partial(
+                profiling.profile_pool_function(partial(
                     _reconstruct_backtrack_continental_bathymetry,
                     time_range=time_range,
                     lithologies=lithologies,
@@ -570,7 +601,9 @@ def reconstruct_backtrack_bathymetry(
                     rotation_filenames=rotation_filenames,
                     anchor_plate_id=anchor_plate_id,
                     output_positive_bathymetry_below_sea_level=output_positive_bathymetry_below_sea_level,
-                    output_rift_stretching_factors=output_rift_stretching_factors),
+                    output_rift_stretching_factors=output_rift_stretching_factors,
+                    use_reconstruction_plate_ids_for_dynamic_topography=use_reconstruction_plate_ids_for_dynamic_topography,
+                    static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)),
                 (
                     continental_grid_samples[
                         continental_grid_sample_group_index * num_continental_grid_samples_per_group :
@@ -578,6 +611,7 @@ def reconstruct_backtrack_bathymetry(
                                 for continental_grid_sample_group_index in range(num_continental_grid_sample_groups)
                 ),
                 1) # chunksize
+        profiling.join_pool(pool)
     
     # The return value of each call to '_reconstruct_backtrack_continental_bathymetry()' can be a 2-tuple (adding rift stretching factors).
     if output_rift_stretching_factors:
@@ -608,21 +642,31 @@ def _reconstruct_backtrack_oceanic_bathymetry(
         sea_levels,
         rotation_filenames,
         anchor_plate_id,
-        output_positive_bathymetry_below_sea_level):
+        output_positive_bathymetry_below_sea_level,
+        use_reconstruction_plate_ids_for_dynamic_topography=False,
+        static_polygon_raster_grid_spacing=None):
 
     # Rotation model used to reconstruct the grid points.
     # Cache enough internal reconstruction trees so that we're not constantly recreating them as we move from point to point.
-    rotation_model = pygplates.RotationModel(rotation_filenames, reconstruction_tree_cache_size = len(time_range))
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=len(time_range))
     
     # Create time-dependent grid object for sampling dynamic topography (if requested).
     if dynamic_topography_model:
         # Gather all the sample positions and their ages.
-        longitudes, latitudes, ages = [], [], []
-        for longitude, latitude, _, _, _, age in oceanic_grid_samples:
+        longitudes, latitudes, ages, reconstruction_plate_ids = [], [], [], []
+        for longitude, latitude, _, _, reconstruction_plate_id, age in oceanic_grid_samples:
             longitudes.append(longitude)
             latitudes.append(latitude)
             ages.append(age)
-        dynamic_topography_model = DynamicTopography.create_from_model_or_bundled_model_name(dynamic_topography_model, longitudes, latitudes, ages)
+            reconstruction_plate_ids.append(reconstruction_plate_id)
+        dynamic_topography_model = DynamicTopography.create_from_model_or_bundled_model_name(
+            dynamic_topography_model, longitudes, latitudes, ages,
+            # Avoid partitioning the sample points again if the plate IDs already assigned to them can be used...
+            reconstruction_plate_id=reconstruction_plate_ids if use_reconstruction_plate_ids_for_dynamic_topography else None,
+            static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)
 
         # Pre-calculate dynamic topography for all decompaction times (including present day) and all ocean sample points.
         # At each time we have a list of dynamic topographies (one per ocean sample point) which is stored in a dictionary (keyed by time).
@@ -659,8 +703,19 @@ def _reconstruct_backtrack_oceanic_bathymetry(
         present_day_decompacted_well = well.decompact(0.0)
         present_day_tectonic_subsidence = present_day_water_depth + present_day_decompacted_well.get_sediment_isostatic_correction()
 
-        # Present-day tectonic subsidence calculated from age-to-depth model.
-        present_day_tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(age, ocean_age_to_depth_model)
+        # Decompaction times in the requested time range that don't exceed the age of ocean crust (bottom age of well).
+        decompaction_times = [decompaction_time for decompaction_time in time_range if decompaction_time <= age]
+        
+        # Tectonic subsidence calculated from age-to-depth model at present day and at the age of the ocean basin at each
+        # decompaction time (converting all ages in a single vectorized call, rather than one call per time).
+        #
+        # Note: We use the model's dense precomputed age-to-depth table (if it's expensive to evaluate) since we're converting
+        #       ages for every ocean grid point.
+        tectonic_subsidences_from_model = age_to_depth.convert_age_to_depth(
+            [age] + [age - decompaction_time for decompaction_time in decompaction_times],
+            ocean_age_to_depth_model,
+            tabulated=True).tolist()
+        present_day_tectonic_subsidence_from_model = tectonic_subsidences_from_model[0]
         
         # There will be a difference between unloaded water depth and subsidence based on age-to-depth model.
         # Assume this offset is constant for all ages and use it to adjust the subsidence obtained from age-to-depth model for other ages.
@@ -672,21 +727,13 @@ def _reconstruct_backtrack_oceanic_bathymetry(
         
         present_day_location = pygplates.PointOnSphere(latitude, longitude)
         
-        for decompaction_time in time_range:
-            # If the decompaction time has exceeded the age of ocean crust (bottom age of well) then we're finished with current well.
-            # That is, the current time exceeded the age grid value. Which means the ocean crust at the current point has been reconstructed
-            # back prior to the time it was created. So we're finished with it (because the remaining times in the loop are even older).
-            if decompaction_time > age:
-                break
-
-            # Decompact at the current time.
-            decompacted_well = well.decompact(decompaction_time)
-
-            # Age of the ocean basin at location when it's decompacted to the current decompaction age.
-            paleo_age_of_crust_at_decompaction_time = age - decompaction_time
-            
-            # Use age-to-depth model to lookup depth given the age.
-            tectonic_subsidence_from_model = age_to_depth.convert_age_to_depth(paleo_age_of_crust_at_decompaction_time, ocean_age_to_depth_model)
+        # Note that we only iterate over decompaction times that don't exceed the age grid value.
+        # Otherwise the ocean crust at the current point would be reconstructed back prior to the time it was created.
+        #
+        # Decompact at all decompaction times together (each time starts with the decompacted thickness of the previous time).
+        decompacted_wells = well.decompact_multiple_ages(decompaction_times)
+        for decompaction_time, decompacted_well, tectonic_subsidence_from_model in zip(
+                decompaction_times, decompacted_wells, tectonic_subsidences_from_model[1:]):
             
             # We add in the constant offset between the age-to-depth model (at age of well) and unloaded water depth at present day.
             decompacted_well.tectonic_subsidence = tectonic_subsidence_from_model + tectonic_subsidence_model_adjustment
@@ -736,11 +783,16 @@ def _reconstruct_backtrack_continental_bathymetry(
         rotation_filenames,
         anchor_plate_id,
         output_positive_bathymetry_below_sea_level,
-        output_rift_stretching_factors):
+        output_rift_stretching_factors,
+        use_reconstruction_plate_ids_for_dynamic_topography=False,
+        static_polygon_raster_grid_spacing=None):
 
     # Rotation model used to reconstruct the grid points.
     # Cache enough internal reconstruction trees so that we're not constantly recreating them as we move from point to point.
-    rotation_model = pygplates.RotationModel(rotation_filenames, reconstruction_tree_cache_size = len(time_range))
+    rotation_model = reconstruction_cache.get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id,
+        reconstruction_tree_cache_size=len(time_range))
     
     # Use integral rift start ages when caching dynamic topography to avoid an excessive number of dynamic topography samples
     # (which can happen since the rift start ages are linearly filtered from rift start age grid and can therefore have many different values).
@@ -750,14 +802,19 @@ def _reconstruct_backtrack_continental_bathymetry(
     # Create time-dependent grid object for sampling dynamic topography (if requested).
     if dynamic_topography_model:
         # Gather all the sample positions and their ages.
-        longitudes, latitudes, ages = [], [], []
+        longitudes, latitudes, ages, reconstruction_plate_ids = [], [], [], []
         dynamic_topography_rift_start_ages = set()
-        for longitude, latitude, _, _, _, _, _, rift_start_age, _ in continental_grid_samples:
+        for longitude, latitude, _, _, reconstruction_plate_id, _, _, rift_start_age, _ in continental_grid_samples:
             longitudes.append(longitude)
             latitudes.append(latitude)
             ages.append(rift_start_age)
+            reconstruction_plate_ids.append(reconstruction_plate_id)
             dynamic_topography_rift_start_ages.add(get_dynamic_topography_rift_start_age(rift_start_age))
-        dynamic_topography_model = DynamicTopography.create_from_model_or_bundled_model_name(dynamic_topography_model, longitudes, latitudes, ages)
+        dynamic_topography_model = DynamicTopography.create_from_model_or_bundled_model_name(
+            dynamic_topography_model, longitudes, latitudes, ages,
+            # Avoid partitioning the sample points again if the plate IDs already assigned to them can be used...
+            reconstruction_plate_id=reconstruction_plate_ids if use_reconstruction_plate_ids_for_dynamic_topography else None,
+            static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing)
 
         # Pre-calculate dynamic topography for all decompaction times (including present day) and all continent sample points.
         # At each time we have a list of dynamic topographies (one per continent sample point) which is stored in a dictionary (keyed by time).
@@ -785,7 +842,10 @@ def _reconstruct_backtrack_continental_bathymetry(
     if output_rift_stretching_factors:
         rift_stretching_factors = []
 
-    # Iterate over the *continental* grid samples.
+    # First iterate over the *continental* grid samples to find their present day tectonic subsidences
+    # (so that we can then estimate the rifting stretching factors of all grid samples in a single call).
+    wells = []
+    present_day_tectonic_subsidences = []
     for grid_sample_index, (longitude, latitude, present_day_total_sediment_thickness, present_day_water_depth, reconstruction_plate_id, age, present_day_crustal_thickness, rift_start_age, rift_end_age) in enumerate(continental_grid_samples):
         
         # Create a well at the current grid sample location with a single stratigraphic layer of total sediment thickness
@@ -817,12 +877,29 @@ def _reconstruct_backtrack_continental_bathymetry(
             # so we can see how much subsidence between those two times is due to stretching and thermal subsidence.
             # Dynamic topography is elevation but we want depth (subsidence) so add (instead of subtract).
             present_day_tectonic_subsidence += dynamic_topography_at_present_day - dynamic_topography_at_rift_start
-
-        # Attempt to estimate rifting stretching factor (beta) that generates the present day tectonic subsidence.
-        rift_beta, subsidence_residual = rifting.estimate_beta(
-            present_day_tectonic_subsidence,
-            present_day_crustal_thickness,
-            rift_end_age)
+        
+        wells.append(well)
+        present_day_tectonic_subsidences.append(present_day_tectonic_subsidence)
+    
+    # Attempt to estimate rifting stretching factor (beta) that generates the present day tectonic subsidence
+    # of each grid sample (all grid samples are estimated together in a single vectorized call).
+    #
+    # Note: We use the precomputed beta inversion tables (one per integer rift end age) since there are many grid samples.
+    if continental_grid_samples:
+        rift_betas, subsidence_residuals = rifting.estimate_beta(
+            present_day_tectonic_subsidences,
+            [continental_grid_sample[6] for continental_grid_sample in continental_grid_samples],  # present day crustal thicknesses
+            [continental_grid_sample[8] for continental_grid_sample in continental_grid_samples],  # rift end ages
+            tabulated=True)
+        rift_betas = rift_betas.tolist()
+        subsidence_residuals = subsidence_residuals.tolist()
+    
+    # Iterate over the *continental* grid samples again (now that we have their rifting stretching factors).
+    for grid_sample_index, (longitude, latitude, present_day_total_sediment_thickness, present_day_water_depth, reconstruction_plate_id, age, present_day_crustal_thickness, rift_start_age, rift_end_age) in enumerate(continental_grid_samples):
+        
+        well = wells[grid_sample_index]
+        rift_beta = rift_betas[grid_sample_index]
+        subsidence_residual = subsidence_residuals[grid_sample_index]
         
         # Skip the current grid sample if the rifting stretching factor (beta) estimate results in a
         # tectonic subsidence inaccuracy (at present day) exceeding this amount (in metres).
@@ -837,24 +914,31 @@ def _reconstruct_backtrack_continental_bathymetry(
             # Add the estimated rifting stretching factor (beta) and its present day location to the list.
             rift_stretching_factors.append((longitude, latitude, rift_beta))
         
+        # If we have dynamic topography then get dynamic topography at rift start.
+        if dynamic_topography:
+            dynamic_topography_at_rift_start = dynamic_topography[get_dynamic_topography_rift_start_age(rift_start_age)][grid_sample_index]
+        
         # Initial (pre-rift) crustal thickness is beta times present day crustal thickness.
         pre_rift_crustal_thickness = rift_beta * present_day_crustal_thickness
         
         present_day_location = pygplates.PointOnSphere(latitude, longitude)
         
-        for decompaction_time in time_range:
-            # If the decompaction time has exceeded the age of continental crust then we're finished with current well.
-            # That is, the current time exceeded the begin time of static polygon. Which means the continental crust at the current point has been
-            # reconstructed back prior to the time it was created. So we're finished with it (because the remaining times in the loop are even older).
-            if decompaction_time > age:
-                break
-
-            # Decompact at the current time.
-            decompacted_well = well.decompact(decompaction_time)
-
-            # Calculate rifting subsidence at decompaction time.
-            decompacted_well.tectonic_subsidence = rifting.total_subsidence(
-                    rift_beta, pre_rift_crustal_thickness, decompaction_time, rift_end_age, rift_start_age)
+        # Decompaction times in the requested time range that don't exceed the age of continental crust (begin time of static polygon).
+        decompaction_times = [decompaction_time for decompaction_time in time_range if decompaction_time <= age]
+        
+        # Calculate rifting subsidence at all decompaction times (in a single vectorized call).
+        tectonic_subsidences = rifting.total_subsidence(
+                rift_beta, pre_rift_crustal_thickness, decompaction_times, rift_end_age, rift_start_age).tolist()
+        
+        # Note that we only iterate over decompaction times that don't exceed the age of continental crust.
+        # Otherwise the continental crust at the current point would be reconstructed back prior to the time it was created.
+        #
+        # Decompact at all decompaction times together (each time starts with the decompacted thickness of the previous time).
+        decompacted_wells = well.decompact_multiple_ages(decompaction_times)
+        for decompaction_time, decompacted_well, tectonic_subsidence in zip(decompaction_times, decompacted_wells, tectonic_subsidences):
+
+            # Rifting subsidence at decompaction time.
+            decompacted_well.tectonic_subsidence = tectonic_subsidence
         
             # If we have dynamic topography then add in the difference at current decompaction time compared to rift start.
             if dynamic_topography:
@@ -895,36 +979,77 @@ def _reconstruct_backtrack_continental_bathymetry(
         return paleo_bathymetry
 
 
+def _is_dynamic_topography_model_using_reconstruction_model(
+        dynamic_topography_model,
+        static_polygon_filename,
+        rotation_filenames):
+    """
+    Returns True if the dynamic topography model (bundled model name or user-provided 3-tuple) uses the same
+    static polygons file and rotation files as the reconstruction model (in which case the same plate IDs get assigned to points).
+    """
+    
+    if isinstance(dynamic_topography_model, str):
+        _, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames = DynamicTopography.get_bundled_model(dynamic_topography_model)
+    else:
+        _, dynamic_topography_static_polygon_filename, dynamic_topography_rotation_filenames = dynamic_topography_model
+    
+    def normalise_filenames(filenames):
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        return [os.path.normcase(os.path.realpath(filename)) for filename in filenames]
+    
+    return (normalise_filenames(dynamic_topography_static_polygon_filename) == normalise_filenames(static_polygon_filename) and
+            normalise_filenames(dynamic_topography_rotation_filenames) == normalise_filenames(rotation_filenames))
+
+
 def _assign_reconstruction_plate_ids(
         grid_samples,
         static_polygon_filename,
         rotation_filenames,
-        region_plate_ids=None):
-    
-    # Static polygons partitioner used to assign plate IDs to the grid points.
-    plate_partitioner = pygplates.PlatePartitioner(static_polygon_filename, rotation_filenames)
+        region_plate_ids=None,
+        static_polygon_raster_grid_spacing=None):
+    
+    # Find the plate ID and appearance age of the static polygon containing the present day location of each grid sample
+    # (or None if not in any plates, which shouldn't happen).
+    if static_polygon_raster_grid_spacing is not None:
+        # Use a raster of the static polygons (only grid samples near static polygon boundaries are partitioned exactly).
+        static_polygon_raster = reconstruction_cache.get_static_polygon_raster(
+            static_polygon_filename, rotation_filenames, static_polygon_raster_grid_spacing)
+        plate_ids, appearance_ages = static_polygon_raster.partition_points(
+            [grid_sample[0] for grid_sample in grid_samples],
+            [grid_sample[1] for grid_sample in grid_samples])
+        partitions = [(int(plate_id), float(appearance_age)) if plate_id >= 0 else None
+                      for plate_id, appearance_age in zip(plate_ids, appearance_ages)]
+    else:
+        # Static polygons partitioner used to assign plate IDs to the grid points.
+        plate_partitioner = reconstruction_cache.get_plate_partitioner(static_polygon_filename, rotation_filenames)
+        
+        partitions = []
+        for grid_sample in grid_samples:
+            longitude, latitude = grid_sample[0], grid_sample[1]
+            present_day_location = pygplates.PointOnSphere(latitude, longitude)
+            partitioning_plate = plate_partitioner.partition_point(present_day_location)
+            if partitioning_plate:
+                # The plate ID and appearance age of the partitioning polygon (static polygon covering this point).
+                partitioning_plate_appearance_age, _ = partitioning_plate.get_feature().get_valid_time()
+                partitions.append((partitioning_plate.get_feature().get_reconstruction_plate_id(), partitioning_plate_appearance_age))
+            else:
+                partitions.append(None)
 
     updated_grid_samples = []
-    for grid_sample in grid_samples:
-        # Find the plate ID of the static polygon containing the present day location (or zero if not in any plates, which shouldn't happen).
-        longitude, latitude = grid_sample[0], grid_sample[1]
-        present_day_location = pygplates.PointOnSphere(latitude, longitude)
-        partitioning_plate = plate_partitioner.partition_point(present_day_location)
-        if not partitioning_plate:
+    for grid_sample, partition in zip(grid_samples, partitions):
+        if partition is None:
             # Not contained by any plates. Shouldn't happen since static polygons have global coverage,
             # but might if there's tiny cracks between polygons.
             continue
 
-        reconstruction_plate_id = partitioning_plate.get_feature().get_reconstruction_plate_id()
+        reconstruction_plate_id, partitioning_plate_appearance_age = partition
 
         # If any regions were specified then skip any grid samples outside all specified regions.
         if region_plate_ids:
             if reconstruction_plate_id not in region_plate_ids:
                 # Skip current grid sample.
                 continue
-
-        # The appearance age of the partitioning polygon (static polygon covering this point).
-        partitioning_plate_appearance_age, _ = partitioning_plate.get_feature().get_valid_time()
         
         # Append the assigned reconstruction plate ID and the partitioning polygon appearance age to the grid sample.
         updated_grid_sample = tuple(grid_sample) + (reconstruction_plate_id, partitioning_plate_appearance_age)
@@ -1397,16 +1522,17 @@ def write_bathymetry_grids(
         # Distribute writing of each grid to a different CPU.
         with multiprocessing.Pool(num_cpus) as pool:
             pool.map(
-                    partial(
+                    profiling.profile_pool_function(partial(
                         _write_paleo_bathymetry_grid_multiprocessing,
                         grid_spacing=grid_spacing_degrees,
                         grid_filename_format=paleo_bathymetry_grid_filename_format,
-                        output_xyz=output_xyz),
+                        output_xyz=output_xyz)),
                     (
                         (paleo_bathymetry_at_reconstruction_time, reconstruction_time)
                             for reconstruction_time, paleo_bathymetry_at_reconstruction_time in paleo_bathymetry.items()
                     ),
                     1) # chunksize
+            profiling.join_pool(pool)
 
 
 def reconstruct_backtrack_bathymetry_and_write_grids(
@@ -1430,6 +1556,7 @@ def reconstruct_backtrack_bathymetry_and_write_grids(
         rifting_period=None,
         exclude_distances_to_trenches_kms=None,
         region_plate_ids=None,
+        static_polygon_raster_grid_spacing=None,
         anchor_plate_id=0,
         output_positive_bathymetry_below_sea_level=False,
         output_xyz=False,
@@ -1459,6 +1586,7 @@ def reconstruct_backtrack_bathymetry_and_write_grids(
         rifting_period=None,\
         exclude_distances_to_trenches_kms=None,\
         region_plate_ids=None,\
+        static_polygon_raster_grid_spacing=None,\
         anchor_plate_id=0,\
         output_positive_bathymetry_below_sea_level=False,\
         output_xyz=False,\
@@ -1557,6 +1685,10 @@ def reconstruct_backtrack_bathymetry_and_write_grids(
     region_plate_ids : list of int, optional
         Plate IDs of one or more plates to restrict paleobathymetry reconstruction to.
         Defaults to global.
+    static_polygon_raster_grid_spacing : float, optional
+        If specified then plate IDs are assigned to the grid points using a raster of the static polygons with this grid spacing (in degrees),
+        which is faster than partitioning each grid point into the static polygons (and gives the same result).
+        The raster is cached on disk (see :class:`pybacktrack.StaticPolygonRaster`). Default is to partition each grid point.
     anchor_plate_id : int, optional
         The anchor plate id used when reconstructing paleobathymetry grid points. Defaults to zero.
     output_positive_bathymetry_below_sea_level : bool, optional
@@ -1602,6 +1734,7 @@ def reconstruct_backtrack_bathymetry_and_write_grids(
         - ``output_file_prefix`` can alternatively be a template string.
         - Added optional ``output_file_decimal_places_in_time`` argument.
         - Added optional ``output_rift_stretching_factor_grid_filename`` argument.
+        - Added optional ``static_polygon_raster_grid_spacing`` argument.
         - Some arguments (after ``*``) are now keyword-**only** (ie, can no longer be specified as positional arguments).
     """
 
@@ -1631,6 +1764,7 @@ def reconstruct_backtrack_bathymetry_and_write_grids(
         rifting_period=rifting_period,
         exclude_distances_to_trenches_kms=exclude_distances_to_trenches_kms,
         region_plate_ids=region_plate_ids,
+        static_polygon_raster_grid_spacing=static_polygon_raster_grid_spacing,
         anchor_plate_id=anchor_plate_id,
         output_positive_bathymetry_below_sea_level=output_positive_bathymetry_below_sea_level,
         output_rift_stretching_factors=output_rift_stretching_factors,
@@ -1779,6 +1913,13 @@ def main():
             dest='region_plate_ids',
             help='Plate IDs of one or more plates to restrict paleobathymetry reconstruction to. Defaults to global.')
     
+    parser.add_argument('--static_polygon_raster_grid_spacing', type=parse_positive_float,
+            metavar='GRID_SPACING_DEGREES',
+            help='Assign plate IDs to grid points using a raster of the static polygons with this grid spacing (in degrees), '
+                 'which is faster than partitioning each grid point into the static polygons (and gives the same result). '
+                 'The raster is cached on disk (and can be created ahead of time with "python -m pybacktrack.util.static_polygon_raster_cli"). '
+                 'Default is to partition each grid point.')
+    
     parser.add_argument('-et', '--exclude_distances_to_trenches_kms', type=parse_non_negative_float, nargs=2,
             metavar=('SUBDUCTING_DISTANCE_KMS', 'OVERRIDING_DISTANCE_KMS'),
             help='The two distances to present-day trenches (on subducting and overriding sides, in that order) '
@@ -1992,11 +2133,25 @@ def main():
              'If this identifier is detected, then each filename is generated by replacing all occurrences of the time identifier with the time. '
              'For both methods of generating filenames, time is formatted to a number of decimal places determined by "--output_file_decimal_places_in_time".')
     
+    # Optionally profile the script, and trace the system commands it calls (including in any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    parser.add_argument(
+        '--trace_system_commands', action='store_true',
+        help='Print a summary of the system commands (such as GMT) called by the script (including those called by any worker processes when using multiple CPUs) when the script finishes.')
+    
     #
     # Parse command-line options.
     #
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
+    # Start tracing system commands (if requested). A summary is printed when the script exits.
+    if args.trace_system_commands:
+        start_system_command_trace(print_summary_at_exit=True)
+    
     #
     # Do any necessary post-processing/validation of parsed options.
     #
@@ -2055,6 +2210,7 @@ def main():
         rifting_period=args.rifting_period,
         exclude_distances_to_trenches_kms=args.exclude_distances_to_trenches_kms,
         region_plate_ids=args.region_plate_ids,
+        static_polygon_raster_grid_spacing=args.static_polygon_raster_grid_spacing,
         anchor_plate_id=args.anchor_plate_id,
         output_positive_bathymetry_below_sea_level=args.output_positive_bathymetry_below_sea_level,
         output_xyz=args.output_xyz,
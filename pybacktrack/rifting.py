@@ -26,7 +26,6 @@
 
 import math
 import numpy as np
-from scipy.optimize import minimize_scalar
 import sys
 
 
@@ -109,25 +108,40 @@ def total_subsidence(
     
     Parameters
     ----------
-    beta : float
+    beta : float or array_like of float
         Stretching factor.
-    pre_rift_crustal_thickness : float
+    pre_rift_crustal_thickness : float or array_like of float
         Initial crustal thickness prior to rifting (in metres).
-    time : float
+    time : float or array_like of float
         Time to calculate subsidence (in My).
-    rift_end_time : float
+    rift_end_time : float or array_like of float
         Time at which rifting ended (in My).
-    rift_start_time : float, optional
+    rift_start_time : float or array_like of float, optional
         Time at which rifting started (in My).
         If not specified then assumes initial (non-thermal) subsidence happens instantaneously at ``rift_end_time``.
         Defaults to ``rift_end_time``.
     
     Returns
     -------
-    float
+    float or numpy.ndarray
         Total subsidence (in metres).
+        If any argument is an array then returns an array (the arguments are broadcast against each other).
+    
+    Raises
+    ------
+    ValueError
+        If ``rift_start_time`` is younger than ``rift_end_time`` (when ``time`` is prior to ``rift_end_time``).
+    
+    Notes
+    -----
+    .. versionchanged:: 1.5
+        All arguments can be arrays (eg, to calculate subsidence at many times and/or locations in a single call).
     """
     
+    if (np.ndim(beta) or np.ndim(pre_rift_crustal_thickness) or np.ndim(time) or np.ndim(rift_end_time) or
+        np.ndim(rift_start_time)):
+        return _total_subsidence_array(beta, pre_rift_crustal_thickness, time, rift_end_time, rift_start_time)
+    
     if time <= rift_end_time:
         # Initial rifting plus subsequent thermal subsidence.
         #
@@ -175,35 +189,107 @@ def total_subsidence(
         return syn_rift_subsidence(partial_rift_beta, pre_rift_crustal_thickness)
 
 
+def _total_subsidence_array(
+        beta,
+        pre_rift_crustal_thickness,
+        time,
+        rift_end_time,
+        rift_start_time=None):
+    """
+    Same as 'total_subsidence()' except arguments are arrays (broadcast against each other), and returns an array.
+    """
+    
+    if rift_start_time is None:
+        beta, pre_rift_crustal_thickness, time, rift_end_time = np.broadcast_arrays(
+            *(np.asarray(array, dtype=float) for array in (beta, pre_rift_crustal_thickness, time, rift_end_time)))
+    else:
+        beta, pre_rift_crustal_thickness, time, rift_end_time, rift_start_time = np.broadcast_arrays(
+            *(np.asarray(array, dtype=float) for array in (beta, pre_rift_crustal_thickness, time, rift_end_time, rift_start_time)))
+    
+    # Subsidence is zero prior to rifting.
+    subsidence = np.zeros(beta.shape)
+    
+    # Initial rifting plus subsequent thermal subsidence.
+    #
+    # Note that this includes 'time == rift_end_time' (see 'total_subsidence()').
+    after_rift_end = time <= rift_end_time
+    subsidence[after_rift_end] = (
+        syn_rift_subsidence(beta[after_rift_end], pre_rift_crustal_thickness[after_rift_end]) +
+        post_rift_subsidence(beta[after_rift_end], rift_end_time[after_rift_end] - time[after_rift_end]))
+    
+    # If rift start time is not specified then assume rifting happened instantaneously (so no subsidence prior to rift end).
+    if rift_start_time is None:
+        return subsidence
+    
+    before_rift_end = ~after_rift_end
+    if np.any(rift_start_time[before_rift_end] < rift_end_time[before_rift_end]):
+        raise ValueError('Rift start time must not be younger than rift end time.')
+    
+    # Partial syn-rift subsidence during rifting (using a constant strain rate over the rifting period, see 'total_subsidence()').
+    #
+    # Note that times prior to rift start are excluded (which also avoids divide by zero when 'rift_start_time == rift_end_time').
+    during_rifting = before_rift_end & (time < rift_start_time)
+    strain_rate = np.log(beta[during_rifting]) / (rift_start_time[during_rifting] - rift_end_time[during_rifting])
+    partial_rift_beta = np.exp(strain_rate * (rift_start_time[during_rifting] - time[during_rifting]))
+    subsidence[during_rifting] = syn_rift_subsidence(partial_rift_beta, pre_rift_crustal_thickness[during_rifting])
+    
+    return subsidence
+
+
 def estimate_beta(
         present_day_subsidence,
         present_day_crustal_thickness,
-        rift_end_time):
+        rift_end_time,
+        *,
+        tabulated=False):
     """
     Estimate the stretching factor (beta).
     
     Parameters
     ----------
-    present_day_subsidence : float
+    present_day_subsidence : float or array_like of float
         The (sediment-free) subsidence at present day (in metres).
-    present_day_crustal_thickness : float
+    present_day_crustal_thickness : float or array_like of float
         The crustal thickness at present day (in metres).
-    rift_end_time : float
+    rift_end_time : float or array_like of float
         The time that rifting ended (in My).
+    tabulated : bool, optional
+        Whether to interpolate precomputed tables of present day subsidence versus beta (one table per integer rift end time)
+        instead of solving for beta. Only used if any argument is an array. Defaults to ``False``.
     
     Returns
     -------
-    beta : float
+    beta : float or numpy.ndarray
         The estimated stretching factor.
-    residual : float
+    residual : float or numpy.ndarray
         The inaccuracy between present day subsidence and subsidence calculated using the estimated stretching factor (beta).
     
     Notes
     -----
     Stretching factor (beta) is calculated by minimizing difference between actual subsidence and
     subsidence calculated from beta (both at present day).
+    
+    If any argument is an array then the stretching factors of all points (the arguments are broadcast against each other)
+    are estimated together, and arrays of stretching factors and residuals are returned.
+    This is much faster than estimating each point separately. Each point first finds the smallest stretching factor at which
+    the subsidence crosses the present day subsidence (by sampling a coarse range of stretching factors), and then refines it
+    using Newton's method (safeguarded by bisection). If the subsidence never crosses the present day subsidence then the
+    stretching factor with the smallest residual is found instead (using a golden-section search).
+    
+    If ``tabulated`` is ``True`` (and any argument is an array) then each beta is instead interpolated from tables of present day subsidence
+    versus beta, that are built for each integer rift end time (the first time they're needed). Each point interpolates between the tables of the
+    integer rift end times on either side of its rift end time, and then refines beta with a few Newton iterations at its actual rift end time.
+    If the resulting residual exceeds 0.1 millimetres (or the point is outside the range of the tables) then beta is solved for as above.
+    
+    .. versionchanged:: 1.5
+        All arguments can be arrays (to estimate many stretching factors in a single call). Added ``tabulated`` argument.
     """
     
+    if np.ndim(present_day_subsidence) or np.ndim(present_day_crustal_thickness) or np.ndim(rift_end_time):
+        if tabulated:
+            return _estimate_beta_from_inversion_tables(present_day_subsidence, present_day_crustal_thickness, rift_end_time)
+        return _estimate_beta_array(present_day_subsidence, present_day_crustal_thickness, rift_end_time)
+    
     # Objective function for SciPy minimization.
     def objective_func(beta):
         # Initial (pre-rift) crustal thickness is beta times present day crustal thickness.
@@ -230,6 +316,9 @@ def estimate_beta(
     #
     # Note: It seems SciPy "minimize_scalar()" works a lot better than "minimize()" in this situation.
     #       Well, for some subsidence/thickness values anyway.
+    #
+    # Note: Import here (rather than at module level) since SciPy is slow to import.
+    from scipy.optimize import minimize_scalar
     res = minimize_scalar(
         objective_func,
         bounds=(min_beta, max_beta),
@@ -239,3 +328,344 @@ def estimate_beta(
     # Return estimated beta and the minimum residual between present day subsidence and
     # subsidence calculated using the estimated beta.
     return res['x'], res['fun']
+
+
+# Number of stretching factors (beta) sampled (per point) to find an initial bracket of the present day subsidence.
+_ESTIMATE_BETA_NUM_BRACKET_SAMPLES = 64
+# Maximum number of Newton/bisection (or golden-section) iterations used to refine each stretching factor (beta).
+_ESTIMATE_BETA_MAX_ITERATIONS = 60
+# Iterations stop when all stretching factors (beta) are refined to within this tolerance.
+_ESTIMATE_BETA_TOLERANCE = 1e-10
+
+
+def _estimate_beta_array(
+        present_day_subsidence,
+        present_day_crustal_thickness,
+        rift_end_time):
+    """
+    Same as 'estimate_beta()' except arguments are arrays (broadcast against each other), and returns arrays of betas and residuals.
+    """
+    
+    present_day_subsidence, present_day_crustal_thickness, rift_end_time = np.broadcast_arrays(
+        *(np.asarray(array, dtype=float) for array in (present_day_subsidence, present_day_crustal_thickness, rift_end_time)))
+    shape = present_day_subsidence.shape
+    present_day_subsidence = present_day_subsidence.ravel()
+    present_day_crustal_thickness = present_day_crustal_thickness.ravel()
+    rift_end_time = rift_end_time.ravel()
+    
+    # Same limits on range of beta values as 'estimate_beta()'.
+    min_beta = np.ones(present_day_subsidence.shape)
+    max_beta = _y_l / present_day_crustal_thickness
+    
+    # Thermal subsidence (at present day) is 'beta/pi * sin(pi/beta)' times this.
+    post_rift_subsidence_scale = _present_day_post_rift_subsidence_scale(rift_end_time)
+    
+    # The difference between subsidence (at present day) calculated from beta and the actual present day subsidence,
+    # and its derivative with respect to beta.
+    #
+    # Note: 'beta' and the returned arrays have the same shape as 'indices' (which index into the points).
+    def subsidence_difference(beta, indices):
+        return _present_day_subsidence_difference(
+            beta, present_day_crustal_thickness[indices], post_rift_subsidence_scale[indices], present_day_subsidence[indices])
+    
+    def subsidence_difference_derivative(beta, indices):
+        return _present_day_subsidence_derivative(
+            beta, present_day_crustal_thickness[indices], post_rift_subsidence_scale[indices])
+    
+    all_indices = np.arange(len(present_day_subsidence))
+    
+    # Sample the subsidence difference over a coarse range of betas (for all points at once).
+    bracket_fractions = np.linspace(0.0, 1.0, _ESTIMATE_BETA_NUM_BRACKET_SAMPLES)
+    sample_betas = min_beta[:, np.newaxis] + (max_beta - min_beta)[:, np.newaxis] * bracket_fractions
+    sample_differences = subsidence_difference(sample_betas, all_indices[:, np.newaxis])
+    
+    # Find the first sign change (smallest beta) of each point (if any).
+    sign_changes = np.signbit(sample_differences[:, :-1]) != np.signbit(sample_differences[:, 1:])
+    has_sign_change = np.any(sign_changes, axis=1)
+    first_sign_change = np.argmax(sign_changes, axis=1)
+    
+    betas = np.empty(len(present_day_subsidence))
+    
+    #
+    # Points with a bracketed root: Newton's method safeguarded by bisection.
+    #
+    bracketed_indices = all_indices[has_sign_change]
+    if len(bracketed_indices):
+        lower = sample_betas[bracketed_indices, first_sign_change[bracketed_indices]]
+        upper = sample_betas[bracketed_indices, first_sign_change[bracketed_indices] + 1]
+        lower_difference = sample_differences[bracketed_indices, first_sign_change[bracketed_indices]]
+        beta = 0.5 * (lower + upper)
+        for _ in range(_ESTIMATE_BETA_MAX_ITERATIONS):
+            difference = subsidence_difference(beta, bracketed_indices)
+            # Shrink the bracket (keeping the root inside it).
+            same_sign_as_lower = np.signbit(difference) == np.signbit(lower_difference)
+            lower = np.where(same_sign_as_lower, beta, lower)
+            lower_difference = np.where(same_sign_as_lower, difference, lower_difference)
+            upper = np.where(same_sign_as_lower, upper, beta)
+            # Newton step (falling back to bisection if it leaves the bracket).
+            derivative = subsidence_difference_derivative(beta, bracketed_indices)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton_beta = beta - difference / derivative
+            next_beta = np.where((newton_beta > lower) & (newton_beta < upper), newton_beta, 0.5 * (lower + upper))
+            converged = np.abs(next_beta - beta) <= _ESTIMATE_BETA_TOLERANCE * np.maximum(1.0, beta)
+            beta = next_beta
+            if np.all(converged):
+                break
+        betas[bracketed_indices] = beta
+    
+    #
+    # Points without a bracketed root: minimize the absolute subsidence difference using a golden-section search
+    # (in the interval surrounding the sampled beta with the smallest absolute difference).
+    #
+    unbracketed_indices = all_indices[~has_sign_change]
+    if len(unbracketed_indices):
+        nearest_sample = np.argmin(np.abs(sample_differences[unbracketed_indices]), axis=1)
+        lower = sample_betas[unbracketed_indices, np.maximum(nearest_sample - 1, 0)]
+        upper = sample_betas[unbracketed_indices, np.minimum(nearest_sample + 1, _ESTIMATE_BETA_NUM_BRACKET_SAMPLES - 1)]
+        inverse_golden_ratio = (math.sqrt(5.0) - 1.0) / 2.0
+        for _ in range(_ESTIMATE_BETA_MAX_ITERATIONS):
+            left = upper - inverse_golden_ratio * (upper - lower)
+            right = lower + inverse_golden_ratio * (upper - lower)
+            left_is_smaller = (np.abs(subsidence_difference(left, unbracketed_indices)) <
+                               np.abs(subsidence_difference(right, unbracketed_indices)))
+            upper = np.where(left_is_smaller, right, upper)
+            lower = np.where(left_is_smaller, lower, left)
+            if np.all(upper - lower <= _ESTIMATE_BETA_TOLERANCE * np.maximum(1.0, upper)):
+                break
+        betas[unbracketed_indices] = 0.5 * (lower + upper)
+    
+    # The residuals between present day subsidence and subsidence calculated using the estimated betas.
+    residuals = np.abs(subsidence_difference(betas, all_indices))
+    
+    return betas.reshape(shape), residuals.reshape(shape)
+
+
+def _present_day_post_rift_subsidence_scale(rift_end_time):
+    """
+    Thermal subsidence at present day (for rifting that ended at 'rift_end_time') is 'beta/pi * sin(pi/beta)' times this.
+    
+    See 'post_rift_subsidence()'.
+    """
+    
+    E0 = 4 * _y_l * _rhoM * _alpha_v * _Tm / ((np.pi ** 2) * (_rhoM - _rhoW))
+    tau = (_y_l ** 2) / ((np.pi ** 2) * _kappa)
+    return E0 * (1 - np.exp(-(np.asarray(rift_end_time) * 365 * 24 * 3600 * 1e6) / tau))
+
+
+def _present_day_subsidence_difference(
+        beta,
+        present_day_crustal_thickness,
+        post_rift_subsidence_scale,
+        present_day_subsidence):
+    """
+    The difference between total subsidence at present day calculated from 'beta' and the actual present day subsidence.
+    
+    All arguments are arrays (broadcast against each other).
+    """
+    
+    # Initial (pre-rift) crustal thickness is beta times present day crustal thickness.
+    pre_rift_crustal_thickness = beta * present_day_crustal_thickness
+    return (syn_rift_subsidence(beta, pre_rift_crustal_thickness) +
+            post_rift_subsidence_scale * (beta / np.pi) * np.sin(np.pi / beta) -
+            present_day_subsidence)
+
+
+def _present_day_subsidence_derivative(
+        beta,
+        present_day_crustal_thickness,
+        post_rift_subsidence_scale):
+    """
+    Derivative (with respect to 'beta') of total subsidence at present day.
+    
+    All arguments are arrays (broadcast against each other).
+    """
+    
+    # Derivative of syn-rift subsidence (with pre-rift crustal thickness 'u = beta * c').
+    c = present_day_crustal_thickness
+    u = beta * c
+    a = (_rhoM - _rhoC) / _y_l
+    k = _alpha_v * _Tm / (2.0 * _y_l)
+    b = _alpha_v * _Tm * _rhoM / 2.0
+    d = _rhoM * (1 - _alpha_v * _Tm) - _rhoW
+    syn_rift_derivative = (_y_l / d) * (
+        (a * u * (1 - k * u) - b) / (beta * beta) +
+        (1 - 1 / beta) * a * c * (1 - 2 * k * u))
+    
+    # Derivative of post-rift subsidence.
+    post_rift_derivative = post_rift_subsidence_scale / np.pi * (np.sin(np.pi / beta) - (np.pi / beta) * np.cos(np.pi / beta))
+    
+    return syn_rift_derivative + post_rift_derivative
+
+
+#
+# Stretching factor (beta) inversion tables.
+#
+# For a given present day crustal thickness and rift end time, the present day subsidence is an increasing function of beta
+# (except for a small dip below zero subsidence near beta=1 for thin crust). So it can be inverted by interpolating a table
+# of present day subsidence versus beta.
+#
+# There is one table per integer rift end time. Each table has a row per crustal thickness (in '_INVERSION_TABLE_CRUSTAL_THICKNESSES')
+# and a column per fraction of the range of beta values [1, max_beta] of the row (where max_beta depends on crustal thickness).
+#
+
+# Present day crustal thicknesses (in metres) of the rows of each inversion table.
+_INVERSION_TABLE_CRUSTAL_THICKNESSES = np.linspace(1000.0, 100000.0, 100)
+# Fractions of the range of beta values [1, max_beta] of the columns of each inversion table.
+_INVERSION_TABLE_BETA_FRACTIONS = np.linspace(0.0, 1.0, 129)
+# Number of Newton iterations used to refine each stretching factor (beta) interpolated from the inversion tables.
+_INVERSION_TABLE_NUM_NEWTON_ITERATIONS = 3
+# An interpolated (and refined) stretching factor (beta) is only accepted if its residual (in metres) is less than this.
+# Otherwise the stretching factor is estimated without the inversion tables.
+_INVERSION_TABLE_MAX_RESIDUAL = 1e-4
+
+# Inversion tables indexed by integer rift end time.
+#
+# Note: These are only cached in memory (not on disk) since building a table is about as fast as loading it from disk.
+_inversion_tables = {}
+
+
+def _get_inversion_table(integer_rift_end_time):
+    """
+    Return the inversion table for an integer rift end time, building it if necessary.
+    
+    Returns 3-tuple (betas, subsidences, increasing_start_columns) where 'betas' and 'subsidences' have a row per crustal thickness and
+    a column per beta fraction, and 'increasing_start_columns' contains (for each row) the first column where subsidence starts increasing
+    (after any dip below zero).
+    """
+    
+    inversion_table = _inversion_tables.get(integer_rift_end_time)
+    if inversion_table is not None:
+        return inversion_table
+    
+    crustal_thicknesses = _INVERSION_TABLE_CRUSTAL_THICKNESSES[:, np.newaxis]
+    max_betas = _y_l / crustal_thicknesses
+    betas = 1.0 + _INVERSION_TABLE_BETA_FRACTIONS[np.newaxis, :] * (max_betas - 1.0)
+    
+    subsidences = _present_day_subsidence_difference(
+        betas,
+        crustal_thicknesses,
+        _present_day_post_rift_subsidence_scale(float(integer_rift_end_time)),
+        0.0)
+    
+    # Subsidence is increasing after its minimum (which is at beta=1 unless there's a dip below zero for thin crust).
+    increasing_start_columns = np.argmin(subsidences, axis=1)
+    
+    inversion_table = betas, subsidences, increasing_start_columns
+    _inversion_tables[integer_rift_end_time] = inversion_table
+    return inversion_table
+
+
+def _invert_inversion_table(
+        inversion_table,
+        present_day_subsidence,
+        present_day_crustal_thickness):
+    """
+    Interpolate beta from an inversion table at arrays of present day subsidences and crustal thicknesses.
+    
+    Returns an array of betas (with NaN where the subsidence is outside the increasing range of subsidences in the table).
+    """
+    
+    table_betas, table_subsidences, increasing_start_columns = inversion_table
+    num_rows, num_columns = table_subsidences.shape
+    
+    # Rows bracketing each crustal thickness (and the interpolation weight between them).
+    row_spacing = _INVERSION_TABLE_CRUSTAL_THICKNESSES[1] - _INVERSION_TABLE_CRUSTAL_THICKNESSES[0]
+    row_positions = (present_day_crustal_thickness - _INVERSION_TABLE_CRUSTAL_THICKNESSES[0]) / row_spacing
+    lower_rows = np.clip(np.floor(row_positions).astype(int), 0, num_rows - 2)
+    row_weights = row_positions - lower_rows
+    
+    betas = np.zeros(present_day_subsidence.shape)
+    for rows, weights in ((lower_rows, 1.0 - row_weights), (lower_rows + 1, row_weights)):
+        # Binary search (within the increasing part of each row) for the columns bracketing each subsidence.
+        lower_columns = increasing_start_columns[rows]
+        upper_columns = np.full(rows.shape, num_columns - 1)
+        outside_table = ((present_day_subsidence < table_subsidences[rows, lower_columns]) |
+                         (present_day_subsidence > table_subsidences[rows, upper_columns]))
+        while np.any(upper_columns - lower_columns > 1):
+            middle_columns = (lower_columns + upper_columns) // 2
+            below_subsidence = table_subsidences[rows, middle_columns] <= present_day_subsidence
+            lower_columns = np.where(below_subsidence, middle_columns, lower_columns)
+            upper_columns = np.where(below_subsidence, upper_columns, middle_columns)
+        
+        # Linearly interpolate beta between the bracketing columns.
+        lower_subsidences = table_subsidences[rows, lower_columns]
+        upper_subsidences = table_subsidences[rows, upper_columns]
+        column_weights = np.divide(
+            present_day_subsidence - lower_subsidences,
+            upper_subsidences - lower_subsidences,
+            out=np.zeros(present_day_subsidence.shape),
+            where=(upper_subsidences > lower_subsidences))
+        row_betas = table_betas[rows, lower_columns] + column_weights * (table_betas[rows, upper_columns] - table_betas[rows, lower_columns])
+        
+        betas += weights * np.where(outside_table, np.nan, row_betas)
+    
+    return betas
+
+
+def _estimate_beta_from_inversion_tables(
+        present_day_subsidence,
+        present_day_crustal_thickness,
+        rift_end_time):
+    """
+    Same as 'estimate_beta()' except uses inversion tables (and arguments are arrays, broadcast against each other).
+    
+    Points that cannot be accurately inverted using the tables are estimated using '_estimate_beta_array()'.
+    """
+    
+    present_day_subsidence, present_day_crustal_thickness, rift_end_time = np.broadcast_arrays(
+        *(np.asarray(array, dtype=float) for array in (present_day_subsidence, present_day_crustal_thickness, rift_end_time)))
+    shape = present_day_subsidence.shape
+    present_day_subsidence = present_day_subsidence.ravel()
+    present_day_crustal_thickness = present_day_crustal_thickness.ravel()
+    rift_end_time = rift_end_time.ravel()
+    
+    betas = np.full(present_day_subsidence.shape, np.nan)
+    
+    # Only use the tables for points inside the range of table crustal thicknesses, with positive subsidence
+    # (since negative subsidence can have two solutions due to the dip below zero for thin crust).
+    use_tables = ((present_day_crustal_thickness >= _INVERSION_TABLE_CRUSTAL_THICKNESSES[0]) &
+                  (present_day_crustal_thickness <= _INVERSION_TABLE_CRUSTAL_THICKNESSES[-1]) &
+                  (present_day_subsidence > 0.0) &
+                  (rift_end_time >= 0.0) &
+                  np.isfinite(rift_end_time))
+    
+    # Interpolate beta between the tables of the integer rift end times on either side of each rift end time.
+    integer_rift_end_times = np.floor(np.where(use_tables, rift_end_time, 0.0)).astype(int)
+    for integer_rift_end_time in np.unique(integer_rift_end_times[use_tables]):
+        indices = np.nonzero(use_tables & (integer_rift_end_times == integer_rift_end_time))[0]
+        weights = rift_end_time[indices] - integer_rift_end_time
+        betas[indices] = (
+            (1.0 - weights) * _invert_inversion_table(
+                _get_inversion_table(integer_rift_end_time), present_day_subsidence[indices], present_day_crustal_thickness[indices]) +
+            weights * _invert_inversion_table(
+                _get_inversion_table(integer_rift_end_time + 1), present_day_subsidence[indices], present_day_crustal_thickness[indices]))
+    
+    # Refine the interpolated betas using a few Newton iterations at the actual (non-integer) rift end times.
+    interpolated_indices = np.nonzero(np.isfinite(betas))[0]
+    interpolated_betas = betas[interpolated_indices]
+    post_rift_subsidence_scale = _present_day_post_rift_subsidence_scale(rift_end_time[interpolated_indices])
+    max_betas = _y_l / present_day_crustal_thickness[interpolated_indices]
+    for _ in range(_INVERSION_TABLE_NUM_NEWTON_ITERATIONS):
+        differences = _present_day_subsidence_difference(
+            interpolated_betas, present_day_crustal_thickness[interpolated_indices], post_rift_subsidence_scale, present_day_subsidence[interpolated_indices])
+        derivatives = _present_day_subsidence_derivative(
+            interpolated_betas, present_day_crustal_thickness[interpolated_indices], post_rift_subsidence_scale)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton_betas = interpolated_betas - differences / derivatives
+        # Keep beta within its allowed range [1, max_beta] (and ignore any non-finite Newton steps).
+        interpolated_betas = np.where(np.isfinite(newton_betas), np.clip(newton_betas, 1.0, max_betas), interpolated_betas)
+    betas[interpolated_indices] = interpolated_betas
+    
+    residuals = np.full(present_day_subsidence.shape, np.inf)
+    residuals[interpolated_indices] = np.abs(_present_day_subsidence_difference(
+        interpolated_betas, present_day_crustal_thickness[interpolated_indices], post_rift_subsidence_scale, present_day_subsidence[interpolated_indices]))
+    
+    # Fall back to estimating beta without the tables for points that could not be accurately inverted using the tables.
+    fallback_indices = np.nonzero(~(residuals <= _INVERSION_TABLE_MAX_RESIDUAL))[0]
+    if len(fallback_indices):
+        betas[fallback_indices], residuals[fallback_indices] = _estimate_beta_array(
+            present_day_subsidence[fallback_indices],
+            present_day_crustal_thickness[fallback_indices],
+            rift_end_time[fallback_indices])
+    
+    return betas.reshape(shape), residuals.reshape(shape)
@@ -25,16 +25,11 @@
 #####################################################################################
 
 
+import numpy as np
 import pybacktrack.bundle_data
 import pybacktrack.util.interpolate
-import math
+from pybacktrack.util.cache import get_files_key
 import os.path
-import scipy.integrate
-import warnings
-
-
-# Warn the user if the inaccuracy of average sea level exceeds this amount (in metres)...
-_MAX_SEA_LEVEL_ERROR = 1
 
 
 class SeaLevel(object):
@@ -53,7 +48,22 @@ class SeaLevel(object):
         """
         
         # Read the sea level curve sea_level=function(age) from sea level file.
-        self.sea_level_function, self.sea_level_times, _ = pybacktrack.util.interpolate.read_curve_function(sea_level_filename)
+        self.sea_level_function, self.sea_level_times, sea_levels = pybacktrack.util.interpolate.read_curve_function(sea_level_filename)
+        
+        # Sort the curve points by time (the sea level file is not required to be sorted).
+        #
+        # Use a stable sort so that any points with duplicate times (a discontinuity in the curve) retain their file order.
+        sort_indices = np.argsort(self.sea_level_times, kind='stable')
+        self._times = np.asarray(self.sea_level_times, dtype=float)[sort_indices]
+        self._levels = np.asarray(sea_levels, dtype=float)[sort_indices]
+        
+        # Since the sea level curve is piecewise linear its integral is exactly the trapezoidal rule.
+        #
+        # So precompute the cumulative integral (from the youngest time in the curve) at each curve point.
+        # Then the integral over any time period is just the difference of the cumulative integral
+        # (interpolated quadratically within a linear segment) at the begin and end times of that period.
+        self._cumulative_integrals = np.zeros(len(self._times))
+        self._cumulative_integrals[1:] = np.cumsum(0.5 * (self._levels[1:] + self._levels[:-1]) * np.diff(self._times))
     
     @staticmethod
     def create_from_bundled_model(sea_level_model_name):
@@ -109,11 +119,15 @@ class SeaLevel(object):
         Notes
         -----
         .. versionadded:: 1.4
+        
+        .. versionchanged:: 1.5
+           Sea level curve files are only read once (unless modified). Subsequent calls return the same (shared) sea level model.
         """
         
         # If a sea level *bundled model name* was specified then create it from a bundled sea level model.
         if sea_level_model_or_bundled_model_name in pybacktrack.bundle_data.BUNDLE_SEA_LEVEL_MODEL_NAMES:
-            return SeaLevel.create_from_bundled_model(sea_level_model_or_bundled_model_name)
+            sea_level_filename = pybacktrack.bundle_data.BUNDLE_SEA_LEVEL_MODELS[sea_level_model_or_bundled_model_name]
+            create_sea_level = lambda: SeaLevel.create_from_bundled_model(sea_level_model_or_bundled_model_name)
         else:
             # Otherwise we're expecting a user-provided sea level model (which should be a text file).
             def is_sea_level_model(sea_level_model):
@@ -125,7 +139,22 @@ class SeaLevel(object):
                     ', '.join(pybacktrack.bundle_data.BUNDLE_SEA_LEVEL_MODEL_NAMES)))
 
             # Create from specified sea level curve file.
-            return SeaLevel(sea_level_model_or_bundled_model_name)
+            sea_level_filename = sea_level_model_or_bundled_model_name
+            create_sea_level = lambda: SeaLevel(sea_level_model_or_bundled_model_name)
+        
+        # Return the cached sea level model if the sea level file has already been read (and has not been modified since).
+        #
+        # This avoids re-reading the sea level curve for every well (or every request in a long-running service).
+        sea_level_file_key = get_files_key(sea_level_filename)
+        if sea_level_file_key is None:
+            return create_sea_level()
+        
+        sea_level = _sea_level_file_cache.get(sea_level_file_key)
+        if sea_level is None:
+            sea_level = create_sea_level()
+            _sea_level_file_cache[sea_level_file_key] = sea_level
+        
+        return sea_level
 
     def get_average_level(self, begin_time, end_time):
         """get_average_level(begin_time, end_time)
@@ -155,44 +184,117 @@ class SeaLevel(object):
         However, if ``begin_time`` and ``end_time`` are equal then this just returns the interpolated sea level at that time
         (clamped to the nearest boundary if that time is outside the time range of the sea level model).
 
+        To average sea level over many time periods it is faster to call :meth:`get_average_levels` once.
+
         .. versionchanged:: 1.5
-            No longer returns zero when ``begin_time`` equals ``end_time``.
+            The following changes were made:
+
+            - No longer returns zero when ``begin_time`` equals ``end_time``.
+            - The sea level curve is integrated exactly (instead of numerically), so no longer warns about inaccurate integration.
         """
         
-        if end_time > begin_time:
+        return float(self.get_average_levels([begin_time], [end_time])[0])
+    
+    def get_average_levels(self, begin_times, end_times):
+        """get_average_levels(begin_times, end_times)
+        Return the average sea level over each of the specified time periods.
+        
+        Parameters
+        ----------
+        begin_times : sequence of float
+            The begin time (in Ma) of each time period. Each should be larger than (or equal to) its corresponding end time.
+        end_times : sequence of float
+            The end time (in Ma) of each time period. Each should be smaller than (or equal to) its corresponding begin time.
+            Should have the same length as ``begin_times``.
+        
+        Returns
+        -------
+        numpy.ndarray
+            Average sea level (in metres) over each time period.
+        
+        Raises
+        ------
+        ValueError
+            If ``begin_times`` and ``end_times`` have different lengths.
+        ValueError
+            If any end time is larger than its corresponding begin time.
+        
+        Notes
+        -----
+        This is the same as calling :meth:`get_average_level` for each time period, but is faster when there are many time periods.
+        
+        Since the sea level curve is piecewise linear, its integral over each time period is calculated exactly
+        (using a table of its cumulative integral computed when the sea level curve was loaded).
+        
+        .. versionadded:: 1.5
+        """
+        
+        begin_times = np.asarray(begin_times, dtype=float)
+        end_times = np.asarray(end_times, dtype=float)
+        if begin_times.shape != end_times.shape:
+            raise ValueError('Begin times and end times should have the same length.')
+        
+        if np.any(end_times > begin_times):
             raise ValueError('End time should not be larger than begin time.')
         
-        time_interval = begin_time - end_time
-        if time_interval == 0.0:
-            # Return interpolated sea level at the identical begin/end time.
-            return self.sea_level_function(begin_time)
-        
-        # Get the times of the points in the sea level curve that are within the time range.
-        # Passing these times to scipy.integrate.quad avoids warnings caused by the non-smooth
-        # changes in sea level curve at these points.
-        times = [time for time in self.sea_level_times if time <= begin_time and time >= end_time]
-        
-        # Integrate sea level curve over time interval.
-        sea_level_integral, sea_level_integral_error = scipy.integrate.quad(
-            self.sea_level_function,
-            end_time,
-            begin_time,
-            # Defaults to None if specified time period outside curve time range.
-            # Note that number of breaks (points) must not exceed 'limit'...
-            points=times if times else None,
-            # Minimum limit is 50 (happens if not enough times in specified time period) to help avoid
-            # "IntegrationWarning: The maximum number of subdivisions (2) has been achieved." where
-            # the '2' is from '2 * len(times)'...
-            limit=max(50, 2 * len(times)))
-        
-        # Average sea level over integrated interval.
-        average_sea_level = sea_level_integral / time_interval
-        
-        # Warn the user if average sea level is inaccurate.
-        average_sea_level_error = sea_level_integral_error / time_interval
-        if math.fabs(average_sea_level_error) > _MAX_SEA_LEVEL_ERROR:
-            warnings.warn('Unable to accurately integrate sea level curve over time period [{0}, {1}]. '
-                          'Average sea level will be inaccurate on the order of {2} metres. '.format(
-                              begin_time, end_time, math.fabs(average_sea_level_error)))
-        
-        return average_sea_level
+        time_intervals = begin_times - end_times
+        
+        # Integrate sea level curve over each time interval.
+        sea_level_integrals = self._get_cumulative_integrals(begin_times) - self._get_cumulative_integrals(end_times)
+        
+        # Average sea level over each integrated interval.
+        #
+        # However, if begin/end times are identical then return the interpolated sea level at that time
+        # (clamped to the boundary sea level if outside the time range of the sea level curve).
+        non_zero_intervals = (time_intervals != 0.0)
+        average_sea_levels = np.interp(begin_times, self._times, self._levels)
+        np.divide(sea_level_integrals, time_intervals, out=average_sea_levels, where=non_zero_intervals)
+        
+        return average_sea_levels
+    
+    def _get_cumulative_integrals(self, times):
+        """
+        Return the integral of the sea level curve from the youngest time in the curve to each time in 'times'.
+        
+        Outside the time range of the curve the sea level is clamped to the boundary sea level (like the sea level function).
+        """
+        
+        curve_times = self._times
+        curve_levels = self._levels
+        
+        # Index of the linear segment containing each time (found by binary search).
+        #
+        # Times before (after) the curve use the first (last) segment, but are clamped below.
+        num_segments = len(curve_times) - 1
+        segment_indices = np.clip(np.searchsorted(curve_times, times, side='right') - 1, 0, max(num_segments - 1, 0))
+        
+        # Clamp the times to the time range of the curve (the constant boundary sea levels are added back below).
+        clamped_times = np.clip(times, curve_times[0], curve_times[-1])
+        
+        # Integrate from the start of each segment to each (clamped) time.
+        segment_start_times = curve_times[segment_indices]
+        segment_start_levels = curve_levels[segment_indices]
+        delta_times = clamped_times - segment_start_times
+        if num_segments > 0:
+            segment_durations = curve_times[segment_indices + 1] - segment_start_times
+            # Avoid dividing by zero for any zero-length segments (duplicate times in the curve).
+            segment_slopes = np.divide(
+                curve_levels[segment_indices + 1] - segment_start_levels,
+                segment_durations,
+                out=np.zeros(segment_durations.shape),
+                where=(segment_durations != 0.0))
+        else:
+            # A single point curve has a constant sea level.
+            segment_slopes = np.zeros(delta_times.shape)
+        cumulative_integrals = (self._cumulative_integrals[segment_indices] +
+                                delta_times * (segment_start_levels + 0.5 * segment_slopes * delta_times))
+        
+        # Add the integral of the constant (clamped) boundary sea levels outside the time range of the curve.
+        cumulative_integrals += np.minimum(times - curve_times[0], 0.0) * curve_levels[0]
+        cumulative_integrals += np.maximum(times - curve_times[-1], 0.0) * curve_levels[-1]
+        
+        return cumulative_integrals
+
+
+# Sea level models read from sea level curve files (keyed by the path, size and modification time of the file).
+_sea_level_file_cache = {}
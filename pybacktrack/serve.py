@@ -0,0 +1,729 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Long-running local service that backtracks, backstrips and converts age to depth (with the loaded models kept in memory).
+
+:func:`pybacktrack.create_backtrack_server` creates a server listening on a localhost HTTP port (or a Unix domain socket).
+
+:func:`pybacktrack.send_backtrack_server_request` sends a request to a running server and returns its response.
+
+Running a single server avoids paying the cost of starting Python, importing pyBacktrack, parsing lithology files,
+loading rotation models and static polygons, reading sea level curves and building age-to-depth tables for each request
+(since these are all cached by the server process). Requests are handled concurrently by a pool of worker threads.
+"""
+
+
+import concurrent.futures
+import http.client
+import http.server
+import json
+import os
+import os.path
+import pybacktrack.bundle_data
+import pybacktrack.util.profiling as profiling
+import pybacktrack.version
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+
+# Default host and port of the HTTP server.
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Maximum size (in bytes) of a request body.
+_MAX_REQUEST_SIZE = 64 * 1024 * 1024
+
+
+class _RequestError(Exception):
+    # Raised for an invalid request (results in a 400 'Bad Request' response).
+    pass
+
+
+def create_backtrack_server(
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        *,
+        unix_socket=None,
+        num_workers=None,
+        preload=True):
+    """create_backtrack_server(host='127.0.0.1', port=8765, *, unix_socket=None, num_workers=None, preload=True)
+    Create a server that handles backtrack, backstrip and age-to-depth requests (sent as JSON over HTTP).
+
+    Parameters
+    ----------
+    host : str, optional
+        Host (interface) to listen on. Defaults to the localhost interface ``127.0.0.1``
+        (the server should not be exposed to other machines since requests can read and write local files).
+    port : int, optional
+        Port to listen on. Use ``0`` to listen on any free port (see ``server_address`` of the returned server).
+    unix_socket : str, optional
+        Listen on a Unix domain socket with this filename (instead of ``host`` and ``port``).
+        Any existing socket file is replaced.
+    num_workers : int, optional
+        Number of requests handled concurrently (by a pool of worker threads). Defaults to the number of CPUs.
+    preload : bool, optional
+        Whether to load the bundled rotation model, static polygons, lithologies and age-to-depth tables
+        before returning (otherwise they're loaded by the first request that uses them).
+
+    Returns
+    -------
+    socketserver.BaseServer
+        The server. Call its ``serve_forever()`` method to handle requests (until its ``shutdown()`` method is called
+        from another thread), and its ``server_close()`` method to close the socket and wait for pending requests to finish.
+
+    Notes
+    -----
+    The requests are:
+
+    - ``GET /health`` returns the server status (including the pyBacktrack version and number of cached reconstruction objects).
+    - ``POST /backtrack`` backtracks a well (see :func:`pybacktrack.backtrack_and_write_well`).
+    - ``POST /backstrip`` backstrips a well (see :func:`pybacktrack.backstrip_and_write_well`).
+    - ``POST /age_to_depth`` converts ocean basin ages to basement depths (see :func:`pybacktrack.convert_age_to_depth`).
+
+    The body of a ``backtrack`` or ``backstrip`` request is a JSON object containing either ``well_filename``, or ``well``
+    (the contents of a well file), and optionally any keyword arguments accepted by the corresponding function.
+    Decompacted columns are specified by name (such as ``["age", "decompacted_thickness", "water_depth"]``),
+    lithology files can be specified by their bundled short names (such as ``["primary", "extended"]``) and
+    the ocean age-to-depth model is specified by name (such as ``"GDH1"``), just like the command-line scripts.
+    The response is a JSON object containing ``decompacted_well`` (the contents of the decompacted output file) and,
+    if ``output_well`` was true in the request, ``amended_well`` (the contents of the amended well file).
+
+    The body of an ``age_to_depth`` request is a JSON object containing ``ages`` (a list) and optionally ``model``
+    (a model name such as ``"GDH1"``) and ``tabulated``. The response is a JSON object containing ``depths``.
+
+    An invalid request results in a response with status 400 and a JSON object containing ``error``.
+
+    .. versionadded:: 1.5
+    """
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError('Number of workers must be positive.')
+
+    if unix_socket is not None:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError('Unix domain sockets are not supported on this platform.')
+
+        # Remove any stale socket file (left by a server that did not exit cleanly).
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+        server = _UnixBacktrackServer(unix_socket, num_workers)
+    else:
+        server = _HTTPBacktrackServer((host, port), num_workers)
+
+    if preload:
+        _preload_models()
+
+    return server
+
+
+def send_backtrack_server_request(
+        path,
+        request=None,
+        *,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        unix_socket=None,
+        timeout=None):
+    """send_backtrack_server_request(path, request=None, *, host='127.0.0.1', port=8765, unix_socket=None, timeout=None)
+    Send a request to a server created by :func:`pybacktrack.create_backtrack_server` and return its response.
+
+    Parameters
+    ----------
+    path : str
+        The request path, such as ``'/backtrack'``, ``'/backstrip'``, ``'/age_to_depth'`` or ``'/health'``.
+    request : dict, optional
+        The request (sent as a JSON object in a ``POST`` request). If not specified then a ``GET`` request is sent.
+    host : str, optional
+        Host of the server.
+    port : int, optional
+        Port of the server.
+    unix_socket : str, optional
+        Filename of the Unix domain socket of the server (instead of ``host`` and ``port``).
+    timeout : float, optional
+        Timeout in seconds (defaults to no timeout).
+
+    Returns
+    -------
+    dict
+        The response.
+
+    Raises
+    ------
+    ValueError
+        If the server rejected the request (or failed to handle it).
+
+    .. versionadded:: 1.5
+    """
+
+    if unix_socket is not None:
+        connection = _UnixHTTPConnection(unix_socket, timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    try:
+        if request is None:
+            connection.request('GET', path)
+        else:
+            connection.request('POST', path, body=json.dumps(request).encode('utf-8'), headers={'Content-Type': 'application/json'})
+
+        http_response = connection.getresponse()
+        response = json.loads(http_response.read().decode('utf-8'))
+    finally:
+        connection.close()
+
+    if http_response.status != 200:
+        raise ValueError('Request "{0}" failed ({1}): {2}'.format(path, http_response.status, response.get('error')))
+
+    return response
+
+
+def serve(
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        *,
+        unix_socket=None,
+        num_workers=None):
+    """
+    Create a server (see :func:`pybacktrack.create_backtrack_server`) and handle requests until interrupted (used by the command-line script).
+    """
+
+    server = create_backtrack_server(host, port, unix_socket=unix_socket, num_workers=num_workers)
+
+    if unix_socket is not None:
+        print('Serving backtrack requests on Unix socket "{0}" using {1} worker(s).'.format(unix_socket, server.num_workers), file=sys.stderr)
+    else:
+        print('Serving backtrack requests on http://{0}:{1} using {2} worker(s).'.format(
+            server.server_address[0], server.server_address[1], server.num_workers), file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+#
+# Servers.
+#
+
+class _WorkerPoolMixIn(object):
+    """
+    Handle each request in a pool of worker threads (rather than in a new thread per request like 'socketserver.ThreadingMixIn').
+
+    This limits the number of requests handled concurrently (any others are queued).
+    """
+
+    def _create_worker_pool(self, num_workers):
+        self.num_workers = num_workers
+        self._worker_pool = concurrent.futures.ThreadPoolExecutor(num_workers, thread_name_prefix='pybacktrack_serve')
+        # Profile the requests handled by the worker threads (if profiling has been started).
+        self._process_request_function = profiling.profile_thread_function(self._process_request_in_worker)
+        self.start_time = time.time()
+
+    def process_request(self, request, client_address):
+        self._worker_pool.submit(self._process_request_function, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super(_WorkerPoolMixIn, self).server_close()
+        # Wait for the requests being handled to finish.
+        self._worker_pool.shutdown(wait=True)
+
+
+class _HTTPBacktrackServer(_WorkerPoolMixIn, http.server.HTTPServer):
+
+    # Avoid "address already in use" errors when restarting the server.
+    allow_reuse_address = True
+
+    def __init__(self, server_address, num_workers):
+        self._create_worker_pool(num_workers)
+        super(_HTTPBacktrackServer, self).__init__(server_address, _BacktrackRequestHandler)
+
+
+# Note: 'socketserver.UnixStreamServer' only exists on platforms supporting Unix domain sockets.
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixBacktrackServer(_WorkerPoolMixIn, socketserver.UnixStreamServer):
+
+        def __init__(self, server_address, num_workers):
+            self._create_worker_pool(num_workers)
+            super(_UnixBacktrackServer, self).__init__(server_address, _BacktrackRequestHandler)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix domain socket.
+    """
+
+    def __init__(self, unix_socket, timeout=None):
+        super(_UnixHTTPConnection, self).__init__('localhost', timeout=timeout)
+        self.unix_socket = unix_socket
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_socket)
+
+
+class _BacktrackRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    server_version = 'pyBacktrack/{0}'.format(pybacktrack.version.__version__)
+
+    # Keep connections alive (so a client can send many requests over one connection).
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_response(200, _get_health(self.server))
+        else:
+            self._send_response(404, {'error': 'Unknown request "{0}".'.format(self.path)})
+
+    def do_POST(self):
+        request_function = _REQUEST_FUNCTIONS.get(self.path)
+        if request_function is None:
+            # Discard the request body (so the connection can be re-used).
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self._send_response(404, {'error': 'Unknown request "{0}".'.format(self.path)})
+            return
+
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length > _MAX_REQUEST_SIZE:
+                # Don't read the request body (and close the connection since the body was not read).
+                self.close_connection = True
+                raise _RequestError('Request body exceeds {0} bytes.'.format(_MAX_REQUEST_SIZE))
+
+            try:
+                request = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            except ValueError as error:
+                raise _RequestError('Request body is not valid JSON: {0}'.format(error))
+            if not isinstance(request, dict):
+                raise _RequestError('Request body should be a JSON object.')
+
+            response = request_function(request)
+        except (_RequestError, ValueError, KeyError, TypeError, OSError) as error:
+            # Invalid requests (including invalid arguments, and missing files) are the client's fault.
+            self._send_response(400, {'error': str(error)})
+        except Exception as error:
+            self._send_response(500, {'error': '{0}: {1}'.format(type(error).__name__, error)})
+        else:
+            self._send_response(200, response)
+
+    def _send_response(self, status, response):
+        response_body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    def address_string(self):
+        # The client address of a Unix domain socket connection is not a (host, port) tuple.
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return self.server.server_address
+
+    def log_message(self, format, *args):
+        # Log requests to stderr (like the base class) but include the worker thread (since requests are handled concurrently).
+        sys.stderr.write('{0} [{1}] {2} {3}\n'.format(
+            self.address_string(),
+            self.log_date_time_string(),
+            threading.current_thread().name,
+            format % args))
+
+
+#
+# Requests.
+#
+
+def _get_health(server):
+    import pybacktrack.util.reconstruction_cache as reconstruction_cache
+
+    return {
+        'status': 'ok',
+        'version': pybacktrack.version.__version__,
+        'process_id': os.getpid(),
+        'uptime': time.time() - server.start_time,
+        'num_workers': server.num_workers,
+        'reconstruction_cache_size': reconstruction_cache.get_cache_size()}
+
+
+def _backtrack(request):
+    # Import here since it imports pygplates (and the server should start quickly without preloading).
+    import pybacktrack.backtrack as backtrack
+
+    # Arguments of 'backtrack_and_write_well()' that can be specified in a request (other than those converted below).
+    keyword_argument_names = (
+        'age_grid_filename',
+        'topography_filename',
+        'total_sediment_thickness_filename',
+        'crustal_thickness_filename',
+        'dynamic_topography_model',
+        'sea_level_model',
+        'base_lithology_name',
+        'output_rift_stretching_factor',
+        'rotation_filenames',
+        'static_polygon_filename',
+        'anchor_plate_id',
+        'well_bottom_age_column',
+        'well_bottom_depth_column',
+        'well_lithology_column')
+
+    keyword_arguments = _get_well_keyword_arguments(
+        request,
+        keyword_argument_names,
+        backtrack._DECOMPACTED_COLUMNS_DICT,
+        # Also accepted by the backtrack request (converted below)...
+        ('rifting_period', 'ocean_age_to_depth_model'))
+
+    return _decompact_well(request, backtrack.backtrack_and_write_well, keyword_arguments)
+
+
+def _backstrip(request):
+    # Import here since it imports pygplates (and the server should start quickly without preloading).
+    import pybacktrack.backstrip as backstrip
+
+    # Arguments of 'backstrip_and_write_well()' that can be specified in a request (other than those converted below).
+    keyword_argument_names = (
+        'total_sediment_thickness_filename',
+        'sea_level_model',
+        'base_lithology_name',
+        'rotation_filenames',
+        'static_polygon_filename',
+        'anchor_plate_id',
+        'well_bottom_age_column',
+        'well_bottom_depth_column',
+        'well_min_water_depth_column',
+        'well_max_water_depth_column',
+        'well_lithology_column')
+
+    keyword_arguments = _get_well_keyword_arguments(
+        request,
+        keyword_argument_names,
+        backstrip._DECOMPACTED_COLUMNS_DICT,
+        ())
+
+    return _decompact_well(request, backstrip.backstrip_and_write_well, keyword_arguments)
+
+
+def _age_to_depth(request):
+    import pybacktrack.age_to_depth as age_to_depth
+
+    _check_request_names(request, ('ages', 'model', 'tabulated'))
+
+    if 'ages' not in request:
+        raise _RequestError('Request should contain "ages".')
+
+    model = _get_age_to_depth_model(request.get('model'))
+    depths = age_to_depth.convert_age_to_depth(
+        [float(age) for age in request['ages']],
+        model,
+        tabulated=bool(request.get('tabulated', False)))
+
+    return {'depths': [float(depth) for depth in depths]}
+
+
+# Maps request paths to the functions handling them (each accepts a request dict and returns a response dict).
+_REQUEST_FUNCTIONS = {
+    '/backtrack': _backtrack,
+    '/backstrip': _backstrip,
+    '/age_to_depth': _age_to_depth,
+}
+
+
+def _get_well_keyword_arguments(request, keyword_argument_names, decompacted_columns_dict, extra_argument_names):
+    """
+    Convert the arguments in a backtrack or backstrip request to keyword arguments of 'backtrack_and_write_well()' or 'backstrip_and_write_well()'.
+    """
+
+    # Arguments converted below (or used by '_decompact_well()').
+    converted_argument_names = (
+        'well', 'well_filename', 'output_well', 'times',
+        'lithology_filenames', 'decompacted_columns', 'well_location') + tuple(extra_argument_names)
+
+    _check_request_names(request, keyword_argument_names + converted_argument_names)
+
+    keyword_arguments = dict((name, request[name]) for name in keyword_argument_names if name in request)
+
+    if request.get('times') is not None:
+        keyword_arguments['times'] = [float(time) for time in request['times']]
+
+    if 'lithology_filenames' in request:
+        from pybacktrack.lithology import bundled_lithology_filenames_dict
+
+        lithology_filenames = request['lithology_filenames']
+        if isinstance(lithology_filenames, str):
+            lithology_filenames = [lithology_filenames]
+        # A lithology filename can be the short name of a bundled lithology file (like the '-l' command-line option).
+        keyword_arguments['lithology_filenames'] = [
+            bundled_lithology_filenames_dict.get(lithology_filename.lower(), lithology_filename)
+                for lithology_filename in lithology_filenames]
+
+    if 'decompacted_columns' in request:
+        try:
+            keyword_arguments['decompacted_columns'] = [
+                decompacted_columns_dict[column_name] for column_name in request['decompacted_columns']]
+        except KeyError as error:
+            raise _RequestError('{0} is not a valid decompacted column name (should be one of {1}).'.format(
+                error, ', '.join(sorted(decompacted_columns_dict.keys()))))
+
+    if request.get('well_location') is not None:
+        keyword_arguments['well_location'] = tuple(request['well_location'])
+
+    if 'dynamic_topography_model' in request and isinstance(request['dynamic_topography_model'], list):
+        # A user-provided dynamic topography model is a 3-tuple (grid list filename, static polygon filename, rotation filenames).
+        keyword_arguments['dynamic_topography_model'] = tuple(request['dynamic_topography_model'])
+
+    if request.get('rifting_period') is not None:
+        keyword_arguments['rifting_period'] = tuple(request['rifting_period'])
+
+    if 'ocean_age_to_depth_model' in request:
+        keyword_arguments['ocean_age_to_depth_model'] = _get_age_to_depth_model(request['ocean_age_to_depth_model'])
+
+    return keyword_arguments
+
+
+def _decompact_well(request, decompact_and_write_well_function, keyword_arguments):
+    """
+    Decompact the well in a backtrack or backstrip request and return the contents of the output files as a response.
+    """
+
+    if ('well' in request) == ('well_filename' in request):
+        raise _RequestError('Request should contain either "well" (contents of a well file) or "well_filename".')
+
+    output_well = bool(request.get('output_well', False))
+
+    # Each request uses its own temporary directory (since requests are handled concurrently).
+    with tempfile.TemporaryDirectory(prefix='pybacktrack_serve_') as temporary_dir:
+        if 'well' in request:
+            well_filename = os.path.join(temporary_dir, 'well.txt')
+            with open(well_filename, 'w') as well_file:
+                well_file.write(request['well'])
+        else:
+            well_filename = request['well_filename']
+
+        decompacted_output_filename = os.path.join(temporary_dir, 'decompacted_well.txt')
+        ammended_well_output_filename = os.path.join(temporary_dir, 'amended_well.txt') if output_well else None
+
+        output = decompact_and_write_well_function(
+            decompacted_output_filename,
+            well_filename,
+            ammended_well_output_filename=ammended_well_output_filename,
+            **keyword_arguments)
+
+        response = {}
+
+        # There's no output if the well has no stratigraphic units.
+        if os.path.exists(decompacted_output_filename):
+            with open(decompacted_output_filename, 'r') as decompacted_output_file:
+                response['decompacted_well'] = decompacted_output_file.read()
+        else:
+            response['decompacted_well'] = ''
+
+        if output_well:
+            if os.path.exists(ammended_well_output_filename):
+                with open(ammended_well_output_filename, 'r') as ammended_well_output_file:
+                    response['amended_well'] = ammended_well_output_file.read()
+            else:
+                response['amended_well'] = ''
+
+        if keyword_arguments.get('output_rift_stretching_factor') and output:
+            # The rift stretching factor is None for oceanic wells.
+            rift_stretching_factor = output[2]
+            response['rift_stretching_factor'] = float(rift_stretching_factor) if rift_stretching_factor is not None else None
+
+    return response
+
+
+def _get_age_to_depth_model(model_name):
+    # Convert an age-to-depth model name (eg, "GDH1") to a model (the default model if not specified).
+    import pybacktrack.age_to_depth as age_to_depth
+
+    if model_name is None:
+        return age_to_depth.DEFAULT_MODEL
+
+    for model, name, _ in age_to_depth.ALL_MODELS:
+        if name == model_name:
+            return model
+
+    raise _RequestError('{0} is not a valid age-to-depth model name (should be one of {1}).'.format(
+        model_name, ', '.join(name for _, name, _ in age_to_depth.ALL_MODELS)))
+
+
+def _check_request_names(request, allowed_names):
+    # Reject unknown names (such as misspelt arguments, which would otherwise be silently ignored).
+    unknown_names = sorted(set(request.keys()) - set(allowed_names))
+    if unknown_names:
+        raise _RequestError('Unknown request argument(s): {0}.'.format(', '.join(unknown_names)))
+
+
+def _preload_models():
+    """
+    Load the bundled models that requests use by default (so the first request is not slower than subsequent requests).
+    """
+
+    import pybacktrack.age_to_depth as age_to_depth
+    from pybacktrack.lithology import read_lithologies_files
+    import pybacktrack.util.reconstruction_cache as reconstruction_cache
+
+    # Rotation model, static polygons and plate partitioner used to reconstruct well locations.
+    reconstruction_cache.get_rotation_model(pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES)
+    reconstruction_cache.get_plate_partitioner(
+        pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES)
+
+    # Lithologies.
+    read_lithologies_files(pybacktrack.bundle_data.BUNDLE_LITHOLOGY_FILENAMES)
+
+    # Age-to-depth tables (of models that are tabulated).
+    for model, _, _ in age_to_depth.ALL_MODELS:
+        age_to_depth.convert_age_to_depth(0.0, model, tabulated=True)
+
+
+def main():
+
+    __description__ = """Run a long-running local service that backtracks, backstrips and converts age to depth.
+
+    The service keeps the loaded rotation models, static polygons, lithologies, sea level curves, age-to-depth tables and
+    sampled grid values in memory (so they're only loaded once), and handles requests concurrently using a pool of workers.
+
+    Requests are sent as JSON objects over HTTP (on a localhost port, or on a Unix domain socket):
+
+        GET  /health        - returns the status of the service
+        POST /backtrack     - backtracks a well (returns the decompacted output file contents)
+        POST /backstrip     - backstrips a well (returns the decompacted output file contents)
+        POST /age_to_depth  - converts ocean basin ages to basement depths
+
+    For example, the following request backtracks a well file:
+
+        curl -d '{"well_filename": "well.txt", "decompacted_columns": ["age", "water_depth"]}' http://127.0.0.1:8765/backtrack
+
+    NOTE: The service can read and write any files accessible to it, so only listen on localhost (the default) or a Unix socket.
+
+    For example...
+
+    python -m pybacktrack.serve_cli --port 8765 --num_workers 4
+    """
+
+    import argparse
+    from pybacktrack.util.call_system_command import start_system_command_trace
+
+    def parse_positive_integer(value_string):
+        try:
+            value = int(value_string)
+        except ValueError:
+            raise argparse.ArgumentTypeError("%s is not an integer" % value_string)
+
+        if value <= 0:
+            raise argparse.ArgumentTypeError("%g is not a positive integer" % value)
+
+        return value
+
+    #
+    # Gather command-line options.
+    #
+
+    # The command-line parser.
+    parser = argparse.ArgumentParser(description=__description__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('--version', action='version', version=pybacktrack.version.__version__)
+
+    parser.add_argument(
+        '--host', type=str, default=DEFAULT_HOST,
+        help='Host (interface) to listen on. Defaults to "{0}".'.format(DEFAULT_HOST))
+    parser.add_argument(
+        '--port', type=int, default=DEFAULT_PORT,
+        help='Port to listen on. Defaults to {0}.'.format(DEFAULT_PORT))
+    parser.add_argument(
+        '--unix_socket', type=str, metavar='socket_filename',
+        help='Listen on a Unix domain socket with this filename (instead of a host and port).')
+    parser.add_argument(
+        '--num_workers', type=parse_positive_integer,
+        help='Number of requests handled concurrently. Defaults to the number of CPUs.')
+
+    # Optionally profile the service, and trace the system commands it calls.
+    profiling.add_profile_argument(parser)
+    parser.add_argument(
+        '--trace_system_commands', action='store_true',
+        help='Print a summary of the system commands (such as GMT) called by the service when it exits.')
+
+    #
+    # Parse command-line options.
+    #
+    args = parser.parse_args()
+
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    # The profile (including the requests handled by worker threads) is written when the service exits.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+
+    # Start tracing system commands (if requested). A summary is printed when the service exits.
+    if args.trace_system_commands:
+        start_system_command_trace(print_summary_at_exit=True)
+
+    serve(args.host, args.port, unix_socket=args.unix_socket, num_workers=args.num_workers)
+
+
+if __name__ == '__main__':
+
+    def warning_format(message, category, filename, lineno, file=None, line=None):
+        # return '{0}:{1}: {1}:{1}\n'.format(filename, lineno, category.__name__, message)
+        return '{0}: {1}\n'.format(category.__name__, message)
+
+    # Print the warnings without the filename and line number.
+    # Users are not going to want to see that.
+    warnings.formatwarning = warning_format
+    
+    #
+    # User should use 'serve_cli' module (instead of this module 'serve'), when executing as a script, to avoid Python 3 warning:
+    #
+    #   RuntimeWarning: 'pybacktrack.serve' found in sys.modules after import of package 'pybacktrack',
+    #                   but prior to execution of 'pybacktrack.serve'; this may result in unpredictable behaviour
+    #
+    # For more details see https://stackoverflow.com/questions/43393764/python-3-6-project-structure-leads-to-runtimewarning
+    #
+    # Importing this module (eg, 'import pybacktrack.serve') is fine though.
+    #
+    warnings.warn("Use 'python -m pybacktrack.serve_cli ...', instead of 'python -m pybacktrack.serve ...'.", DeprecationWarning)
+
+    try:
+        main()
+        sys.exit(0)
+    except Exception as exc:
+        print('ERROR: {0}'.format(exc), file=sys.stderr)
+        # Uncomment these to print traceback to location of raised exception.
+        # import traceback
+        # traceback.print_exc()
+        sys.exit(1)
@@ -28,6 +28,7 @@
 import argparse
 import math
 import pybacktrack.bundle_data
+import pybacktrack.util.profiling as profiling
 import pybacktrack.version
 from pybacktrack.util.interpolate import read_curve_function
 import sys
@@ -296,9 +297,16 @@ def main():
         metavar='output_filename',
         help='The output filename containing the converted "age" values (and associated depth values).')
     
+    # Optionally profile the script (and any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    
     # Parse command-line options.
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
     convert_stratigraphic_depth_to_age_files(
         args.input_filename,
         args.output_filename,
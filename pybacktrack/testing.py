@@ -0,0 +1,468 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Generate small synthetic inputs (grids, dynamic topography models, reconstruction models and wells) for tests and benchmarks.
+
+These do not need the (large) bundled grids, and are deterministic (the same inputs produce the same outputs).
+
+:func:`pybacktrack.testing.write_synthetic_grids` writes age, topography, total sediment thickness and crustal thickness grids.
+
+:func:`pybacktrack.testing.write_synthetic_reconstruction_model` writes a rotation file and a static polygon file.
+
+:func:`pybacktrack.testing.write_synthetic_dynamic_topography_model` writes a time series of dynamic topography grids.
+
+:func:`pybacktrack.testing.create_synthetic_well` creates a well with a chosen number of units and mix of lithologies.
+
+The synthetic Earth is simple. An ocean, centred on a north-south mid-ocean ridge along the prime meridian, separates two continents.
+The ocean opened at a constant rate, and so its crust is oldest (``SYNTHETIC_MAX_OCEANIC_AGE``) along the two continental margins at
+longitudes -``SYNTHETIC_OCEAN_HALF_WIDTH`` and +``SYNTHETIC_OCEAN_HALF_WIDTH``. Each continent has a shallow submerged shelf
+(covered in sediment) next to its margin. The western continent and ocean are on plate ``SYNTHETIC_WEST_PLATE_ID`` (fixed
+relative to the anchor plate), and the eastern ocean and continent are on plate ``SYNTHETIC_EAST_PLATE_ID``.
+
+.. note:: The synthetic grids are gridline-registered COARDS-compliant netCDF grids, and so can be sampled by GMT.
+          Since the builtin rift start/end grids do not match the synthetic Earth, specify a ``rifting_period`` when
+          reconstructing paleo bathymetry of the synthetic continental shelves.
+
+.. versionadded:: 1.5
+"""
+
+
+import math
+import numpy as np
+import os.path
+import pybacktrack.bundle_data
+from pybacktrack.lithology import read_lithologies_file
+from pybacktrack.well import Well
+
+
+# Age (in Ma) of the oldest synthetic oceanic crust (along both continental margins).
+SYNTHETIC_MAX_OCEANIC_AGE = 120.0
+
+# Longitude (in degrees) of the synthetic continental margins (either side of the mid-ocean ridge on the prime meridian).
+SYNTHETIC_OCEAN_HALF_WIDTH = 60.0
+
+# Plate IDs of the synthetic western plate (fixed relative to the anchor plate) and eastern plate.
+SYNTHETIC_WEST_PLATE_ID = 101
+SYNTHETIC_EAST_PLATE_ID = 201
+
+# Appearance age (in Ma) of the synthetic continents.
+SYNTHETIC_CONTINENT_AGE = 600.0
+
+# Lithologies (in the bundled primary lithologies file) randomly mixed into the units of synthetic wells by default.
+DEFAULT_SYNTHETIC_WELL_LITHOLOGY_NAMES = ('Shale', 'Sand', 'Limestone', 'Chalk', 'Clay', 'Silt', 'Dolomite', 'Mud')
+
+
+def write_synthetic_grids(
+        output_dir,
+        grid_spacing_degrees=1.0):
+    """write_synthetic_grids(output_dir, grid_spacing_degrees=1.0)
+    Write synthetic global age, topography, total sediment thickness and crustal thickness grids.
+
+    Parameters
+    ----------
+    output_dir : str
+        The directory to write the grids to (must exist).
+    grid_spacing_degrees : float, optional
+        The spacing of the grids (in degrees). Defaults to 1 degree.
+
+    Returns
+    -------
+    dict
+        The grid filenames keyed by ``age_grid_filename``, ``topography_filename``, ``total_sediment_thickness_filename``
+        and ``crustal_thickness_filename``.
+        These are the names of the grid arguments of :func:`pybacktrack.reconstruct_paleo_bathymetry`
+        (and :func:`pybacktrack.reconstruct_paleo_bathymetry_grids`), so the dict can be passed directly as keyword arguments.
+
+    Raises
+    ------
+    ValueError
+        If ``grid_spacing_degrees`` is negative or zero.
+
+    Notes
+    -----
+    The age grid is masked (NaN) on continental crust, and the total sediment thickness grid is masked on continental
+    crust above sea level. Grid values only vary with longitude, except the total sediment thickness which also decreases
+    towards the poles (so that samples are not all the same along each meridian).
+
+    .. versionadded:: 1.5
+    """
+
+    longitudes, latitudes = _get_grid_coordinates(grid_spacing_degrees)
+    lon_grid, lat_grid = np.meshgrid(longitudes, latitudes)
+
+    grid_filenames = {
+        'age_grid_filename': os.path.join(output_dir, 'age.nc'),
+        'topography_filename': os.path.join(output_dir, 'topography.nc'),
+        'total_sediment_thickness_filename': os.path.join(output_dir, 'total_sediment_thickness.nc'),
+        'crustal_thickness_filename': os.path.join(output_dir, 'crustal_thickness.nc'),
+    }
+
+    _write_grid(grid_filenames['age_grid_filename'], longitudes, latitudes, _synthetic_age(lon_grid), 'age', 'Myr')
+    _write_grid(grid_filenames['topography_filename'], longitudes, latitudes, _synthetic_topography(lon_grid), 'z', 'm')
+    _write_grid(grid_filenames['total_sediment_thickness_filename'], longitudes, latitudes,
+                _synthetic_total_sediment_thickness(lon_grid, lat_grid), 'z', 'm')
+    _write_grid(grid_filenames['crustal_thickness_filename'], longitudes, latitudes, _synthetic_crustal_thickness(lon_grid), 'z', 'm')
+
+    return grid_filenames
+
+
+def write_synthetic_reconstruction_model(
+        output_dir):
+    """write_synthetic_reconstruction_model(output_dir)
+    Write the rotations and static polygons of the synthetic Earth.
+
+    Parameters
+    ----------
+    output_dir : str
+        The directory to write the rotation file and static polygon file to (must exist).
+
+    Returns
+    -------
+    dict
+        The filenames keyed by ``rotation_filenames`` (a list containing the rotation filename) and ``static_polygon_filename``.
+        These are the names of the reconstruction model arguments of :func:`pybacktrack.reconstruct_paleo_bathymetry`
+        (and :func:`pybacktrack.reconstruct_paleo_bathymetry_grids`), so the dict can be passed directly as keyword arguments.
+
+    Notes
+    -----
+    The eastern plate moves away from the (fixed) western plate at a constant rate (about the north pole) since the
+    ocean started opening, such that the oceanic crust of both plates was created along the mid-ocean ridge.
+
+    There is one static polygon for each ocean (appearing at ``SYNTHETIC_MAX_OCEANIC_AGE``) and each continent
+    (appearing at ``SYNTHETIC_CONTINENT_AGE``). Points within one degree of the poles are not inside any static polygon.
+
+    .. versionadded:: 1.5
+    """
+
+    # Only import pygplates when needed (it's slow to import).
+    import pygplates
+
+    rotation_filename = os.path.join(output_dir, 'rotations.rot')
+    static_polygon_filename = os.path.join(output_dir, 'static_polygons.gpml')
+
+    # The eastern plate rotates westward (about the north pole) relative to the western plate going back in time until
+    # the ocean has closed (and remains there before then).
+    max_rotation_angle = 2 * SYNTHETIC_OCEAN_HALF_WIDTH
+    with open(rotation_filename, 'w') as rotation_file:
+        rotation_file.write('{0} 0.0 90.0 0.0 0.0 000 !Synthetic west plate\n'.format(SYNTHETIC_WEST_PLATE_ID))
+        rotation_file.write('{0} {1} 90.0 0.0 0.0 000 !Synthetic west plate\n'.format(SYNTHETIC_WEST_PLATE_ID, SYNTHETIC_CONTINENT_AGE))
+        rotation_file.write('{0} 0.0 90.0 0.0 0.0 {1} !Synthetic east plate\n'.format(SYNTHETIC_EAST_PLATE_ID, SYNTHETIC_WEST_PLATE_ID))
+        rotation_file.write('{0} {1} 90.0 0.0 {2} {3} !Synthetic east plate\n'.format(
+            SYNTHETIC_EAST_PLATE_ID, SYNTHETIC_MAX_OCEANIC_AGE, -max_rotation_angle, SYNTHETIC_WEST_PLATE_ID))
+        rotation_file.write('{0} {1} 90.0 0.0 {2} {3} !Synthetic east plate\n'.format(
+            SYNTHETIC_EAST_PLATE_ID, SYNTHETIC_CONTINENT_AGE, -max_rotation_angle, SYNTHETIC_WEST_PLATE_ID))
+
+    # Each static polygon spans less than 180 degrees of longitude (so its interior is unambiguous).
+    static_polygon_features = []
+    for min_lon, max_lon, plate_id, appearance_age, feature_type in (
+            (-180.0, -SYNTHETIC_OCEAN_HALF_WIDTH, SYNTHETIC_WEST_PLATE_ID, SYNTHETIC_CONTINENT_AGE, pygplates.FeatureType.gpml_closed_continental_boundary),
+            (-SYNTHETIC_OCEAN_HALF_WIDTH, 0.0, SYNTHETIC_WEST_PLATE_ID, SYNTHETIC_MAX_OCEANIC_AGE, pygplates.FeatureType.gpml_oceanic_crust),
+            (0.0, SYNTHETIC_OCEAN_HALF_WIDTH, SYNTHETIC_EAST_PLATE_ID, SYNTHETIC_MAX_OCEANIC_AGE, pygplates.FeatureType.gpml_oceanic_crust),
+            (SYNTHETIC_OCEAN_HALF_WIDTH, 180.0, SYNTHETIC_EAST_PLATE_ID, SYNTHETIC_CONTINENT_AGE, pygplates.FeatureType.gpml_closed_continental_boundary)):
+        static_polygon_features.append(
+            pygplates.Feature.create_reconstructable_feature(
+                feature_type,
+                pygplates.PolygonOnSphere(_get_lon_lat_box_boundary(min_lon, max_lon, -89.0, 89.0)),
+                valid_time=(appearance_age, pygplates.GeoTimeInstant.create_distant_future()),
+                reconstruction_plate_id=plate_id))
+    pygplates.FeatureCollection(static_polygon_features).write(static_polygon_filename)
+
+    return {
+        'rotation_filenames': [rotation_filename],
+        'static_polygon_filename': static_polygon_filename,
+    }
+
+
+def write_synthetic_dynamic_topography_model(
+        output_dir,
+        grid_spacing_degrees=1.0,
+        oldest_time=100.0,
+        time_increment=10.0,
+        *,
+        amplitude=500.0):
+    """write_synthetic_dynamic_topography_model(output_dir, grid_spacing_degrees=1.0, oldest_time=100.0, time_increment=10.0, *, amplitude=500.0)
+    Write a time series of synthetic global dynamic topography grids (in the mantle frame), and a grid list file.
+
+    Parameters
+    ----------
+    output_dir : str
+        The directory to write the grids, the grid list file and the synthetic reconstruction model to (must exist).
+    grid_spacing_degrees : float, optional
+        The spacing of the grids (in degrees). Defaults to 1 degree.
+    oldest_time : float, optional
+        The time (in Ma) of the oldest grid. Defaults to 100 Ma.
+    time_increment : float, optional
+        The time interval (in My) between grids. Defaults to 10 My.
+    amplitude : float, optional
+        The maximum absolute dynamic topography (in metres). Defaults to 500 metres.
+
+    Returns
+    -------
+    tuple
+        A 3-tuple of (grid list filename, static polygon filename, rotation filenames).
+        This can be specified as the dynamic topography model of :class:`pybacktrack.DynamicTopography`,
+        :func:`pybacktrack.backtrack_well` and :func:`pybacktrack.reconstruct_paleo_bathymetry`.
+
+    Raises
+    ------
+    ValueError
+        If ``grid_spacing_degrees`` or ``time_increment`` is negative or zero, or
+        ``oldest_time`` is less than ``time_increment`` (there must be at least two grids).
+
+    Notes
+    -----
+    The dynamic topography is a wave (one wavelength around the equator) that travels westward by one degree per My.
+    The grids have global coverage (no NaN values).
+
+    The synthetic reconstruction model (see :func:`write_synthetic_reconstruction_model`) is also written to ``output_dir``.
+
+    .. versionadded:: 1.5
+    """
+
+    if time_increment <= 0:
+        raise ValueError('Time increment must be positive (and non-zero).')
+    if oldest_time < time_increment:
+        raise ValueError('Oldest time must not be less than the time increment (need at least two grids).')
+
+    longitudes, latitudes = _get_grid_coordinates(grid_spacing_degrees)
+    lon_grid, lat_grid = np.meshgrid(longitudes, latitudes)
+
+    grid_list_filename = os.path.join(output_dir, 'dynamic_topography.grids')
+    with open(grid_list_filename, 'w') as grid_list_file:
+        # Note: Using 1e-6 to ensure the oldest time gets included (if it's an exact multiple of the time increment).
+        for time in np.arange(0.0, oldest_time + 1e-6, time_increment):
+            # Grid filenames in the list file are relative to the directory of the list file.
+            grid_basename = 'dynamic_topography_{0:.2f}.nc'.format(time)
+            _write_grid(
+                os.path.join(output_dir, grid_basename),
+                longitudes,
+                latitudes,
+                amplitude * np.cos(np.radians(lat_grid)) * np.sin(np.radians(lon_grid + time)),
+                'z',
+                'm')
+            grid_list_file.write('{0} {1}\n'.format(grid_basename, time))
+
+    reconstruction_model = write_synthetic_reconstruction_model(output_dir)
+
+    return grid_list_filename, reconstruction_model['static_polygon_filename'], reconstruction_model['rotation_filenames']
+
+
+def create_synthetic_well(
+        num_units,
+        *,
+        lithologies=None,
+        lithology_names=DEFAULT_SYNTHETIC_WELL_LITHOLOGY_NAMES,
+        max_lithology_components=3,
+        unit_thickness_range=(10.0, 100.0),
+        unit_duration_range=(0.1, 2.0),
+        water_depth_range=None,
+        well_attributes=None,
+        seed=0):
+    """create_synthetic_well(num_units, *, lithologies=None, lithology_names=pybacktrack.testing.DEFAULT_SYNTHETIC_WELL_LITHOLOGY_NAMES,\
+        max_lithology_components=3, unit_thickness_range=(10.0, 100.0), unit_duration_range=(0.1, 2.0), water_depth_range=None,\
+        well_attributes=None, seed=0)
+    Create a well with random (but reproducible) stratigraphic units.
+
+    Parameters
+    ----------
+    num_units : int
+        The number of stratigraphic units.
+    lithologies : dict, optional
+        A dictionary mapping lithology names to :class:`pybacktrack.Lithology` objects.
+        Defaults to the bundled primary lithologies.
+    lithology_names : sequence of str, optional
+        The lithologies (in ``lithologies``) to randomly mix into each unit.
+    max_lithology_components : int, optional
+        The maximum number of lithologies mixed into each unit (each unit has between one and this many lithologies).
+        Defaults to 3.
+    unit_thickness_range : tuple of float, optional
+        The (minimum, maximum) compacted thickness (in metres) of each unit. Defaults to 10 to 100 metres.
+    unit_duration_range : tuple of float, optional
+        The (minimum, maximum) difference (in My) between the bottom and top age of each unit. Defaults to 0.1 to 2 My.
+    water_depth_range : tuple of float, optional
+        If specified then each unit has ``min_water_depth`` and ``max_water_depth`` attributes (as required by
+        :func:`pybacktrack.backstrip_well`) randomly chosen within this (minimum, maximum) water depth range (in metres).
+    well_attributes : dict, optional
+        Attributes to store on the well object (such as ``longitude`` and ``latitude``, as required by :func:`pybacktrack.backtrack_well`).
+    seed : int, optional
+        Seed of the random number generator. The same seed (and other arguments) creates the same well.
+
+    Returns
+    -------
+    :class:`pybacktrack.Well`
+        The well. Its surface is at present day and zero depth.
+
+    Raises
+    ------
+    ValueError
+        If ``num_units`` is not positive, or
+        ``max_lithology_components`` is not positive or exceeds the number of lithology names.
+    KeyError
+        If a lithology name is not in ``lithologies``.
+
+    .. versionadded:: 1.5
+    """
+
+    if num_units <= 0:
+        raise ValueError('Number of units must be positive.')
+    if not 0 < max_lithology_components <= len(lithology_names):
+        raise ValueError('Maximum number of lithology components must be positive and not exceed the number of lithology names.')
+
+    if lithologies is None:
+        lithologies = read_lithologies_file(pybacktrack.bundle_data.PRIMARY_BUNDLE_LITHOLOGY_FILENAME)
+
+    random = np.random.default_rng(seed)
+
+    well = Well(well_attributes)
+    top_age = 0.0
+    top_depth = 0.0
+    for _ in range(num_units):
+        bottom_age = top_age + random.uniform(*unit_duration_range)
+        bottom_depth = top_depth + random.uniform(*unit_thickness_range)
+
+        # Randomly mix between one and 'max_lithology_components' lithologies.
+        unit_lithology_names = random.choice(lithology_names, size=random.integers(1, max_lithology_components + 1), replace=False)
+        fractions = np.round(random.dirichlet(np.ones(len(unit_lithology_names))), 3)
+        # Ensure the fractions sum to exactly one (after rounding).
+        fractions[-1] = 1.0 - np.sum(fractions[:-1])
+        lithology_components = [(str(name), float(fraction)) for name, fraction in zip(unit_lithology_names, fractions)]
+
+        other_attributes = None
+        if water_depth_range is not None:
+            min_water_depth, max_water_depth = np.sort(random.uniform(*water_depth_range, size=2))
+            other_attributes = {'min_water_depth': float(min_water_depth), 'max_water_depth': float(max_water_depth)}
+
+        well.add_compacted_unit(top_age, bottom_age, top_depth, bottom_depth, lithology_components, lithologies, other_attributes)
+
+        top_age = bottom_age
+        top_depth = bottom_depth
+
+    return well
+
+
+def _get_grid_coordinates(grid_spacing_degrees):
+    """
+    Return the longitudes and latitudes (1D arrays) of a global gridline-registered grid starting at longitude -180 and latitude -90.
+    """
+
+    if grid_spacing_degrees <= 0:
+        raise ValueError('Grid spacing must be positive (and non-zero).')
+
+    # If 180 is an integer multiple of grid spacing then final longitude lands on dateline (+180) and final latitude on the north pole.
+    num_longitudes = int(math.floor(360.0 / grid_spacing_degrees + 1e-9)) + 1
+    num_latitudes = int(math.floor(180.0 / grid_spacing_degrees + 1e-9)) + 1
+
+    return (-180.0 + grid_spacing_degrees * np.arange(num_longitudes),
+            -90.0 + grid_spacing_degrees * np.arange(num_latitudes))
+
+
+def _write_grid(grid_filename, longitudes, latitudes, values, variable_name, units):
+    """
+    Write a COARDS-compliant (netCDF3) grid that GMT can read.
+
+    'values' is a 2D array with one row per latitude and one column per longitude (NaN values are masked).
+    """
+
+    # Only import scipy when needed (it's slow to import).
+    import scipy.io
+
+    values = np.asarray(values, dtype=np.float32)
+
+    with scipy.io.netcdf_file(grid_filename, 'w') as grid_file:
+        grid_file.Conventions = 'COARDS'
+        grid_file.title = 'pyBacktrack synthetic grid'
+
+        grid_file.createDimension('lon', len(longitudes))
+        grid_file.createDimension('lat', len(latitudes))
+
+        lon_variable = grid_file.createVariable('lon', 'f8', ('lon',))
+        lon_variable.long_name = 'longitude'
+        lon_variable.units = 'degrees_east'
+        lon_variable[:] = longitudes
+
+        lat_variable = grid_file.createVariable('lat', 'f8', ('lat',))
+        lat_variable.long_name = 'latitude'
+        lat_variable.units = 'degrees_north'
+        lat_variable[:] = latitudes
+
+        value_variable = grid_file.createVariable(variable_name, 'f4', ('lat', 'lon'))
+        value_variable.units = units
+        value_variable._FillValue = np.float32(np.nan)
+        if np.any(np.isfinite(values)):
+            value_variable.actual_range = np.array([np.nanmin(values), np.nanmax(values)], dtype=np.float32)
+        value_variable[:] = values
+
+
+def _get_lon_lat_box_boundary(min_lon, max_lon, min_lat, max_lat, max_spacing_degrees=1.0):
+    """
+    Return the (latitude, longitude) points around the boundary of a longitude/latitude box.
+
+    The boundary is densely sampled so that its edges follow the meridians and parallels (rather than great circle arcs).
+    """
+
+    num_lon_intervals = max(1, int(math.ceil((max_lon - min_lon) / max_spacing_degrees)))
+    num_lat_intervals = max(1, int(math.ceil((max_lat - min_lat) / max_spacing_degrees)))
+    lons = np.linspace(min_lon, max_lon, num_lon_intervals + 1)
+    lats = np.linspace(min_lat, max_lat, num_lat_intervals + 1)
+
+    # Go around the boundary (south, east, north and west edges) without repeating the corners.
+    return ([(min_lat, lon) for lon in lons[:-1]] +
+            [(lat, max_lon) for lat in lats[:-1]] +
+            [(max_lat, lon) for lon in lons[:0:-1]] +
+            [(lat, min_lon) for lat in lats[:0:-1]])
+
+
+def _synthetic_age(lon):
+    # Oceanic crust was created at the mid-ocean ridge (on the prime meridian) at a constant rate.
+    # Continental crust is masked (NaN).
+    abs_lon = np.abs(lon)
+    return np.where(
+        abs_lon <= SYNTHETIC_OCEAN_HALF_WIDTH,
+        SYNTHETIC_MAX_OCEANIC_AGE * abs_lon / SYNTHETIC_OCEAN_HALF_WIDTH,
+        np.nan)
+
+
+def _synthetic_topography(lon):
+    # Ocean floor deepens with the square root of age (like a cooling half-space).
+    # Continents rise (at 20 metres per degree) from a 200 metre deep continental shelf at the margins.
+    abs_lon = np.abs(lon)
+    ocean_floor_age = SYNTHETIC_MAX_OCEANIC_AGE * np.minimum(abs_lon, SYNTHETIC_OCEAN_HALF_WIDTH) / SYNTHETIC_OCEAN_HALF_WIDTH
+    return np.where(
+        abs_lon <= SYNTHETIC_OCEAN_HALF_WIDTH,
+        -(2600.0 + 350.0 * np.sqrt(ocean_floor_age)),
+        np.minimum(-200.0 + 20.0 * (abs_lon - SYNTHETIC_OCEAN_HALF_WIDTH), 2000.0))
+
+
+def _synthetic_total_sediment_thickness(lon, lat):
+    # Sediment thickens with oceanic crustal age, and is thickest on the submerged continental shelves.
+    # Decreases towards the poles. Masked (NaN) on continental crust above sea level.
+    abs_lon = np.abs(lon)
+    latitude_scale = 0.5 + 0.5 * np.cos(np.radians(lat))
+    ocean_floor_age = SYNTHETIC_MAX_OCEANIC_AGE * np.minimum(abs_lon, SYNTHETIC_OCEAN_HALF_WIDTH) / SYNTHETIC_OCEAN_HALF_WIDTH
+    return np.where(
+        abs_lon <= SYNTHETIC_OCEAN_HALF_WIDTH,
+        latitude_scale * (100.0 + 10.0 * ocean_floor_age),
+        np.where(_synthetic_topography(lon) < 0.0, latitude_scale * 2000.0, np.nan))
+
+
+def _synthetic_crustal_thickness(lon):
+    # Oceanic crust is 7 km thick. Continental crust thickens (at 1 km per degree) from 20 km at the margins up to 40 km.
+    abs_lon = np.abs(lon)
+    return np.where(
+        abs_lon <= SYNTHETIC_OCEAN_HALF_WIDTH,
+        7000.0,
+        np.minimum(20000.0 + 1000.0 * (abs_lon - SYNTHETIC_OCEAN_HALF_WIDTH), 40000.0))
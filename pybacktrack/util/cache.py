@@ -0,0 +1,113 @@
+"""
+    Copyright (C) 2025 The University of Sydney, Australia
+    
+    This program is free software; you can redistribute it and/or modify it under
+    the terms of the GNU General Public License, version 2, as published by
+    the Free Software Foundation.
+    
+    This program is distributed in the hope that it will be useful, but WITHOUT
+    ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+    FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+    for more details.
+    
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+
+import numpy as np
+import os
+import os.path
+import tempfile
+
+
+# Environment variable that overrides the on-disk cache directory.
+# If it is set to an empty string then on-disk caching is disabled.
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = 'PYBACKTRACK_CACHE_DIR'
+
+
+# Returns the directory used to cache data (that is expensive to compute) on disk, or None if on-disk caching is disabled.
+#
+# This is the directory in the 'PYBACKTRACK_CACHE_DIR' environment variable (if set), otherwise
+# a 'pybacktrack' sub-directory of the user's cache directory ('XDG_CACHE_HOME' if set, otherwise '~/.cache').
+#
+# Note that the returned directory might not exist yet (it's created when something is first written to it).
+def get_cache_directory():
+    
+    cache_directory = os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if cache_directory is not None:
+        # An empty string disables on-disk caching.
+        return cache_directory if cache_directory else None
+    
+    user_cache_directory = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(user_cache_directory, 'pybacktrack')
+
+
+# Returns a hashable key identifying the contents of the specified file (or sequence of files) using
+# their absolute paths, sizes and modification times.
+#
+# Returns None if any file cannot be accessed (or is not a filename, such as a pygplates feature collection).
+def get_files_key(filenames):
+    
+    if isinstance(filenames, (str, os.PathLike)):
+        filenames = [filenames]
+    
+    files_key = []
+    for filename in filenames:
+        if not isinstance(filename, (str, os.PathLike)):
+            return None
+        
+        try:
+            file_stat = os.stat(filename)
+        except OSError:
+            return None
+        
+        files_key.append((os.path.abspath(filename), file_stat.st_mtime_ns, file_stat.st_size))
+    
+    return tuple(files_key)
+
+
+# Reads a NumPy array cached on disk with the specified filename (relative to the cache directory).
+#
+# Returns None if on-disk caching is disabled, or the cached file does not exist or cannot be read.
+def read_cached_array(cache_filename):
+    
+    cache_directory = get_cache_directory()
+    if cache_directory is None:
+        return None
+    
+    try:
+        return np.load(os.path.join(cache_directory, cache_filename), allow_pickle=False)
+    except (OSError, ValueError):
+        # File does not exist, or is corrupt (in which case it'll get overwritten when next written).
+        return None
+
+
+# Writes a NumPy array to the on-disk cache with the specified filename (relative to the cache directory).
+#
+# The file is written atomically (so that concurrent processes never read a partially written file).
+# Failure to write (eg, a read-only cache directory) is silently ignored since caching is only an optimisation.
+#
+# Returns True if the array was written.
+def write_cached_array(cache_filename, array):
+    
+    cache_directory = get_cache_directory()
+    if cache_directory is None:
+        return False
+    
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+        
+        # Write to a temporary file in the cache directory and then rename it to the cache filename.
+        file_descriptor, temporary_filename = tempfile.mkstemp(dir=cache_directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                np.save(temporary_file, array, allow_pickle=False)
+            os.replace(temporary_filename, os.path.join(cache_directory, cache_filename))
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+    except OSError:
+        return False
+    
+    return True
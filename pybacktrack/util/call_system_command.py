@@ -16,8 +16,24 @@
     51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """
 
+import atexit
+import json
+import os
+import os.path
 import subprocess
 import sys
+import tempfile
+import time
+
+
+# Environment variable containing the filename that a trace record of each system command call is appended to (if tracing).
+#
+# An environment variable is used (rather than a module variable) so that multiprocessing workers also trace their system commands
+# (workers inherit the environment whether they are forked or spawned). It also means tracing can be enabled outside of Python.
+SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE = 'PYBACKTRACK_SYSTEM_COMMAND_TRACE'
+
+# The trace file created by 'start_system_command_trace()' (if it created one), so it can be removed when tracing stops.
+_created_trace_filename = None
 
 
 # Function to call a command on the system (based on 'subprocess' module).
@@ -64,10 +80,24 @@ def call_system_command(
     else:
         stderr_pipe = None
     
+    # If tracing system commands then record this call (even if it fails).
+    trace_filename = os.environ.get(SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE)
+    if trace_filename:
+        trace_start_time = time.time()
+        trace_start_counter = time.perf_counter()
+    
     # Execute command.
     try:
-        command = subprocess.Popen(args, stdin=stdin_pipe, stdout=stdout_pipe, stderr=stderr_pipe, universal_newlines=True, **subprocess_options)
-        stdout, stderr = command.communicate(stdin)
+        command = None
+        stdout, stderr = None, None
+        try:
+            command = subprocess.Popen(args, stdin=stdin_pipe, stdout=stdout_pipe, stderr=stderr_pipe, universal_newlines=True, **subprocess_options)
+            stdout, stderr = command.communicate(stdin)
+        finally:
+            if trace_filename:
+                _write_trace_record(
+                    trace_filename, args, trace_start_time, time.perf_counter() - trace_start_counter,
+                    stdin, stdout, stderr, command.returncode if command is not None else None)
     except ValueError as e:
         if print_errors:
             print("System command called with invalid arguments: {0}".format(e), file=sys.stderr)
@@ -104,6 +134,255 @@ def call_system_command(
     return True
 
 
+def start_system_command_trace(trace_filename=None, *, print_summary_at_exit=False):
+    """start_system_command_trace(trace_filename=None, *, print_summary_at_exit=False)
+    Start recording each system command (such as GMT) called by pyBacktrack, including calls made by multiprocessing workers.
+    
+    Parameters
+    ----------
+    trace_filename : str, optional
+        The file that a trace record of each system command call is appended to (as a line of JSON).
+        By default a temporary file is created (and removed by :func:`pybacktrack.stop_system_command_trace`).
+    print_summary_at_exit : bool, default=False
+        Whether to print a summary of the traced system commands (to standard error) when the process exits.
+    
+    Raises
+    ------
+    RuntimeError
+        If already tracing system commands.
+    
+    Notes
+    -----
+    Each trace record contains the command, the process ID (of the process calling the command), the start time,
+    the duration (in seconds), the number of bytes piped to standard input and from standard output and error, and
+    the return code (or ``None`` if the command could not be executed).
+    
+    Tracing is enabled by setting the ``PYBACKTRACK_SYSTEM_COMMAND_TRACE`` environment variable to the trace filename
+    (so that multiprocessing workers, which inherit the environment, also trace). This environment variable can also be set
+    before running a script to trace it.
+    
+    .. versionadded:: 1.5
+    """
+    
+    global _created_trace_filename
+    
+    if os.environ.get(SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE):
+        raise RuntimeError('Already tracing system commands.')
+    
+    if trace_filename is None:
+        trace_file_descriptor, trace_filename = tempfile.mkstemp(prefix='pybacktrack_system_command_trace_', suffix='.jsonl')
+        os.close(trace_file_descriptor)
+        _created_trace_filename = trace_filename
+    
+    os.environ[SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE] = os.path.abspath(trace_filename)
+    
+    if print_summary_at_exit:
+        atexit.register(_print_summary_at_exit, os.getpid())
+
+
+def stop_system_command_trace():
+    """stop_system_command_trace()
+    Stop recording system commands, and return the trace records.
+    
+    Returns
+    -------
+    list of dict
+        The trace records (see :func:`pybacktrack.get_system_command_trace`).
+        Returns an empty list if not tracing.
+    
+    .. versionadded:: 1.5
+    """
+    
+    global _created_trace_filename
+    
+    trace_records = get_system_command_trace()
+    
+    trace_filename = os.environ.pop(SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE, None)
+    
+    # Remove the trace file if 'start_system_command_trace()' created it.
+    if trace_filename and _created_trace_filename and os.path.abspath(_created_trace_filename) == trace_filename:
+        try:
+            os.remove(trace_filename)
+        except OSError:
+            pass
+    _created_trace_filename = None
+    
+    return trace_records
+
+
+def get_system_command_trace():
+    """get_system_command_trace()
+    Return the trace records of the system commands called so far (by this process and its multiprocessing workers).
+    
+    Returns
+    -------
+    list of dict
+        One dict per system command call (in the order the calls finished) with the keys:
+        
+        - ``command``: the command (and its arguments),
+        - ``program``: the program name (and subcommand for GMT, such as ``gmt grdtrack``),
+        - ``process_id``: ID of the process calling the command,
+        - ``start_time``: time the command started (in seconds since the epoch),
+        - ``duration``: time taken by the command (in seconds),
+        - ``stdin_bytes``, ``stdout_bytes``, ``stderr_bytes``: number of bytes piped to/from the command, and
+        - ``return_code``: the return code of the command (or ``None`` if the command could not be executed).
+        
+        Returns an empty list if not tracing.
+    
+    .. versionadded:: 1.5
+    """
+    
+    trace_filename = os.environ.get(SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE)
+    if not trace_filename or not os.path.exists(trace_filename):
+        return []
+    
+    trace_records = []
+    with open(trace_filename, 'r') as trace_file:
+        for line in trace_file:
+            line = line.strip()
+            if line:
+                trace_records.append(json.loads(line))
+    
+    return trace_records
+
+
+def summarize_system_command_trace(trace_records=None):
+    """summarize_system_command_trace(trace_records=None)
+    Aggregate trace records by program.
+    
+    Parameters
+    ----------
+    trace_records : list of dict, optional
+        The trace records to summarize. Defaults to the system commands traced so far (see :func:`pybacktrack.get_system_command_trace`).
+    
+    Returns
+    -------
+    dict
+        Maps each program (such as ``gmt grdtrack``) to a dict with the keys:
+        
+        - ``count``: number of calls,
+        - ``failures``: number of calls that could not be executed or returned a non-zero return code,
+        - ``total_duration``, ``max_duration``: total and maximum time taken by the calls (in seconds),
+        - ``stdin_bytes``, ``stdout_bytes``, ``stderr_bytes``: total number of bytes piped to/from the calls, and
+        - ``num_processes``: number of processes making the calls.
+    
+    .. versionadded:: 1.5
+    """
+    
+    if trace_records is None:
+        trace_records = get_system_command_trace()
+    
+    summary = {}
+    process_ids = {}
+    for trace_record in trace_records:
+        program = trace_record['program']
+        program_summary = summary.get(program)
+        if program_summary is None:
+            program_summary = summary[program] = {
+                'count': 0,
+                'failures': 0,
+                'total_duration': 0.0,
+                'max_duration': 0.0,
+                'stdin_bytes': 0,
+                'stdout_bytes': 0,
+                'stderr_bytes': 0,
+                'num_processes': 0}
+            process_ids[program] = set()
+        
+        program_summary['count'] += 1
+        if trace_record['return_code'] != 0:
+            program_summary['failures'] += 1
+        program_summary['total_duration'] += trace_record['duration']
+        program_summary['max_duration'] = max(program_summary['max_duration'], trace_record['duration'])
+        for byte_count_key in ('stdin_bytes', 'stdout_bytes', 'stderr_bytes'):
+            program_summary[byte_count_key] += trace_record[byte_count_key]
+        process_ids[program].add(trace_record['process_id'])
+        program_summary['num_processes'] = len(process_ids[program])
+    
+    return summary
+
+
+def format_system_command_trace_summary(summary):
+    """
+    Return a text table of a summary returned by 'summarize_system_command_trace()'.
+    """
+    
+    lines = ['{0:<24} {1:>8} {2:>8} {3:>12} {4:>12} {5:>14} {6:>14} {7:>10}'.format(
+        'program', 'calls', 'failed', 'total (s)', 'max (s)', 'stdin bytes', 'stdout bytes', 'processes')]
+    # List the programs taking the most time first.
+    for program, program_summary in sorted(summary.items(), key=lambda item: item[1]['total_duration'], reverse=True):
+        lines.append('{0:<24} {1:>8} {2:>8} {3:>12.3f} {4:>12.3f} {5:>14} {6:>14} {7:>10}'.format(
+            program,
+            program_summary['count'],
+            program_summary['failures'],
+            program_summary['total_duration'],
+            program_summary['max_duration'],
+            program_summary['stdin_bytes'],
+            program_summary['stdout_bytes'],
+            program_summary['num_processes']))
+    
+    return '\n'.join(lines)
+
+
+def _write_trace_record(trace_filename, args, start_time, duration, stdin, stdout, stderr, return_code):
+    """
+    Append a trace record of a system command call to the trace file (as a single line of JSON).
+    """
+    
+    # The command as a list of strings.
+    if isinstance(args, (str, bytes)):
+        command = [args] if isinstance(args, str) else [args.decode('utf-8', 'replace')]
+        command_words = command[0].split()
+    else:
+        command = [str(arg) for arg in args]
+        command_words = command
+    
+    # The program name (and the subcommand if it's GMT, such as 'gmt grdtrack').
+    program = os.path.basename(command_words[0]) if command_words else ''
+    if program in ('gmt', 'gmt.exe') and len(command_words) > 1:
+        program = 'gmt {0}'.format(command_words[1])
+    
+    trace_record = {
+        'command': command,
+        'program': program,
+        'process_id': os.getpid(),
+        'start_time': start_time,
+        'duration': duration,
+        'stdin_bytes': _get_num_bytes(stdin),
+        'stdout_bytes': _get_num_bytes(stdout),
+        'stderr_bytes': _get_num_bytes(stderr),
+        'return_code': return_code}
+    
+    # Write the record with a single (appending) write so that records written concurrently by
+    # multiprocessing workers (to the same trace file) do not get interleaved.
+    trace_file_descriptor = os.open(trace_filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(trace_file_descriptor, (json.dumps(trace_record) + '\n').encode('utf-8'))
+    finally:
+        os.close(trace_file_descriptor)
+
+
+def _get_num_bytes(text):
+    if text is None:
+        return 0
+    if isinstance(text, bytes):
+        return len(text)
+    return len(text.encode('utf-8'))
+
+
+def _print_summary_at_exit(process_id):
+    # Only the process that started tracing prints the summary (not any forked child processes).
+    if os.getpid() != process_id or not os.environ.get(SYSTEM_COMMAND_TRACE_ENVIRONMENT_VARIABLE):
+        return
+    
+    summary = summarize_system_command_trace(stop_system_command_trace())
+    if summary:
+        print('System commands called:', file=sys.stderr)
+        print(format_system_command_trace_summary(summary), file=sys.stderr)
+    else:
+        print('No system commands called.', file=sys.stderr)
+
+
 #   if __name__ == '__main__':
 #
 #       # Windows 'dir' command (change to 'ls -l', for example, on Mac and Linux).
@@ -0,0 +1,299 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Write columns of decompacted well data (one array per column) to CSV, NumPy ``.npz`` and NetCDF files.
+
+:func:`write_decompacted_wells_file` writes the decompacted columns of one well, or of many wells into a single file indexed by well
+(using :func:`write_columns_file`). The available columns (and their names and values) are specified by the backtrack and backstrip modules.
+
+The text format (with fixed-width columns) is written by the ``write_well`` functions of the backtrack and backstrip modules.
+"""
+
+
+import csv
+import numbers
+import numpy as np
+
+
+# All output formats of decompacted wells.
+OUTPUT_FORMATS = ('text', 'csv', 'npz', 'netcdf')
+
+# The output formats written by 'write_columns_file()' (ie, all except the fixed-width text format).
+COLUMNAR_OUTPUT_FORMATS = ('csv', 'npz', 'netcdf')
+
+# Number of decimal places of floating-point values written to CSV files.
+_CSV_FLOAT_FORMAT = '%.6f'
+
+
+def check_output_format(output_format, allow_text=True):
+    """
+    Raise ValueError if 'output_format' is not a supported output format (including 'text' if 'allow_text' is True).
+    """
+
+    output_formats = OUTPUT_FORMATS if allow_text else COLUMNAR_OUTPUT_FORMATS
+    if output_format not in output_formats:
+        raise ValueError('Output format "{0}" is not one of {1}.'.format(output_format, ', '.join(output_formats)))
+
+
+def format_lithology_components(lithology_components):
+    """
+    Format lithology components (a sequence of (name, fraction) tuples) as a single string
+    (such as "Shale 0.50 Sand 0.50", which is the same order as the lithology columns of a well file).
+    """
+
+    return ' '.join('{0} {1:.2f}'.format(lithology_name, fraction) for lithology_name, fraction in lithology_components)
+
+
+def get_lithology_column_array(decompacted_wells):
+    """
+    Return an array of strings containing the lithology components of the surface stratigraphic unit of each decompacted well
+    (see 'format_lithology_components()').
+    """
+
+    return np.array(
+        [format_lithology_components(decompacted_well.surface_unit.lithology_components) for decompacted_well in decompacted_wells],
+        dtype=str)
+
+
+def get_well_metadata(well, well_attributes=None):
+    """
+    Return the metadata of a well as a list of (name, value) tuples sorted by name.
+
+    This is the same metadata written to well files by 'pybacktrack.well.write_well_metadata()'
+    (the requested well attributes that are not None, and the surface age).
+    """
+
+    metadata = []
+
+    if well_attributes:
+        for well_attribute_name, well_metadata_name in well_attributes.items():
+            well_attribute_value = getattr(well, well_attribute_name)
+            if well_attribute_value is not None:
+                metadata.append((well_metadata_name, well_attribute_value))
+
+    metadata.append(('SurfaceAge', well.stratigraphic_units[0].top_age))
+
+    return sorted(metadata)
+
+
+def write_decompacted_wells_file(
+        filename,
+        output_format,
+        decompacted_wells_list,
+        wells,
+        decompacted_columns,
+        column_names,
+        get_column_array,
+        well_attributes=None,
+        well_names=None):
+    """
+    Write decompacted columns of one or more wells to a CSV (``csv``), NumPy (``npz``) or NetCDF (``netcdf``) file.
+
+    'decompacted_wells_list' is a sequence (one per well in 'wells') of sequences of decompacted wells.
+    'column_names' is a dict mapping each decompacted column to its name.
+    'get_column_array(decompacted_wells, decompacted_column)' returns an array containing the values of a decompacted column
+    at each decompacted well (floats, or strings for the lithology column).
+    'well_attributes' are the well attributes written as metadata (see 'get_well_metadata()').
+
+    If 'well_names' is None then there must be a single well, otherwise the wells are written to a single file indexed by well
+    (see 'write_columns_file()').
+
+    Raises ValueError if 'output_format' is not a columnar output format, or if the number of decompacted well sequences
+    does not match the number of wells.
+    """
+
+    check_output_format(output_format, allow_text=False)
+
+    if len(decompacted_wells_list) != len(wells):
+        raise ValueError('Number of decompacted well sequences must match the number of wells.')
+
+    write_columns_file(
+        filename,
+        output_format,
+        [column_names[decompacted_column] for decompacted_column in decompacted_columns],
+        [[get_column_array(decompacted_wells, decompacted_column) for decompacted_column in decompacted_columns]
+            for decompacted_wells in decompacted_wells_list],
+        [get_well_metadata(well, well_attributes) for well in wells],
+        well_names)
+
+
+def write_columns_file(
+        filename,
+        output_format,
+        column_names,
+        wells_column_arrays,
+        wells_metadata,
+        well_names=None):
+    """
+    Write columns of one or more wells to a CSV (``csv``), NumPy (``npz``) or NetCDF (``netcdf``) file.
+
+    'column_names' is a sequence of column names.
+    'wells_column_arrays' is a sequence (one per well) of column arrays (one per column name), where each well's arrays have the same length.
+    Each column array contains floats, or strings (such as the lithology column).
+    'wells_metadata' is a sequence (one per well) of (name, value) metadata tuples (see 'get_well_metadata()').
+
+    If 'well_names' is None then there must be a single well, otherwise the wells are written to a single file indexed by well:
+
+    - CSV files have a leading "well" column containing the well name of each row.
+    - NumPy files contain a "well_names" array and a "well_row_offsets" array, where the rows of well 'i' are
+      'well_row_offsets[i]' to 'well_row_offsets[i+1]' (and "metadata_values" is a 2D array indexed by well and metadata name).
+    - NetCDF files contain a "well_name" variable and a "row_size" variable (the number of rows of each well) following the
+      contiguous ragged array representation of the CF conventions (and each metadata is a variable indexed by well).
+
+    CSV files contain a header row of column names (but no metadata).
+    In NumPy files each column is an array named after its column, and the metadata is in "metadata_names" and "metadata_values".
+    In NetCDF files each column is a variable named after its column (indexed by row), and the metadata of a single well are global attributes.
+    """
+
+    check_output_format(output_format, allow_text=False)
+
+    if well_names is None:
+        if len(wells_column_arrays) != 1:
+            raise ValueError('Well names must be specified when writing more than one well.')
+    elif len(well_names) != len(wells_column_arrays):
+        raise ValueError('Number of well names must match the number of wells.')
+
+    if not wells_column_arrays:
+        raise ValueError('No wells to write.')
+
+    # Join the columns of all wells (one array per column).
+    num_well_rows = [len(column_arrays[0]) if column_arrays else 0 for column_arrays in wells_column_arrays]
+    column_arrays = [
+        np.concatenate([np.asarray(well_column_arrays[column_index]) for well_column_arrays in wells_column_arrays])
+        for column_index in range(len(column_names))]
+
+    if output_format == 'csv':
+        _write_csv_file(filename, column_names, column_arrays, num_well_rows, well_names)
+    elif output_format == 'npz':
+        _write_npz_file(filename, column_names, column_arrays, num_well_rows, wells_metadata, well_names)
+    else:  # 'netcdf'
+        _write_netcdf_file(filename, column_names, column_arrays, num_well_rows, wells_metadata, well_names)
+
+
+def _write_csv_file(filename, column_names, column_arrays, num_well_rows, well_names):
+
+    # Format each column as an array of strings.
+    column_strings = [
+        column_array if column_array.dtype.kind == 'U' else np.char.mod(_CSV_FLOAT_FORMAT, column_array)
+        for column_array in column_arrays]
+
+    header = list(column_names)
+    if well_names is not None:
+        header.insert(0, 'well')
+        column_strings.insert(0, np.repeat(np.array(well_names, dtype=str), num_well_rows))
+
+    with open(filename, 'w', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(header)
+        csv_writer.writerows(zip(*(strings.tolist() for strings in column_strings)))
+
+
+def _get_metadata_arrays(wells_metadata):
+    """
+    Return the metadata names (the union over all wells) and a 2D array of metadata values indexed by well and name
+    (NaN where a well does not have a metadata, or its value is not numeric).
+    """
+
+    metadata_names = sorted(set(name for well_metadata in wells_metadata for name, _ in well_metadata))
+    metadata_indices = dict((name, index) for index, name in enumerate(metadata_names))
+
+    metadata_values = np.full((len(wells_metadata), len(metadata_names)), np.nan)
+    for well_index, well_metadata in enumerate(wells_metadata):
+        for name, value in well_metadata:
+            if isinstance(value, numbers.Real):
+                metadata_values[well_index, metadata_indices[name]] = value
+
+    return metadata_names, metadata_values
+
+
+def _write_npz_file(filename, column_names, column_arrays, num_well_rows, wells_metadata, well_names):
+
+    metadata_names, metadata_values = _get_metadata_arrays(wells_metadata)
+
+    arrays = dict(zip(column_names, column_arrays))
+    arrays['metadata_names'] = np.array(metadata_names, dtype=str)
+    if well_names is None:
+        arrays['metadata_values'] = metadata_values[0]
+    else:
+        arrays['metadata_values'] = metadata_values
+        arrays['well_names'] = np.array(well_names, dtype=str)
+        arrays['well_row_offsets'] = np.concatenate(([0], np.cumsum(num_well_rows))).astype(np.int64)
+
+    # Write to an open file (otherwise NumPy appends '.npz' to filenames without that extension).
+    with open(filename, 'wb') as npz_file:
+        np.savez_compressed(npz_file, **arrays)
+
+
+def _to_char_array(strings):
+    """
+    Convert a sequence of strings to a 2D array of characters (as required by NetCDF3 files), with the second dimension padded
+    to the length of the longest (UTF-8 encoded) string.
+    """
+
+    encoded_strings = np.char.encode(np.asarray(strings, dtype=str), 'utf-8')
+    max_length = max(1, encoded_strings.dtype.itemsize)
+    return encoded_strings.astype('S{0}'.format(max_length)).view('S1').reshape(len(encoded_strings), max_length)
+
+
+def _write_netcdf_file(filename, column_names, column_arrays, num_well_rows, wells_metadata, well_names):
+
+    # Only import scipy when writing NetCDF files (it's slow to import).
+    import scipy.io
+
+    metadata_names, metadata_values = _get_metadata_arrays(wells_metadata)
+
+    # Use 64-bit offsets (NetCDF3 version 2) since combined wells can exceed 2GB.
+    with scipy.io.netcdf_file(filename, 'w', version=2) as netcdf_file:
+        netcdf_file.createDimension('row', sum(num_well_rows))
+
+        for column_name, column_array in zip(column_names, column_arrays):
+            if column_array.dtype.kind == 'U':
+                char_array = _to_char_array(column_array)
+                strlen_dimension_name = '{0}_strlen'.format(column_name)
+                netcdf_file.createDimension(strlen_dimension_name, char_array.shape[1])
+                variable = netcdf_file.createVariable(column_name, 'c', ('row', strlen_dimension_name))
+                variable[:] = char_array
+            else:
+                variable = netcdf_file.createVariable(column_name, 'd', ('row',))
+                variable[:] = column_array
+
+        if well_names is None:
+            # The metadata of a single well are global attributes.
+            for metadata_name, metadata_value in zip(metadata_names, metadata_values[0]):
+                setattr(netcdf_file, metadata_name, metadata_value)
+            return
+
+        netcdf_file.Conventions = 'CF-1.8'
+        netcdf_file.featureType = 'profile'
+
+        netcdf_file.createDimension('well', len(well_names))
+
+        well_name_chars = _to_char_array(well_names)
+        netcdf_file.createDimension('well_name_strlen', well_name_chars.shape[1])
+        variable = netcdf_file.createVariable('well_name', 'c', ('well', 'well_name_strlen'))
+        variable.cf_role = 'profile_id'
+        variable[:] = well_name_chars
+
+        # Contiguous ragged array (the rows of each well are contiguous).
+        variable = netcdf_file.createVariable('row_size', 'i', ('well',))
+        variable.sample_dimension = 'row'
+        variable.long_name = 'number of rows of each well'
+        variable[:] = np.asarray(num_well_rows, dtype=np.int32)
+
+        for metadata_index, metadata_name in enumerate(metadata_names):
+            variable = netcdf_file.createVariable(metadata_name, 'd', ('well',))
+            variable[:] = metadata_values[:, metadata_index]
@@ -26,9 +26,9 @@
 """
 
 
+import pybacktrack.util.profiling as profiling
 import pybacktrack.version
 import math
-import scipy.interpolate
 import sys
 import warnings
 
@@ -142,6 +142,10 @@ def read_curve_function(
     if not x_column:
         raise ValueError('Curve file {0} contains no data.'.format(curve_filename))
     
+    # Import here (rather than at module level) since SciPy is slow to import
+    # (and this module is imported by command-line scripts that don't always need it).
+    import scipy.interpolate
+    
     # Handling of out-of-bounds (when x is outside the range [xmin, xmax]).
     if out_of_bounds == 'clamp':
         # Clamp y to boundary value when x is outside range [xmin, xmax].
@@ -321,9 +325,16 @@ def main():
         metavar='output_filename',
         help='The output filename that the "x" positions (from input file) and interpolated "y" values (at those "x" positions) will be written to.')
     
+    # Optionally profile the script (and any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+    
     # Parse command-line options.
     args = parser.parse_args()
     
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+    
     # Read the curve function y=f(x) from curve file.
     curve_function, _, _ = read_curve_function(args.curve_filename, args.curve_x_column, args.curve_y_column, out_of_bounds=args.out_of_bounds)
     
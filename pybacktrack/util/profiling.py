@@ -0,0 +1,257 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Profile the command-line scripts (including their multiprocessing pool workers) with cProfile.
+
+:func:`add_profile_argument` adds a ``--profile`` option to a command-line parser.
+
+:func:`start_profiling` profiles the current (main) process until :func:`stop_profiling` is called (or the process exits).
+The profile of the main process is then merged with the profiles of its pool workers into a single profile and a text summary
+sorted by cumulative time.
+
+:func:`profile_pool_function` wraps a function passed to a ``multiprocessing.Pool`` so that the pool workers are also profiled
+(it returns the function unchanged if profiling has not been started). Each worker writes its profile when it exits, so the pool
+should be closed with :func:`join_pool` (rather than terminated when leaving its ``with`` block).
+Similarly :func:`profile_thread_function` wraps a function called by other threads (such as the request workers of a service).
+"""
+
+
+import atexit
+import cProfile
+import functools
+import glob
+import multiprocessing.util
+import os
+import os.path
+import pstats
+import sys
+import threading
+
+
+# Number of functions listed in the text summary.
+_NUM_SUMMARY_FUNCTIONS = 100
+
+# Filename prefix (including directory) of the profile files written by the current run (None if not profiling).
+_profile_prefix = None
+# Profiler of the main process (the process that started profiling).
+_main_profiler = None
+_main_process_id = None
+_main_thread_id = None
+# Profiler of the current pool worker process (if it's a pool worker).
+_worker_profiler = None
+# Profilers of the threads (in the main process) that called functions wrapped with 'profile_thread_function()'.
+_thread_profilers = []
+_thread_profilers_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def add_profile_argument(parser):
+    """
+    Add the ``--profile`` option to an ``argparse.ArgumentParser``.
+    """
+
+    parser.add_argument(
+        '--profile', type=str, metavar='profile_dir',
+        help='Profile the main process and any worker processes (when using multiple CPUs) and write their profiles to '
+             'this directory (created if necessary). Each process writes a "<name>-<pid>-main.prof" or "<name>-<pid>-worker-<worker_pid>.prof" file, '
+             'and these are merged into "<name>-<pid>.prof" and a text summary "<name>-<pid>-summary.txt" sorted by cumulative time '
+             '(where <name> is the name of the script and <pid> is its process ID). '
+             'Threads handling requests in a service (with Python 3.11 or earlier) also write "<name>-<pid>-thread-<index>.prof" files.')
+
+
+def start_profiling(profile_dir, name=None):
+    """
+    Start profiling the current process (and any pool workers running functions wrapped with :func:`profile_pool_function`).
+
+    Profiles are written to the directory ``profile_dir`` (created if necessary) when :func:`stop_profiling` is called,
+    which happens automatically when the process exits.
+
+    ``name`` prefixes the profile filenames, and defaults to the name of the script being run.
+
+    Returns the filename prefix (including directory) of the profile files.
+    """
+
+    global _profile_prefix, _main_profiler, _main_process_id, _main_thread_id
+
+    if _main_profiler is not None:
+        raise RuntimeError('Profiling has already been started.')
+
+    if name is None:
+        name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'pybacktrack'
+
+    os.makedirs(profile_dir, exist_ok=True)
+
+    # Include the process ID so that separate runs (using the same profile directory) don't merge each other's profiles.
+    _main_process_id = os.getpid()
+    _main_thread_id = threading.get_ident()
+    _profile_prefix = os.path.join(os.path.abspath(profile_dir), '{0}-{1}'.format(name, _main_process_id))
+
+    # Merge and write the profiles when the process exits (if not explicitly stopped before then).
+    atexit.register(stop_profiling)
+
+    _main_profiler = cProfile.Profile()
+    _main_profiler.enable()
+
+    return _profile_prefix
+
+
+def stop_profiling():
+    """
+    Stop profiling the current process, and merge its profile with the profiles of any pool workers.
+
+    Returns the filename of the text summary (sorted by cumulative time), or None if profiling was not started.
+    """
+
+    global _profile_prefix, _main_profiler, _main_process_id, _main_thread_id
+
+    # Only the process that started profiling can stop it.
+    if _main_profiler is None or os.getpid() != _main_process_id:
+        return None
+
+    _main_profiler.disable()
+    main_profile_filename = _profile_prefix + '-main.prof'
+    _main_profiler.dump_stats(main_profile_filename)
+
+    # Each worker process wrote its own profile (when it exited).
+    worker_profile_filenames = sorted(glob.glob(glob.escape(_profile_prefix) + '-worker-*.prof'))
+
+    # Write the profile of each thread that was profiled separately (to the main thread).
+    with _thread_profilers_lock:
+        for thread_index, thread_profiler in enumerate(_thread_profilers):
+            thread_profile_filename = '{0}-thread-{1}.prof'.format(_profile_prefix, thread_index)
+            thread_profiler.dump_stats(thread_profile_filename)
+            worker_profile_filenames.append(thread_profile_filename)
+        del _thread_profilers[:]
+
+    merged_profile_filename = _profile_prefix + '.prof'
+    summary_filename = _profile_prefix + '-summary.txt'
+    with open(summary_filename, 'w') as summary_file:
+        summary_file.write('Merged profile of {0} process(es) and thread(s):\n'.format(1 + len(worker_profile_filenames)))
+        for profile_filename in [main_profile_filename] + worker_profile_filenames:
+            summary_file.write('  {0} ({1:.3f} seconds of profiled CPU time)\n'.format(
+                os.path.basename(profile_filename), pstats.Stats(profile_filename).total_tt))
+        summary_file.write('\n')
+
+        merged_stats = pstats.Stats(main_profile_filename, *worker_profile_filenames, stream=summary_file)
+        merged_stats.dump_stats(merged_profile_filename)
+        merged_stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_NUM_SUMMARY_FUNCTIONS)
+
+    print('Profile summary written to "{0}".'.format(summary_filename), file=sys.stderr)
+
+    _profile_prefix = None
+    _main_profiler = None
+    _main_process_id = None
+    _main_thread_id = None
+
+    return summary_filename
+
+
+def profile_pool_function(function):
+    """
+    Wrap ``function`` (to be called by ``multiprocessing.Pool`` workers) so that each worker profiles its calls of ``function``.
+
+    Each worker writes its profile when it exits, so close the pool with :func:`join_pool` when its results have been obtained.
+
+    Returns ``function`` unchanged if profiling has not been started (see :func:`start_profiling`).
+    """
+
+    if _profile_prefix is None:
+        return function
+
+    return _ProfiledPoolFunction(function, _profile_prefix)
+
+
+def profile_thread_function(function):
+    """
+    Wrap ``function`` (to be called by threads, such as ``concurrent.futures.ThreadPoolExecutor`` workers) so that each thread
+    profiles its calls of ``function``.
+
+    Returns ``function`` unchanged if profiling has not been started (see :func:`start_profiling`), or with Python 3.12 and later
+    (where the profiler of the main thread also profiles other threads, and a thread cannot start its own profiler).
+    """
+
+    if _profile_prefix is None or sys.version_info >= (3, 12):
+        return function
+
+    @functools.wraps(function)
+    def profiled_function(*args, **kwargs):
+        # If called in the main thread then it's already being profiled.
+        if threading.get_ident() == _main_thread_id:
+            return function(*args, **kwargs)
+
+        thread_profiler = getattr(_thread_local, 'profiler', None)
+        if thread_profiler is None:
+            thread_profiler = _thread_local.profiler = cProfile.Profile()
+            with _thread_profilers_lock:
+                _thread_profilers.append(thread_profiler)
+
+        thread_profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            thread_profiler.disable()
+
+    return profiled_function
+
+
+def join_pool(pool):
+    """
+    Close a ``multiprocessing.Pool`` and wait for its workers to exit.
+
+    This should be called (when the results of the pool have been obtained) before leaving the ``with`` block of the pool,
+    since that terminates the workers before they can write their profiles (see :func:`profile_pool_function`).
+    """
+
+    pool.close()
+    pool.join()
+
+
+class _ProfiledPoolFunction(object):
+    """
+    Picklable wrapper of a pool function that profiles each call in a worker process.
+    """
+
+    def __init__(self, function, profile_prefix):
+        self.function = function
+        self.profile_prefix = profile_prefix
+
+    def __call__(self, *args, **kwargs):
+        global _main_profiler, _worker_profiler
+
+        # If called in the main process then it's already being profiled.
+        if os.getpid() == _main_process_id:
+            return self.function(*args, **kwargs)
+
+        if _worker_profiler is None:
+            # A worker that was forked (rather than spawned) inherits the main process's profiler (which is enabled),
+            # so disable it (otherwise the worker profiler cannot be enabled).
+            if _main_profiler is not None:
+                _main_profiler.disable()
+                _main_profiler = None
+            _worker_profiler = cProfile.Profile()
+            # Write the worker's profile (of all its calls) once, when the worker exits normally (see 'join_pool()').
+            multiprocessing.util.Finalize(
+                None,
+                _worker_profiler.dump_stats,
+                args=('{0}-worker-{1}.prof'.format(self.profile_prefix, os.getpid()),),
+                exitpriority=0)
+
+        _worker_profiler.enable()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            _worker_profiler.disable()
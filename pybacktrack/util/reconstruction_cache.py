@@ -0,0 +1,340 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Process-level cache of rotation models, static polygons, plate partitioners and static polygon rasters.
+
+:func:`pybacktrack.get_rotation_model` returns a shared ``pygplates.RotationModel`` for a list of rotation files.
+
+:func:`pybacktrack.get_static_polygons` returns a shared ``pygplates.FeatureCollection`` for a static polygon file.
+
+:func:`pybacktrack.get_plate_partitioner` returns a shared ``pygplates.PlatePartitioner`` for a static polygon file and a list of rotation files.
+
+:func:`pybacktrack.get_static_polygon_raster` returns a shared :class:`pybacktrack.StaticPolygonRaster` for a static polygon file and a list of rotation files.
+
+:func:`pybacktrack.clear_reconstruction_cache` removes all cached objects.
+
+:func:`pybacktrack.get_reconstruction_cache_size` returns the number of cached objects.
+
+:func:`pybacktrack.set_reconstruction_cache_max_size` limits the number of cached objects.
+"""
+
+
+from collections import OrderedDict
+from pybacktrack.util.cache import get_files_key
+import pygplates
+import threading
+
+
+# Default maximum number of objects (rotation models, static polygon collections and plate partitioners) to cache.
+DEFAULT_MAX_CACHE_SIZE = 32
+
+# Number of reconstruction trees cached internally by a rotation model if not specified (this is also the pygplates default).
+DEFAULT_RECONSTRUCTION_TREE_CACHE_SIZE = 150
+
+
+# Cached objects keyed by (kind, file keys, ...) in least-recently-used order (most recently used last).
+_cache = OrderedDict()
+_max_cache_size = DEFAULT_MAX_CACHE_SIZE
+_cache_lock = threading.RLock()
+
+
+def get_rotation_model(
+        rotation_filenames,
+        anchor_plate_id=0,
+        reconstruction_tree_cache_size=None):
+    """Return a (shared) rotation model loaded from rotation files.
+
+    Parameters
+    ----------
+    rotation_filenames : str or list of str
+        The rotation filename, or list of rotation filenames.
+    anchor_plate_id : int, optional
+        The default anchor plate of the returned rotation model.
+    reconstruction_tree_cache_size : int, optional
+        The minimum number of reconstruction trees that the returned rotation model should cache internally.
+        This should typically be the number of distinct reconstruction times in a run so that no reconstruction tree
+        is created more than once. Defaults to (and is never less than) 150.
+
+    Returns
+    -------
+    pygplates.RotationModel
+        The rotation model.
+
+    Notes
+    -----
+    Rotation models are cached using the absolute paths and modification times of the rotation files, and the anchor plate.
+    So the same rotation model is returned by subsequent calls unless a rotation file has since been modified
+    (or the cache was cleared, or the rotation model was evicted from the cache).
+
+    If a cached rotation model caches fewer reconstruction trees than ``reconstruction_tree_cache_size`` then it is replaced
+    by a new rotation model that caches ``reconstruction_tree_cache_size`` reconstruction trees.
+
+    .. versionadded:: 1.5
+    """
+
+    # Never cache fewer reconstruction trees than the default (the rotation model might be shared with runs needing more times).
+    if reconstruction_tree_cache_size is None or reconstruction_tree_cache_size < DEFAULT_RECONSTRUCTION_TREE_CACHE_SIZE:
+        reconstruction_tree_cache_size = DEFAULT_RECONSTRUCTION_TREE_CACHE_SIZE
+
+    rotation_files_key = get_files_key(rotation_filenames)
+    if rotation_files_key is None:
+        # Unable to access a rotation file, so let pygplates report the error (or load it if it's not a regular file).
+        return pygplates.RotationModel(
+            rotation_filenames,
+            reconstruction_tree_cache_size=reconstruction_tree_cache_size,
+            default_anchor_plate_id=anchor_plate_id)
+
+    cache_key = ('rotation_model', rotation_files_key, anchor_plate_id)
+
+    with _cache_lock:
+        cached_value = _get_cached_value(cache_key)
+        if cached_value is not None:
+            rotation_model, cached_reconstruction_tree_cache_size = cached_value
+            # Only re-use the cached rotation model if it caches enough reconstruction trees.
+            if cached_reconstruction_tree_cache_size >= reconstruction_tree_cache_size:
+                return rotation_model
+
+        rotation_model = pygplates.RotationModel(
+            rotation_filenames,
+            reconstruction_tree_cache_size=reconstruction_tree_cache_size,
+            default_anchor_plate_id=anchor_plate_id)
+        _set_cached_value(cache_key, (rotation_model, reconstruction_tree_cache_size))
+
+        return rotation_model
+
+
+def get_static_polygons(
+        static_polygon_filename):
+    """Return a (shared) feature collection of static polygons loaded from a static polygon file.
+
+    Parameters
+    ----------
+    static_polygon_filename : str
+        The filename of the static polygons file.
+
+    Returns
+    -------
+    pygplates.FeatureCollection
+        The static polygons.
+
+    Notes
+    -----
+    Static polygons are cached using the absolute path and modification time of the static polygon file.
+
+    The returned feature collection is shared and so should not be modified.
+
+    .. versionadded:: 1.5
+    """
+
+    static_polygon_file_key = get_files_key(static_polygon_filename)
+    if static_polygon_file_key is None:
+        return pygplates.FeatureCollection(static_polygon_filename)
+
+    cache_key = ('static_polygons', static_polygon_file_key)
+
+    with _cache_lock:
+        static_polygons = _get_cached_value(cache_key)
+        if static_polygons is None:
+            static_polygons = pygplates.FeatureCollection(static_polygon_filename)
+            _set_cached_value(cache_key, static_polygons)
+
+        return static_polygons
+
+
+def get_plate_partitioner(
+        static_polygon_filename,
+        rotation_filenames,
+        anchor_plate_id=0):
+    """Return a (shared) plate partitioner of static polygons reconstructed to present day.
+
+    Parameters
+    ----------
+    static_polygon_filename : str
+        The filename of the static polygons file.
+    rotation_filenames : str or list of str
+        The rotation filename, or list of rotation filenames.
+    anchor_plate_id : int, optional
+        The anchor plate used to reconstruct the static polygons to present day.
+
+    Returns
+    -------
+    pygplates.PlatePartitioner
+        The plate partitioner.
+
+    Notes
+    -----
+    Plate partitioners are cached using the absolute paths and modification times of the static polygon and rotation files,
+    and the anchor plate. The static polygons and rotation model of the plate partitioner are also shared
+    (see :func:`pybacktrack.get_rotation_model`).
+
+    .. versionadded:: 1.5
+    """
+
+    static_polygon_file_key = get_files_key(static_polygon_filename)
+    rotation_files_key = get_files_key(rotation_filenames)
+    if static_polygon_file_key is None or rotation_files_key is None:
+        return pygplates.PlatePartitioner(
+            static_polygon_filename,
+            pygplates.RotationModel(rotation_filenames, default_anchor_plate_id=anchor_plate_id))
+
+    cache_key = ('plate_partitioner', static_polygon_file_key, rotation_files_key, anchor_plate_id)
+
+    with _cache_lock:
+        plate_partitioner = _get_cached_value(cache_key)
+        if plate_partitioner is None:
+            plate_partitioner = pygplates.PlatePartitioner(
+                get_static_polygons(static_polygon_filename),
+                get_rotation_model(rotation_filenames, anchor_plate_id))
+            _set_cached_value(cache_key, plate_partitioner)
+
+        return plate_partitioner
+
+
+def get_static_polygon_raster(
+        static_polygon_filename,
+        rotation_filenames,
+        grid_spacing_degrees=None):
+    """Return a (shared) raster of static polygons for fast assignment of plate IDs to points.
+    
+    Parameters
+    ----------
+    static_polygon_filename : str
+        The filename of the static polygons file.
+    rotation_filenames : str or list of str
+        The rotation filename, or list of rotation filenames.
+    grid_spacing_degrees : float, optional
+        The spacing of the raster grid cells (in degrees). Defaults to 0.1 degrees.
+    
+    Returns
+    -------
+    :class:`pybacktrack.StaticPolygonRaster`
+        The static polygon raster.
+    
+    Notes
+    -----
+    Static polygon rasters are cached using the absolute paths and modification times of the static polygon and rotation files,
+    and the grid spacing. They are also cached on disk (see :class:`pybacktrack.StaticPolygonRaster`).
+    
+    .. versionadded:: 1.5
+    """
+    
+    # Avoid a circular import (the static polygon raster module uses this module).
+    from pybacktrack.util.static_polygon_raster import StaticPolygonRaster, DEFAULT_GRID_SPACING_DEGREES
+    
+    if grid_spacing_degrees is None:
+        grid_spacing_degrees = DEFAULT_GRID_SPACING_DEGREES
+    
+    static_polygon_file_key = get_files_key(static_polygon_filename)
+    rotation_files_key = get_files_key(rotation_filenames)
+    if static_polygon_file_key is None or rotation_files_key is None:
+        return StaticPolygonRaster(static_polygon_filename, rotation_filenames, grid_spacing_degrees)
+    
+    cache_key = ('static_polygon_raster', static_polygon_file_key, rotation_files_key, grid_spacing_degrees)
+    
+    with _cache_lock:
+        static_polygon_raster = _get_cached_value(cache_key)
+        if static_polygon_raster is None:
+            static_polygon_raster = StaticPolygonRaster(static_polygon_filename, rotation_filenames, grid_spacing_degrees)
+            _set_cached_value(cache_key, static_polygon_raster)
+        
+        return static_polygon_raster
+
+
+def clear_cache():
+    """Remove all cached rotation models, static polygons and plate partitioners.
+
+    Notes
+    -----
+    Objects previously returned remain valid (they're just no longer shared with subsequent calls).
+
+    .. versionadded:: 1.5
+    """
+
+    with _cache_lock:
+        _cache.clear()
+
+
+def get_cache_size():
+    """Return the number of cached rotation models, static polygons and plate partitioners.
+
+    .. versionadded:: 1.5
+    """
+
+    with _cache_lock:
+        return len(_cache)
+
+
+def set_max_cache_size(max_cache_size):
+    """Set the maximum number of cached rotation models, static polygons and plate partitioners.
+
+    Parameters
+    ----------
+    max_cache_size : int
+        The maximum number of cached objects. When exceeded, the least recently used objects are evicted.
+        Zero disables caching.
+
+    Raises
+    ------
+    ValueError
+        If ``max_cache_size`` is negative.
+
+    Notes
+    -----
+    The default maximum size is 32.
+
+    .. versionadded:: 1.5
+    """
+
+    global _max_cache_size
+
+    if max_cache_size < 0:
+        raise ValueError('Maximum reconstruction cache size must not be negative')
+
+    with _cache_lock:
+        _max_cache_size = max_cache_size
+        _evict()
+
+
+def _get_cached_value(cache_key):
+    """
+    Return the cached value associated with 'cache_key' (and mark it as most recently used), or None if not cached.
+    """
+
+    cached_value = _cache.get(cache_key)
+    if cached_value is not None:
+        _cache.move_to_end(cache_key)
+
+    return cached_value
+
+
+def _set_cached_value(cache_key, value):
+    """
+    Cache a value (as the most recently used) and evict the least recently used values if the cache is full.
+    """
+
+    _cache[cache_key] = value
+    _cache.move_to_end(cache_key)
+    _evict()
+
+
+def _evict():
+    """
+    Evict the least recently used values until the cache is not larger than its maximum size.
+    """
+
+    while len(_cache) > _max_cache_size:
+        _cache.popitem(last=False)
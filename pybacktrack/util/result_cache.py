@@ -0,0 +1,466 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Opt-in on-disk cache of the results of backtracking and backstripping single wells.
+
+:func:`pybacktrack.enable_result_cache` enables the cache (it's disabled by default).
+
+:func:`pybacktrack.disable_result_cache` disables the cache.
+
+:func:`pybacktrack.clear_result_cache` removes all cached results.
+
+:func:`pybacktrack.get_result_cache_size` returns the total size (in bytes) of the cached results.
+
+Results are content addressed: each result is stored in a file named after a hash of everything that determines the result
+(the function, pyBacktrack version, contents of the well and lithology files, identifiers of the grids and models, and the
+numeric parameters). So a changed input simply misses the cache (and least recently used results are evicted when the
+cache exceeds its maximum size).
+"""
+
+
+import functools
+import hashlib
+import inspect
+import numbers
+import numpy as np
+import os
+import os.path
+import pickle
+from pybacktrack.util.cache import get_cache_directory, get_files_key
+import pybacktrack.version
+import tempfile
+import threading
+
+
+# Default maximum total size (in bytes) of the cached results.
+DEFAULT_MAX_RESULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# Version of the cached result files (increment when the pickled classes change incompatibly).
+_RESULT_CACHE_VERSION = 1
+
+# When the cache exceeds its maximum size, least recently used results are evicted until it's below this fraction of the maximum size
+# (so that eviction, which lists the cache directory, does not happen on every subsequent write).
+_EVICTION_TARGET_FRACTION = 0.8
+
+# Sub-directory (of the pyBacktrack cache directory) containing the cached results.
+_RESULT_CACHE_SUB_DIRECTORY = 'results'
+
+# Maximum total size of the cached results (None if the result cache is disabled).
+_max_result_cache_size = None
+# Estimated total size of the cached results (None if not yet known). It's only an estimate since other processes can also write results.
+_estimated_result_cache_size = None
+_result_cache_lock = threading.Lock()
+
+
+def enable_result_cache(max_size=DEFAULT_MAX_RESULT_CACHE_SIZE):
+    """enable_result_cache(max_size=256*1024*1024)
+    Cache the results of backtracking and backstripping single wells on disk.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum total size (in bytes) of the cached results. Least recently used results are removed when this is exceeded.
+        Defaults to 256MB.
+
+    Notes
+    -----
+    This caches the results of :func:`pybacktrack.backtrack_well`, :func:`pybacktrack.backstrip_well`,
+    :func:`pybacktrack.backtrack_and_write_well` and :func:`pybacktrack.backstrip_and_write_well`.
+    When one of these is called with the same inputs as a previous call, it returns (a copy of) the previous result
+    instead of recomputing it (the ``_and_write_well`` variants still write their output files).
+
+    The inputs are the contents of the well, lithology and sea level files, the path, size and modification time of the grid and
+    reconstruction files (including the grids of a dynamic topography model), and all other parameters. Results are not cached if
+    an input cannot be identified (such as a user-provided age-to-depth model function, or a well object instead of a well file).
+
+    The results are stored in the ``results`` sub-directory of the pyBacktrack cache directory, which is the directory in the
+    ``PYBACKTRACK_CACHE_DIR`` environment variable (if set), otherwise the ``pybacktrack`` sub-directory of the user's cache
+    directory (such as ``~/.cache/pybacktrack``). Setting ``PYBACKTRACK_CACHE_DIR`` to an empty string disables all on-disk caching.
+
+    Any warnings emitted when computing a result are not emitted again when the cached result is returned.
+
+    .. warning:: Cached results are stored as Python pickle files, so the cache directory should not be writable by other users.
+
+    .. versionadded:: 1.5
+    """
+
+    global _max_result_cache_size
+
+    if max_size <= 0:
+        raise ValueError('Maximum result cache size must be positive.')
+
+    with _result_cache_lock:
+        _max_result_cache_size = max_size
+
+
+def disable_result_cache():
+    """
+    Stop caching the results of backtracking and backstripping single wells (see :func:`pybacktrack.enable_result_cache`).
+
+    The cached results remain on disk (see :func:`pybacktrack.clear_result_cache`).
+
+    .. versionadded:: 1.5
+    """
+
+    global _max_result_cache_size
+
+    with _result_cache_lock:
+        _max_result_cache_size = None
+
+
+def clear_result_cache():
+    """
+    Remove all cached results (see :func:`pybacktrack.enable_result_cache`).
+
+    .. versionadded:: 1.5
+    """
+
+    global _estimated_result_cache_size
+
+    with _result_cache_lock:
+        for result_filename, _, _ in _list_result_files():
+            try:
+                os.remove(result_filename)
+            except OSError:
+                pass
+        _estimated_result_cache_size = 0
+
+
+def get_result_cache_size():
+    """
+    Return the total size (in bytes) of the cached results (see :func:`pybacktrack.enable_result_cache`).
+
+    .. versionadded:: 1.5
+    """
+
+    return sum(result_file_size for _, result_file_size, _ in _list_result_files())
+
+
+def cache_results(argument_identifiers, implicit_filenames=()):
+    """
+    Decorator that caches the results of a function (if the result cache is enabled).
+
+    'argument_identifiers' maps each argument name of the function to a function that converts its value to a picklable identifier
+    (such as 'file_contents_identifier', 'files_identifier' or 'value_identifier'), or raises 'UncacheableArgument' if the value
+    cannot be identified (in which case the result is not cached). Every argument of the function must have an identifier function.
+
+    'implicit_filenames' are files that the function reads regardless of its arguments (identified by 'files_identifier').
+    """
+
+    def decorator(function):
+
+        signature = inspect.signature(function)
+
+        # Make sure every argument is identified (so that a new argument added later cannot be accidentally ignored).
+        unidentified_argument_names = set(signature.parameters) - set(argument_identifiers)
+        if unidentified_argument_names:
+            raise ValueError('Arguments {0} of {1} have no cache identifier.'.format(sorted(unidentified_argument_names), function.__name__))
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _max_result_cache_size is None:
+                return function(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+
+            try:
+                key = _get_result_key(function, arguments.arguments, argument_identifiers, implicit_filenames)
+            except UncacheableArgument:
+                return function(*args, **kwargs)
+
+            cache_directory = get_cache_directory()
+            if cache_directory is None:
+                return function(*args, **kwargs)
+            result_filename = os.path.join(cache_directory, _RESULT_CACHE_SUB_DIRECTORY, key + '.pickle')
+
+            try:
+                with open(result_filename, 'rb') as result_file:
+                    result = pickle.load(result_file)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                # Not cached (or the cached file is corrupt, in which case it'll get overwritten).
+                pass
+            else:
+                # Mark the result as recently used (so it's not evicted before less recently used results).
+                try:
+                    os.utime(result_filename)
+                except OSError:
+                    pass
+                return result
+
+            result = function(*args, **kwargs)
+
+            _write_result(result_filename, result)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class UncacheableArgument(Exception):
+    """
+    Raised by an argument identifier function if the argument value cannot be identified (so the result is not cached).
+    """
+    pass
+
+
+def file_contents_identifier(filenames):
+    """
+    Identify a file, or sequence of files, by a hash of their contents (for small files like well and lithology files).
+    """
+
+    if filenames is None:
+        return None
+
+    if isinstance(filenames, (str, os.PathLike)):
+        return _hash_file_contents(filenames)
+
+    # Cannot identify other values (such as a well object instead of a well filename).
+    if not isinstance(filenames, (list, tuple)):
+        raise UncacheableArgument
+
+    return tuple(_hash_file_contents(filename) for filename in filenames)
+
+
+def files_identifier(filenames):
+    """
+    Identify a file, or sequence of files, by their absolute paths, sizes and modification times (for large files like grids).
+    """
+
+    if filenames is None:
+        return None
+
+    files_key = get_files_key(filenames)
+    if files_key is None:
+        # Unable to access a file (or it's not a filename), so let the function report the error (or handle it).
+        raise UncacheableArgument
+
+    return files_key
+
+
+def value_identifier(value):
+    """
+    Identify a value (None, bool, number, string, or a sequence or NumPy array of these).
+    """
+
+    if value is None or isinstance(value, (bool, str)):
+        return value
+
+    if isinstance(value, numbers.Integral):
+        return int(value)
+
+    if isinstance(value, numbers.Real):
+        return float(value)
+
+    if isinstance(value, np.ndarray):
+        return tuple(value_identifier(element) for element in value.tolist())
+
+    if isinstance(value, (list, tuple)):
+        return tuple(value_identifier(element) for element in value)
+
+    # Cannot identify other values (such as functions).
+    raise UncacheableArgument
+
+
+def sea_level_model_identifier(sea_level_model):
+    """
+    Identify a sea level model (the name of a bundled sea level model, or a sea level filename) by the contents of its file.
+    """
+
+    if sea_level_model is None:
+        return None
+
+    # Import here to avoid a circular import (the bundle data module is imported by the modules using this cache).
+    import pybacktrack.bundle_data
+
+    if isinstance(sea_level_model, str) and sea_level_model in pybacktrack.bundle_data.BUNDLE_SEA_LEVEL_MODELS:
+        sea_level_model = pybacktrack.bundle_data.BUNDLE_SEA_LEVEL_MODELS[sea_level_model]
+
+    return file_contents_identifier(sea_level_model)
+
+
+def dynamic_topography_model_identifier(dynamic_topography_model):
+    """
+    Identify a dynamic topography model (the name of a bundled model, or a 3-tuple of grid list filename, static polygon filename
+    and rotation filenames) by the contents of its grid list file and the paths, sizes and modification times of the files it references.
+    """
+
+    if dynamic_topography_model is None:
+        return None
+
+    # Import here to avoid a circular import (the bundle data module is imported by the modules using this cache).
+    import pybacktrack.bundle_data
+
+    if isinstance(dynamic_topography_model, str):
+        try:
+            dynamic_topography_model = pybacktrack.bundle_data.BUNDLE_DYNAMIC_TOPOGRAPHY_MODELS[dynamic_topography_model]
+        except KeyError:
+            # Not a bundled model name, so let the function report the error.
+            raise UncacheableArgument
+
+    try:
+        grid_list_filename, static_polygon_filename, rotation_filenames = dynamic_topography_model
+    except (TypeError, ValueError):
+        raise UncacheableArgument
+
+    # The grids are listed (in the first column) relative to the directory of the grid list file.
+    grid_list_directory = os.path.dirname(grid_list_filename)
+    grid_filenames = []
+    try:
+        with open(grid_list_filename, 'r') as grid_list_file:
+            for line in grid_list_file:
+                line_data = line.split()
+                if not line_data or line_data[0].startswith('#'):
+                    continue
+                grid_filenames.append(os.path.join(grid_list_directory, line_data[0]))
+    except OSError:
+        raise UncacheableArgument
+
+    return (
+        file_contents_identifier(grid_list_filename),
+        files_identifier(grid_filenames),
+        files_identifier(static_polygon_filename),
+        files_identifier(rotation_filenames))
+
+
+def _hash_file_contents(filename):
+    if not isinstance(filename, (str, os.PathLike)):
+        raise UncacheableArgument
+
+    try:
+        with open(filename, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        # Unable to read the file, so let the function report the error.
+        raise UncacheableArgument
+
+
+def _get_result_key(function, arguments, argument_identifiers, implicit_filenames):
+    """
+    Return the key (a hexadecimal hash) identifying the result of calling 'function' with 'arguments'.
+    """
+
+    key_parts = (
+        _RESULT_CACHE_VERSION,
+        pybacktrack.version.__version__,
+        function.__module__,
+        function.__qualname__,
+        tuple((argument_name, argument_identifiers[argument_name](argument_value))
+              for argument_name, argument_value in sorted(arguments.items())),
+        tuple(files_identifier(implicit_filename) if os.path.exists(implicit_filename) else None
+              for implicit_filename in implicit_filenames))
+
+    # Note: The key parts only contain None, bools, numbers, strings and (nested) tuples of these, so their 'repr' is deterministic.
+    return hashlib.sha256(repr(key_parts).encode('utf-8')).hexdigest()
+
+
+def _write_result(result_filename, result):
+    """
+    Write a result to the cache (atomically), and evict least recently used results if the cache exceeds its maximum size.
+
+    Failure to write (eg, a read-only cache directory) is silently ignored since caching is only an optimisation.
+    """
+
+    global _estimated_result_cache_size
+
+    try:
+        result_data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    result_directory = os.path.dirname(result_filename)
+    try:
+        os.makedirs(result_directory, exist_ok=True)
+
+        # Write to a temporary file in the result directory and then rename it to the result filename
+        # (so that concurrent processes never read a partially written file).
+        file_descriptor, temporary_filename = tempfile.mkstemp(dir=result_directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                temporary_file.write(result_data)
+            os.replace(temporary_filename, result_filename)
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+    except OSError:
+        return
+
+    with _result_cache_lock:
+        if _max_result_cache_size is None:
+            return
+
+        # Only list the cache directory when the cache might exceed its maximum size (rather than on every write).
+        if _estimated_result_cache_size is None:
+            _estimated_result_cache_size = get_result_cache_size()
+        else:
+            _estimated_result_cache_size += len(result_data)
+
+        if _estimated_result_cache_size > _max_result_cache_size:
+            _estimated_result_cache_size = _evict_results(int(_EVICTION_TARGET_FRACTION * _max_result_cache_size))
+
+
+def _evict_results(target_size):
+    """
+    Remove least recently used results until the total size of the cached results is at most 'target_size'.
+
+    Returns the total size of the remaining results.
+    """
+
+    # Sort by last use (modification time), oldest first.
+    result_files = sorted(_list_result_files(), key=lambda result_file: result_file[2])
+
+    total_size = sum(result_file_size for _, result_file_size, _ in result_files)
+    for result_filename, result_file_size, _ in result_files:
+        if total_size <= target_size:
+            break
+        try:
+            os.remove(result_filename)
+        except OSError:
+            # Another process might have removed it.
+            pass
+        total_size -= result_file_size
+
+    return total_size
+
+
+def _list_result_files():
+    """
+    Return a list of (filename, size, modification time) of the cached results.
+    """
+
+    cache_directory = get_cache_directory()
+    if cache_directory is None:
+        return []
+
+    result_files = []
+    try:
+        with os.scandir(os.path.join(cache_directory, _RESULT_CACHE_SUB_DIRECTORY)) as directory_entries:
+            for directory_entry in directory_entries:
+                if not directory_entry.name.endswith('.pickle'):
+                    continue
+                try:
+                    file_stat = directory_entry.stat()
+                except OSError:
+                    continue
+                result_files.append((directory_entry.path, file_stat.st_size, file_stat.st_mtime_ns))
+    except OSError:
+        # The result directory does not exist yet.
+        pass
+
+    return result_files
@@ -0,0 +1,439 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Rasterise static polygons into plate ID and appearance age grids for fast assignment of plate IDs to points.
+
+:class:`pybacktrack.StaticPolygonRaster` assigns plate IDs (and static polygon appearance ages) to points by grid lookup,
+falling back to exact point-in-polygon tests only for points in grid cells that straddle static polygon boundaries.
+"""
+
+
+import hashlib
+import math
+import numpy as np
+import pybacktrack.bundle_data
+from pybacktrack.util.cache import get_files_key, read_cached_array, write_cached_array
+import pybacktrack.util.profiling as profiling
+import pybacktrack.util.reconstruction_cache as reconstruction_cache
+import pybacktrack.version
+import pygplates
+import scipy.ndimage
+
+
+# Default grid spacing (in degrees) of the static polygon raster.
+DEFAULT_GRID_SPACING_DEGREES = 0.1
+
+# Plate ID of points not inside any static polygon (and of grid regions that need exact partitioning).
+_UNRESOLVED_PLATE_ID = -1
+
+# The static polygon boundaries are sampled at intervals no larger than this many grid cells (at the latitude of the samples).
+_BOUNDARY_SAMPLE_SPACING_IN_GRID_CELLS = 0.5
+
+# Increment this if the format (or algorithm) of the cached raster changes (so that old cached rasters are ignored).
+_RASTER_CACHE_VERSION = 1
+
+
+class StaticPolygonRaster(object):
+    """
+    Class that assigns plate IDs and static polygon appearance ages to points using grids rasterised from static polygons.
+
+    Attributes
+    ----------
+    grid_spacing_degrees : float
+        The spacing of the grid cells (in degrees).
+
+    Notes
+    -----
+    Grid cells are cell-registered and start at longitude -180 and latitude -90.
+
+    The grid cells not straddling any static polygon boundary are grouped into connected regions, where each region
+    is entirely inside one static polygon. So only one point per region is partitioned when rasterising.
+
+    .. versionadded:: 1.5
+    """
+
+    def __init__(self, static_polygon_filename, rotation_filenames, grid_spacing_degrees=DEFAULT_GRID_SPACING_DEGREES):
+        """
+        Rasterise the static polygons (or load them from the on-disk cache if previously rasterised).
+
+        Parameters
+        ----------
+        static_polygon_filename : str
+            The filename of the static polygons file.
+        rotation_filenames : list of str
+            The list of rotation filenames (used to reconstruct the static polygons to present day).
+        grid_spacing_degrees : float, optional
+            The spacing of the grid cells (in degrees). This is rounded so that an integral number of grid cells spans 180 degrees.
+            Smaller spacings result in fewer points needing exact point-in-polygon tests, but take longer to rasterise
+            (and use more memory). Defaults to 0.1 degrees.
+
+        Raises
+        ------
+        ValueError
+            If ``grid_spacing_degrees`` is not positive.
+
+        Notes
+        -----
+        Rasterising is expensive, so the grids are cached on disk (keyed by the paths, sizes and modification times
+        of the static polygon and rotation files and the grid spacing) and loaded by subsequent instances
+        (including in other processes). The cache directory is ``~/.cache/pybacktrack`` by default, or the
+        ``PYBACKTRACK_CACHE_DIR`` environment variable if set (an empty value disables caching).
+        """
+
+        if grid_spacing_degrees <= 0:
+            raise ValueError('Static polygon raster grid spacing must be positive')
+
+        self._static_polygon_filename = static_polygon_filename
+        self._rotation_filenames = rotation_filenames
+
+        # Use an integral number of grid cells in latitude (and twice that in longitude).
+        self._num_latitudes = max(1, int(round(180.0 / grid_spacing_degrees)))
+        self._num_longitudes = 2 * self._num_latitudes
+        self.grid_spacing_degrees = 180.0 / self._num_latitudes
+
+        # Load the raster from the on-disk cache (if possible), otherwise rasterise the static polygons (and cache the raster).
+        #
+        # The raster consists of a grid of region labels and a table of the plate ID and appearance age of each region label.
+        files_key = get_files_key([static_polygon_filename] + _get_filename_list(rotation_filenames))
+        region_labels = regions = None
+        if files_key is not None:
+            cache_filename_prefix = 'static_polygon_raster_v{0}_{1}'.format(
+                _RASTER_CACHE_VERSION,
+                hashlib.sha1(repr((files_key, self._num_latitudes)).encode('utf-8')).hexdigest())
+            region_labels = read_cached_array(cache_filename_prefix + '_labels.npy')
+            regions = read_cached_array(cache_filename_prefix + '_regions.npy')
+            # Rasterise again if either file is missing or they don't match (eg, if a concurrent process was writing them).
+            if (region_labels is None or
+                regions is None or
+                region_labels.shape != (self._num_latitudes, self._num_longitudes) or
+                regions.ndim != 2 or
+                regions.shape[0] != region_labels.max() + 1):
+                region_labels = regions = None
+
+        if region_labels is None:
+            region_labels, regions = self._rasterise()
+            if files_key is not None:
+                write_cached_array(cache_filename_prefix + '_labels.npy', region_labels)
+                write_cached_array(cache_filename_prefix + '_regions.npy', regions)
+
+        self._region_labels = region_labels
+        # Plate IDs are stored as floats in the regions table (along with the appearance ages).
+        self._region_plate_ids = regions[:, 0].astype(int)
+        self._region_appearance_ages = regions[:, 1]
+
+    def partition_points(self, longitudes, latitudes):
+        """
+        Assign the plate ID and appearance age of the static polygon containing each point.
+
+        Parameters
+        ----------
+        longitudes : sequence of float
+            Longitudes of the points.
+        latitudes : sequence of float
+            Latitudes of the points.
+
+        Returns
+        -------
+        plate_ids : numpy.ndarray
+            Integer plate ID of the static polygon containing each point (or -1 if a point is not inside any static polygon).
+        appearance_ages : numpy.ndarray
+            Appearance age of the static polygon containing each point (or NaN if a point is not inside any static polygon).
+
+        Notes
+        -----
+        The result is the same as partitioning each point into the static polygons with ``pygplates.PlatePartitioner``.
+        However only points in grid cells that straddle static polygon boundaries are partitioned
+        (the remaining points are simply looked up in the grids).
+        """
+
+        longitudes = np.asarray(longitudes, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+
+        # Look up the plate IDs and appearance ages of the grid cells (regions) containing the points.
+        latitude_indices, longitude_indices = self._get_grid_cell_indices(longitudes, latitudes)
+        point_region_labels = self._region_labels[latitude_indices, longitude_indices]
+        plate_ids = self._region_plate_ids[point_region_labels]
+        appearance_ages = self._region_appearance_ages[point_region_labels]
+
+        # Exactly partition those points in grid cells that straddle static polygon boundaries.
+        unresolved_point_indices = np.nonzero(plate_ids == _UNRESOLVED_PLATE_ID)[0]
+        if unresolved_point_indices.size:
+            plate_partitioner = reconstruction_cache.get_plate_partitioner(self._static_polygon_filename, self._rotation_filenames)
+            for point_index in unresolved_point_indices:
+                plate_ids[point_index], appearance_ages[point_index] = _partition_point(
+                    plate_partitioner, latitudes[point_index], longitudes[point_index])
+
+        return plate_ids, appearance_ages
+
+    def get_unresolved_fraction(self):
+        """
+        Return the fraction of grid cells whose points are partitioned exactly (such as those straddling static polygon boundaries).
+        """
+
+        return np.count_nonzero(self._region_plate_ids[self._region_labels] == _UNRESOLVED_PLATE_ID) / self._region_labels.size
+
+    def _get_grid_cell_indices(self, longitudes, latitudes):
+        """
+        Return the latitude and longitude indices of the grid cells containing the points.
+        """
+
+        latitude_indices = np.floor((latitudes + 90.0) / self.grid_spacing_degrees).astype(int)
+        np.clip(latitude_indices, 0, self._num_latitudes - 1, out=latitude_indices)
+
+        # Longitudes wrap around the globe.
+        longitude_indices = np.floor(np.mod(longitudes + 180.0, 360.0) / self.grid_spacing_degrees).astype(int)
+        np.clip(longitude_indices, 0, self._num_longitudes - 1, out=longitude_indices)
+
+        return latitude_indices, longitude_indices
+
+    def _rasterise(self):
+        """
+        Rasterise the static polygons into a 2D grid of region labels (latitude by longitude) and
+        a table of the plate ID and appearance age of each region label (with label zero representing grid cells that straddle boundaries).
+        """
+
+        # Find the grid cells that might straddle static polygon boundaries.
+        is_boundary_cell = self._find_boundary_cells()
+
+        # Each connected region of grid cells not straddling a boundary is entirely inside the same static polygon (if any).
+        # So we only need to partition one grid cell centre in each region.
+        region_labels, num_regions = scipy.ndimage.label(~is_boundary_cell, output=np.int32)
+        # The first grid cell in each region.
+        region_labels_found, region_cell_indices = np.unique(region_labels.ravel(), return_index=True)
+        
+        # Plate ID and appearance age of each region (label zero contains the boundary cells, which remain unresolved).
+        region_plate_ids = np.full(num_regions + 1, float(_UNRESOLVED_PLATE_ID))
+        region_appearance_ages = np.full(num_regions + 1, np.nan)
+        plate_partitioner = reconstruction_cache.get_plate_partitioner(self._static_polygon_filename, self._rotation_filenames)
+        for region_label, region_cell_index in zip(region_labels_found, region_cell_indices):
+            if region_label == 0:
+                continue
+            latitude_index, longitude_index = np.unravel_index(region_cell_index, region_labels.shape)
+            # Regions outside all static polygons remain unresolved (these should be rare).
+            region_plate_ids[region_label], region_appearance_ages[region_label] = _partition_point(
+                plate_partitioner,
+                -90.0 + (latitude_index + 0.5) * self.grid_spacing_degrees,
+                -180.0 + (longitude_index + 0.5) * self.grid_spacing_degrees)
+        
+        return region_labels, np.column_stack((region_plate_ids, region_appearance_ages))
+
+    def _find_boundary_cells(self):
+        """
+        Return a 2D boolean array that is True for grid cells that might straddle static polygon boundaries.
+
+        The static polygon boundaries are densely sampled such that consecutive samples are in the same or adjacent grid cells.
+        So every cell crossed by a boundary is one of the (up to four) cells spanned by a pair of consecutive samples.
+        """
+
+        is_boundary_cell = np.zeros((self._num_latitudes, self._num_longitudes), dtype=bool)
+
+        # Static polygons reconstructed to present day (the same polygons that points are partitioned into).
+        reconstructed_static_polygons = []
+        pygplates.reconstruct(
+            reconstruction_cache.get_static_polygons(self._static_polygon_filename),
+            reconstruction_cache.get_rotation_model(self._rotation_filenames),
+            reconstructed_static_polygons,
+            0.0)
+
+        grid_spacing_radians = math.radians(self.grid_spacing_degrees)
+        for reconstructed_static_polygon in reconstructed_static_polygons:
+            polygon = reconstructed_static_polygon.get_reconstructed_geometry()
+            # Limit the length of polygon edges (so that an edge doesn't bulge much towards the poles compared to its end points).
+            polygon = polygon.to_tessellated(min(grid_spacing_radians, math.radians(1.0)))
+
+            rings = [polygon.get_exterior_ring_points()]
+            rings.extend(polygon.get_interior_ring_points(interior_ring_index)
+                         for interior_ring_index in range(polygon.get_number_of_interior_rings()))
+            for ring in rings:
+                ring_points = np.array([point.to_xyz() for point in ring])
+
+                boundary_longitudes, boundary_latitudes = self._sample_ring(ring_points)
+                latitude_indices, longitude_indices = self._get_grid_cell_indices(boundary_longitudes, boundary_latitudes)
+                
+                # Consecutive samples are in the same or adjacent grid cells, and the (short) boundary segment between them
+                # only crosses the grid cells spanned by them (ie, the cells in the latitude/longitude bounding box of the two samples).
+                next_latitude_indices = np.roll(latitude_indices, -1)
+                next_longitude_indices = np.roll(longitude_indices, -1)
+                for cell_latitude_indices in (latitude_indices, next_latitude_indices):
+                    for cell_longitude_indices in (longitude_indices, next_longitude_indices):
+                        is_boundary_cell[cell_latitude_indices, cell_longitude_indices] = True
+
+        # Grid cells adjacent to the poles converge to a point, so always partition points in those cells exactly.
+        is_boundary_cell[0] = True
+        is_boundary_cell[-1] = True
+
+        return is_boundary_cell
+
+    def _sample_ring(self, ring_points):
+        """
+        Sample the closed ring of (x,y,z) points such that consecutive samples are no further apart than
+        half a grid cell (in longitude and latitude).
+
+        Returns the longitudes and latitudes (in degrees) of the samples.
+        """
+
+        start_points = ring_points
+        end_points = np.roll(ring_points, -1, axis=0)
+
+        # The angular length of each ring edge.
+        edge_angles = np.arccos(np.clip(np.sum(start_points * end_points, axis=1), -1.0, 1.0))
+
+        # The distance across a grid cell in longitude shrinks towards the poles.
+        # So use the latitude of the edge end point closest to a pole (plus a margin for the great circle arc bulging towards the pole).
+        max_abs_edge_latitudes = np.arcsin(np.clip(np.maximum(np.abs(start_points[:, 2]), np.abs(end_points[:, 2])), -1.0, 1.0))
+        max_abs_edge_latitudes = np.minimum(max_abs_edge_latitudes + math.radians(1.0) + math.radians(self.grid_spacing_degrees), 0.5 * math.pi)
+        grid_spacing_radians = math.radians(self.grid_spacing_degrees)
+        sample_spacings = _BOUNDARY_SAMPLE_SPACING_IN_GRID_CELLS * grid_spacing_radians * np.maximum(
+            np.cos(max_abs_edge_latitudes),
+            # Near the poles the grid cells are always partitioned exactly, so there's no need to sample more densely than this.
+            math.sin(grid_spacing_radians))
+
+        # Number of samples along each edge (excluding the edge end point, which is the start point of the next edge).
+        num_edge_samples = np.maximum(1, np.ceil(edge_angles / sample_spacings).astype(int))
+
+        # Interpolate samples along each edge (and project them onto the sphere).
+        edge_indices = np.repeat(np.arange(len(ring_points)), num_edge_samples)
+        edge_sample_indices = np.arange(edge_indices.size) - np.repeat(np.cumsum(num_edge_samples) - num_edge_samples, num_edge_samples)
+        interpolation = (edge_sample_indices / num_edge_samples[edge_indices])[:, np.newaxis]
+        samples = (1.0 - interpolation) * start_points[edge_indices] + interpolation * end_points[edge_indices]
+        samples /= np.linalg.norm(samples, axis=1)[:, np.newaxis]
+
+        sample_longitudes = np.degrees(np.arctan2(samples[:, 1], samples[:, 0]))
+        sample_latitudes = np.degrees(np.arcsin(np.clip(samples[:, 2], -1.0, 1.0)))
+
+        return sample_longitudes, sample_latitudes
+
+
+def _get_filename_list(filenames):
+    """
+    Return a list of filenames given a single filename or a sequence of filenames.
+    """
+
+    if isinstance(filenames, str):
+        return [filenames]
+
+    return list(filenames)
+
+
+def _partition_point(plate_partitioner, latitude, longitude):
+    """
+    Return the plate ID and appearance age of the static polygon containing the point, or (-1, NaN) if not contained by any.
+    """
+
+    partitioning_plate = plate_partitioner.partition_point(pygplates.PointOnSphere(latitude, longitude))
+    if not partitioning_plate:
+        return _UNRESOLVED_PLATE_ID, float('nan')
+
+    partitioning_feature = partitioning_plate.get_feature()
+    appearance_age, _ = partitioning_feature.get_valid_time()
+
+    return partitioning_feature.get_reconstruction_plate_id(), appearance_age
+
+
+########################
+# Command-line parsing #
+########################
+
+def main():
+
+    __description__ = \
+        """Rasterise static polygons into plate ID and appearance age grids (cached on disk).
+
+    The cached grids are subsequently used to quickly assign plate IDs to points (such as when reconstructing paleobathymetry
+    with the '--static_polygon_raster_grid_spacing' option). Running this ahead of time avoids rasterising during the first such run.
+
+    The cache directory is '~/.cache/pybacktrack' by default, or the 'PYBACKTRACK_CACHE_DIR' environment variable if set.
+
+    NOTE: Separate the positional and optional arguments with '--' (workaround for bug in argparse module).
+    For example...
+
+    python -m pybacktrack.util.static_polygon_raster_cli -g 0.5
+    """
+
+    import argparse
+    import time
+
+    def parse_positive_float(value_string):
+        try:
+            value = float(value_string)
+        except ValueError:
+            raise argparse.ArgumentTypeError("%s is not a number" % value_string)
+
+        if value <= 0:
+            raise argparse.ArgumentTypeError("%g is not a positive number" % value)
+
+        return value
+
+    #
+    # Gather command-line options.
+    #
+
+    # The command-line parser.
+    parser = argparse.ArgumentParser(description=__description__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('--version', action='version', version=pybacktrack.version.__version__)
+
+    parser.add_argument(
+        '-g', '--grid_spacing', type=parse_positive_float,
+        default=DEFAULT_GRID_SPACING_DEGREES,
+        metavar='grid_spacing',
+        help='The grid spacing (in degrees) of the rasterised static polygons. Defaults to {0} degrees.'.format(DEFAULT_GRID_SPACING_DEGREES))
+
+    parser.add_argument(
+        '-p', '--static_polygon_filename', type=str,
+        default=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME,
+        metavar='static_polygon_filename',
+        help='Optional filename of the static polygons. Defaults to the bundled static polygons.')
+
+    parser.add_argument(
+        '-r', '--rotation_filenames', type=str, nargs='+',
+        default=pybacktrack.bundle_data.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES,
+        metavar='rotation_filename',
+        help='Optional one or more rotation files. Defaults to the bundled rotation files.')
+
+    # Optionally profile the script (and any worker processes when using multiple CPUs).
+    profiling.add_profile_argument(parser)
+
+    # Parse command-line options.
+    args = parser.parse_args()
+
+    # Start profiling (if requested) now that the command-line options have been parsed.
+    if args.profile:
+        profiling.start_profiling(args.profile)
+
+    start_time = time.time()
+    static_polygon_raster = StaticPolygonRaster(args.static_polygon_filename, args.rotation_filenames, args.grid_spacing)
+
+    print('Rasterised static polygons at {0:g} degree spacing in {1:.1f} seconds ({2:.1f}% of grid cells straddle polygon boundaries).'.format(
+        static_polygon_raster.grid_spacing_degrees,
+        time.time() - start_time,
+        100.0 * static_polygon_raster.get_unresolved_fraction()))
+
+
+if __name__ == '__main__':
+
+    import sys
+
+    try:
+        main()
+        sys.exit(0)
+    except Exception as exc:
+        print('ERROR: {0}'.format(exc), file=sys.stderr)
+        # Uncomment these to print traceback to location of raised exception.
+        # import traceback
+        # traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,239 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Processing of wells shared by the backtrack and backstrip modules.
+
+This includes decompacting many wells across CPUs, adding sea levels and paleo locations to decompacted wells,
+sampling grids at well locations (using GMT), and generating the output filenames of multiple wells.
+"""
+
+
+import functools
+from functools import partial
+import multiprocessing
+import os.path
+from pybacktrack.util.cache import get_files_key
+from pybacktrack.util.call_system_command import call_system_command
+import pybacktrack.util.profiling as profiling
+import pygplates
+import re
+
+
+# Maximum number of grid samples (at single well locations) to cache.
+#
+# Note: The cache is shared by backtracking and backstripping (eg, both sample the total sediment thickness grid).
+_MAX_GRID_SAMPLE_CACHE_SIZE = 4096
+
+
+def decompact_wells(
+        decompact_well_function,
+        wells,
+        times,
+        num_cpus):
+    """
+    Decompact wells using 'decompact_well_function(well, times)', distributing across 'num_cpus' CPUs if more than one.
+
+    'decompact_well_function' must be a module-level function (so that it can be sent to other processes).
+
+    Returns an iterator over the results of 'decompact_well_function' (one per well, in the same order as 'wells').
+    """
+
+    if num_cpus == 1:
+        for well in wells:
+            yield decompact_well_function(well, times)
+        return
+
+    # Send a few wells per task to reduce inter-process communication (but not so many that the CPUs are unevenly loaded).
+    chunksize = max(1, min(16, len(wells) // (4 * num_cpus)))
+
+    with multiprocessing.Pool(num_cpus) as pool:
+        for decompaction in pool.imap(profiling.profile_pool_function(partial(decompact_well_function, times=times)), wells, chunksize):
+            yield decompaction
+        profiling.join_pool(pool)
+
+
+def get_num_decompaction_times(
+        wells,
+        times=None):
+    """
+    Returns the number of distinct times that the wells will be decompacted at.
+
+    This is the number of times in 'times' (if specified), otherwise the number of distinct top ages of the stratigraphic units in the wells.
+    """
+
+    if times is not None:
+        return len(set(times))
+
+    return len(set(stratigraphic_unit.top_age for well in wells for stratigraphic_unit in well.stratigraphic_units))
+
+
+def add_sea_level(
+        well,
+        decompacted_wells,
+        sea_level):
+    """
+    Calculate average sea levels (relative to present day) for the stratigraphic layers in a well.
+
+    The sea level (relative to present day) is integrated over the period of deposition of each
+    stratigraphic layer (in decompacted wells) and added as a 'sea_level' attribute to each decompacted well.
+
+    sea_level: A SeaLevel object for integrating sea level over time periods.
+    """
+
+    # Average sea level over the period of deposition of the surface unit of all decompacted wells (in one call).
+    sea_levels = sea_level.get_average_levels(
+        [decompacted_well.surface_unit.bottom_age for decompacted_well in decompacted_wells],
+        [decompacted_well.surface_unit.top_age for decompacted_well in decompacted_wells])
+
+    for decompacted_well, decompacted_sea_level in zip(decompacted_wells, sea_levels.tolist()):
+        decompacted_well.sea_level = decompacted_sea_level
+
+
+def add_paleo_locations(
+        well,
+        decompacted_wells,
+        rotation_model,
+        plate_partitioner,
+        anchor_plate_id=0):
+    """
+    Reconstruct the present day location of the well to the age of each decompacted well (the top age of its surface unit).
+
+    The reconstructed well location is added as 'paleo_longitude' and 'paleo_latitude' attributes of each decompacted well.
+    """
+
+    # Present day well location.
+    present_day_well_location = pygplates.PointOnSphere(well.latitude, well.longitude)
+
+    # Find the plate ID of the static polygon containing the well location (or anchor plate if not in any plates).
+    plate_containing_well_location = plate_partitioner.partition_point(present_day_well_location)
+    if plate_containing_well_location:
+        well_reconstruction_plate_id = plate_containing_well_location.get_feature().get_reconstruction_plate_id()
+    else:
+        # Shouldn't really get here if static polygons have global coverage at present day.
+        well_reconstruction_plate_id = anchor_plate_id
+
+    for decompacted_well in decompacted_wells:
+        # The current decompaction time (age of the surface of the current decompacted column of the well).
+        well_decompaction_time = decompacted_well.get_age()
+        # Get rotation from present day to current decompaction time using the reconstruction plate ID of the well location.
+        #
+        # NOTE: We specify 'from_time=0' since there could be a non-zero finite rotation at present day (generally there shouldn't be) and
+        #       we don't want our present day well location to move when 'well_decompaction_time' is zero (or have this offset for non-zero times).
+        rotation = rotation_model.get_rotation(well_decompaction_time, well_reconstruction_plate_id, from_time=0, anchor_plate_id=anchor_plate_id)
+        # Reconstruct well location to current decompaction time.
+        reconstructed_well_location = rotation * present_day_well_location
+        # Store reconstructed well location as attributes in the current decompacted well.
+        decompacted_well.paleo_latitude, decompacted_well.paleo_longitude = reconstructed_well_location.to_lat_lon()
+
+
+def sample_grid(longitude, latitude, grid_filename):
+    """
+    Samples the grid file 'grid_filename' at the longitude/latitude location (in degrees).
+
+    Returns sampled float value (which can be NaN if location is in a masked region of grid).
+
+    Samples are cached (keyed by the grid file's path, size and modification time, and the location), so that
+    backtracking or backstripping the same well location again (for example, with different parameters in a long-running service)
+    does not call GMT again.
+    """
+
+    grid_file_key = get_files_key(grid_filename)
+    if grid_file_key is None:
+        # Unable to access the grid file, so let GMT report the error.
+        return _sample_grid_file(longitude, latitude, grid_filename)
+
+    return _sample_cached_grid_file(longitude, latitude, grid_filename, grid_file_key)
+
+
+@functools.lru_cache(maxsize=_MAX_GRID_SAMPLE_CACHE_SIZE)
+def _sample_cached_grid_file(longitude, latitude, grid_filename, grid_file_key):
+    # Note: 'grid_file_key' is only used as part of the cache key (so a modified grid file is sampled again).
+    return _sample_grid_file(longitude, latitude, grid_filename)
+
+
+def _sample_grid_file(longitude, latitude, grid_filename):
+
+    location_data = '{0} {1}\n'.format(longitude, latitude)
+
+    # The command-line strings to execute GMT 'grdtrack'.
+    grdtrack_command_line = ["gmt", "grdtrack", "-G{0}".format(grid_filename)]
+
+    # Call the system command.
+    stdout_data = call_system_command(grdtrack_command_line, stdin=location_data, return_stdout=True)
+
+    # GMT grdtrack returns a single line containing "longitude latitude sampled_value".
+    # Note that if GMT returns "NaN" then we'll return float('nan').
+    return float(stdout_data.split()[2])
+
+
+def sample_grid_at_locations(locations, grid_filename):
+    """
+    Samples the grid file 'grid_filename' at a sequence of (longitude, latitude) locations (in degrees).
+
+    All locations are sampled with a single call to GMT 'grdtrack' (rather than one call per location).
+
+    Returns a list of sampled float values (one per location, in the same order as 'locations').
+    A sampled value can be NaN if its location is in a masked region of grid.
+    """
+
+    if not locations:
+        return []
+
+    # Also pass the index of each location through 'grdtrack' so we can match output rows to input locations.
+    location_data = ''.join(
+        '{0} {1} {2}\n'.format(longitude, latitude, location_index)
+            for location_index, (longitude, latitude) in enumerate(locations))
+
+    # The command-line strings to execute GMT 'grdtrack'.
+    grdtrack_command_line = ["gmt", "grdtrack", "-G{0}".format(grid_filename)]
+
+    # Call the system command.
+    stdout_data = call_system_command(grdtrack_command_line, stdin=location_data, return_stdout=True)
+
+    # Any location not returned by GMT grdtrack remains NaN.
+    grid_values = [float('nan')] * len(locations)
+    for line in stdout_data.splitlines():
+        # Each line returned by GMT grdtrack contains "longitude latitude location_index sampled_value".
+        # Note that if GMT returns "NaN" then we'll return float('nan').
+        line_data = line.split()
+        if len(line_data) < 4:
+            continue
+        grid_values[int(float(line_data[2]))] = float(line_data[3])
+
+    return grid_values
+
+
+def get_well_output_filename(output_filename, well_filename):
+    """
+    Generate the output filename of a well (when backtracking or backstripping multiple wells).
+
+    If 'output_filename' is a template string containing the 'well' identifier then all occurrences of the 'well' identifier
+    are replaced with the well filename (excluding directory and extension).
+    Otherwise "_" + well filename (excluding directory) is appended to 'output_filename'.
+    """
+
+    well_basename = os.path.basename(well_filename)
+
+    # The 'well' identifier can be "${well}", or "$well" NOT followed by an alphanumeric character (including underscore).
+    # See string.Template for more details.
+    if re.search(r'(\$\{well\}|\$well(?![A-Za-z0-9_]))', output_filename):
+        # Note: We use a template string instead of more a general format string because the former is more security conscious.
+        from string import Template
+        well_name, _ = os.path.splitext(well_basename)
+        return Template(output_filename).safe_substitute(well=well_name)
+
+    return '{0}_{1}'.format(output_filename, well_basename)
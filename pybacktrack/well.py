@@ -26,8 +26,12 @@
 
 import copy
 import math
-from pybacktrack.lithology import create_lithology_from_components
+import numbers
+import numpy as np
+from pybacktrack.lithology import Lithology, create_lithology_from_components
 import warnings
+import zipfile
+import zlib
 
 
 # Density in kg/m3.
@@ -106,6 +110,8 @@ class StratigraphicUnit(object):
 
         # Full decompacted thickness is calculated on first call to 'self.get_fully_decompacted_thickness()'.
         self._fully_decompacted_thickness = None
+        # Grain thickness is calculated on first call to 'self._get_grain_thickness()'.
+        self._grain_thickness = None
         
         # Add any extra attributes requested.
         if other_attributes is not None:
@@ -144,13 +150,24 @@ class StratigraphicUnit(object):
         .. versionadded:: 1.4
         """
         
+        return StratigraphicUnit._create_partial_unit_at_depth(unit, top_age, unit._calc_compacted_depth(top_age))
+    
+    @staticmethod
+    def _create_partial_unit_at_depth(unit, top_age, top_depth):
+        """_create_partial_unit_at_depth(unit, top_age, top_depth)
+        Same as :meth:`create_partial_unit` but with the compacted top depth (at ``top_age``) already calculated.
+        
+        .. versionadded:: 1.5
+        """
+        
         # Copy 'unit' and modify the top age and depth.
         new_unit = copy.copy(unit)
         new_unit.top_age = top_age
-        new_unit.top_depth = unit._calc_compacted_depth(top_age)
+        new_unit.top_depth = top_depth
 
-        # Need to re-calculate fully decompacted thickness since new partial unit has a different compacted thickness.
+        # Need to re-calculate fully decompacted thickness (and grain thickness) since new partial unit has a different compacted thickness.
         new_unit._fully_decompacted_thickness = None
+        new_unit._grain_thickness = None
 
         # Fully decompacted top depth will be different (since the fully decompacted thickness of the new partial unit is different).
         #
@@ -167,6 +184,39 @@ class StratigraphicUnit(object):
 
         return new_unit
     
+    @staticmethod
+    def _create_from_lithology(top_age, bottom_age, top_depth, bottom_depth, lithology, lithology_components, other_attributes=None):
+        """_create_from_lithology(top_age, bottom_age, top_depth, bottom_depth, lithology, lithology_components, other_attributes=None)
+        Create a stratigraphic unit from an already combined lithology (rather than from lithology components and a lithologies dictionary).
+        
+        This is used to convert a :class:`pybacktrack.WellArrays` back to a :class:`pybacktrack.Well`.
+        
+        .. versionadded:: 1.5
+        """
+        
+        # Bypass '__init__()' since it creates the combined lithology from the lithology components.
+        unit = StratigraphicUnit.__new__(StratigraphicUnit)
+        
+        unit.top_age = top_age
+        unit.bottom_age = bottom_age
+        unit.top_depth = top_depth
+        unit.bottom_depth = bottom_depth
+        
+        unit.lithology = lithology
+        unit.lithology_components = lithology_components
+        
+        # Full decompacted thickness is calculated on first call to 'unit.get_fully_decompacted_thickness()'.
+        unit._fully_decompacted_thickness = None
+        # Grain thickness is calculated on first call to 'unit._get_grain_thickness()'.
+        unit._grain_thickness = None
+        
+        # Add any extra attributes requested.
+        if other_attributes is not None:
+            for name, value in other_attributes.items():
+                setattr(unit, name, value)
+        
+        return unit
+    
     @staticmethod
     def _create_zero_thickness_surface_unit(surface_unit, surface_age):
         """_create_zero_thickness_surface_unit(surface_unit, surface_age)
@@ -202,8 +252,9 @@ class StratigraphicUnit(object):
         # Note: The top age will be used as the age of a DecompactedWell (containing this surface unit, and all units underneath that).
         new_surface_unit.top_age = surface_age
 
-        # Need to re-calculate fully decompacted thickness since new surface unit has a different compacted thickness (it'll be zero).
+        # Need to re-calculate fully decompacted thickness (and grain thickness) since new surface unit has a different compacted thickness (it'll be zero).
         new_surface_unit._fully_decompacted_thickness = None
+        new_surface_unit._grain_thickness = None
 
         # Fully decompacted bottom depth will be different (since the fully decompacted thickness of the new surface unit is different - it's zero).
         #
@@ -253,8 +304,9 @@ class StratigraphicUnit(object):
         # Note: The top age will be used as the age of a DecompactedWell (containing this base unit as its only unit).
         new_base_unit.top_age = new_base_unit.bottom_age = base_age
 
-        # Need to re-calculate fully decompacted thickness since new base unit has a different compacted thickness (it'll be zero).
+        # Need to re-calculate fully decompacted thickness (and grain thickness) since new base unit has a different compacted thickness (it'll be zero).
         new_base_unit._fully_decompacted_thickness = None
+        new_base_unit._grain_thickness = None
 
         # Fully decompacted bottom depth will be different (since the fully decompacted thickness of the new base unit is different - it's zero).
         #
@@ -271,7 +323,7 @@ class StratigraphicUnit(object):
 
         return new_base_unit
     
-    def calc_decompacted_thickness(self, decompacted_depth_to_top):
+    def calc_decompacted_thickness(self, decompacted_depth_to_top, *, initial_decompacted_thickness=None):
         """
         Calculate decompacted thickness when top of this stratigraphic unit is at a decompacted depth.
         
@@ -279,11 +331,19 @@ class StratigraphicUnit(object):
         ----------
         decompacted_depth_to_top : float
             Decompacted depth of the top of this stratigraphic unit.
+        initial_decompacted_thickness : float, optional
+            Initial estimate of the decompacted thickness (such as the decompacted thickness of this unit at a nearby age).
+            A close estimate reduces the number of iterations needed to converge. Defaults to the present day thickness.
         
         Returns
         -------
         float
             Decompacted thickness.
+        
+        Notes
+        -----
+        .. versionchanged:: 1.5
+           Added the ``initial_decompacted_thickness`` parameter.
         """
         
         present_day_thickness = self.bottom_depth - self.top_depth
@@ -325,17 +385,21 @@ class StratigraphicUnit(object):
         #    T = a * exp(-T/decay) + b
         #
         # ...can be solved iteratively by repeatedly substituting the left hand side back into the right hand side
-        # until T converges on a solution. The initial T is chosen to be 't' (the present day thickness).
+        # until T converges on a solution. The initial T is chosen to be 't' (the present day thickness),
+        # unless an initial estimate was provided.
         #
         
         # Constants 'a' and 'b' are calculated outside the iteration loop for efficiency.
+        #
+        # Note that 'b + a' is the grain thickness of this unit (the same for all decompacted depths), so it's only calculated once.
         a = -porosity_decay * surface_porosity * math.exp(-decompacted_depth_to_top / porosity_decay)
-        b = (-a + present_day_thickness +
-             porosity_decay * surface_porosity * math.exp(-self.top_depth / porosity_decay) *
-             (math.exp(-present_day_thickness / porosity_decay) - 1))
+        b = -a + self._get_grain_thickness()
         
-        # Start out with initial estimate - choose the present day thickness.
-        decompacted_thickness = present_day_thickness
+        # Start out with initial estimate - choose the present day thickness (unless an estimate was provided).
+        if initial_decompacted_thickness is not None:
+            decompacted_thickness = initial_decompacted_thickness
+        else:
+            decompacted_thickness = present_day_thickness
         
         # Limit the number of iterations in case we never converge.
         # Although should converge within around 20 iterations (for 1e-6 accuracy).
@@ -479,7 +543,6 @@ class StratigraphicUnit(object):
             return 0.0
         
         surface_porosity = self.lithology.surface_porosity
-        porosity_decay = self.lithology.porosity_decay
         
         #
         # Assuming the porosity decays exponentially and that the volume of grains within a unit never changes we get:
@@ -503,15 +566,44 @@ class StratigraphicUnit(object):
         #
         #    T = [t + decay * porosity(0) * exp(-d/decay) * (exp(-t/decay) - 1)] / [1 - porosity(0)]
         #
-        fully_decompacted_thickness = (
-            (present_day_thickness +
-                porosity_decay * surface_porosity * math.exp(-self.top_depth / porosity_decay) *
-                (math.exp(-present_day_thickness / porosity_decay) - 1)) /
-            (1 - surface_porosity)
-        )
+        # ...where the numerator is the grain thickness.
+        #
+        fully_decompacted_thickness = self._get_grain_thickness() / (1 - surface_porosity)
         
         return fully_decompacted_thickness
     
+    def _get_grain_thickness(self):
+        """
+        Get the grain thickness of this stratigraphic unit (the thickness with all pore space removed). It is calculated on first call.
+        
+        Returns
+        -------
+        float
+            Grain thickness.
+        
+        Notes
+        -----
+        This is 'Integral(1 - porosity(z), z = d -> d + t)' where 'd' is present day depth to top of unit and 't' is present day thickness of unit.
+        The volume of grains in a unit never changes, so this is calculated once and then used each time the unit is decompacted.
+        """
+        
+        # Calculate it if haven't already.
+        if self._grain_thickness is None:
+            present_day_thickness = self.bottom_depth - self.top_depth
+            if present_day_thickness == 0.0:
+                self._grain_thickness = 0.0
+            else:
+                surface_porosity = self.lithology.surface_porosity
+                porosity_decay = self.lithology.porosity_decay
+                
+                # See 'calc_decompacted_thickness()' for the derivation.
+                self._grain_thickness = (
+                    present_day_thickness +
+                    porosity_decay * surface_porosity * math.exp(-self.top_depth / porosity_decay) *
+                    (math.exp(-present_day_thickness / porosity_decay) - 1))
+        
+        return self._grain_thickness
+    
     def _calc_compacted_depth(self, age):
         """
         Calculate the compacted depth of this stratigraphic unit at ``age`` assuming a constant sediment deposition rate for this unit.
@@ -782,6 +874,9 @@ class Well(object):
            Added the ``age`` parameter.
         .. versionchanged:: 1.5
            No longer returns ``None`` when ``age`` is specified but is older than bottom age of the well.
+        .. versionchanged:: 1.5
+           When ``age`` is not specified, the decompacted thicknesses at each age are used as the initial estimates
+           when decompacting at the next age (which speeds up convergence).
         """
         if age is None:
             #
@@ -792,6 +887,9 @@ class Well(object):
             # Each decompacted well represents decompaction at the age of a stratigraphic unit in the well.
             decompacted_wells = []
             
+            # Initial estimates of the decompacted thicknesses of the units to decompact (None means use present day thicknesses).
+            initial_decompacted_thicknesses = None
+            
             # Iterate over the stratigraphic units - they are sorted by age (youngest to oldest).
             #
             # Note that the first decompacted well doesn't really need decompaction (it's compacted) but we do it anyway
@@ -808,14 +906,119 @@ class Well(object):
                 #    partial_unit = StratigraphicUnit.create_partial_unit(unit, unit.top_age)
                 #    units_to_decompact[unit_index] = partial_unit
 
-                decompacted_well = self._decompact_units(units_to_decompact)
+                decompacted_well = self._decompact_units(units_to_decompact, initial_decompacted_thicknesses)
                 decompacted_wells.append(decompacted_well)
+                
+                # At the next age the current surface unit is stripped off, so the units beneath it are buried less deeply.
+                # Their decompacted thicknesses at the current age are much closer to their decompacted thicknesses at the
+                # next age than their present day thicknesses are (since decompacted thicknesses only increase with age).
+                initial_decompacted_thicknesses = [
+                    decompacted_unit.decompacted_thickness
+                    for decompacted_unit in decompacted_well.decompacted_stratigraphic_units[1:]]
             
             return decompacted_wells
 
         #
         # An age was specified, so return a single decompacted well representing the state of decompaction at the specified age.
         #
+        units_to_decompact, _ = self._get_units_to_decompact(age)
+        
+        return self._decompact_units(units_to_decompact)
+    
+    def decompact_multiple_ages(
+            self,
+            ages):
+        """
+        Finds decompacted total sediment thickness at each of ``ages``.
+        
+        Parameters
+        ----------
+        ages : sequence of float
+            The ages to decompact at.
+        
+        Returns
+        -------
+        list of :class:`pybacktrack.DecompactedWell`
+            The decompacted wells with one per age (in the same order as ``ages``).
+        
+        Notes
+        -----
+        This is equivalent to ``[well.decompact(age) for age in ages]`` (to within the tolerance of the decompaction convergence),
+        but is faster when successive ages are close together (such as densely sampled ages). This is because the
+        decompacted thickness of each stratigraphic unit at an age is the initial estimate when decompacting at the next age.
+        
+        .. versionadded:: 1.5
+        """
+        
+        decompacted_wells = []
+        
+        # The most recent decompacted thickness of each stratigraphic unit in this well (None if not yet decompacted).
+        previous_decompacted_thicknesses = [None] * len(self.stratigraphic_units)
+        
+        for age in ages:
+            units_to_decompact, unit_indices = self._get_units_to_decompact(age)
+            
+            # Start with the decompacted thicknesses at the previous age.
+            initial_decompacted_thicknesses = [
+                previous_decompacted_thicknesses[unit_index] if unit_index is not None else None
+                for unit_index in unit_indices]
+            
+            decompacted_well = self._decompact_units(units_to_decompact, initial_decompacted_thicknesses)
+            decompacted_wells.append(decompacted_well)
+            
+            for unit_index, decompacted_unit in zip(unit_indices, decompacted_well.decompacted_stratigraphic_units):
+                if unit_index is not None:
+                    previous_decompacted_thicknesses[unit_index] = decompacted_unit.decompacted_thickness
+        
+        return decompacted_wells
+    
+    def decompact_at_times(
+            self,
+            times):
+        """
+        Finds decompacted total sediment thickness, average density and isostatic correction at each of ``times`` (returned as arrays).
+        
+        Parameters
+        ----------
+        times : array_like
+            The times (ages) to decompact at.
+        
+        Returns
+        -------
+        :class:`pybacktrack.DecompactedWellArrays`
+            The decompacted well at all times (in the same order as ``times``). It contains arrays (with one element per time) of the
+            surface age (``ages``), total decompacted thickness (``total_decompacted_thicknesses``), average decompacted density
+            (``average_decompacted_densities``) and isostatic correction (``get_sediment_isostatic_corrections()``).
+        
+        Raises
+        ------
+        ValueError
+            If this well has no stratigraphic units.
+        
+        Notes
+        -----
+        This is much faster than ``[well.decompact(time) for time in times]`` for many times (such as densely sampled times).
+        The surface unit at each time is located by bisection, and all times are decompacted together using NumPy arrays
+        (including the partial surface units of times in the middle of a stratigraphic unit).
+        The results match :meth:`decompact` (to within the tolerance of the decompaction convergence).
+        
+        Use :meth:`pybacktrack.DecompactedWellArrays.create_decompacted_wells` (with this well) to convert the result to
+        a list of :class:`pybacktrack.DecompactedWell`.
+        
+        .. seealso:: :class:`pybacktrack.WellArrays`
+        
+        .. versionadded:: 1.5
+        """
+        
+        return WellArrays.create_from_well(self).decompact(times)
+    
+    def _get_units_to_decompact(
+            self,
+            age):
+        # Returns the stratigraphic units to decompact at 'age' (a surface unit at 'age' and the units beneath it).
+        #
+        # Returns 2-tuple (units_to_decompact, unit_indices) where 'unit_indices' contains the index (into 'self.stratigraphic_units')
+        # of the unit that each unit to decompact was created from, or None if it's a new zero-thickness unit.
     
         # Find the stratigraphic unit containing the specified age.
         # This is the surface unit at the specified age.
@@ -837,6 +1040,7 @@ class Well(object):
                 # (which means it's possible that 'age' is not recorded in the well).
                 if age >= surface_unit.top_age:
                     units_to_decompact = self.stratigraphic_units[surface_unit_index:]
+                    unit_indices = list(range(surface_unit_index, len(self.stratigraphic_units)))
                     # If the requested age is in the middle of the current surface unit then
                     # replace the surface unit (to decompact) with a new partial surface unit
                     # that has top age matching the requested age and top depth adjusted appropriately.
@@ -844,7 +1048,7 @@ class Well(object):
                     if age > surface_unit.top_age:
                         partial_surface_unit = StratigraphicUnit.create_partial_unit(surface_unit, age)
                         units_to_decompact[0] = partial_surface_unit
-                    return self._decompact_units(units_to_decompact)
+                    return units_to_decompact, unit_indices
         
         # No stratigraphic unit was found that contains 'age'.
         #
@@ -865,6 +1069,7 @@ class Well(object):
             units_to_decompact = self.stratigraphic_units[:]
             surface_unit = self.stratigraphic_units[0]
             units_to_decompact.insert(0, StratigraphicUnit._create_zero_thickness_surface_unit(surface_unit, age))
+            unit_indices = [None] + list(range(len(self.stratigraphic_units)))
         else:
             # 'age' is older than the well's bottom age.
             #
@@ -878,14 +1083,19 @@ class Well(object):
             units_to_decompact = []
             base_unit = self.stratigraphic_units[-1]
             units_to_decompact.append(StratigraphicUnit._create_zero_thickness_base_unit(base_unit, age))
+            unit_indices = [None]
 
-        return self._decompact_units(units_to_decompact)
+        return units_to_decompact, unit_indices
     
     def _decompact_units(
             self,
-            units):
+            units,
+            initial_decompacted_thicknesses=None):
         # Decompact the specified stratigraphic units (which is a surface unit at a particular age and the units beneath it).
         #
+        # If 'initial_decompacted_thicknesses' is specified then it contains an initial estimate of the decompacted thickness
+        # of each unit (or None to use its present day thickness), such as its decompacted thickness at a nearby age.
+        #
         # Returns a DecompactedWell.
         
         surface_unit = units[0]
@@ -897,10 +1107,13 @@ class Well(object):
         total_decompacted_thickness = 0.0
         
         # Starting at the current surface unit, iterate over all units beneath it.
-        for unit in units:
+        for unit_index, unit in enumerate(units):
             # Decompact the current unit assuming there is 'total_decompacted_thickness' depth
             # of sediment (from other units) above it.
-            unit_decompacted_thickness = unit.calc_decompacted_thickness(total_decompacted_thickness)
+            unit_decompacted_thickness = unit.calc_decompacted_thickness(
+                total_decompacted_thickness,
+                initial_decompacted_thickness=(
+                    initial_decompacted_thicknesses[unit_index] if initial_decompacted_thicknesses is not None else None))
             
             # Calculate decompacted density of unit (average density over thickness).
             unit_decompacted_density = unit.calc_decompacted_density(unit_decompacted_thickness, total_decompacted_thickness)
@@ -917,6 +1130,331 @@ class Well(object):
             
         return decompacted_well
 
+    def decompact_ensemble(
+            self,
+            ages,
+            num_samples,
+            *,
+            density_scales=None,
+            surface_porosity_scales=None,
+            porosity_decay_scales=None,
+            age_offsets=None,
+            total_sediment_thickness_offsets=None):
+        """
+        Finds decompacted total sediment thickness at each of ``ages`` for an ensemble of perturbed versions of this well.
+        
+        Each ensemble member is this well with its lithology parameters, stratigraphic ages and total sediment thickness perturbed.
+        All ensemble members (and all ages) are decompacted together using NumPy arrays (rather than decompacting one well at a time).
+        
+        Parameters
+        ----------
+        ages : sequence of float
+            The ages to decompact each ensemble member at.
+        num_samples : int
+            Number of ensemble members.
+        density_scales : array_like, optional
+            Factors multiplying the lithology density of each stratigraphic unit.
+            Must be broadcastable to shape (``num_samples``, number of stratigraphic units).
+            Defaults to no scaling.
+        surface_porosity_scales : array_like, optional
+            Factors multiplying the lithology surface porosity of each stratigraphic unit.
+            Must be broadcastable to shape (``num_samples``, number of stratigraphic units).
+            Defaults to no scaling.
+        porosity_decay_scales : array_like, optional
+            Factors multiplying the lithology porosity decay of each stratigraphic unit.
+            Must be broadcastable to shape (``num_samples``, number of stratigraphic units).
+            Defaults to no scaling.
+        age_offsets : array_like, optional
+            Offsets (in My) added to the stratigraphic unit boundary ages, where the first boundary is the top age of the
+            surface unit and the remaining boundaries are the bottom ages of the units (from youngest to oldest).
+            Must be broadcastable to shape (``num_samples``, number of stratigraphic units + 1).
+            Perturbed ages are clamped to be non-negative, and re-sorted (so that stratigraphic units remain ordered by age).
+            Defaults to no offset.
+        total_sediment_thickness_offsets : array_like, optional
+            Offsets (in metres) added to the bottom depth of the deepest stratigraphic unit (ie, total sediment thickness).
+            Must be broadcastable to shape (``num_samples``,).
+            The thickness of the deepest unit is clamped to be non-negative.
+            Defaults to no offset.
+        
+        Returns
+        -------
+        total_decompacted_thicknesses : ndarray
+            Total decompacted thickness of each ensemble member at each age, with shape (``num_samples``, len(``ages``)).
+        average_decompacted_densities : ndarray
+            Average density of the entire decompacted column of each ensemble member at each age,
+            with shape (``num_samples``, len(``ages``)).
+        sediment_isostatic_corrections : ndarray
+            Isostatic correction of each ensemble member at each age, with shape (``num_samples``, len(``ages``)).
+        
+        Notes
+        -----
+        Without any perturbations, each ensemble member matches :meth:`decompact` at each age
+        (to within the tolerance of the decompaction convergence).
+        
+        .. seealso:: :meth:`pybacktrack.DecompactedWell.get_sediment_isostatic_correction`
+        
+        .. versionadded:: 1.5
+        """
+        
+        ages = np.asarray(ages, dtype=float)
+        num_ages = len(ages)
+        num_units = len(self.stratigraphic_units)
+        units_shape = (num_samples, num_units)
+        
+        # Lithology parameters of each stratigraphic unit of each ensemble member.
+        densities = np.array([unit.lithology.density for unit in self.stratigraphic_units]) * np.ones(units_shape)
+        surface_porosities = np.array([unit.lithology.surface_porosity for unit in self.stratigraphic_units]) * np.ones(units_shape)
+        porosity_decays = np.array([unit.lithology.porosity_decay for unit in self.stratigraphic_units]) * np.ones(units_shape)
+        if density_scales is not None:
+            densities *= density_scales
+        if surface_porosity_scales is not None:
+            surface_porosities *= surface_porosity_scales
+        if porosity_decay_scales is not None:
+            porosity_decays *= porosity_decay_scales
+        
+        # Stratigraphic unit boundary ages of each ensemble member (top age of surface unit followed by the bottom age of each unit).
+        boundary_ages = np.array(
+            [self.stratigraphic_units[0].top_age] + [unit.bottom_age for unit in self.stratigraphic_units]) * np.ones((num_samples, num_units + 1))
+        if age_offsets is not None:
+            boundary_ages += age_offsets
+            # Keep ages non-negative and the units ordered by age (from youngest to oldest).
+            boundary_ages = np.sort(np.maximum(boundary_ages, 0.0), axis=1)
+        top_ages = boundary_ages[:, :-1]
+        bottom_ages = boundary_ages[:, 1:]
+        
+        # Present day (compacted) depths of each stratigraphic unit of each ensemble member.
+        top_depths = np.array([unit.top_depth for unit in self.stratigraphic_units]) * np.ones(units_shape)
+        bottom_depths = np.array([unit.bottom_depth for unit in self.stratigraphic_units]) * np.ones(units_shape)
+        if total_sediment_thickness_offsets is not None:
+            bottom_depths[:, -1] = np.maximum(bottom_depths[:, -1] + total_sediment_thickness_offsets, top_depths[:, -1])
+        
+        # Decompact all ensemble members (and all ages) at once.
+        total_decompacted_thicknesses, average_decompacted_densities, _ = _decompact_units_at_ages(
+            np.broadcast_to(ages, (num_samples, num_ages)),
+            top_ages,
+            bottom_ages,
+            top_depths,
+            bottom_depths,
+            densities,
+            surface_porosities,
+            porosity_decays)
+        
+        sediment_isostatic_corrections = (
+            total_decompacted_thicknesses *
+            (_DENSITY_MANTLE - average_decompacted_densities) /
+            (_DENSITY_MANTLE - _DENSITY_WATER))
+        
+        return total_decompacted_thicknesses, average_decompacted_densities, sediment_isostatic_corrections
+
+
+def _decompact_units_at_ages(
+        ages,
+        top_ages,
+        bottom_ages,
+        top_depths,
+        bottom_depths,
+        densities,
+        surface_porosities,
+        porosity_decays,
+        surface_unit_indices=None,
+        return_unit_arrays=False):
+    """
+    Array version of 'Well.decompact()' for multiple wells (eg, ensemble members) and multiple ages.
+    
+    'ages' has shape (num_wells, num_ages) and the stratigraphic unit arrays have shape (num_wells, num_units),
+    except 'top_ages' and 'bottom_ages' which are ages of the units sorted from youngest to oldest.
+    
+    If 'surface_unit_indices' (shape (num_wells, num_ages)) is specified then it's the index of the surface unit at each age,
+    otherwise it's determined from the ages. Specifying it avoids skipping zero age-range units when decompacting at unit top ages.
+    
+    Returns 3-tuple (total_decompacted_thicknesses, average_decompacted_densities, unit_arrays) where the first two have shape
+    (num_wells, num_ages) and 'unit_arrays' is None unless 'return_unit_arrays' is True, in which case it's a 4-tuple
+    (surface_unit_indices, compacted_thicknesses, decompacted_thicknesses, decompacted_densities) where the last three
+    have shape (num_wells, num_ages, num_units) and are zero for units not yet deposited at an age.
+    """
+    
+    num_wells, num_ages = ages.shape
+    num_units = top_depths.shape[1]
+    well_indices = np.arange(num_wells)[:, np.newaxis]
+    
+    if surface_unit_indices is None:
+        # Index of the surface unit of each well at each age (see 'Well.decompact()').
+        #
+        # This is the first unit whose bottom age is older than the age, except the bottommost unit *includes* its bottom age.
+        # If the age is older than the bottom age of the bottommost unit then the index is 'num_units' (ie, no units).
+        # If the age is younger than the top age of the surface unit then the index is zero (ie, all units).
+        surface_unit_indices = np.sum(bottom_ages[:, :-1, np.newaxis] <= ages[:, np.newaxis, :], axis=1)
+        surface_unit_indices[ages > bottom_ages[:, -1:]] = num_units
+    
+    # If an age is in the middle of the surface unit then the top part of the surface unit is stripped off
+    # (see 'StratigraphicUnit.create_partial_unit()').
+    clamped_surface_unit_indices = np.minimum(surface_unit_indices, num_units - 1)
+    is_partial_surface_unit = (
+        (surface_unit_indices < num_units) &
+        (ages > top_ages[well_indices, clamped_surface_unit_indices]))
+    partial_surface_unit_top_depths = _calc_compacted_depths(
+        ages,
+        top_ages[well_indices, clamped_surface_unit_indices],
+        bottom_ages[well_indices, clamped_surface_unit_indices],
+        top_depths[well_indices, clamped_surface_unit_indices],
+        bottom_depths[well_indices, clamped_surface_unit_indices],
+        surface_porosities[well_indices, clamped_surface_unit_indices],
+        porosity_decays[well_indices, clamped_surface_unit_indices])
+    
+    total_decompacted_thicknesses = np.zeros((num_wells, num_ages))
+    total_decompacted_thicknesses_times_densities = np.zeros((num_wells, num_ages))
+    
+    if return_unit_arrays:
+        compacted_thicknesses = np.zeros((num_wells, num_ages, num_units))
+        decompacted_thicknesses = np.zeros((num_wells, num_ages, num_units))
+        decompacted_densities = np.zeros((num_wells, num_ages, num_units))
+    
+    # Starting at the top unit, iterate over all units beneath it (like 'Well._decompact_units()').
+    # Each unit is decompacted for all wells and ages at once.
+    for unit_index in range(num_units):
+        unit_top_depths = np.where(
+            is_partial_surface_unit & (surface_unit_indices == unit_index),
+            partial_surface_unit_top_depths,
+            top_depths[:, unit_index:unit_index + 1])
+        # Units above the surface unit (at an age) have not yet been deposited (so have zero thickness).
+        unit_present_day_thicknesses = np.where(
+            unit_index >= surface_unit_indices,
+            bottom_depths[:, unit_index:unit_index + 1] - unit_top_depths,
+            0.0)
+        
+        unit_decompacted_thicknesses, unit_decompacted_densities = _calc_decompacted_thicknesses_and_densities(
+            total_decompacted_thicknesses,
+            unit_top_depths,
+            unit_present_day_thicknesses,
+            densities[:, unit_index:unit_index + 1],
+            surface_porosities[:, unit_index:unit_index + 1],
+            porosity_decays[:, unit_index:unit_index + 1])
+        
+        total_decompacted_thicknesses += unit_decompacted_thicknesses
+        total_decompacted_thicknesses_times_densities += unit_decompacted_thicknesses * unit_decompacted_densities
+        
+        if return_unit_arrays:
+            compacted_thicknesses[:, :, unit_index] = unit_present_day_thicknesses
+            decompacted_thicknesses[:, :, unit_index] = unit_decompacted_thicknesses
+            decompacted_densities[:, :, unit_index] = unit_decompacted_densities
+    
+    average_decompacted_densities = np.divide(
+        total_decompacted_thicknesses_times_densities,
+        total_decompacted_thicknesses,
+        out=np.zeros((num_wells, num_ages)),
+        where=(total_decompacted_thicknesses > 0.0))
+    
+    unit_arrays = None
+    if return_unit_arrays:
+        unit_arrays = (surface_unit_indices, compacted_thicknesses, decompacted_thicknesses, decompacted_densities)
+    
+    return total_decompacted_thicknesses, average_decompacted_densities, unit_arrays
+
+
+def _calc_decompacted_thicknesses_and_densities(
+        decompacted_depths_to_top,
+        top_depths,
+        present_day_thicknesses,
+        densities,
+        surface_porosities,
+        porosity_decays):
+    """
+    Array version of 'StratigraphicUnit.calc_decompacted_thickness()' and 'StratigraphicUnit.calc_decompacted_density()'.
+    
+    All array arguments must be broadcastable to the same shape.
+    
+    Returns 2-tuple (decompacted_thicknesses, decompacted_densities) of arrays.
+    Both are zero where the present day thickness is zero.
+    """
+    
+    # See 'StratigraphicUnit.calc_decompacted_thickness()' for the derivation of 'a' and 'b' in:
+    #
+    #    T = a * exp(-T/decay) + b
+    #
+    a = -porosity_decays * surface_porosities * np.exp(-decompacted_depths_to_top / porosity_decays)
+    b = (-a + present_day_thicknesses +
+         porosity_decays * surface_porosities * np.exp(-top_depths / porosity_decays) *
+         (np.exp(-present_day_thicknesses / porosity_decays) - 1))
+    
+    # Start out with initial estimate - choose the present day thickness.
+    decompacted_thicknesses = present_day_thicknesses
+    
+    # Iterate until all thicknesses have converged.
+    # Limit the number of iterations in case we never converge.
+    for iteration in range(1000):
+        new_decompacted_thicknesses = a * np.exp(-decompacted_thicknesses / porosity_decays) + b
+        converged = np.all(np.abs(new_decompacted_thicknesses - decompacted_thicknesses) < 1e-6)
+        decompacted_thicknesses = new_decompacted_thicknesses
+        if converged:
+            break
+    
+    decompacted_thicknesses = np.where(present_day_thicknesses == 0.0, 0.0, decompacted_thicknesses)
+    
+    # See 'StratigraphicUnit.calc_decompacted_density()' for the derivation.
+    nonzero_decompacted_thicknesses = np.where(decompacted_thicknesses == 0.0, 1.0, decompacted_thicknesses)
+    decompacted_densities = np.where(
+        decompacted_thicknesses == 0.0,
+        0.0,
+        densities +
+            (_DENSITY_WATER - densities) * porosity_decays * surface_porosities *
+            np.exp(-decompacted_depths_to_top / porosity_decays) *
+            (1 - np.exp(-decompacted_thicknesses / porosity_decays)) / nonzero_decompacted_thicknesses)
+    
+    return decompacted_thicknesses, decompacted_densities
+
+
+def _calc_compacted_depths(
+        ages,
+        top_ages,
+        bottom_ages,
+        top_depths,
+        bottom_depths,
+        surface_porosities,
+        porosity_decays):
+    """
+    Array version of 'StratigraphicUnit._calc_compacted_depth()'.
+    
+    All array arguments must be broadcastable to the same shape.
+    Ages outside the top/bottom age range of their unit are clamped to that range (rather than raising ValueError).
+    
+    Returns an array of compacted depths.
+    """
+    
+    present_day_thicknesses = bottom_depths - top_depths
+    age_ranges = bottom_ages - top_ages
+    
+    # Zero thickness or zero age range returns the bottom depth.
+    is_degenerate = (present_day_thicknesses == 0.0) | (age_ranges <= 0.0)
+    
+    # Sediment deposited from 'age' to bottom age divided by sediment deposited from top age to bottom age.
+    sediment_deposition_ratios = np.clip(
+        (bottom_ages - ages) / np.where(is_degenerate, 1.0, age_ranges),
+        0.0, 1.0)
+    
+    # See 'StratigraphicUnit._calc_compacted_depth()' for the derivation of 'a' and 'b' in:
+    #
+    #    ta = a * exp(ta/decay) + b
+    #
+    a = porosity_decays * surface_porosities * np.exp(-bottom_depths / porosity_decays)
+    b = (-a + sediment_deposition_ratios * (
+            present_day_thicknesses +
+            porosity_decays * surface_porosities * np.exp(-bottom_depths / porosity_decays) *
+            (1 - np.exp(present_day_thicknesses / porosity_decays))))
+    
+    # Start out with initial estimate - choose the deposition ratio of present day thickness.
+    compacted_thicknesses_at_ages = sediment_deposition_ratios * present_day_thicknesses
+    
+    # Iterate until all thicknesses have converged.
+    # Limit the number of iterations in case we never converge.
+    for iteration in range(1000):
+        new_compacted_thicknesses_at_ages = a * np.exp(compacted_thicknesses_at_ages / porosity_decays) + b
+        converged = np.all(np.abs(new_compacted_thicknesses_at_ages - compacted_thicknesses_at_ages) < 1e-6)
+        compacted_thicknesses_at_ages = new_compacted_thicknesses_at_ages
+        if converged:
+            break
+    
+    return np.where(is_degenerate, bottom_depths, bottom_depths - compacted_thicknesses_at_ages)
+
 
 class DecompactedStratigraphicUnit(object):
     """
@@ -1397,6 +1935,623 @@ class DecompactedWell(object):
         return getattr(self, 'dynamic_topography', default_dynamic_topography)
 
 
+# Attributes that every stratigraphic unit has (any other attributes were added using 'other_attributes').
+_STRATIGRAPHIC_UNIT_BUILTIN_ATTRIBUTE_NAMES = frozenset([
+    'top_age', 'bottom_age', 'top_depth', 'bottom_depth', 'lithology', 'lithology_components',
+    'decompacted_top_depth', 'decompacted_bottom_depth', '_fully_decompacted_thickness', '_grain_thickness'])
+
+# Attributes that every decompacted well has (any other attributes, such as 'tectonic_subsidence', were added when backtracking/backstripping).
+_DECOMPACTED_WELL_BUILTIN_ATTRIBUTE_NAMES = frozenset([
+    'surface_unit', 'total_compacted_thickness', 'total_decompacted_thickness', 'decompacted_stratigraphic_units',
+    '_total_decompacted_thickness_times_density'])
+
+# Version of the binary well file format (see 'write_well_arrays_binary_file()').
+# Increment when the format changes (files written with an older version should still be readable).
+_WELL_ARRAYS_BINARY_FORMAT_VERSION = 1
+
+
+class WellArrays(object):
+    """
+    Class containing all the stratigraphic units in a well stored as NumPy arrays (one element per unit) sorted by age (from youngest to oldest).
+    
+    This is a compact alternative to :class:`pybacktrack.Well` (which stores a :class:`pybacktrack.StratigraphicUnit` object per unit).
+    
+    Attributes
+    ----------
+    top_ages : ndarray
+        Age of top of each stratigraphic unit (in Ma).
+    bottom_ages : ndarray
+        Age of bottom of each stratigraphic unit (in Ma).
+    top_depths : ndarray
+        Depth of top of each stratigraphic unit (in metres).
+    bottom_depths : ndarray
+        Depth of bottom of each stratigraphic unit (in metres).
+    densities : ndarray
+        Lithology density of each stratigraphic unit (in kg/m3).
+    surface_porosities : ndarray
+        Lithology surface porosity of each stratigraphic unit (unit-less).
+    porosity_decays : ndarray
+        Lithology porosity decay of each stratigraphic unit (in metres).
+    decompacted_top_depths : ndarray
+        Fully decompacted depth of top of each stratigraphic unit (in metres) as if no portion of any layer had ever been buried (ie, using surface porosities only).
+    decompacted_bottom_depths : ndarray
+        Fully decompacted depth of bottom of each stratigraphic unit (in metres) as if no portion of any layer had ever been buried (ie, using surface porosities only).
+    lithology_components : list
+        The lithology components of each stratigraphic unit, where each is a sequence of tuples (name, fraction).
+    unit_attributes : dict
+        Extra attributes of the stratigraphic units (such as ``min_water_depth`` and ``max_water_depth`` when backstripping).
+        Maps each attribute name to an array of values (one per unit, with NaN for units without the attribute).
+    well_attributes : dict
+        Attributes of the well (such as ``longitude`` and ``latitude``).
+    
+    Notes
+    -----
+    .. versionadded:: 1.5
+    """
+    
+    def __init__(
+            self,
+            top_ages,
+            bottom_ages,
+            top_depths,
+            bottom_depths,
+            densities,
+            surface_porosities,
+            porosity_decays,
+            *,
+            lithology_components=None,
+            unit_attributes=None,
+            well_attributes=None):
+        """
+        Create a well from arrays of stratigraphic unit ages, depths and lithology parameters.
+        
+        Parameters
+        ----------
+        top_ages : array_like
+            Age of top of each stratigraphic unit (in Ma).
+        bottom_ages : array_like
+            Age of bottom of each stratigraphic unit (in Ma).
+        top_depths : array_like
+            Depth of top of each stratigraphic unit (in metres).
+        bottom_depths : array_like
+            Depth of bottom of each stratigraphic unit (in metres).
+        densities : array_like
+            Lithology density of each stratigraphic unit (in kg/m3).
+        surface_porosities : array_like
+            Lithology surface porosity of each stratigraphic unit (unit-less).
+        porosity_decays : array_like
+            Lithology porosity decay of each stratigraphic unit (in metres).
+        lithology_components : sequence, optional
+            The lithology components of each stratigraphic unit, where each is a sequence of tuples (name, fraction).
+            These are only used when converting to a :class:`pybacktrack.Well` (for example, to write a well file).
+            Defaults to no components.
+        unit_attributes : dict, optional
+            Extra attributes of the stratigraphic units. Maps each attribute name to a sequence of values (one per unit).
+        well_attributes : dict, optional
+            Attributes of the well.
+        
+        Raises
+        ------
+        ValueError
+            If:
+            
+            #. the arrays do not all have the same length, or
+            #. youngest unit does not have zero depth, or
+            #. adjacent units do not have matching top and bottom ages and depths.
+            
+            ...this ensures the units are contiguous in depth from the surface (ie, no gaps).
+        
+        Notes
+        -----
+        The units can be unsorted (by age) but will be stored in sorted order.
+        """
+        
+        top_ages = np.asarray(top_ages, dtype=float)
+        num_units = len(top_ages)
+        
+        def _to_unit_array(values):
+            values = np.asarray(values, dtype=float)
+            if values.shape != (num_units,):
+                raise ValueError('Stratigraphic unit arrays must all be one-dimensional and have the same length.')
+            return values
+        
+        if top_ages.ndim != 1:
+            raise ValueError('Stratigraphic unit arrays must all be one-dimensional and have the same length.')
+        
+        if lithology_components is None:
+            lithology_components = [[] for _ in range(num_units)]
+        elif len(lithology_components) != num_units:
+            raise ValueError('Number of lithology components must match the number of stratigraphic units.')
+        
+        if unit_attributes is None:
+            unit_attributes = {}
+        
+        # Sort by age (like 'Well').
+        sort_indices = np.argsort(top_ages, kind='stable')
+        
+        self.top_ages = top_ages[sort_indices]
+        self.bottom_ages = _to_unit_array(bottom_ages)[sort_indices]
+        self.top_depths = _to_unit_array(top_depths)[sort_indices]
+        self.bottom_depths = _to_unit_array(bottom_depths)[sort_indices]
+        self.densities = _to_unit_array(densities)[sort_indices]
+        self.surface_porosities = _to_unit_array(surface_porosities)[sort_indices]
+        self.porosity_decays = _to_unit_array(porosity_decays)[sort_indices]
+        self.lithology_components = [lithology_components[index] for index in sort_indices]
+        self.unit_attributes = dict((name, _to_unit_array(values)[sort_indices]) for name, values in unit_attributes.items())
+        self.well_attributes = dict(well_attributes) if well_attributes is not None else {}
+        
+        # Check the units are contiguous (see 'Well._add_compacted_unit()').
+        if num_units > 0 and self.top_depths[0] != 0.0:
+            raise ValueError('Top stratigraphic unit in well must have zero top depth.')
+        if np.any(np.abs(self.bottom_ages[:-1] - self.top_ages[1:]) > 1e-6):
+            raise ValueError('Adjacent stratigraphic units in well must have matching top and bottom ages.')
+        if np.any(np.abs(self.bottom_depths[:-1] - self.top_depths[1:]) > 1e-6):
+            raise ValueError('Adjacent stratigraphic units in well must have matching top and bottom depths.')
+        
+        # Fully decompacted depths accumulate the fully decompacted thicknesses from the surface (using surface porosity only).
+        self.decompacted_bottom_depths = np.cumsum(_calc_fully_decompacted_thicknesses(
+            self.top_depths,
+            self.bottom_depths,
+            self.surface_porosities,
+            self.porosity_decays))
+        self.decompacted_top_depths = np.concatenate(([0.0], self.decompacted_bottom_depths[:-1]))
+    
+    def __len__(self):
+        """
+        Return the number of stratigraphic units.
+        """
+        
+        return len(self.top_ages)
+    
+    @staticmethod
+    def create_from_well(well):
+        """create_from_well(well)
+        Create a :class:`pybacktrack.WellArrays` from a :class:`pybacktrack.Well`.
+        
+        Parameters
+        ----------
+        well : :class:`pybacktrack.Well`
+            The well to convert.
+        
+        Returns
+        -------
+        :class:`pybacktrack.WellArrays`
+            The well stored as arrays.
+        
+        Notes
+        -----
+        Extra stratigraphic unit attributes (such as ``min_water_depth`` and ``max_water_depth``) are only converted if they're numeric.
+        """
+        
+        units = well.stratigraphic_units
+        
+        return WellArrays(
+            [unit.top_age for unit in units],
+            [unit.bottom_age for unit in units],
+            [unit.top_depth for unit in units],
+            [unit.bottom_depth for unit in units],
+            [unit.lithology.density for unit in units],
+            [unit.lithology.surface_porosity for unit in units],
+            [unit.lithology.porosity_decay for unit in units],
+            lithology_components=[unit.lithology_components for unit in units],
+            unit_attributes=_get_numeric_attribute_arrays(units, _STRATIGRAPHIC_UNIT_BUILTIN_ATTRIBUTE_NAMES),
+            well_attributes=dict((name, value) for name, value in vars(well).items() if name != 'stratigraphic_units'))
+    
+    def create_well(self):
+        """
+        Create a :class:`pybacktrack.Well` from this well.
+        
+        Returns
+        -------
+        :class:`pybacktrack.Well`
+            The well stored as a list of :class:`pybacktrack.StratigraphicUnit` objects.
+        
+        Notes
+        -----
+        Units with the same lithology parameters share the same :class:`pybacktrack.Lithology`.
+        Extra unit attributes are not set on units where their value is NaN.
+        """
+        
+        # Share lithologies between units with the same lithology parameters.
+        lithologies = {}
+        
+        stratigraphic_units = []
+        for unit_index in range(len(self)):
+            lithology_parameters = (
+                float(self.densities[unit_index]),
+                float(self.surface_porosities[unit_index]),
+                float(self.porosity_decays[unit_index]))
+            lithology = lithologies.get(lithology_parameters)
+            if lithology is None:
+                lithology = lithologies[lithology_parameters] = Lithology(*lithology_parameters)
+            
+            other_attributes = dict(
+                (name, float(values[unit_index]))
+                for name, values in self.unit_attributes.items() if not np.isnan(values[unit_index]))
+            
+            stratigraphic_units.append(StratigraphicUnit._create_from_lithology(
+                float(self.top_ages[unit_index]),
+                float(self.bottom_ages[unit_index]),
+                float(self.top_depths[unit_index]),
+                float(self.bottom_depths[unit_index]),
+                lithology,
+                self.lithology_components[unit_index],
+                other_attributes))
+        
+        return Well(self.well_attributes, stratigraphic_units)
+    
+    def decompact(
+            self,
+            ages=None):
+        """
+        Decompact this well at ``ages`` (if specified), otherwise at each (top) age in all stratigraphic units.
+        
+        Parameters
+        ----------
+        ages : array_like, optional
+            The ages to decompact at. Defaults to the top age of each stratigraphic unit (from youngest to oldest).
+        
+        Returns
+        -------
+        :class:`pybacktrack.DecompactedWellArrays`
+            The decompacted well at all ages (with 2D arrays indexed by age and stratigraphic unit).
+        
+        Raises
+        ------
+        ValueError
+            If this well has no stratigraphic units.
+        
+        Notes
+        -----
+        All ages are decompacted together using NumPy arrays.
+        At each age the result matches :meth:`pybacktrack.Well.decompact` (to within the tolerance of the decompaction convergence).
+        """
+        
+        num_units = len(self)
+        if num_units == 0:
+            raise ValueError('Cannot decompact a well with no stratigraphic units.')
+        
+        if ages is None:
+            # Decompact at the top age of each unit, with that unit as the surface unit
+            # (even if it has a zero age range, like 'Well.decompact()').
+            ages = self.top_ages.copy()
+            surface_unit_indices = np.arange(num_units)[np.newaxis, :]
+        else:
+            ages = np.atleast_1d(np.asarray(ages, dtype=float))
+            # Locate the surface unit at each age by bisection (the unit bottom ages are sorted since the units are contiguous).
+            #
+            # This is the first unit whose bottom age is older than the age, except the bottommost unit *includes* its bottom age.
+            # If the age is older than the bottom age of the bottommost unit then the index is 'num_units' (ie, no units).
+            # If the age is younger than the top age of the surface unit then the index is zero (ie, all units).
+            surface_unit_indices = np.searchsorted(self.bottom_ages[:-1], ages, side='right')
+            surface_unit_indices[ages > self.bottom_ages[-1]] = num_units
+            surface_unit_indices = surface_unit_indices[np.newaxis, :]
+        
+        # Decompact as a single well (the first dimension of the arrays).
+        _, _, unit_arrays = _decompact_units_at_ages(
+            ages[np.newaxis, :],
+            self.top_ages[np.newaxis, :],
+            self.bottom_ages[np.newaxis, :],
+            self.top_depths[np.newaxis, :],
+            self.bottom_depths[np.newaxis, :],
+            self.densities[np.newaxis, :],
+            self.surface_porosities[np.newaxis, :],
+            self.porosity_decays[np.newaxis, :],
+            surface_unit_indices,
+            return_unit_arrays=True)
+        surface_unit_indices, compacted_thicknesses, decompacted_thicknesses, decompacted_densities = unit_arrays
+        surface_unit_indices = surface_unit_indices[0]
+        
+        # Like 'DecompactedWell', the minimum and maximum water depths (when backstripping) come from the surface unit.
+        attributes = {}
+        clamped_surface_unit_indices = np.minimum(surface_unit_indices, num_units - 1)
+        for name in ('min_water_depth', 'max_water_depth'):
+            if name in self.unit_attributes:
+                attributes[name] = self.unit_attributes[name][clamped_surface_unit_indices]
+        
+        return DecompactedWellArrays(
+            self,
+            ages,
+            surface_unit_indices,
+            compacted_thicknesses[0],
+            decompacted_thicknesses[0],
+            decompacted_densities[0],
+            attributes=attributes)
+
+
+class DecompactedWellArrays(object):
+    """
+    Class containing the decompacted well data at multiple ages stored as NumPy arrays.
+    
+    This is a compact alternative to a list of :class:`pybacktrack.DecompactedWell` (one per age).
+    
+    Attributes
+    ----------
+    well_arrays : :class:`pybacktrack.WellArrays`
+        The (compacted) well that was decompacted.
+    ages : ndarray
+        Age of the surface of the decompacted well at each age (in Ma), with shape (num_ages,).
+    surface_unit_indices : ndarray
+        Index of the surface stratigraphic unit at each age, with shape (num_ages,).
+        This is the number of stratigraphic units if an age is older than the bottom age of the well.
+    compacted_thicknesses : ndarray
+        Present day (compacted) thickness of each stratigraphic unit deposited by each age, with shape (num_ages, num_units).
+        This is zero for units not yet deposited, and is partial for a surface unit deposited part way.
+    decompacted_thicknesses : ndarray
+        Decompacted thickness of each stratigraphic unit at each age, with shape (num_ages, num_units).
+    decompacted_densities : ndarray
+        Decompacted density of each stratigraphic unit at each age, with shape (num_ages, num_units).
+    total_compacted_thicknesses : ndarray
+        Total compacted thickness of all stratigraphic units at each age, with shape (num_ages,).
+    total_decompacted_thicknesses : ndarray
+        Total decompacted thickness of all stratigraphic units at each age, with shape (num_ages,).
+    average_decompacted_densities : ndarray
+        Average density of the entire decompacted column of the well at each age, with shape (num_ages,).
+    attributes : dict
+        Extra attributes at each age (such as ``tectonic_subsidence``, ``min_water_depth``, ``max_water_depth`` and ``sea_level``).
+        Maps each attribute name to an array of values with shape (num_ages,), with NaN for ages without the attribute.
+    
+    Notes
+    -----
+    .. versionadded:: 1.5
+    """
+    
+    def __init__(
+            self,
+            well_arrays,
+            ages,
+            surface_unit_indices,
+            compacted_thicknesses,
+            decompacted_thicknesses,
+            decompacted_densities,
+            *,
+            attributes=None):
+        """
+        Create a decompacted well from arrays indexed by age (and stratigraphic unit).
+        
+        Parameters
+        ----------
+        well_arrays : :class:`pybacktrack.WellArrays`
+            The (compacted) well that was decompacted.
+        ages : array_like
+            Age of the surface of the decompacted well at each age (in Ma).
+        surface_unit_indices : array_like
+            Index of the surface stratigraphic unit at each age.
+        compacted_thicknesses : array_like
+            Present day (compacted) thickness of each stratigraphic unit deposited by each age, with shape (num_ages, num_units).
+        decompacted_thicknesses : array_like
+            Decompacted thickness of each stratigraphic unit at each age, with shape (num_ages, num_units).
+        decompacted_densities : array_like
+            Decompacted density of each stratigraphic unit at each age, with shape (num_ages, num_units).
+        attributes : dict, optional
+            Extra attributes at each age. Maps each attribute name to a sequence of values (one per age).
+        """
+        
+        self.well_arrays = well_arrays
+        self.ages = np.asarray(ages, dtype=float)
+        self.surface_unit_indices = np.asarray(surface_unit_indices, dtype=int)
+        self.compacted_thicknesses = np.asarray(compacted_thicknesses, dtype=float)
+        self.decompacted_thicknesses = np.asarray(decompacted_thicknesses, dtype=float)
+        self.decompacted_densities = np.asarray(decompacted_densities, dtype=float)
+        self.attributes = dict(
+            (name, np.asarray(values, dtype=float))
+            for name, values in attributes.items()) if attributes is not None else {}
+        
+        self.total_compacted_thicknesses = np.sum(self.compacted_thicknesses, axis=1)
+        self.total_decompacted_thicknesses = np.sum(self.decompacted_thicknesses, axis=1)
+        self.average_decompacted_densities = np.divide(
+            np.sum(self.decompacted_thicknesses * self.decompacted_densities, axis=1),
+            self.total_decompacted_thicknesses,
+            out=np.zeros(len(self.ages)),
+            where=(self.total_decompacted_thicknesses > 0.0))
+    
+    def __len__(self):
+        """
+        Return the number of ages.
+        """
+        
+        return len(self.ages)
+    
+    def get_sediment_isostatic_corrections(self):
+        """
+        Returns
+        -------
+        ndarray
+            Isostatic correction of the decompacted well at each age.
+        
+        Notes
+        -----
+        .. seealso:: :meth:`pybacktrack.DecompactedWell.get_sediment_isostatic_correction`
+        """
+        
+        return (self.total_decompacted_thicknesses *
+                (_DENSITY_MANTLE - self.average_decompacted_densities) /
+                (_DENSITY_MANTLE - _DENSITY_WATER))
+    
+    @staticmethod
+    def create_from_decompacted_wells(well_arrays, decompacted_wells):
+        """create_from_decompacted_wells(well_arrays, decompacted_wells)
+        Create a :class:`pybacktrack.DecompactedWellArrays` from a sequence of :class:`pybacktrack.DecompactedWell`.
+        
+        Parameters
+        ----------
+        well_arrays : :class:`pybacktrack.WellArrays`
+            The (compacted) well that was decompacted.
+        decompacted_wells : sequence of :class:`pybacktrack.DecompactedWell`
+            The decompacted wells (one per age), such as those returned by :meth:`pybacktrack.Well.decompact`
+            or by backtracking/backstripping.
+        
+        Returns
+        -------
+        :class:`pybacktrack.DecompactedWellArrays`
+            The decompacted wells stored as arrays.
+        
+        Notes
+        -----
+        The decompacted units of each decompacted well are matched with the bottommost units of ``well_arrays``.
+        
+        Extra decompacted well attributes (such as ``tectonic_subsidence``) are only converted if they're numeric.
+        """
+        
+        num_units = len(well_arrays)
+        num_ages = len(decompacted_wells)
+        
+        ages = np.array([decompacted_well.get_age() for decompacted_well in decompacted_wells], dtype=float)
+        surface_unit_indices = np.full(num_ages, num_units, dtype=int)
+        compacted_thicknesses = np.zeros((num_ages, num_units))
+        decompacted_thicknesses = np.zeros((num_ages, num_units))
+        decompacted_densities = np.zeros((num_ages, num_units))
+        
+        for age_index, decompacted_well in enumerate(decompacted_wells):
+            # If the age is older than the bottom age of the well then nothing was deposited
+            # (the decompacted well only contains a zero-thickness base unit).
+            if num_units == 0 or ages[age_index] > well_arrays.bottom_ages[-1]:
+                continue
+            
+            # The decompacted units are the bottommost units of the well (the surface unit might be partial).
+            # If there are more decompacted units than units then the extra zero-thickness surface unit is ignored.
+            decompacted_units = decompacted_well.decompacted_stratigraphic_units
+            num_decompacted_units = min(len(decompacted_units), num_units)
+            surface_unit_index = num_units - num_decompacted_units
+            surface_unit_indices[age_index] = surface_unit_index
+            for unit_index, decompacted_unit in enumerate(
+                    decompacted_units[len(decompacted_units) - num_decompacted_units:],
+                    start=surface_unit_index):
+                compacted_thicknesses[age_index, unit_index] = (
+                    decompacted_unit.stratigraphic_unit.bottom_depth - decompacted_unit.stratigraphic_unit.top_depth)
+                decompacted_thicknesses[age_index, unit_index] = decompacted_unit.decompacted_thickness
+                decompacted_densities[age_index, unit_index] = decompacted_unit.decompacted_density
+        
+        return DecompactedWellArrays(
+            well_arrays,
+            ages,
+            surface_unit_indices,
+            compacted_thicknesses,
+            decompacted_thicknesses,
+            decompacted_densities,
+            attributes=_get_numeric_attribute_arrays(decompacted_wells, _DECOMPACTED_WELL_BUILTIN_ATTRIBUTE_NAMES))
+    
+    def create_decompacted_wells(self, well=None):
+        """
+        Create a list of :class:`pybacktrack.DecompactedWell` (one per age) from this decompacted well.
+        
+        Parameters
+        ----------
+        well : :class:`pybacktrack.Well`, optional
+            The (compacted) well whose stratigraphic units are referenced by the decompacted wells.
+            Must have the same stratigraphic units as :attr:`well_arrays`.
+            Defaults to converting :attr:`well_arrays` using :meth:`pybacktrack.WellArrays.create_well`.
+        
+        Returns
+        -------
+        list of :class:`pybacktrack.DecompactedWell`
+            The decompacted wells (one per age).
+        
+        Notes
+        -----
+        Extra attributes are not set on decompacted wells where their value is NaN.
+        """
+        
+        if well is None:
+            well = self.well_arrays.create_well()
+        
+        units = well.stratigraphic_units
+        num_units = len(units)
+        
+        decompacted_wells = []
+        for age_index in range(len(self.ages)):
+            age = float(self.ages[age_index])
+            surface_unit_index = int(self.surface_unit_indices[age_index])
+            
+            # Create the same units to decompact as 'Well.decompact()'.
+            # Each is paired with the index of its unit in the well (or None for a new zero-thickness surface unit).
+            if surface_unit_index >= num_units:
+                # Age is older than the well's bottom age (so only need a single base unit of zero thickness).
+                units_to_decompact = [StratigraphicUnit._create_zero_thickness_base_unit(units[-1], age)]
+                unit_indices = [num_units - 1]
+            elif age < units[0].top_age:
+                # Age is younger than the well's surface age (so insert a new surface unit of zero thickness).
+                units_to_decompact = [StratigraphicUnit._create_zero_thickness_surface_unit(units[0], age)] + units
+                unit_indices = [None] + list(range(num_units))
+            else:
+                units_to_decompact = units[surface_unit_index:]
+                # If age is in the middle of the surface unit then replace it with a partial surface unit.
+                #
+                # Its compacted top depth has already been calculated (so avoid calculating it again).
+                if age > units[surface_unit_index].top_age:
+                    surface_unit = units[surface_unit_index]
+                    units_to_decompact[0] = StratigraphicUnit._create_partial_unit_at_depth(
+                        surface_unit,
+                        age,
+                        surface_unit.bottom_depth - float(self.compacted_thicknesses[age_index, surface_unit_index]))
+                unit_indices = list(range(surface_unit_index, num_units))
+            
+            decompacted_well = DecompactedWell(units_to_decompact[0])
+            for unit, unit_index in zip(units_to_decompact, unit_indices):
+                if unit_index is None:
+                    decompacted_well.add_decompacted_unit(unit, 0.0, 0.0)
+                else:
+                    decompacted_well.add_decompacted_unit(
+                        unit,
+                        float(self.decompacted_thicknesses[age_index, unit_index]),
+                        float(self.decompacted_densities[age_index, unit_index]))
+            
+            for name, values in self.attributes.items():
+                if not np.isnan(values[age_index]):
+                    setattr(decompacted_well, name, float(values[age_index]))
+            
+            decompacted_wells.append(decompacted_well)
+        
+        return decompacted_wells
+
+
+def _get_numeric_attribute_arrays(objects, builtin_attribute_names):
+    """
+    Return a dict mapping the names of extra numeric attributes of 'objects' to arrays of their values (one per object).
+    
+    Attributes in 'builtin_attribute_names' are ignored, as are attributes with any non-numeric values.
+    Objects without an attribute have a value of NaN.
+    """
+    
+    attribute_names = []
+    for obj in objects:
+        for name in vars(obj):
+            if name not in builtin_attribute_names and name not in attribute_names:
+                attribute_names.append(name)
+    
+    attribute_arrays = {}
+    for name in attribute_names:
+        values = [getattr(obj, name, math.nan) for obj in objects]
+        if all(isinstance(value, numbers.Real) for value in values):
+            attribute_arrays[name] = np.array(values, dtype=float)
+    
+    return attribute_arrays
+
+
+def _calc_fully_decompacted_thicknesses(
+        top_depths,
+        bottom_depths,
+        surface_porosities,
+        porosity_decays):
+    """
+    Array version of 'StratigraphicUnit._calc_fully_decompacted_thickness()'.
+    
+    Returns an array of fully decompacted thicknesses (zero where the present day thickness is zero).
+    """
+    
+    present_day_thicknesses = bottom_depths - top_depths
+    
+    # See 'StratigraphicUnit._calc_fully_decompacted_thickness()' for the derivation.
+    fully_decompacted_thicknesses = (
+        (present_day_thicknesses +
+            porosity_decays * surface_porosities * np.exp(-top_depths / porosity_decays) *
+            (np.exp(-present_day_thicknesses / porosity_decays) - 1)) /
+        (1 - surface_porosities)
+    )
+    
+    return np.where(present_day_thicknesses == 0.0, 0.0, fully_decompacted_thicknesses)
+
+
 def read_well_file(
         well_filename,
         lithologies,
@@ -1490,80 +2645,23 @@ def read_well_file(
             
             # If line starts with '#' then search for well metadata and then skip to next line.
             if line_string_list[0].startswith('#'):
-                comment = line[1:]
-                # See if comment contains "name=value".
-                comment_data = comment.split('=')
-                # See if it's a metadata line (has a single '=' char).
-                if len(comment_data) == 2:
-                    name = comment_data[0].strip()  # Note: Case-insensitive comparison.
-                    value = comment_data[1].strip()
-                    
-                    # See if current line contains a well attribute requested by caller.
-                    if name in well_attributes:
-                        attribute_name, attribute_conversion = well_attributes[name]
-                        try:
-                            attributes[attribute_name] = attribute_conversion(value)
-                        except Exception as exc:
-                            warnings.warn('Line {0} of "{1}": Ignoring {2}: {3}.' .format(
-                                          line_number, well_filename, name, exc))
-                    
-                    # else read 'SurfaceAge'...
-                    elif name == 'SurfaceAge':
-                        try:
-                            age = float(value)
-                            if age < 0:
-                                raise ValueError
-                            surface_age = age
-                        except ValueError:
-                            warnings.warn('Line {0} of "{1}": Ignoring SurfaceAge: '
-                                          '{2} is not a number >= 0.' .format(line_number, well_filename, value))
-                
-                continue
-            
-            # The number of columns must include the lithology name and fraction
-            # (starting with lithology column - extra strings if more than one lithology component).
-            if num_strings < lithology_column + 2:
-                warnings.warn('Line {0} of "{1}": Ignoring lithology: line does not have at least '
-                              '{2} white-space separated strings.'.format(line_number, well_filename, lithology_column + 2))
+                line_surface_age = _read_well_metadata_line(line, line_number, well_filename, well_attributes, attributes)
+                if line_surface_age is not None:
+                    surface_age = line_surface_age
                 continue
             
-            # Need an odd number of strings per line (each lithology component is 2 strings).
-            if ((num_strings - lithology_column) % 2) == 1:
-                warnings.warn('Line {0} of "{1}": Ignoring lithology: each extra lithology must have two '
-                              'strings (name and fraction).'.format(line_number, well_filename))
+            # Skip line if it doesn't have the right number of strings for the lithology components.
+            if not _check_well_line_num_strings(num_strings, lithology_column, line_number, well_filename):
                 continue
             
             # Attempt to read/convert the column strings.
-            try:
-                bottom_age = float(line_string_list[bottom_age_column])
-                bottom_depth = float(line_string_list[bottom_depth_column])
-                
-                # Read the lithology components (name, fraction) pairs.
-                lithology_components = []
-                num_lithology_components = (num_strings - lithology_column) // 2
-                for index in range(num_lithology_components):
-                    name = line_string_list[lithology_column + 2 * index]
-                    fraction = float(line_string_list[lithology_column + 2 * index + 1])
-                    lithology_components.append((name, fraction))
-            except ValueError:
-                warnings.warn('Line {0} of "{1}": Ignoring stratigraphic unit: cannot '
-                              'read age/depth/lithology values.' .format(line_number, well_filename))
+            stratigraphic_unit = _read_well_line_values(
+                line_string_list, line_number, well_filename,
+                bottom_age_column, bottom_depth_column, lithology_column, other_columns)
+            if stratigraphic_unit is None:
                 continue
             
-            # Read any extra columns if requested.
-            other_attributes = None
-            if other_columns is not None:
-                other_attributes = {}
-                try:
-                    for column_name, column in other_columns.items():
-                        column_value = float(line_string_list[column])
-                        other_attributes[column_name] = column_value
-                except ValueError:
-                    warnings.warn('Line {0} of "{1}": Ignoring stratigraphic unit: cannot read {2} '
-                                  'value at column index {3}.' .format(line_number, well_filename, column_name, column))
-                    continue
-            
-            stratigraphic_units.append((bottom_age, bottom_depth, lithology_components, other_attributes))
+            stratigraphic_units.append(stratigraphic_unit)
     
     well = Well(attributes)
     
@@ -1731,3 +2829,484 @@ def write_well_metadata(well_file, well, well_attributes=None):
     # Write the metadata (sorted by name).
     for well_metadata_name, well_metadata_value in sorted(metadata):
         well_file.write('# {0} = {1:.4f}\n'.format(well_metadata_name, well_metadata_value))
+
+
+def read_well_arrays_file(
+        well_filename,
+        lithologies,
+        *,
+        bottom_age_column=0,
+        bottom_depth_column=1,
+        lithology_column=2,
+        other_columns=None,
+        well_attributes=None):
+    """
+    Reads a well text file (with each row representing a stratigraphic unit) into a :class:`pybacktrack.WellArrays`.
+    
+    This is a faster alternative to :func:`pybacktrack.read_well_file` for large wells (such as wells with thousands of stratigraphic units).
+    
+    Parameters
+    ----------
+    well_filename : str
+        Name of well text file.
+    lithologies : dict
+        Dictionary mapping lithology names to :class:`pybacktrack.Lithology` objects.
+    bottom_age_column : int, optional
+        The column of well file containing bottom age. Defaults to 0.
+    bottom_depth_column : int, optional
+        The column of well file containing bottom depth. Defaults to 1.
+    lithology_column : int, optional
+        The column of well file containing lithology(s). Defaults to 2.
+    other_columns : dict, optional
+        Dictionary of extra columns (besides age, depth and lithology(s)).
+        Each dict value should be a column index (to read from file), and each associated dict key
+        should be the name of an array in :attr:`pybacktrack.WellArrays.unit_attributes` containing the values read
+        (such as ``min_water_depth`` and ``max_water_depth`` when backstripping).
+    well_attributes : dict, optional
+        Attributes to read from well file metadata and store in :attr:`pybacktrack.WellArrays.well_attributes`.
+        If specified then must be a dictionary mapping each metadata name to a 2-tuple containing
+        attribute name and a function to convert attribute string to attribute value
+        (see :func:`pybacktrack.read_well_file`).
+    
+    Returns
+    -------
+    :class:`pybacktrack.WellArrays`
+        Well read from file.
+    
+    Raises
+    ------
+    ValueError
+        If ``lithology_column`` is not the largest column number (must be last column).
+    KeyError
+        If a lithology name is not found in ``lithologies``.
+    
+    Notes
+    -----
+    The file format, and the handling of invalid lines (which are ignored with a warning), is the same as :func:`pybacktrack.read_well_file`.
+    
+    The columns of all rows with the same number of lithology components are converted together (as whole arrays),
+    and the combined lithology of each distinct set of lithology components is only created once.
+    
+    .. versionadded:: 1.5
+    """
+    
+    if (max(bottom_age_column, bottom_depth_column) >= lithology_column or
+        (other_columns is not None and max(other_columns.values()) >= lithology_column)):
+        raise ValueError('Lithology columns must be the last column in well text file.')
+    
+    if other_columns is None:
+        other_columns = {}
+    
+    # All requested well attributes default to None if not found in well file.
+    attributes = {}
+    if well_attributes is not None:
+        for _, (well_attribute_name, _) in well_attributes.items():
+            attributes[well_attribute_name] = None
+    
+    # Attempt to parse the file for the surface age (becomes top age of top stratigraphic unit).
+    # If it's not found then it defaults to zero (present day).
+    surface_age = 0.0
+    
+    # Read the whole file and split each line into white-space separated strings.
+    with open(well_filename, 'r') as well_file:
+        well_lines = well_file.read().splitlines()
+    well_line_string_lists = [line.split() for line in well_lines]
+    
+    # Group the stratigraphic unit lines by their number of strings (ie, number of lithology components)
+    # so that the columns of each group can be converted as whole arrays.
+    line_groups = {}
+    for line_index, line_string_list in enumerate(well_line_string_lists):
+        # If just a line containing white-space then skip to next line.
+        if not line_string_list:
+            continue
+        
+        # Make line number 1-based instead of 0-based.
+        line_number = line_index + 1
+        
+        # If line starts with '#' then search for well metadata and then skip to next line.
+        if line_string_list[0].startswith('#'):
+            line_surface_age = _read_well_metadata_line(well_lines[line_index], line_number, well_filename, well_attributes, attributes)
+            if line_surface_age is not None:
+                surface_age = line_surface_age
+            continue
+        
+        num_strings = len(line_string_list)
+        line_group = line_groups.get(num_strings)
+        if line_group is None:
+            # Skip line if it doesn't have the right number of strings for the lithology components
+            # (this is only checked once for each valid number of strings, but each invalid line is warned about).
+            if not _check_well_line_num_strings(num_strings, lithology_column, line_number, well_filename):
+                continue
+            line_group = line_groups[num_strings] = ([], [])
+        
+        line_numbers, line_string_lists = line_group
+        line_numbers.append(line_number)
+        line_string_lists.append(line_string_list)
+    
+    # The distinct sets of lithology components (and their combined lithologies) in the well.
+    lithology_components_list = []
+    lithology_list = []
+    lithology_indices = {}
+    # Map the lithology strings of a line (lithology names and fractions) to an index into the above lists.
+    lithology_string_indices = {}
+    
+    # Column arrays of each group of lines.
+    group_line_numbers = []
+    group_bottom_ages = []
+    group_bottom_depths = []
+    group_lithology_indices = []
+    group_other_values = dict((column_name, []) for column_name in other_columns)
+    
+    for num_strings, (line_numbers, line_string_lists) in line_groups.items():
+        num_lithology_components = (num_strings - lithology_column) // 2
+        
+        # Convert all numeric columns of the group (transposing the lines into columns first).
+        #
+        # If any line cannot be converted then convert each line separately to find the invalid lines
+        # (which are then ignored with the same warnings as 'read_well_file()').
+        numeric_columns = ([bottom_age_column, bottom_depth_column] + list(other_columns.values()) +
+                           [lithology_column + 2 * index + 1 for index in range(num_lithology_components)])
+        line_columns = list(zip(*line_string_lists))
+        try:
+            numeric_arrays = [np.array(line_columns[column], dtype=float) for column in numeric_columns]
+        except ValueError:
+            valid_lines = [
+                (line_number, line_string_list)
+                for line_number, line_string_list in zip(line_numbers, line_string_lists)
+                if _read_well_line_values(
+                    line_string_list, line_number, well_filename,
+                    bottom_age_column, bottom_depth_column, lithology_column, other_columns) is not None]
+            if not valid_lines:
+                continue
+            line_numbers, line_string_lists = zip(*valid_lines)
+            line_columns = list(zip(*line_string_lists))
+            numeric_arrays = [np.array(line_columns[column], dtype=float) for column in numeric_columns]
+        
+        group_line_numbers.append(np.array(line_numbers, dtype=int))
+        group_bottom_ages.append(numeric_arrays[0])
+        group_bottom_depths.append(numeric_arrays[1])
+        for other_column_index, column_name in enumerate(other_columns):
+            group_other_values[column_name].append(numeric_arrays[2 + other_column_index])
+        
+        # Look up the lithology of each line (only creating a combined lithology for each distinct set of lithology components).
+        unit_lithology_indices = []
+        for lithology_strings in zip(*line_columns[lithology_column:]):
+            lithology_index = lithology_string_indices.get(lithology_strings)
+            if lithology_index is None:
+                lithology_components = [
+                    (lithology_strings[2 * index], float(lithology_strings[2 * index + 1]))
+                    for index in range(num_lithology_components)]
+                # Different strings can represent the same components (eg, fractions '1' and '1.0').
+                lithology_key = tuple(lithology_components)
+                lithology_index = lithology_indices.get(lithology_key)
+                if lithology_index is None:
+                    lithology_index = lithology_indices[lithology_key] = len(lithology_list)
+                    lithology_list.append(create_lithology_from_components(lithology_components, lithologies))
+                    lithology_components_list.append(lithology_components)
+                lithology_string_indices[lithology_strings] = lithology_index
+            unit_lithology_indices.append(lithology_index)
+        group_lithology_indices.append(np.array(unit_lithology_indices, dtype=int))
+    
+    line_numbers = np.concatenate(group_line_numbers) if group_line_numbers else np.empty(0, dtype=int)
+    bottom_ages = np.concatenate(group_bottom_ages) if group_bottom_ages else np.empty(0)
+    bottom_depths = np.concatenate(group_bottom_depths) if group_bottom_depths else np.empty(0)
+    unit_lithology_indices = np.concatenate(group_lithology_indices) if group_lithology_indices else np.empty(0, dtype=int)
+    unit_attributes = dict(
+        (column_name, np.concatenate(values) if values else np.empty(0))
+        for column_name, values in group_other_values.items())
+    
+    # Sort the units in order of age (and then in order of line number, like the stable sort in 'read_well_file()').
+    sort_indices = np.lexsort((line_numbers, bottom_ages))
+    bottom_ages = bottom_ages[sort_indices]
+    bottom_depths = bottom_depths[sort_indices]
+    unit_lithology_indices = unit_lithology_indices[sort_indices]
+    unit_attributes = dict((column_name, values[sort_indices]) for column_name, values in unit_attributes.items())
+    
+    # The top age and depth of each unit is the bottom age and depth of the next younger unit
+    # (except the youngest unit which is at the surface).
+    top_ages = np.concatenate(([surface_age], bottom_ages[:-1]))[:len(bottom_ages)]
+    top_depths = np.concatenate(([0.0], bottom_depths[:-1]))[:len(bottom_depths)]
+    
+    densities = np.array([lithology.density for lithology in lithology_list])
+    surface_porosities = np.array([lithology.surface_porosity for lithology in lithology_list])
+    porosity_decays = np.array([lithology.porosity_decay for lithology in lithology_list])
+    
+    return WellArrays(
+        top_ages,
+        bottom_ages,
+        top_depths,
+        bottom_depths,
+        densities[unit_lithology_indices] if lithology_list else np.empty(0),
+        surface_porosities[unit_lithology_indices] if lithology_list else np.empty(0),
+        porosity_decays[unit_lithology_indices] if lithology_list else np.empty(0),
+        lithology_components=[lithology_components_list[lithology_index] for lithology_index in unit_lithology_indices],
+        unit_attributes=unit_attributes,
+        well_attributes=attributes)
+
+
+def write_well_arrays_binary_file(well_arrays, well_filename):
+    """
+    Writes a well to a compact binary file (a compressed NumPy ``.npz`` file).
+    
+    Parameters
+    ----------
+    well_arrays : :class:`pybacktrack.WellArrays` or :class:`pybacktrack.Well`
+        The well to write.
+    well_filename : str
+        Name of binary well file (typically with a ``.npz`` extension).
+    
+    Notes
+    -----
+    Each distinct lithology (set of lithology components) is only stored once (in a lithology dictionary),
+    and each stratigraphic unit stores an index into the lithology dictionary.
+    
+    Numeric well attributes (such as ``longitude`` and ``latitude``) and well attributes that are ``None`` are written,
+    but other well attributes are not.
+    
+    The file can be read with :func:`pybacktrack.read_well_arrays_binary_file`.
+    
+    .. versionadded:: 1.5
+    """
+    
+    if isinstance(well_arrays, Well):
+        well_arrays = WellArrays.create_from_well(well_arrays)
+    
+    num_units = len(well_arrays)
+    
+    # Build the lithology dictionary (the distinct lithology components and lithology parameters).
+    lithology_indices = {}
+    lithology_keys = []
+    unit_lithology_indices = np.empty(num_units, dtype=np.int64)
+    for unit_index in range(num_units):
+        lithology_key = (
+            tuple((str(name), float(fraction)) for name, fraction in well_arrays.lithology_components[unit_index]),
+            float(well_arrays.densities[unit_index]),
+            float(well_arrays.surface_porosities[unit_index]),
+            float(well_arrays.porosity_decays[unit_index]))
+        lithology_index = lithology_indices.get(lithology_key)
+        if lithology_index is None:
+            lithology_index = lithology_indices[lithology_key] = len(lithology_keys)
+            lithology_keys.append(lithology_key)
+        unit_lithology_indices[unit_index] = lithology_index
+    
+    # The lithology components of all lithologies are concatenated (with offsets marking where each lithology starts).
+    lithology_component_offsets = np.cumsum([0] + [len(lithology_components) for lithology_components, _, _, _ in lithology_keys])
+    lithology_component_names = [name for lithology_components, _, _, _ in lithology_keys for name, _ in lithology_components]
+    lithology_component_fractions = [fraction for lithology_components, _, _, _ in lithology_keys for _, fraction in lithology_components]
+    
+    # Only numeric (or None) well attributes can be stored as arrays (None is stored as NaN).
+    well_attribute_names = []
+    well_attribute_values = []
+    for name, value in well_arrays.well_attributes.items():
+        if value is None:
+            value = math.nan
+        elif not isinstance(value, numbers.Real):
+            continue
+        well_attribute_names.append(name)
+        well_attribute_values.append(float(value))
+    
+    unit_attribute_names = list(well_arrays.unit_attributes.keys())
+    
+    # Write to an open file (otherwise NumPy appends '.npz' to filenames without that extension).
+    with open(well_filename, 'wb') as well_file:
+        np.savez_compressed(
+            well_file,
+            format_version=np.array(_WELL_ARRAYS_BINARY_FORMAT_VERSION),
+            top_ages=well_arrays.top_ages,
+            bottom_ages=well_arrays.bottom_ages,
+            top_depths=well_arrays.top_depths,
+            bottom_depths=well_arrays.bottom_depths,
+            unit_lithology_indices=unit_lithology_indices,
+            lithology_densities=np.array([density for _, density, _, _ in lithology_keys], dtype=float),
+            lithology_surface_porosities=np.array([surface_porosity for _, _, surface_porosity, _ in lithology_keys], dtype=float),
+            lithology_porosity_decays=np.array([porosity_decay for _, _, _, porosity_decay in lithology_keys], dtype=float),
+            lithology_component_offsets=np.asarray(lithology_component_offsets, dtype=np.int64),
+            lithology_component_names=np.array(lithology_component_names, dtype=str),
+            lithology_component_fractions=np.array(lithology_component_fractions, dtype=float),
+            unit_attribute_names=np.array(unit_attribute_names, dtype=str),
+            unit_attribute_values=np.array([well_arrays.unit_attributes[name] for name in unit_attribute_names], dtype=float).reshape(
+                len(unit_attribute_names), num_units),
+            well_attribute_names=np.array(well_attribute_names, dtype=str),
+            well_attribute_values=np.array(well_attribute_values, dtype=float))
+
+
+def read_well_arrays_binary_file(well_filename):
+    """
+    Reads a well from a binary file written by :func:`pybacktrack.write_well_arrays_binary_file`.
+    
+    Parameters
+    ----------
+    well_filename : str
+        Name of binary well file.
+    
+    Returns
+    -------
+    :class:`pybacktrack.WellArrays`
+        Well read from file (use :meth:`pybacktrack.WellArrays.create_well` to convert it to a :class:`pybacktrack.Well`).
+    
+    Raises
+    ------
+    ValueError
+        If the file is not a binary well file (or was written by a newer version of pyBacktrack).
+    OSError
+        If the file cannot be opened (such as :class:`FileNotFoundError` if the file does not exist).
+    
+    Notes
+    -----
+    Unlike a well text file, the lithologies are stored in the file (so a lithologies dictionary is not needed).
+    
+    .. versionadded:: 1.5
+    """
+    
+    # Open the file first so that errors opening it (such as a missing file) are not reported as an invalid binary well file.
+    with open(well_filename, 'rb') as well_file:
+        try:
+            # Note: NumPy raises ValueError for files that are not NumPy files (such as a well text file, since pickles are not allowed),
+            #       BadZipFile for a truncated or corrupt '.npz' file, and EOFError for an empty file.
+            with np.load(well_file, allow_pickle=False) as well_data:
+                well_data = dict(well_data.items())
+            format_version = int(well_data['format_version'])
+        except (KeyError, ValueError, TypeError, EOFError, OSError, zipfile.BadZipFile, zlib.error) as exc:
+            raise ValueError('"{0}" is not a binary well file: {1}'.format(well_filename, exc)) from exc
+    
+    if format_version > _WELL_ARRAYS_BINARY_FORMAT_VERSION:
+        raise ValueError('Binary well file "{0}" was written by a newer version of pyBacktrack.'.format(well_filename))
+    
+    # Expand the lithology dictionary.
+    lithology_component_offsets = well_data['lithology_component_offsets']
+    lithology_component_names = well_data['lithology_component_names'].tolist()
+    lithology_component_fractions = well_data['lithology_component_fractions'].tolist()
+    lithology_components_list = [
+        list(zip(lithology_component_names[start:end], lithology_component_fractions[start:end]))
+        for start, end in zip(lithology_component_offsets[:-1], lithology_component_offsets[1:])]
+    
+    unit_lithology_indices = well_data['unit_lithology_indices']
+    
+    unit_attributes = dict(zip(well_data['unit_attribute_names'].tolist(), well_data['unit_attribute_values']))
+    
+    well_attributes = dict(
+        (name, None if math.isnan(value) else value)
+        for name, value in zip(well_data['well_attribute_names'].tolist(), well_data['well_attribute_values'].tolist()))
+    
+    return WellArrays(
+        well_data['top_ages'],
+        well_data['bottom_ages'],
+        well_data['top_depths'],
+        well_data['bottom_depths'],
+        well_data['lithology_densities'][unit_lithology_indices],
+        well_data['lithology_surface_porosities'][unit_lithology_indices],
+        well_data['lithology_porosity_decays'][unit_lithology_indices],
+        lithology_components=[lithology_components_list[lithology_index] for lithology_index in unit_lithology_indices],
+        unit_attributes=unit_attributes,
+        well_attributes=well_attributes)
+
+
+def _read_well_metadata_line(line, line_number, well_filename, well_attributes, attributes):
+    """
+    Read the well metadata in a commented line (starting with '#') of a well file.
+    
+    Any well attributes requested (in 'well_attributes') are stored in 'attributes'.
+    
+    Returns the surface age if the line contains 'SurfaceAge', otherwise None.
+    """
+    
+    comment = line[1:]
+    # See if comment contains "name=value".
+    comment_data = comment.split('=')
+    # See if it's a metadata line (has a single '=' char).
+    if len(comment_data) != 2:
+        return None
+    
+    name = comment_data[0].strip()  # Note: Case-insensitive comparison.
+    value = comment_data[1].strip()
+    
+    # See if current line contains a well attribute requested by caller.
+    if well_attributes and name in well_attributes:
+        attribute_name, attribute_conversion = well_attributes[name]
+        try:
+            attributes[attribute_name] = attribute_conversion(value)
+        except Exception as exc:
+            warnings.warn('Line {0} of "{1}": Ignoring {2}: {3}.' .format(
+                          line_number, well_filename, name, exc))
+    
+    # else read 'SurfaceAge'...
+    elif name == 'SurfaceAge':
+        try:
+            age = float(value)
+            if age < 0:
+                raise ValueError
+            return age
+        except ValueError:
+            warnings.warn('Line {0} of "{1}": Ignoring SurfaceAge: '
+                          '{2} is not a number >= 0.' .format(line_number, well_filename, value))
+    
+    return None
+
+
+def _check_well_line_num_strings(num_strings, lithology_column, line_number, well_filename):
+    """
+    Return True if a (non-comment) line of a well file has the right number of strings for its lithology components
+    (otherwise warn and return False).
+    """
+    
+    # The number of columns must include the lithology name and fraction
+    # (starting with lithology column - extra strings if more than one lithology component).
+    if num_strings < lithology_column + 2:
+        warnings.warn('Line {0} of "{1}": Ignoring lithology: line does not have at least '
+                      '{2} white-space separated strings.'.format(line_number, well_filename, lithology_column + 2))
+        return False
+    
+    # Need an odd number of strings per line (each lithology component is 2 strings).
+    if ((num_strings - lithology_column) % 2) == 1:
+        warnings.warn('Line {0} of "{1}": Ignoring lithology: each extra lithology must have two '
+                      'strings (name and fraction).'.format(line_number, well_filename))
+        return False
+    
+    return True
+
+
+def _read_well_line_values(
+        line_string_list,
+        line_number,
+        well_filename,
+        bottom_age_column,
+        bottom_depth_column,
+        lithology_column,
+        other_columns):
+    """
+    Convert the strings of a (non-comment) line of a well file.
+    
+    Returns a tuple (bottom_age, bottom_depth, lithology_components, other_attributes),
+    or None if the strings cannot be converted (in which case a warning is emitted).
+    """
+    
+    try:
+        bottom_age = float(line_string_list[bottom_age_column])
+        bottom_depth = float(line_string_list[bottom_depth_column])
+        
+        # Read the lithology components (name, fraction) pairs.
+        lithology_components = []
+        num_lithology_components = (len(line_string_list) - lithology_column) // 2
+        for index in range(num_lithology_components):
+            name = line_string_list[lithology_column + 2 * index]
+            fraction = float(line_string_list[lithology_column + 2 * index + 1])
+            lithology_components.append((name, fraction))
+    except ValueError:
+        warnings.warn('Line {0} of "{1}": Ignoring stratigraphic unit: cannot '
+                      'read age/depth/lithology values.' .format(line_number, well_filename))
+        return None
+    
+    # Read any extra columns if requested.
+    other_attributes = None
+    if other_columns is not None:
+        other_attributes = {}
+        try:
+            for column_name, column in other_columns.items():
+                column_value = float(line_string_list[column])
+                other_attributes[column_name] = column_value
+        except ValueError:
+            warnings.warn('Line {0} of "{1}": Ignoring stratigraphic unit: cannot read {2} '
+                          'value at column index {3}.' .format(line_number, well_filename, column_name, column))
+            return None
+    
+    return bottom_age, bottom_depth, lithology_components, other_attributes
@@ -0,0 +1,506 @@
+#
+# Copyright (C) 2025 The University of Sydney, Australia
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License, version 2, as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+"""Store many wells in a local SQLite database (indexed by location, bottom age and bottom depth).
+
+:class:`pybacktrack.WellStore` imports well files into the database once, and then quickly selects wells by region,
+bottom age and bottom depth (without parsing any well files). The selected wells can be passed directly to
+:func:`pybacktrack.backtrack_wells` and :func:`pybacktrack.backstrip_wells`.
+"""
+
+
+import json
+from pybacktrack.lithology import read_lithologies_file, read_lithologies_files
+import pybacktrack.bundle_data
+from pybacktrack.well import Well, read_well_file
+import os.path
+import sqlite3
+
+
+# Version of the database schema (stored in the SQLite 'user_version' pragma).
+_SCHEMA_VERSION = 1
+
+# Tables and indexes of the database.
+#
+# Each well has a row in the 'wells' table, and each of its stratigraphic units has a row in the 'units' table.
+# The well location, bottom age (of its deepest unit) and bottom depth (of its deepest unit) are indexed for fast queries.
+# The indexed 'longitude' is wrapped to the range [-180, 180) and the original longitude is in 'site_longitude'.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wells (
+    well_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    longitude REAL,
+    site_longitude REAL,
+    latitude REAL,
+    rift_start_age REAL,
+    rift_end_age REAL,
+    surface_age REAL,
+    bottom_age REAL,
+    bottom_depth REAL,
+    min_water_depth REAL,
+    max_water_depth REAL,
+    num_units INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS wells_location ON wells (latitude, longitude);
+CREATE INDEX IF NOT EXISTS wells_bottom_age ON wells (bottom_age);
+CREATE INDEX IF NOT EXISTS wells_bottom_depth ON wells (bottom_depth);
+CREATE TABLE IF NOT EXISTS units (
+    well_id INTEGER NOT NULL REFERENCES wells (well_id) ON DELETE CASCADE,
+    unit_index INTEGER NOT NULL,
+    top_age REAL NOT NULL,
+    bottom_age REAL NOT NULL,
+    top_depth REAL NOT NULL,
+    bottom_depth REAL NOT NULL,
+    min_water_depth REAL,
+    max_water_depth REAL,
+    lithology_components TEXT NOT NULL,
+    PRIMARY KEY (well_id, unit_index)) WITHOUT ROWID;
+"""
+
+
+class WellStore(object):
+    """
+    Class to store many wells in a local SQLite database (indexed by location, bottom age and bottom depth).
+
+    Notes
+    -----
+    Each stored well records its location (``SiteLongitude`` and ``SiteLatitude``), any rifting period
+    (``RiftStartAge`` and ``RiftEndAge``), and the top/bottom ages and depths, lithology components and
+    (for backstripping) min/max water depths of its stratigraphic units.
+
+    .. versionadded:: 1.5
+    """
+
+    def __init__(self, database_filename=':memory:', lithology_filenames=[pybacktrack.bundle_data.DEFAULT_BUNDLE_LITHOLOGY_FILENAME]):
+        """__init__(database_filename=':memory:', lithology_filenames=[pybacktrack.DEFAULT_BUNDLE_LITHOLOGY_FILENAME])
+        Open (or create) a well store.
+
+        Parameters
+        ----------
+        database_filename : str, optional
+            Filename of the SQLite database (created if it does not exist).
+            Defaults to an in-memory database (that is discarded when the well store is closed).
+        lithology_filenames : list of string, optional
+            One or more text files containing lithologies.
+            Lithologies of imported wells must be in these files, and wells returned by queries use these lithologies.
+
+        Notes
+        -----
+        The well store can also be used as a context manager (that closes the database on exit).
+        """
+
+        # It used to be a single filename (instead of a list) in other functions, so handle that case too.
+        if isinstance(lithology_filenames, str):
+            self.lithologies = read_lithologies_file(lithology_filenames)
+        else:
+            self.lithologies = read_lithologies_files(lithology_filenames)
+
+        self._connection = sqlite3.connect(database_filename)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+
+        schema_version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if schema_version == 0:
+            with self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute('PRAGMA user_version = {0}'.format(_SCHEMA_VERSION))
+        elif schema_version != _SCHEMA_VERSION:
+            self._connection.close()
+            raise ValueError('Well store "{0}" has an unsupported schema version {1}.'.format(database_filename, schema_version))
+
+    def close(self):
+        """
+        Close the database.
+        """
+
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        """
+        Return the number of wells in the store.
+        """
+
+        return self._connection.execute('SELECT COUNT(*) FROM wells').fetchone()[0]
+
+    def import_well_files(
+            self,
+            well_filenames,
+            *,
+            well_bottom_age_column=0,
+            well_bottom_depth_column=1,
+            well_min_water_depth_column=None,
+            well_max_water_depth_column=None,
+            well_lithology_column=2):
+        """
+        Read well files and add their wells to the store.
+
+        Parameters
+        ----------
+        well_filenames : sequence of string
+            Names of the well text files.
+            Each well is named after its filename (excluding the directory and the filename extension).
+        well_bottom_age_column : int, optional
+            The column of well files containing bottom age. Defaults to 0.
+        well_bottom_depth_column : int, optional
+            The column of well files containing bottom depth. Defaults to 1.
+        well_min_water_depth_column : int, optional
+            The column of well files containing minimum water depth (only needed for backstripping).
+        well_max_water_depth_column : int, optional
+            The column of well files containing maximum water depth (only needed for backstripping).
+        well_lithology_column : int, optional
+            The column of well files containing lithology(s). Defaults to 2.
+
+        Returns
+        -------
+        list of int
+            The ID of each imported well (in the same order as ``well_filenames``).
+
+        Raises
+        ------
+        ValueError
+            If ``well_lithology_column`` is not the largest column number (must be last column).
+        ValueError
+            If only one of ``well_min_water_depth_column`` and ``well_max_water_depth_column`` is specified.
+
+        Notes
+        -----
+        A well with the same name as a well already in the store replaces that well.
+
+        All wells are added in a single transaction (so either all of them are added or, if an error is raised, none of them are).
+
+        To backstrip imported wells, the min/max water depth columns should be specified
+        (for example, ``well_min_water_depth_column=2``, ``well_max_water_depth_column=3`` and ``well_lithology_column=4``
+        for the default backstrip well columns).
+        """
+
+        if (well_min_water_depth_column is None) != (well_max_water_depth_column is None):
+            raise ValueError('Both (or neither) of the min and max water depth columns should be specified.')
+
+        if well_min_water_depth_column is not None:
+            # Extra columns to read into attributes 'min_water_depth' and 'max_water_depth' of each stratigraphic unit.
+            other_columns = {
+                'min_water_depth': well_min_water_depth_column,
+                'max_water_depth': well_max_water_depth_column}
+        else:
+            other_columns = None
+
+        well_ids = []
+        with self._connection:
+            for well_filename in well_filenames:
+                well = read_well_file(
+                    well_filename,
+                    self.lithologies,
+                    bottom_age_column=well_bottom_age_column,
+                    bottom_depth_column=well_bottom_depth_column,
+                    lithology_column=well_lithology_column,
+                    other_columns=other_columns,
+                    # Attributes to read from file metadata into returned well object...
+                    well_attributes={
+                        'SiteLongitude': ('longitude', float),
+                        'SiteLatitude': ('latitude', float),
+                        'RiftStartAge': ('rift_start_age', float),
+                        'RiftEndAge': ('rift_end_age', float)})
+
+                well_name = os.path.splitext(os.path.basename(well_filename))[0]
+                well_ids.append(self._add_well(well, well_name, os.path.abspath(well_filename)))
+
+        return well_ids
+
+    def add_well(self, well, name):
+        """
+        Add a well to the store.
+
+        Parameters
+        ----------
+        well : :class:`pybacktrack.Well`
+            The well. Its ``longitude``, ``latitude``, ``rift_start_age`` and ``rift_end_age`` attributes are stored (if it has them),
+            as are the ``min_water_depth`` and ``max_water_depth`` attributes of its stratigraphic units (if they have them).
+        name : str
+            Name of the well. A well with the same name already in the store is replaced.
+
+        Returns
+        -------
+        int
+            The ID of the added well.
+        """
+
+        with self._connection:
+            return self._add_well(well, name, None)
+
+    def _add_well(self, well, name, filename):
+
+        site_longitude = getattr(well, 'longitude', None)
+        # Index longitudes in the range [-180, 180) so that regions can be queried consistently
+        # (but also store the original longitude so that it can be returned unchanged).
+        longitude = _wrap_longitude(site_longitude) if site_longitude is not None else None
+
+        units = well.stratigraphic_units
+        min_water_depths = [getattr(unit, 'min_water_depth', None) for unit in units]
+        max_water_depths = [getattr(unit, 'max_water_depth', None) for unit in units]
+
+        # Replace any well with the same name (its units are deleted by the foreign key cascade).
+        self._connection.execute('DELETE FROM wells WHERE name = ?', (name,))
+
+        well_id = self._connection.execute(
+            'INSERT INTO wells (name, filename, longitude, site_longitude, latitude, rift_start_age, rift_end_age, surface_age, '
+            'bottom_age, bottom_depth, min_water_depth, max_water_depth, num_units) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (name,
+             filename,
+             longitude,
+             site_longitude,
+             getattr(well, 'latitude', None),
+             getattr(well, 'rift_start_age', None),
+             getattr(well, 'rift_end_age', None),
+             units[0].top_age if units else None,
+             units[-1].bottom_age if units else None,
+             units[-1].bottom_depth if units else None,
+             min(min_water_depths) if units and None not in min_water_depths else None,
+             max(max_water_depths) if units and None not in max_water_depths else None,
+             len(units))).lastrowid
+
+        self._connection.executemany(
+            'INSERT INTO units (well_id, unit_index, top_age, bottom_age, top_depth, bottom_depth, '
+            'min_water_depth, max_water_depth, lithology_components) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(well_id,
+              unit_index,
+              unit.top_age,
+              unit.bottom_age,
+              unit.top_depth,
+              unit.bottom_depth,
+              min_water_depths[unit_index],
+              max_water_depths[unit_index],
+              json.dumps(unit.lithology_components))
+                for unit_index, unit in enumerate(units)])
+
+        return well_id
+
+    def remove_wells(self, well_ids):
+        """
+        Remove wells from the store.
+
+        Parameters
+        ----------
+        well_ids : sequence of int
+            The IDs of the wells to remove.
+        """
+
+        with self._connection:
+            self._connection.executemany('DELETE FROM wells WHERE well_id = ?', [(well_id,) for well_id in well_ids])
+
+    def query_well_ids(
+            self,
+            *,
+            region=None,
+            min_bottom_age=None,
+            max_bottom_age=None,
+            min_bottom_depth=None,
+            max_bottom_depth=None,
+            names=None):
+        """
+        Return the IDs of the wells matching all the specified filters.
+
+        Parameters
+        ----------
+        region : tuple of 4 float, optional
+            Only wells located inside the region (``min_longitude``, ``max_longitude``, ``min_latitude``, ``max_latitude``) in degrees.
+            Longitudes can be in any range (for example, ``(170, 200, ...)`` and ``(170, -160, ...)`` are the same region).
+            If ``min_longitude`` is greater than ``max_longitude`` (after both are wrapped to the range [-180, 180))
+            then the region crosses the dateline (longitude 180).
+            A region spanning 360 degrees (or more) of longitude includes all longitudes.
+        min_bottom_age : float, optional
+            Only wells whose bottom age (age at the bottom of the well) is at least this age (in Ma).
+        max_bottom_age : float, optional
+            Only wells whose bottom age is at most this age (in Ma).
+        min_bottom_depth : float, optional
+            Only wells whose bottom depth (depth of the bottom of the well) is at least this depth (in metres).
+        max_bottom_depth : float, optional
+            Only wells whose bottom depth is at most this depth (in metres).
+        names : sequence of str, optional
+            Only wells with these names.
+
+        Returns
+        -------
+        list of int
+            The IDs of the matching wells (in the order they were added).
+        """
+
+        where_clause, where_parameters = _get_where_clause(
+            region, min_bottom_age, max_bottom_age, min_bottom_depth, max_bottom_depth, names)
+
+        return [well_id for well_id, in self._connection.execute(
+            'SELECT well_id FROM wells{0} ORDER BY well_id'.format(where_clause), where_parameters)]
+
+    def query_wells(
+            self,
+            *,
+            region=None,
+            min_bottom_age=None,
+            max_bottom_age=None,
+            min_bottom_depth=None,
+            max_bottom_depth=None,
+            names=None):
+        """
+        Return the wells matching all the specified filters.
+
+        The filters are the same as :meth:`query_well_ids`.
+
+        Returns
+        -------
+        list of :class:`pybacktrack.Well`
+            The matching wells (in the order they were added). These can be passed directly to
+            :func:`pybacktrack.backtrack_wells` and :func:`pybacktrack.backstrip_wells` (instead of well filenames).
+
+        Notes
+        -----
+        Each returned well has the attributes ``well_id``, ``name``, ``longitude``, ``latitude``, ``rift_start_age`` and ``rift_end_age``
+        (the last four are None if they were not in the well file). The longitude is the same as in the well file
+        (ie, it is not wrapped to the range [-180, 180) like the longitudes used to query regions). Its stratigraphic units also have ``min_water_depth`` and
+        ``max_water_depth`` attributes if they were imported.
+
+        Example: Select all wells in a region older than 100 Ma, and backtrack them:
+        ::
+
+            well_store = pybacktrack.WellStore('wells.sqlite')
+            wells = well_store.query_wells(region=(100, 160, -50, -10), min_bottom_age=100)
+            for well, decompacted_wells in pybacktrack.backtrack_wells(wells):
+                ...
+        """
+
+        where_clause, where_parameters = _get_where_clause(
+            region, min_bottom_age, max_bottom_age, min_bottom_depth, max_bottom_depth, names)
+
+        wells = []
+        well = None
+        # Read the matching wells and their units in a single query (ordered by well then unit).
+        for row in self._connection.execute(
+                'SELECT wells.well_id, wells.name, wells.site_longitude, wells.latitude, wells.rift_start_age, wells.rift_end_age, '
+                'units.top_age, units.bottom_age, units.top_depth, units.bottom_depth, '
+                'units.min_water_depth, units.max_water_depth, units.lithology_components '
+                'FROM wells LEFT JOIN units ON units.well_id = wells.well_id{0} '
+                'ORDER BY wells.well_id, units.unit_index'.format(where_clause),
+                where_parameters):
+            (well_id, name, longitude, latitude, rift_start_age, rift_end_age,
+             top_age, bottom_age, top_depth, bottom_depth, min_water_depth, max_water_depth, lithology_components) = row
+
+            if well is None or well.well_id != well_id:
+                well = Well({
+                    'well_id': well_id,
+                    'name': name,
+                    'longitude': longitude,
+                    'latitude': latitude,
+                    'rift_start_age': rift_start_age,
+                    'rift_end_age': rift_end_age})
+                wells.append(well)
+
+            # A well without units has a single row with NULL unit columns.
+            if top_age is None:
+                continue
+
+            if min_water_depth is not None and max_water_depth is not None:
+                other_attributes = {'min_water_depth': min_water_depth, 'max_water_depth': max_water_depth}
+            else:
+                other_attributes = None
+
+            well.add_compacted_unit(
+                top_age, bottom_age,
+                top_depth, bottom_depth,
+                [tuple(lithology_component) for lithology_component in json.loads(lithology_components)],
+                self.lithologies,
+                other_attributes)
+
+        return wells
+
+    def get_well(self, well_id):
+        """
+        Return the well with the specified ID (see :meth:`query_wells`).
+
+        Raises
+        ------
+        KeyError
+            If there is no well with the specified ID.
+        """
+
+        row = self._connection.execute('SELECT name FROM wells WHERE well_id = ?', (well_id,)).fetchone()
+        if row is None:
+            raise KeyError('No well with ID {0} in well store.'.format(well_id))
+
+        return self.query_wells(names=[row[0]])[0]
+
+
+def _get_where_clause(region, min_bottom_age, max_bottom_age, min_bottom_depth, max_bottom_depth, names):
+    """
+    Return the SQL 'WHERE' clause (and its parameters) of the specified query filters on the 'wells' table.
+    """
+
+    conditions = []
+    parameters = []
+
+    if region is not None:
+        min_longitude, max_longitude, min_latitude, max_latitude = region
+        conditions.append('wells.latitude BETWEEN ? AND ?')
+        parameters.extend([min_latitude, max_latitude])
+        # A region spanning 360 degrees (or more) of longitude includes all longitudes.
+        if max_longitude - min_longitude < 360.0:
+            # Wrap the region's longitudes the same way as the stored longitudes (to the range [-180, 180)).
+            min_longitude = _wrap_longitude(min_longitude)
+            max_longitude = _wrap_longitude(max_longitude)
+            if min_longitude <= max_longitude:
+                conditions.append('wells.longitude BETWEEN ? AND ?')
+                parameters.extend([min_longitude, max_longitude])
+            else:
+                # Region crosses the dateline.
+                conditions.append('(wells.longitude >= ? OR wells.longitude <= ?)')
+                parameters.extend([min_longitude, max_longitude])
+
+    for column, operator, value in (
+            ('bottom_age', '>=', min_bottom_age),
+            ('bottom_age', '<=', max_bottom_age),
+            ('bottom_depth', '>=', min_bottom_depth),
+            ('bottom_depth', '<=', max_bottom_depth)):
+        if value is not None:
+            conditions.append('wells.{0} {1} ?'.format(column, operator))
+            parameters.append(value)
+
+    if names is not None:
+        names = list(names)
+        conditions.append('wells.name IN ({0})'.format(', '.join('?' * len(names))))
+        parameters.extend(names)
+
+    if not conditions:
+        return '', parameters
+
+    return ' WHERE ' + ' AND '.join(conditions), parameters
+
+
+def _wrap_longitude(longitude):
+    """
+    Wrap a longitude (in degrees) to the range [-180, 180).
+
+    Longitudes already in that range are returned unchanged (to avoid any floating-point round-off).
+    """
+
+    if -180.0 <= longitude < 180.0:
+        return longitude
+
+    return ((longitude + 180.0) % 360.0) - 180.0
@@ -1,6 +1,7 @@
 import pytest
 import pybacktrack
 from pybacktrack.util.call_system_command import call_system_command
+import numpy as np
 import py
 import sys
 
@@ -21,6 +22,28 @@ def test_convert_age_to_depth():
         pybacktrack.convert_age_to_depth(-0.01)  # Negative age.
 
 
+def test_convert_age_to_depth_arrays():
+    """Test convert_age_to_depth function with an array of ages gives the same depths as converting each age separately."""
+    
+    ages = [0.0, 0.5, 10.0, 19.9, 20.0, 55.5, 120.0, 250.0]
+    
+    def gdh1_age_to_depth(age):
+        # A user-provided model that only supports a single age (not arrays).
+        return pybacktrack.convert_age_to_depth(age, pybacktrack.AGE_TO_DEPTH_MODEL_GDH1)
+    
+    for model in (pybacktrack.AGE_TO_DEPTH_MODEL_GDH1,
+                  pybacktrack.AGE_TO_DEPTH_MODEL_CROSBY_2007,
+                  pybacktrack.AGE_TO_DEPTH_MODEL_RHCW18,
+                  gdh1_age_to_depth):
+        depths = pybacktrack.convert_age_to_depth(ages, model)
+        assert len(depths) == len(ages)
+        for age, depth in zip(ages, depths):
+            assert depth == pytest.approx(pybacktrack.convert_age_to_depth(age, model))
+    
+    with pytest.raises(ValueError):
+        pybacktrack.convert_age_to_depth([10.0, -0.01])  # Negative age.
+
+
 def test_convert_age_to_depth_files(tmpdir):
     """Test convert_age_to_depth_files function."""
     
@@ -85,3 +108,53 @@ def test_age_to_depth_script(tmpdir):
     
     # Compare original output file and temporary output file just written.
     assert test_output_filename.read() == output_filename.read()
+
+
+def test_convert_age_to_depth_tabulated(tmpdir, monkeypatch):
+    """Test convert_age_to_depth function using dense precomputed age-to-depth tables."""
+    
+    # Cache the age-to-depth tables of built-in models in a temporary directory.
+    monkeypatch.setenv('PYBACKTRACK_CACHE_DIR', str(tmpdir))
+    
+    ages = [0.0, 0.001, 0.5, 10.0, 19.9, 20.0, 55.5, 120.0, 250.0, 300.0, 450.0]
+    
+    def sqrt_age_to_depth(age):
+        # A user-provided model that only supports a single age (not arrays).
+        return 2500.0 + 350.0 * age ** 0.5
+    
+    for model in (pybacktrack.AGE_TO_DEPTH_MODEL_GDH1,
+                  pybacktrack.AGE_TO_DEPTH_MODEL_CROSBY_2007,
+                  pybacktrack.AGE_TO_DEPTH_MODEL_RHCW18,
+                  sqrt_age_to_depth):
+        depths = pybacktrack.convert_age_to_depth(ages, model, tabulated=True)
+        assert len(depths) == len(ages)
+        for age, depth in zip(ages, depths):
+            # Table interpolation error should be less than 1cm.
+            assert depth == pytest.approx(pybacktrack.convert_age_to_depth(age, model), abs=0.01)
+            assert pybacktrack.convert_age_to_depth(age, model, tabulated=True) == pytest.approx(depth)
+
+
+def test_convert_age_to_depth_auto_tabulated():
+    """Test convert_age_to_depth only tabulates a user-provided function (with tabulated='auto') when converting many ages."""
+    
+    # Number of ages the user-provided model has been evaluated at.
+    num_calls = [0]
+    
+    def sqrt_age_to_depth(age):
+        num_calls[0] += np.size(age)
+        return 2500.0 + 350.0 * np.sqrt(age)
+    
+    # A few ages should only evaluate the function at those ages (and not build its table).
+    ages = [0.0, 10.0, 55.5]
+    depths = pybacktrack.convert_age_to_depth(ages, sqrt_age_to_depth, tabulated='auto')
+    assert num_calls[0] == len(ages)
+    assert pybacktrack.convert_age_to_depth(ages[1], sqrt_age_to_depth, tabulated='auto') == pytest.approx(depths[1])
+    assert num_calls[0] == len(ages) + 1
+    
+    # Many ages should build the table (and then use it for later conversions, even of a few ages).
+    many_ages = np.linspace(0.0, 200.0, 50000)
+    many_depths = pybacktrack.convert_age_to_depth(many_ages, sqrt_age_to_depth, tabulated='auto')
+    assert many_depths == pytest.approx(2500.0 + 350.0 * np.sqrt(many_ages), abs=0.01)
+    num_calls[0] = 0
+    assert list(pybacktrack.convert_age_to_depth(ages, sqrt_age_to_depth, tabulated='auto')) == pytest.approx(list(depths), abs=0.01)
+    assert num_calls[0] == 0
@@ -1,6 +1,7 @@
 import pytest
 import pybacktrack
 from pybacktrack.util.call_system_command import call_system_command
+import numpy as np
 import py
 import sys
 import warnings
@@ -107,3 +108,166 @@ def test_backstrip(tmpdir):
     # Compare original output files and temporary output files just written.
     assert test_ammended_well_output_filename.read() == ammended_well_output_filename.read()
     assert test_decompacted_output_filename.read() == decompacted_output_filename.read()
+
+
+def test_backstrip_and_write_wells(tmpdir):
+    """Test backstrip_and_write_wells function (with a directory of wells) gives the same output as backstrip_and_write_well."""
+    
+    # Test data filenames.
+    input_well_filename = TEST_DATA_DIR.join('sunrise_lithology.txt')
+    ammended_well_output_filename = TEST_DATA_DIR.join('sunrise_backstrip_amended.txt')
+    decompacted_output_filename = TEST_DATA_DIR.join('sunrise_backstrip_decompacted.txt')
+    
+    # Copy the same well twice into a directory of wells (in temporary directory provided by pytest 'tmpdir' fixture).
+    input_well_dir = tmpdir.mkdir('wells')
+    input_well_names = ['sunrise1', 'sunrise2']
+    for input_well_name in input_well_names:
+        input_well_filename.copy(input_well_dir.join(input_well_name + '.txt'))
+    
+    with warnings.catch_warnings():
+        # Ignore user warnings related to well thickness being larger than total sediment thickness.
+        warnings.simplefilter("ignore", UserWarning)
+        
+        written_wells = pybacktrack.backstrip_and_write_wells(
+            str(tmpdir.join('${well}_decompacted.txt')),
+            str(input_well_dir),
+            lithology_filenames=[pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME,
+                                 pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME],
+            sea_level_model='Haq87_SealevelCurve_Longterm',
+            decompacted_columns=[pybacktrack.BACKSTRIP_COLUMN_AGE, pybacktrack.BACKSTRIP_COLUMN_COMPACTED_DEPTH, pybacktrack.BACKSTRIP_COLUMN_COMPACTED_THICKNESS, pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS,
+                                 pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_DENSITY, pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_SEDIMENT_RATE, pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_DEPTH,
+                                 pybacktrack.BACKSTRIP_COLUMN_MIN_TECTONIC_SUBSIDENCE, pybacktrack.BACKSTRIP_COLUMN_MAX_TECTONIC_SUBSIDENCE, pybacktrack.BACKSTRIP_COLUMN_AVERAGE_TECTONIC_SUBSIDENCE,
+                                 pybacktrack.BACKSTRIP_COLUMN_MIN_WATER_DEPTH, pybacktrack.BACKSTRIP_COLUMN_MAX_WATER_DEPTH, pybacktrack.BACKSTRIP_COLUMN_AVERAGE_WATER_DEPTH, pybacktrack.BACKSTRIP_COLUMN_SEA_LEVEL,
+                                 pybacktrack.BACKSTRIP_COLUMN_PALEO_LONGITUDE, pybacktrack.BACKSTRIP_COLUMN_PALEO_LATITUDE, pybacktrack.BACKSTRIP_COLUMN_LITHOLOGY],
+            ammended_well_output_filename=str(tmpdir.join('${well}_amended.txt')))
+    
+    assert [written_well_filename for written_well_filename, _ in written_wells] == [
+        str(input_well_dir.join(input_well_name + '.txt')) for input_well_name in input_well_names]
+    
+    # Compare original output files and temporary output files just written (for each well).
+    for input_well_name in input_well_names:
+        assert tmpdir.join(input_well_name + '_amended.txt').read() == ammended_well_output_filename.read()
+        assert tmpdir.join(input_well_name + '_decompacted.txt').read() == decompacted_output_filename.read()
+
+
+def _backstrip_sunrise_well(well_filename):
+    # Ignore the total sediment thickness grid (so GMT is not needed).
+    return pybacktrack.backstrip_well(
+        str(well_filename),
+        lithology_filenames=[pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME,
+                             pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=None,
+        sea_level_model='Haq87_SealevelCurve_Longterm')
+
+
+def test_backstrip_write_well_output_formats(tmpdir):
+    """Test write_backstrip_well function writes the same columns to CSV, NumPy and NetCDF files."""
+    
+    # Only import scipy here (it's only used to read NetCDF files).
+    import scipy.io
+    
+    well, decompacted_wells = _backstrip_sunrise_well(TEST_DATA_DIR.join('sunrise_lithology.txt'))
+    
+    decompacted_columns = [pybacktrack.BACKSTRIP_COLUMN_AGE, pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS,
+                           pybacktrack.BACKSTRIP_COLUMN_MIN_TECTONIC_SUBSIDENCE, pybacktrack.BACKSTRIP_COLUMN_AVERAGE_WATER_DEPTH,
+                           pybacktrack.BACKSTRIP_COLUMN_LITHOLOGY]
+    well_attributes = {'longitude': 'SiteLongitude', 'latitude': 'SiteLatitude'}
+    
+    ages = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    decompacted_thicknesses = [decompacted_well.total_decompacted_thickness for decompacted_well in decompacted_wells]
+    min_tectonic_subsidences = [decompacted_well.get_min_max_tectonic_subsidence()[0] for decompacted_well in decompacted_wells]
+    lithologies = [' '.join('{0} {1:.2f}'.format(lithology_name, fraction) for lithology_name, fraction in decompacted_well.surface_unit.lithology_components)
+                   for decompacted_well in decompacted_wells]
+    
+    for output_format in ('csv', 'npz', 'netcdf'):
+        pybacktrack.write_backstrip_well(
+            decompacted_wells,
+            str(tmpdir.join('decompacted.' + output_format)),
+            well,
+            well_attributes=well_attributes,
+            decompacted_columns=decompacted_columns,
+            output_format=output_format)
+    
+    csv_lines = tmpdir.join('decompacted.csv').read().splitlines()
+    assert csv_lines[0] == 'age,decompacted_thickness,min_tectonic_subsidence,average_water_depth,lithology'
+    assert len(csv_lines) == len(decompacted_wells) + 1
+    csv_values = [csv_line.split(',') for csv_line in csv_lines[1:]]
+    assert [float(values[0]) for values in csv_values] == pytest.approx(ages)
+    assert [float(values[2]) for values in csv_values] == pytest.approx(min_tectonic_subsidences)
+    assert [values[4] for values in csv_values] == lithologies
+    
+    with np.load(str(tmpdir.join('decompacted.npz'))) as npz_file:
+        assert list(npz_file['age']) == pytest.approx(ages)
+        assert list(npz_file['decompacted_thickness']) == pytest.approx(decompacted_thicknesses)
+        assert list(npz_file['lithology']) == lithologies
+        assert list(npz_file['metadata_names']) == ['SiteLatitude', 'SiteLongitude', 'SurfaceAge']
+        assert list(npz_file['metadata_values']) == pytest.approx([well.latitude, well.longitude, 0.0])
+    
+    with scipy.io.netcdf_file(str(tmpdir.join('decompacted.netcdf')), mmap=False) as netcdf_file:
+        assert list(netcdf_file.variables['min_tectonic_subsidence'][:]) == pytest.approx(min_tectonic_subsidences)
+        assert [lithology.tobytes().rstrip(b'\0').decode() for lithology in netcdf_file.variables['lithology'][:]] == lithologies
+        assert netcdf_file.SiteLongitude == pytest.approx(well.longitude)
+    
+    with pytest.raises(ValueError):
+        pybacktrack.write_backstrip_well(decompacted_wells, str(tmpdir.join('decompacted.xyz')), well, output_format='xyz')
+
+
+def test_backstrip_write_wells(tmpdir):
+    """Test write_backstrip_wells function writes many wells to a single file indexed by well."""
+    
+    # Only import scipy here (it's only used to read NetCDF files).
+    import scipy.io
+    
+    well_filename = TEST_DATA_DIR.join('sunrise_lithology.txt')
+    
+    # A second well with fewer stratigraphic units (the last two units removed).
+    short_well_filename = tmpdir.join('sunrise_short.txt')
+    short_well_filename.write(''.join(well_filename.readlines()[:-2]))
+    
+    well, decompacted_wells = _backstrip_sunrise_well(well_filename)
+    short_well, short_decompacted_wells = _backstrip_sunrise_well(short_well_filename)
+    
+    well_names = ['sunrise', 'sunrise_short']
+    decompacted_columns = [pybacktrack.BACKSTRIP_COLUMN_AGE, pybacktrack.BACKSTRIP_COLUMN_AVERAGE_TECTONIC_SUBSIDENCE]
+    well_attributes = {'longitude': 'SiteLongitude', 'latitude': 'SiteLatitude'}
+    
+    for output_format in ('csv', 'npz', 'netcdf'):
+        pybacktrack.write_backstrip_wells(
+            [decompacted_wells, short_decompacted_wells],
+            str(tmpdir.join('decompacted.' + output_format)),
+            [well, short_well],
+            well_names,
+            well_attributes=well_attributes,
+            decompacted_columns=decompacted_columns,
+            output_format=output_format)
+    
+    csv_lines = tmpdir.join('decompacted.csv').read().splitlines()
+    assert csv_lines[0] == 'well,age,average_tectonic_subsidence'
+    assert [csv_line.split(',')[0] for csv_line in csv_lines[1:]] == (
+        ['sunrise'] * len(decompacted_wells) + ['sunrise_short'] * len(short_decompacted_wells))
+    
+    with np.load(str(tmpdir.join('decompacted.npz'))) as npz_file:
+        assert list(npz_file['well_names']) == well_names
+        well_row_offsets = npz_file['well_row_offsets']
+        assert list(well_row_offsets) == [0, len(decompacted_wells), len(decompacted_wells) + len(short_decompacted_wells)]
+        short_well_ages = npz_file['age'][well_row_offsets[1]:well_row_offsets[2]]
+        assert list(short_well_ages) == pytest.approx([decompacted_well.get_age() for decompacted_well in short_decompacted_wells])
+    
+    # NetCDF uses a contiguous ragged array (the rows of each well are contiguous, with the number of rows in "row_size").
+    with scipy.io.netcdf_file(str(tmpdir.join('decompacted.netcdf')), mmap=False) as netcdf_file:
+        assert [well_name.tobytes().rstrip(b'\0').decode() for well_name in netcdf_file.variables['well_name'][:]] == well_names
+        row_sizes = list(netcdf_file.variables['row_size'][:])
+        assert row_sizes == [len(decompacted_wells), len(short_decompacted_wells)]
+        assert netcdf_file.variables['row_size'].sample_dimension == b'row'
+        ages = netcdf_file.variables['age'][:]
+        assert len(ages) == sum(row_sizes)
+        assert list(ages[row_sizes[0]:]) == pytest.approx([decompacted_well.get_age() for decompacted_well in short_decompacted_wells])
+        # Each metadata is a variable indexed by well.
+        assert list(netcdf_file.variables['SiteLongitude'][:]) == pytest.approx([well.longitude, short_well.longitude])
+        assert list(netcdf_file.variables['SurfaceAge'][:]) == pytest.approx([0.0, 0.0])
+    
+    # The text format cannot contain more than one well.
+    with pytest.raises(ValueError):
+        pybacktrack.write_backstrip_wells(
+            [decompacted_wells, short_decompacted_wells], str(tmpdir.join('decompacted.txt')), [well, short_well], well_names,
+            output_format='text')
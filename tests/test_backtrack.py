@@ -152,3 +152,177 @@ def test_backtrack_DSDP(tmpdir):
     # Compare original output files and temporary output files just written.
     assert test_ammended_well_output_filename.read() == ammended_well_output_filename.read()
     assert test_decompacted_output_filename.read() == decompacted_output_filename.read()
+
+
+def test_backtrack_wells(tmpdir):
+    """Test the pybacktrack.backtrack_wells function gives the same results as pybacktrack.backtrack_well for each well."""
+    
+    # Test data filenames.
+    input_well_filenames = [
+        str(TEST_DATA_DIR.join('ODP-114-699-Lithology.txt')),
+        str(TEST_DATA_DIR.join('DSDP-36-327-Lithology.txt'))]
+    
+    with warnings.catch_warnings():
+        # Ignore user warnings related to dynamic topography.
+        warnings.simplefilter("ignore", UserWarning)
+        
+        backtrack_wells_output = list(pybacktrack.backtrack_wells(
+            input_well_filenames,
+            dynamic_topography_model='M2',
+            sea_level_model='Haq87_SealevelCurve_Longterm',
+            output_rift_stretching_factor=True))
+        
+        backtrack_well_output = [
+            pybacktrack.backtrack_well(
+                input_well_filename,
+                dynamic_topography_model='M2',
+                sea_level_model='Haq87_SealevelCurve_Longterm',
+                output_rift_stretching_factor=True)
+            for input_well_filename in input_well_filenames]
+    
+    assert len(backtrack_wells_output) == len(input_well_filenames)
+    
+    for (batch_well, batch_decompacted_wells, batch_rift_stretching_factor), (well, decompacted_wells, rift_stretching_factor) in zip(
+            backtrack_wells_output, backtrack_well_output):
+        assert len(batch_well.stratigraphic_units) == len(well.stratigraphic_units)
+        assert batch_rift_stretching_factor == pytest.approx(rift_stretching_factor)
+        
+        assert len(batch_decompacted_wells) == len(decompacted_wells)
+        for batch_decompacted_well, decompacted_well in zip(batch_decompacted_wells, decompacted_wells):
+            assert batch_decompacted_well.get_age() == pytest.approx(decompacted_well.get_age())
+            assert batch_decompacted_well.total_decompacted_thickness == pytest.approx(decompacted_well.total_decompacted_thickness)
+            assert batch_decompacted_well.get_water_depth() == pytest.approx(decompacted_well.get_water_depth())
+            assert batch_decompacted_well.dynamic_topography == pytest.approx(decompacted_well.dynamic_topography)
+            assert batch_decompacted_well.sea_level == pytest.approx(decompacted_well.sea_level)
+            assert batch_decompacted_well.paleo_longitude == pytest.approx(decompacted_well.paleo_longitude)
+            assert batch_decompacted_well.paleo_latitude == pytest.approx(decompacted_well.paleo_latitude)
+
+
+def test_backtrack_well_ensemble(tmpdir):
+    """Test the median of pybacktrack.backtrack_well_ensemble (with no uncertainty) matches pybacktrack.backtrack_well."""
+    
+    # Test data filenames.
+    input_well_filename = str(TEST_DATA_DIR.join('ODP-114-699-Lithology.txt'))
+    
+    with warnings.catch_warnings():
+        # Ignore user warnings related to dynamic topography.
+        warnings.simplefilter("ignore", UserWarning)
+        
+        ensemble_well, ensemble_decompacted_wells, percentile_curves = pybacktrack.backtrack_well_ensemble(
+            input_well_filename,
+            4,
+            dynamic_topography_model='M2',
+            sea_level_model='Haq87_SealevelCurve_Longterm',
+            percentiles=(50.0,),
+            random_seed=0)
+        
+        well, decompacted_wells = pybacktrack.backtrack_well(
+            input_well_filename,
+            dynamic_topography_model='M2',
+            sea_level_model='Haq87_SealevelCurve_Longterm')
+    
+    assert len(ensemble_decompacted_wells) == len(decompacted_wells)
+    for curve_name in ('decompacted_thickness', 'tectonic_subsidence', 'water_depth'):
+        assert percentile_curves[curve_name].shape == (1, len(decompacted_wells))
+    
+    for age_index, decompacted_well in enumerate(decompacted_wells):
+        assert percentile_curves['decompacted_thickness'][0, age_index] == pytest.approx(decompacted_well.total_decompacted_thickness, abs=1e-2)
+        assert percentile_curves['tectonic_subsidence'][0, age_index] == pytest.approx(decompacted_well.tectonic_subsidence, abs=1e-2)
+        assert percentile_curves['water_depth'][0, age_index] == pytest.approx(decompacted_well.get_water_depth(), abs=1e-2)
+
+
+def test_backtrack_write_well_output_formats(tmpdir):
+    """Test write_backtrack_well and write_backtrack_wells functions write the same columns to CSV, NumPy and NetCDF files."""
+    
+    # Only import scipy here (it's only used to read NetCDF files).
+    import scipy.io
+    import numpy as np
+    
+    input_well_filenames = [
+        str(TEST_DATA_DIR.join('ODP-114-699-Lithology.txt')),
+        str(TEST_DATA_DIR.join('DSDP-36-327-Lithology.txt'))]
+    well_names = ['ODP-114-699', 'DSDP-36-327']
+    
+    with warnings.catch_warnings():
+        # Ignore user warnings related to dynamic topography.
+        warnings.simplefilter("ignore", UserWarning)
+        
+        well, decompacted_wells = pybacktrack.backtrack_well(
+            input_well_filenames[0],
+            dynamic_topography_model='M2',
+            sea_level_model='Haq87_SealevelCurve_Longterm')
+        other_well, other_decompacted_wells = pybacktrack.backtrack_well(
+            input_well_filenames[1],
+            sea_level_model='Haq87_SealevelCurve_Longterm')
+    
+    decompacted_columns = [pybacktrack.BACKTRACK_COLUMN_AGE, pybacktrack.BACKTRACK_COLUMN_WATER_DEPTH,
+                           pybacktrack.BACKTRACK_COLUMN_TECTONIC_SUBSIDENCE, pybacktrack.BACKTRACK_COLUMN_DYNAMIC_TOPOGRAPHY,
+                           pybacktrack.BACKTRACK_COLUMN_LITHOLOGY]
+    well_attributes = {'longitude': 'SiteLongitude', 'latitude': 'SiteLatitude'}
+    
+    ages = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    water_depths = [decompacted_well.get_water_depth() for decompacted_well in decompacted_wells]
+    dynamic_topographies = [decompacted_well.get_dynamic_topography() for decompacted_well in decompacted_wells]
+    lithologies = [' '.join('{0} {1:.2f}'.format(lithology_name, fraction) for lithology_name, fraction in decompacted_well.surface_unit.lithology_components)
+                   for decompacted_well in decompacted_wells]
+    
+    for output_format in ('csv', 'npz', 'netcdf'):
+        pybacktrack.write_backtrack_well(
+            decompacted_wells,
+            str(tmpdir.join('decompacted.' + output_format)),
+            well,
+            well_attributes=well_attributes,
+            decompacted_columns=decompacted_columns,
+            output_format=output_format)
+        pybacktrack.write_backtrack_wells(
+            [decompacted_wells, other_decompacted_wells],
+            str(tmpdir.join('decompacted_wells.' + output_format)),
+            [well, other_well],
+            well_names,
+            well_attributes=well_attributes,
+            decompacted_columns=decompacted_columns,
+            output_format=output_format)
+    
+    csv_lines = tmpdir.join('decompacted.csv').read().splitlines()
+    assert csv_lines[0] == 'age,water_depth,tectonic_subsidence,dynamic_topography,lithology'
+    assert len(csv_lines) == len(decompacted_wells) + 1
+    csv_values = [csv_line.split(',') for csv_line in csv_lines[1:]]
+    assert [float(values[0]) for values in csv_values] == pytest.approx(ages)
+    assert [float(values[1]) for values in csv_values] == pytest.approx(water_depths)
+    assert [values[4] for values in csv_values] == lithologies
+    
+    with np.load(str(tmpdir.join('decompacted.npz'))) as npz_file:
+        assert list(npz_file['age']) == pytest.approx(ages)
+        assert list(npz_file['dynamic_topography']) == pytest.approx(dynamic_topographies)
+        assert list(npz_file['lithology']) == lithologies
+        assert list(npz_file['metadata_names']) == ['SiteLatitude', 'SiteLongitude', 'SurfaceAge']
+        assert list(npz_file['metadata_values']) == pytest.approx([well.latitude, well.longitude, 0.0])
+    
+    with scipy.io.netcdf_file(str(tmpdir.join('decompacted.netcdf')), mmap=False) as netcdf_file:
+        assert list(netcdf_file.variables['water_depth'][:]) == pytest.approx(water_depths)
+        assert [lithology.tobytes().rstrip(b'\0').decode() for lithology in netcdf_file.variables['lithology'][:]] == lithologies
+        assert netcdf_file.SiteLatitude == pytest.approx(well.latitude)
+    
+    # The rows of the second well follow the rows of the first well.
+    num_rows = [len(decompacted_wells), len(other_decompacted_wells)]
+    other_water_depths = [decompacted_well.get_water_depth() for decompacted_well in other_decompacted_wells]
+    
+    csv_lines = tmpdir.join('decompacted_wells.csv').read().splitlines()
+    assert csv_lines[0] == 'well,age,water_depth,tectonic_subsidence,dynamic_topography,lithology'
+    assert [csv_line.split(',')[0] for csv_line in csv_lines[1:]] == [well_names[0]] * num_rows[0] + [well_names[1]] * num_rows[1]
+    
+    with np.load(str(tmpdir.join('decompacted_wells.npz'))) as npz_file:
+        assert list(npz_file['well_names']) == well_names
+        assert list(npz_file['well_row_offsets']) == [0, num_rows[0], num_rows[0] + num_rows[1]]
+        assert list(npz_file['water_depth'][num_rows[0]:]) == pytest.approx(other_water_depths)
+        assert npz_file['metadata_values'].shape == (2, 3)
+    
+    with scipy.io.netcdf_file(str(tmpdir.join('decompacted_wells.netcdf')), mmap=False) as netcdf_file:
+        assert [well_name.tobytes().rstrip(b'\0').decode() for well_name in netcdf_file.variables['well_name'][:]] == well_names
+        assert list(netcdf_file.variables['row_size'][:]) == num_rows
+        assert list(netcdf_file.variables['water_depth'][num_rows[0]:]) == pytest.approx(other_water_depths)
+        assert list(netcdf_file.variables['SiteLatitude'][:]) == pytest.approx([well.latitude, other_well.latitude])
+    
+    with pytest.raises(ValueError):
+        pybacktrack.write_backtrack_wells(
+            [decompacted_wells], str(tmpdir.join('decompacted_wells.csv')), [well, other_well], well_names)
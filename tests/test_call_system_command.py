@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+import pybacktrack
+from pybacktrack.util.call_system_command import call_system_command
+import sys
+
+
+def test_system_command_trace():
+    """Test tracing system commands (including those called by multiprocessing workers)."""
+
+    echo_command = [sys.executable, '-c', 'import sys; sys.stdout.write(sys.stdin.read())']
+    fail_command = [sys.executable, '-c', 'import sys; sys.exit(3)']
+
+    # Not tracing yet.
+    assert call_system_command(echo_command, stdin='not traced', return_stdout=True) == 'not traced'
+    assert pybacktrack.get_system_command_trace() == []
+
+    pybacktrack.start_system_command_trace()
+    try:
+        assert call_system_command(echo_command, stdin='hello', return_stdout=True) == 'hello'
+        assert call_system_command(fail_command, raise_errors=False, print_errors=False) is None
+
+        # Workers (child processes) inherit tracing.
+        with multiprocessing.Pool(2) as pool:
+            pool.map(call_system_command, [echo_command] * 4)
+
+        trace_records = pybacktrack.get_system_command_trace()
+        assert len(trace_records) == 6
+        assert trace_records[0]['command'] == echo_command
+        assert trace_records[0]['stdin_bytes'] == 5 and trace_records[0]['stdout_bytes'] == 5
+        assert trace_records[0]['return_code'] == 0
+        assert trace_records[0]['process_id'] == os.getpid()
+        assert trace_records[1]['return_code'] == 3
+        assert all(trace_record['process_id'] != os.getpid() for trace_record in trace_records[2:])
+
+        summary = pybacktrack.summarize_system_command_trace()
+        program = os.path.basename(sys.executable)
+        assert list(summary) == [program]
+        assert summary[program]['count'] == 6
+        assert summary[program]['failures'] == 1
+        assert summary[program]['stdin_bytes'] == 5
+        assert summary[program]['total_duration'] >= summary[program]['max_duration'] > 0
+        assert summary[program]['num_processes'] >= 2
+    finally:
+        trace_records = pybacktrack.stop_system_command_trace()
+
+    assert len(trace_records) == 6
+    # No longer tracing.
+    call_system_command(echo_command, stdin='not traced', return_stdout=True)
+    assert pybacktrack.get_system_command_trace() == []
+
+    # GMT commands are summarized by subcommand.
+    assert list(pybacktrack.summarize_system_command_trace([dict(trace_records[0], program='gmt grdtrack')])) == ['gmt grdtrack']
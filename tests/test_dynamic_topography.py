@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+import pybacktrack
+
+
+def test_precomputed_reconstruction_plate_ids():
+    """Test DynamicTopography accepts precomputed plate IDs (and ages) instead of partitioning locations into static polygons."""
+    
+    longitudes = [0.0, 90.0, -45.0, 150.0]
+    latitudes = [0.0, -30.0, 60.0, 10.0]
+    
+    # Partition the locations into the static polygons of the dynamic topography model.
+    dynamic_topography = pybacktrack.DynamicTopography.create_from_bundled_model('M2', longitudes, latitudes)
+    assert len(dynamic_topography.reconstruction_plate_id) == len(longitudes)
+    assert len(dynamic_topography.age) == len(longitudes)
+    
+    # Provide the same plate IDs and ages (as NumPy arrays) so that no partitioning is needed.
+    precomputed_dynamic_topography = pybacktrack.DynamicTopography.create_from_model_or_bundled_model_name(
+        'M2', longitudes, latitudes, np.array(dynamic_topography.age),
+        reconstruction_plate_id=np.array(dynamic_topography.reconstruction_plate_id))
+    assert precomputed_dynamic_topography.reconstruction_plate_id == dynamic_topography.reconstruction_plate_id
+    assert all(isinstance(plate_id, int) for plate_id in precomputed_dynamic_topography.reconstruction_plate_id)
+    
+    # Provide only the plate IDs (the ages still come from the static polygons).
+    precomputed_dynamic_topography = pybacktrack.DynamicTopography.create_from_bundled_model(
+        'M2', longitudes, latitudes,
+        reconstruction_plate_id=[101] * len(longitudes))
+    assert precomputed_dynamic_topography.reconstruction_plate_id == [101] * len(longitudes)
+    assert precomputed_dynamic_topography.age == dynamic_topography.age
+    
+    # A single location.
+    precomputed_dynamic_topography = pybacktrack.DynamicTopography.create_from_bundled_model(
+        'M2', longitudes[0], latitudes[0], 10.0,
+        reconstruction_plate_id=dynamic_topography.reconstruction_plate_id[0])
+    assert precomputed_dynamic_topography.reconstruction_plate_id == dynamic_topography.reconstruction_plate_id[:1]
+    assert precomputed_dynamic_topography.age == 10.0
+    
+    with pytest.raises(ValueError):
+        # Plate ID sequence not the same length as locations.
+        pybacktrack.DynamicTopography.create_from_bundled_model('M2', longitudes, latitudes, reconstruction_plate_id=[101])
+    with pytest.raises(ValueError):
+        # Single plate ID but multiple locations.
+        pybacktrack.DynamicTopography.create_from_bundled_model('M2', longitudes, latitudes, reconstruction_plate_id=101)
+    with pytest.raises(ValueError):
+        # Multiple plate IDs but single location.
+        pybacktrack.DynamicTopography.create_from_bundled_model('M2', longitudes[0], latitudes[0], reconstruction_plate_id=[101])
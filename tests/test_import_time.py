@@ -0,0 +1,63 @@
+import subprocess
+import sys
+import pybacktrack
+
+
+# Modules that are slow to import and should only be imported when needed.
+SLOW_TO_IMPORT_MODULES = ('pygplates', 'scipy')
+
+
+def _get_imported_modules(module_name):
+    # Import the module in a new Python process (and use '-X importtime' to list all modules it imports).
+    #
+    # Returns 2-tuple (imported module names, cumulative import time in microseconds of 'module_name').
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {0}'.format(module_name)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+    
+    imported_module_names = set()
+    cumulative_import_time = None
+    for line in result.stderr.splitlines():
+        # Each line is "import time: <self us> | <cumulative us> | <indented module name>".
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            # Skip the header line.
+            continue
+        imported_module_name = fields[2].strip()
+        imported_module_names.add(imported_module_name)
+        if imported_module_name == module_name:
+            cumulative_import_time = cumulative
+    
+    return imported_module_names, cumulative_import_time
+
+
+def test_import_time():
+    """Test importing pybacktrack (and the lightweight command-line scripts) does not import slow-to-import modules."""
+    
+    for module_name in (
+            'pybacktrack',
+            'pybacktrack.age_to_depth_cli',
+            'pybacktrack.stratigraphic_depth_to_age_cli',
+            'pybacktrack.util.interpolate_cli'):
+        imported_module_names, cumulative_import_time = _get_imported_modules(module_name)
+        assert module_name in imported_module_names
+        assert cumulative_import_time is not None
+        
+        for slow_to_import_module in SLOW_TO_IMPORT_MODULES:
+            assert not any(
+                imported_module_name == slow_to_import_module or imported_module_name.startswith(slow_to_import_module + '.')
+                for imported_module_name in imported_module_names), (
+                    '"import {0}" imported "{1}" (and took {2} microseconds)'.format(module_name, slow_to_import_module, cumulative_import_time))
+    
+    # The public API is still available (it's imported when first accessed).
+    assert callable(pybacktrack.convert_age_to_depth)
+    assert pybacktrack.DecompactedWell.__name__ == 'DecompactedWell'
+    assert pybacktrack.backtrack.backtrack_well is pybacktrack.backtrack_well
+    assert set(pybacktrack.__all__) <= set(dir(pybacktrack))
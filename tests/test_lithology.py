@@ -0,0 +1,74 @@
+import copy
+import os
+import pickle
+import pytest
+import pybacktrack
+
+
+def test_read_lithologies_file_cache(tmpdir):
+    """Test pybacktrack.read_lithologies_file shares lithologies until the lithology file is modified."""
+    
+    lithologies_filename = tmpdir.join('lithologies.txt')
+    lithologies_filename.write(
+        'Sand  2650  0.4  3700\n'
+        'Shale 2720  0.6  1900\n')
+    
+    lithologies = pybacktrack.read_lithologies_file(str(lithologies_filename))
+    assert sorted(lithologies.keys()) == ['Sand', 'Shale']
+    assert lithologies['Sand'].density == 2650
+    
+    # Reading again returns a new dict containing the same lithologies.
+    reread_lithologies = pybacktrack.read_lithologies_file(str(lithologies_filename))
+    assert reread_lithologies is not lithologies
+    assert reread_lithologies['Sand'] is lithologies['Sand']
+    # Modifying a returned dict does not affect subsequent reads.
+    del reread_lithologies['Sand']
+    assert 'Sand' in pybacktrack.read_lithologies_file(str(lithologies_filename))
+    
+    # Modifying the lithology file (its modification time) reads it again.
+    lithologies_filename.write('Sand  2600  0.4  3700\n')
+    stat = os.stat(str(lithologies_filename))
+    os.utime(str(lithologies_filename), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    modified_lithologies = pybacktrack.read_lithologies_file(str(lithologies_filename))
+    assert list(modified_lithologies.keys()) == ['Sand']
+    assert modified_lithologies['Sand'].density == 2600
+
+
+def test_immutable_lithology():
+    """Test lithologies cannot be modified, but can be compared, pickled and copied."""
+    
+    lithology = pybacktrack.Lithology(2650, 0.4, 3700)
+    with pytest.raises(AttributeError):
+        lithology.density = 2000
+    with pytest.raises(AttributeError):
+        lithology.thickness = 10
+    with pytest.raises(AttributeError):
+        del lithology.porosity_decay
+    assert lithology.density == 2650
+    
+    assert lithology == pybacktrack.Lithology(2650, 0.4, 3700)
+    assert lithology != pybacktrack.Lithology(2650, 0.5, 3700)
+    assert hash(lithology) == hash(pybacktrack.Lithology(2650, 0.4, 3700))
+    
+    for lithology_copy in (pickle.loads(pickle.dumps(lithology)), copy.copy(lithology), copy.deepcopy(lithology)):
+        assert lithology_copy == lithology
+        assert (lithology_copy.density, lithology_copy.surface_porosity, lithology_copy.porosity_decay) == (2650, 0.4, 3700)
+
+
+def test_create_lithology_from_components():
+    """Test mixed lithologies are shared for the same components."""
+    
+    lithologies = pybacktrack.read_lithologies_file(pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME)
+    
+    components = [('Sand', 0.25), ('Shale', 0.75)]
+    mixed_lithology = pybacktrack.create_lithology_from_components(components, lithologies)
+    assert mixed_lithology.density == pytest.approx(0.25 * lithologies['Sand'].density + 0.75 * lithologies['Shale'].density)
+    assert pybacktrack.create_lithology_from_components(list(components), lithologies) is mixed_lithology
+    
+    # A single component is just its lithology.
+    assert pybacktrack.create_lithology_from_components([('Sand', 1.0)], lithologies) is lithologies['Sand']
+    
+    with pytest.raises(KeyError):
+        pybacktrack.create_lithology_from_components([('Unknown', 1.0)], lithologies)
+    with pytest.raises(ValueError):
+        pybacktrack.create_lithology_from_components([('Sand', 0.5), ('Shale', 0.25)], lithologies)
@@ -0,0 +1,52 @@
+import glob
+import os.path
+import subprocess
+import sys
+
+
+def test_profile_pool_workers(tmpdir):
+    """Test profiling the main process and its pool workers (in a separate Python process) merges their profiles."""
+
+    profile_dir = tmpdir.join('profile')
+    subprocess.run(
+        [sys.executable, '-c',
+            'import math, multiprocessing, sys\n'
+            'import pybacktrack.util.profiling as profiling\n'
+            'profiling.start_profiling(sys.argv[1], "test")\n'
+            'with multiprocessing.Pool(2) as pool:\n'
+            '    pool.map(profiling.profile_pool_function(math.factorial), [20000] * 8)\n',
+            str(profile_dir)],
+        check=True)
+
+    main_profile_filenames = glob.glob(str(profile_dir.join('test-*-main.prof')))
+    worker_profile_filenames = glob.glob(str(profile_dir.join('test-*-worker-*.prof')))
+    summary_filenames = glob.glob(str(profile_dir.join('test-*-summary.txt')))
+    assert len(main_profile_filenames) == 1
+    assert 1 <= len(worker_profile_filenames) <= 2
+    assert len(summary_filenames) == 1
+    assert os.path.isfile(summary_filenames[0].replace('-summary.txt', '.prof'))
+
+    # The merged summary includes the function called by the pool workers.
+    with open(summary_filenames[0], 'r') as summary_file:
+        summary = summary_file.read()
+    assert 'Merged profile of {0} process(es)'.format(1 + len(worker_profile_filenames)) in summary
+    assert 'factorial' in summary
+
+
+def test_profile_command_line(tmpdir):
+    """Test the '--profile' command-line option."""
+
+    input_filename = tmpdir.join('ages.txt')
+    input_filename.write('0\n10\n50\n')
+    output_filename = tmpdir.join('depths.txt')
+    profile_dir = tmpdir.join('profile')
+
+    subprocess.run(
+        [sys.executable, '-m', 'pybacktrack.age_to_depth_cli', '--profile', str(profile_dir), str(input_filename), str(output_filename)],
+        check=True)
+
+    assert os.path.isfile(str(output_filename))
+    summary_filenames = glob.glob(str(profile_dir.join('age_to_depth_cli-*-summary.txt')))
+    assert len(summary_filenames) == 1
+    with open(summary_filenames[0], 'r') as summary_file:
+        assert 'convert_age_to_depth_files' in summary_file.read()
@@ -0,0 +1,81 @@
+import os
+import pytest
+import pybacktrack
+
+
+def _write_rotation_file(rotation_filename, angle):
+    # Plate 101 rotates (relative to plate 0) by 'angle' degrees about the north pole from present day to 100Ma.
+    rotation_filename.write(
+        '101   0.0  90.0  0.0  0.0  000 !Test\n'
+        '101 100.0  90.0  0.0  {0}  000 !Test\n'.format(angle))
+
+
+def test_rotation_model_cache(tmpdir):
+    """Test pybacktrack.get_rotation_model shares rotation models until a rotation file is modified or the cache is cleared."""
+
+    pybacktrack.clear_reconstruction_cache()
+    assert pybacktrack.get_reconstruction_cache_size() == 0
+
+    rotation_filename = tmpdir.join('rotations.rot')
+    _write_rotation_file(rotation_filename, 10.0)
+
+    rotation_model = pybacktrack.get_rotation_model(str(rotation_filename))
+    assert rotation_model.get_rotation(100.0, 101).get_lat_lon_euler_pole_and_angle_degrees()[2] == pytest.approx(10.0)
+    # Same files (and anchor plate) share the same rotation model.
+    assert pybacktrack.get_rotation_model([str(rotation_filename)]) is rotation_model
+    assert pybacktrack.get_rotation_model(str(rotation_filename), reconstruction_tree_cache_size=10) is rotation_model
+    # A different anchor plate does not.
+    assert pybacktrack.get_rotation_model(str(rotation_filename), anchor_plate_id=101) is not rotation_model
+    # Requesting more cached reconstruction trees than the shared rotation model caches replaces it.
+    larger_rotation_model = pybacktrack.get_rotation_model(str(rotation_filename), reconstruction_tree_cache_size=1000)
+    assert larger_rotation_model is not rotation_model
+    assert pybacktrack.get_rotation_model(str(rotation_filename)) is larger_rotation_model
+
+    # Modifying the rotation file (its modification time) loads a new rotation model.
+    _write_rotation_file(rotation_filename, 20.0)
+    stat = os.stat(str(rotation_filename))
+    os.utime(str(rotation_filename), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    modified_rotation_model = pybacktrack.get_rotation_model(str(rotation_filename))
+    assert modified_rotation_model is not larger_rotation_model
+    assert modified_rotation_model.get_rotation(100.0, 101).get_lat_lon_euler_pole_and_angle_degrees()[2] == pytest.approx(20.0)
+
+    # Clearing the cache loads a new rotation model.
+    pybacktrack.clear_reconstruction_cache()
+    assert pybacktrack.get_reconstruction_cache_size() == 0
+    assert pybacktrack.get_rotation_model(str(rotation_filename)) is not modified_rotation_model
+
+
+def test_plate_partitioner_cache():
+    """Test pybacktrack.get_plate_partitioner shares plate partitioners and the cache size limit evicts them."""
+
+    pybacktrack.clear_reconstruction_cache()
+
+    static_polygon_filename = pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME
+    rotation_filenames = pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES
+
+    plate_partitioner = pybacktrack.get_plate_partitioner(static_polygon_filename, rotation_filenames)
+    assert pybacktrack.get_plate_partitioner(static_polygon_filename, rotation_filenames) is plate_partitioner
+    # The static polygons and rotation model used by the plate partitioner are also shared.
+    assert pybacktrack.get_reconstruction_cache_size() == 3
+    static_polygons = pybacktrack.get_static_polygons(static_polygon_filename)
+    rotation_model = pybacktrack.get_rotation_model(rotation_filenames)
+    assert pybacktrack.get_reconstruction_cache_size() == 3
+
+    try:
+        # Limiting the cache size evicts the least recently used objects (the plate partitioner).
+        pybacktrack.set_reconstruction_cache_max_size(2)
+        assert pybacktrack.get_reconstruction_cache_size() == 2
+        assert pybacktrack.get_static_polygons(static_polygon_filename) is static_polygons
+        assert pybacktrack.get_rotation_model(rotation_filenames) is rotation_model
+        assert pybacktrack.get_plate_partitioner(static_polygon_filename, rotation_filenames) is not plate_partitioner
+
+        # A zero cache size disables caching.
+        pybacktrack.set_reconstruction_cache_max_size(0)
+        assert pybacktrack.get_reconstruction_cache_size() == 0
+        assert pybacktrack.get_rotation_model(rotation_filenames) is not pybacktrack.get_rotation_model(rotation_filenames)
+
+        with pytest.raises(ValueError):
+            pybacktrack.set_reconstruction_cache_max_size(-1)
+    finally:
+        pybacktrack.set_reconstruction_cache_max_size(pybacktrack.util.reconstruction_cache.DEFAULT_MAX_CACHE_SIZE)
+        pybacktrack.clear_reconstruction_cache()
@@ -0,0 +1,79 @@
+import py
+import pybacktrack
+import pybacktrack.util.result_cache as result_cache
+import pytest
+
+
+# Test data directory is inside the pybacktrack module.
+TEST_DATA_DIR = py.path.local(__file__).dirpath('test_data')
+
+
+@pytest.fixture
+def enabled_result_cache(tmpdir, monkeypatch):
+    # Cache results in a temporary directory (and disable the result cache afterwards).
+    monkeypatch.setenv('PYBACKTRACK_CACHE_DIR', str(tmpdir.join('cache')))
+    monkeypatch.setattr(result_cache, '_estimated_result_cache_size', None)
+    pybacktrack.enable_result_cache()
+    yield
+    pybacktrack.disable_result_cache()
+
+
+def _backstrip_well(well_filename):
+    # Ignore the total sediment thickness grid (so GMT is not needed).
+    return pybacktrack.backstrip_well(
+        str(well_filename),
+        lithology_filenames=[pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME, pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=None,
+        sea_level_model='Haq87_SealevelCurve_Longterm')
+
+
+def test_result_cache(tmpdir, enabled_result_cache, monkeypatch):
+    """Test cached backstrip results are reused (and not reused when the well file changes)."""
+
+    well_filename = tmpdir.join('sunrise_lithology.txt')
+    TEST_DATA_DIR.join('sunrise_lithology.txt').copy(well_filename)
+
+    well, decompacted_wells = _backstrip_well(well_filename)
+    assert pybacktrack.get_result_cache_size() > 0
+
+    # Backstripping the same well again should not decompact it again.
+    def _decompact_well(*args, **kwargs):
+        raise AssertionError('Result was not cached.')
+    with monkeypatch.context() as context:
+        context.setattr(pybacktrack.backstrip, '_decompact_well', _decompact_well)
+        cached_well, cached_decompacted_wells = _backstrip_well(well_filename)
+
+    assert cached_well.longitude == well.longitude and cached_well.latitude == well.latitude
+    assert [decompacted_well.get_age() for decompacted_well in cached_decompacted_wells] == \
+        [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+    assert [decompacted_well.get_min_max_tectonic_subsidence() for decompacted_well in cached_decompacted_wells] == \
+        [decompacted_well.get_min_max_tectonic_subsidence() for decompacted_well in decompacted_wells]
+
+    # Changing the well file (removing its last stratigraphic unit) should not use the cached result.
+    well_lines = well_filename.readlines()
+    well_filename.write(''.join(well_lines[:-1]))
+    _, modified_decompacted_wells = _backstrip_well(well_filename)
+    assert len(modified_decompacted_wells) == len(decompacted_wells) - 1
+
+    pybacktrack.clear_result_cache()
+    assert pybacktrack.get_result_cache_size() == 0
+
+
+def test_result_cache_eviction(tmpdir, enabled_result_cache):
+    """Test least recently used results are evicted when the cache exceeds its maximum size."""
+
+    well_filename = TEST_DATA_DIR.join('sunrise_lithology.txt')
+
+    _backstrip_well(well_filename)
+    result_size = pybacktrack.get_result_cache_size()
+
+    # Only allow room for one result (the oldest result is evicted when a second result is written).
+    pybacktrack.enable_result_cache(max_size=int(1.5 * result_size))
+    pybacktrack.backstrip_well(
+        str(well_filename),
+        lithology_filenames=[pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME, pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=None)
+    assert 0 < pybacktrack.get_result_cache_size() <= 1.5 * result_size
+
+    with pytest.raises(ValueError):
+        pybacktrack.enable_result_cache(max_size=0)
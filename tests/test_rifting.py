@@ -0,0 +1,60 @@
+import pytest
+import pybacktrack.rifting as rifting
+
+
+def test_total_subsidence_arrays():
+    """Test rifting.total_subsidence with arrays gives the same subsidences as calling it separately for each element."""
+    
+    beta = 2.0
+    pre_rift_crustal_thickness = 40000.0
+    rift_end_time = 100.0
+    rift_start_time = 120.0
+    times = [0.0, 50.0, 100.0, 110.0, 120.0, 150.0]
+    
+    for start_time in (None, rift_start_time):
+        subsidences = rifting.total_subsidence(beta, pre_rift_crustal_thickness, times, rift_end_time, start_time)
+        assert len(subsidences) == len(times)
+        for time, subsidence in zip(times, subsidences):
+            assert subsidence == pytest.approx(
+                rifting.total_subsidence(beta, pre_rift_crustal_thickness, time, rift_end_time, start_time))
+    
+    with pytest.raises(ValueError):
+        # Rift start time younger than rift end time.
+        rifting.total_subsidence(beta, pre_rift_crustal_thickness, times, rift_end_time, rift_end_time - 1.0)
+
+
+def test_estimate_beta_arrays():
+    """Test batched rifting.estimate_beta gives the same stretching factors as estimating each separately."""
+    
+    present_day_subsidences = [500.0, 1500.0, 3000.0, 4500.0, 2000.0]
+    present_day_crustal_thicknesses = [30000.0, 25000.0, 20000.0, 15000.0, 10000.0]
+    rift_end_times = [150.0, 100.0, 50.0, 0.0, 200.0]
+    
+    betas, residuals = rifting.estimate_beta(present_day_subsidences, present_day_crustal_thicknesses, rift_end_times)
+    assert len(betas) == len(residuals) == len(present_day_subsidences)
+    
+    for present_day_subsidence, present_day_crustal_thickness, rift_end_time, beta, residual in zip(
+            present_day_subsidences, present_day_crustal_thicknesses, rift_end_times, betas, residuals):
+        scalar_beta, scalar_residual = rifting.estimate_beta(present_day_subsidence, present_day_crustal_thickness, rift_end_time)
+        assert beta == pytest.approx(scalar_beta, abs=1e-4)
+        assert residual <= scalar_residual + 1e-3
+        # Subsidence calculated from the estimated beta should match present day subsidence.
+        assert rifting.total_subsidence(beta, beta * present_day_crustal_thickness, 0.0, rift_end_time) == pytest.approx(
+            present_day_subsidence, abs=1e-3)
+
+
+def test_estimate_beta_tabulated():
+    """Test rifting.estimate_beta using inversion tables gives the same stretching factors as solving for them."""
+    
+    # Includes negative subsidence, non-integer rift end times and crustal thickness outside table range (which fall back to solving).
+    present_day_subsidences = [500.0, 1500.0, 3000.0, 4500.0, 2000.0, -100.0, 2500.0, 30000.0]
+    present_day_crustal_thicknesses = [30000.0, 25000.0, 20000.0, 15000.0, 10000.0, 5000.0, 500.0, 20000.0]
+    rift_end_times = [150.0, 100.5, 50.25, 0.0, 199.9, 10.0, 80.0, 20.0]
+    
+    betas, residuals = rifting.estimate_beta(present_day_subsidences, present_day_crustal_thicknesses, rift_end_times)
+    tabulated_betas, tabulated_residuals = rifting.estimate_beta(
+        present_day_subsidences, present_day_crustal_thicknesses, rift_end_times, tabulated=True)
+    
+    for beta, residual, tabulated_beta, tabulated_residual in zip(betas, residuals, tabulated_betas, tabulated_residuals):
+        assert tabulated_beta == pytest.approx(beta, abs=1e-6)
+        assert tabulated_residual == pytest.approx(residual, abs=1e-3)
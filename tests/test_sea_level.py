@@ -0,0 +1,55 @@
+import pytest
+import pybacktrack
+
+
+def test_get_average_levels(tmpdir):
+    """Test SeaLevel.get_average_level and SeaLevel.get_average_levels integrate a piecewise linear curve exactly."""
+    
+    # Sea level curve (unsorted times): 0m at 0Ma, 100m at 10Ma, 50m at 20Ma.
+    sea_level_filename = tmpdir.join('sea_level.txt')
+    sea_level_filename.write('10 100\n0 0\n20 50\n')
+    
+    sea_level = pybacktrack.SeaLevel(str(sea_level_filename))
+    
+    # Within a single linear segment.
+    assert sea_level.get_average_level(10.0, 0.0) == pytest.approx(50.0)
+    # Spanning two linear segments.
+    assert sea_level.get_average_level(20.0, 0.0) == pytest.approx((500.0 + 750.0) / 20.0)
+    # Partially outside the time range of the curve (sea level is clamped to the boundary values).
+    assert sea_level.get_average_level(30.0, 20.0) == pytest.approx(50.0)
+    assert sea_level.get_average_level(0.0, -10.0) == pytest.approx(0.0)
+    assert sea_level.get_average_level(25.0, 15.0) == pytest.approx((0.5 * (75.0 + 50.0) * 5.0 + 50.0 * 5.0) / 10.0)
+    # Identical begin and end times return the interpolated sea level.
+    assert sea_level.get_average_level(5.0, 5.0) == pytest.approx(50.0)
+    
+    begin_times = [10.0, 20.0, 30.0, 5.0, 12.5]
+    end_times = [0.0, 0.0, 20.0, 5.0, 2.5]
+    average_levels = sea_level.get_average_levels(begin_times, end_times)
+    assert len(average_levels) == len(begin_times)
+    for begin_time, end_time, average_level in zip(begin_times, end_times, average_levels):
+        assert average_level == pytest.approx(sea_level.get_average_level(begin_time, end_time))
+    
+    with pytest.raises(ValueError):
+        sea_level.get_average_level(0.0, 10.0)  # End time larger than begin time.
+    with pytest.raises(ValueError):
+        sea_level.get_average_levels([10.0, 20.0], [0.0])  # Different number of begin and end times.
+
+
+def test_sea_level_cache(tmpdir):
+    """Test SeaLevel.create_from_model_or_bundled_model_name only reads a sea level file once (unless modified)."""
+    
+    sea_level_filename = tmpdir.join('sea_level.txt')
+    sea_level_filename.write('0 0\n10 100\n')
+    
+    sea_level = pybacktrack.SeaLevel.create_from_model_or_bundled_model_name(str(sea_level_filename))
+    assert pybacktrack.SeaLevel.create_from_model_or_bundled_model_name(str(sea_level_filename)) is sea_level
+    
+    # Modifying the file (here its size) reads it again.
+    sea_level_filename.write('0 0\n10 200\n')
+    modified_sea_level = pybacktrack.SeaLevel.create_from_model_or_bundled_model_name(str(sea_level_filename))
+    assert modified_sea_level is not sea_level
+    assert modified_sea_level.get_average_level(10.0, 0.0) == pytest.approx(100.0)
+    
+    # Bundled models are also cached.
+    bundled_sea_level = pybacktrack.SeaLevel.create_from_model_or_bundled_model_name('Haq87_SealevelCurve_Longterm')
+    assert pybacktrack.SeaLevel.create_from_model_or_bundled_model_name('Haq87_SealevelCurve_Longterm') is bundled_sea_level
@@ -0,0 +1,116 @@
+import concurrent.futures
+import contextlib
+import py
+import pybacktrack
+import pytest
+import socket
+import threading
+
+
+# Test data directory is inside the pybacktrack module.
+TEST_DATA_DIR = py.path.local(__file__).dirpath('test_data')
+
+
+@contextlib.contextmanager
+def _run_server(**server_kwargs):
+    # Run the server in a separate thread (listening on any free localhost port, unless a Unix socket is specified).
+    server = pybacktrack.create_backtrack_server(port=0, preload=False, **server_kwargs)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        server_thread.join()
+
+
+def test_serve_age_to_depth():
+    """Test age-to-depth requests (including concurrent and invalid requests)."""
+
+    ages = [0.0, 10.0, 50.0, 150.0]
+
+    with _run_server(num_workers=2) as server:
+        port = server.server_address[1]
+
+        health = pybacktrack.send_backtrack_server_request('/health', port=port)
+        assert health['status'] == 'ok'
+        assert health['version'] == pybacktrack.__version__
+        assert health['num_workers'] == 2
+
+        response = pybacktrack.send_backtrack_server_request('/age_to_depth', {'ages': ages, 'model': 'GDH1'}, port=port)
+        assert response['depths'] == pytest.approx(
+            list(pybacktrack.convert_age_to_depth(ages, pybacktrack.AGE_TO_DEPTH_MODEL_GDH1)))
+
+        # Send more concurrent requests than there are workers.
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(
+                lambda age: pybacktrack.send_backtrack_server_request('/age_to_depth', {'ages': [age]}, port=port),
+                ages * 4))
+        assert [response['depths'][0] for response in responses] == pytest.approx(
+            list(pybacktrack.convert_age_to_depth(ages * 4)))
+
+        # Invalid requests.
+        with pytest.raises(ValueError, match='age-to-depth model'):
+            pybacktrack.send_backtrack_server_request('/age_to_depth', {'ages': ages, 'model': 'unknown'}, port=port)
+        with pytest.raises(ValueError, match='Unknown request argument'):
+            pybacktrack.send_backtrack_server_request('/age_to_depth', {'ages': ages, 'modle': 'GDH1'}, port=port)
+        with pytest.raises(ValueError, match='Unknown request'):
+            pybacktrack.send_backtrack_server_request('/unknown', {}, port=port)
+
+
+def test_serve_backstrip(tmpdir):
+    """Test a backstrip request returns the same output as backstrip_and_write_well (with the well sent inline or as a filename)."""
+
+    input_well_filename = TEST_DATA_DIR.join('sunrise_lithology.txt')
+    decompacted_column_names = ['age', 'decompacted_thickness', 'average_water_depth', 'sea_level', 'lithology']
+
+    # Ignore the total sediment thickness grid (so GMT is not needed).
+    decompacted_output_filename = tmpdir.join('sunrise_backstrip_decompacted.txt')
+    ammended_well_output_filename = tmpdir.join('sunrise_backstrip_amended.txt')
+    pybacktrack.backstrip_and_write_well(
+        str(decompacted_output_filename),
+        str(input_well_filename),
+        lithology_filenames=[pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME, pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME],
+        total_sediment_thickness_filename=None,
+        sea_level_model=pybacktrack.BUNDLE_SEA_LEVEL_MODELS['Haq87_SealevelCurve_Longterm'],
+        decompacted_columns=[pybacktrack.BACKSTRIP_COLUMN_AGE, pybacktrack.BACKSTRIP_COLUMN_DECOMPACTED_THICKNESS,
+                             pybacktrack.BACKSTRIP_COLUMN_AVERAGE_WATER_DEPTH, pybacktrack.BACKSTRIP_COLUMN_SEA_LEVEL,
+                             pybacktrack.BACKSTRIP_COLUMN_LITHOLOGY],
+        ammended_well_output_filename=str(ammended_well_output_filename))
+
+    request = {
+        'lithology_filenames': ['primary', 'extended'],
+        'total_sediment_thickness_filename': None,
+        'sea_level_model': 'Haq87_SealevelCurve_Longterm',
+        'decompacted_columns': decompacted_column_names,
+        'output_well': True}
+
+    with _run_server(num_workers=1) as server:
+        port = server.server_address[1]
+
+        response = pybacktrack.send_backtrack_server_request(
+            '/backstrip', dict(request, well_filename=str(input_well_filename)), port=port)
+        assert response['decompacted_well'] == decompacted_output_filename.read()
+        assert response['amended_well'] == ammended_well_output_filename.read()
+
+        # Send the contents of the well file (instead of its filename).
+        response = pybacktrack.send_backtrack_server_request(
+            '/backstrip', dict(request, well=input_well_filename.read()), port=port)
+        assert response['decompacted_well'] == decompacted_output_filename.read()
+
+        with pytest.raises(ValueError, match='not a valid decompacted column name'):
+            pybacktrack.send_backtrack_server_request(
+                '/backstrip', dict(request, well_filename=str(input_well_filename), decompacted_columns=['water_depth']), port=port)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix domain sockets are not supported')
+def test_serve_unix_socket(tmpdir):
+    """Test requests sent over a Unix domain socket."""
+
+    unix_socket = str(tmpdir.join('pybacktrack.sock'))
+
+    with _run_server(unix_socket=unix_socket, num_workers=1):
+        assert pybacktrack.send_backtrack_server_request('/health', unix_socket=unix_socket)['status'] == 'ok'
+        response = pybacktrack.send_backtrack_server_request('/age_to_depth', {'ages': [0.0]}, unix_socket=unix_socket)
+        assert response['depths'] == pytest.approx([pybacktrack.convert_age_to_depth(0.0)])
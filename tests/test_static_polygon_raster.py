@@ -0,0 +1,56 @@
+import numpy as np
+import os
+import pybacktrack
+import pygplates
+import pytest
+
+
+def test_static_polygon_raster(tmpdir, monkeypatch):
+    """Test StaticPolygonRaster assigns the same plate IDs and appearance ages as partitioning points exactly."""
+    
+    # Cache the rasters in a temporary directory.
+    monkeypatch.setenv('PYBACKTRACK_CACHE_DIR', str(tmpdir))
+    
+    static_polygon_filename = pybacktrack.BUNDLE_RECONSTRUCTION_STATIC_POLYGON_FILENAME
+    rotation_filenames = pybacktrack.BUNDLE_RECONSTRUCTION_ROTATION_FILENAMES
+    
+    with pytest.raises(ValueError):
+        pybacktrack.StaticPolygonRaster(static_polygon_filename, rotation_filenames, 0.0)
+    
+    static_polygon_raster = pybacktrack.StaticPolygonRaster(static_polygon_filename, rotation_filenames, 1.0)
+    assert static_polygon_raster.grid_spacing_degrees == pytest.approx(1.0)
+    # Most grid cells should not need exact partitioning.
+    assert 0.0 < static_polygon_raster.get_unresolved_fraction() < 0.5
+    # The raster should have been cached on disk.
+    assert os.listdir(str(tmpdir))
+    
+    # Random points uniformly distributed on the globe, plus points on grid cell boundaries (including the dateline and poles).
+    random_number_generator = np.random.default_rng(0)
+    longitudes = np.concatenate((random_number_generator.uniform(-180.0, 180.0, 2000), np.arange(-180.0, 181.0, 30.0), [0.0, 0.0]))
+    latitudes = np.concatenate((np.degrees(np.arcsin(random_number_generator.uniform(-1.0, 1.0, 2000))), np.full(13, 10.0), [-90.0, 90.0]))
+    
+    plate_ids, appearance_ages = static_polygon_raster.partition_points(longitudes, latitudes)
+    
+    plate_partitioner = pybacktrack.get_plate_partitioner(static_polygon_filename, rotation_filenames)
+    for longitude, latitude, plate_id, appearance_age in zip(longitudes, latitudes, plate_ids, appearance_ages):
+        partitioning_plate = plate_partitioner.partition_point(pygplates.PointOnSphere(latitude, longitude))
+        if partitioning_plate:
+            assert plate_id == partitioning_plate.get_feature().get_reconstruction_plate_id()
+            assert appearance_age == partitioning_plate.get_feature().get_valid_time()[0]
+        else:
+            assert plate_id == -1
+            assert np.isnan(appearance_age)
+    
+    # A raster loaded from the on-disk cache gives the same results.
+    cached_static_polygon_raster = pybacktrack.StaticPolygonRaster(static_polygon_filename, rotation_filenames, 1.0)
+    cached_plate_ids, cached_appearance_ages = cached_static_polygon_raster.partition_points(longitudes, latitudes)
+    assert np.array_equal(cached_plate_ids, plate_ids)
+    assert np.array_equal(cached_appearance_ages, appearance_ages, equal_nan=True)
+    
+    # Dynamic topography can also assign plate IDs (and ages) using a static polygon raster.
+    dynamic_topography = pybacktrack.DynamicTopography.create_from_bundled_model('M2', list(longitudes[:100]), list(latitudes[:100]))
+    raster_dynamic_topography = pybacktrack.DynamicTopography.create_from_bundled_model(
+        'M2', list(longitudes[:100]), list(latitudes[:100]),
+        static_polygon_raster_grid_spacing=1.0)
+    assert raster_dynamic_topography.reconstruction_plate_id == dynamic_topography.reconstruction_plate_id
+    assert raster_dynamic_topography.age == dynamic_topography.age
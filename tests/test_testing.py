@@ -0,0 +1,99 @@
+import math
+import pybacktrack
+import pybacktrack.testing
+import pygplates
+import pytest
+import scipy.io
+
+
+def _read_grid_values(grid_filename):
+    with scipy.io.netcdf_file(grid_filename, 'r', mmap=False) as grid_file:
+        value_variable_name, = (name for name in grid_file.variables if name not in ('lon', 'lat'))
+        return (grid_file.variables['lon'][:].copy(),
+                grid_file.variables['lat'][:].copy(),
+                grid_file.variables[value_variable_name][:].copy())
+
+
+def test_synthetic_grids(tmpdir):
+    """Test pybacktrack.testing.write_synthetic_grids."""
+
+    grid_filenames = pybacktrack.testing.write_synthetic_grids(str(tmpdir), grid_spacing_degrees=2.0)
+    assert set(grid_filenames) == {
+        'age_grid_filename', 'topography_filename', 'total_sediment_thickness_filename', 'crustal_thickness_filename'}
+
+    lons, lats, ages = _read_grid_values(grid_filenames['age_grid_filename'])
+    assert len(lons) == 181 and lons[0] == -180 and lons[-1] == 180
+    assert len(lats) == 91 and lats[0] == -90 and lats[-1] == 90
+    assert ages.shape == (91, 181)
+
+    # Oceanic crust is youngest at the mid-ocean ridge (prime meridian) and oldest at the continental margins.
+    ridge_lon_index = 90
+    margin_lon_index = 90 + int(pybacktrack.testing.SYNTHETIC_OCEAN_HALF_WIDTH / 2)
+    assert ages[45, ridge_lon_index] == pytest.approx(0.0)
+    assert ages[45, margin_lon_index] == pytest.approx(pybacktrack.testing.SYNTHETIC_MAX_OCEANIC_AGE)
+    # Continental crust is masked.
+    assert math.isnan(ages[45, margin_lon_index + 1])
+    assert math.isnan(ages[45, 0])
+
+    # Sediment covers the ocean and the submerged continental shelves, but is masked on continental crust above sea level.
+    _, _, topography = _read_grid_values(grid_filenames['topography_filename'])
+    _, _, total_sediment_thickness = _read_grid_values(grid_filenames['total_sediment_thickness_filename'])
+    assert topography[45, margin_lon_index + 1] < 0 and total_sediment_thickness[45, margin_lon_index + 1] > 0
+    assert topography[45, 0] > 0 and math.isnan(total_sediment_thickness[45, 0])
+
+    with pytest.raises(ValueError):
+        pybacktrack.testing.write_synthetic_grids(str(tmpdir), grid_spacing_degrees=0.0)
+
+
+def test_synthetic_reconstruction_model(tmpdir):
+    """Test pybacktrack.testing.write_synthetic_reconstruction_model and write_synthetic_dynamic_topography_model."""
+
+    reconstruction_model = pybacktrack.testing.write_synthetic_reconstruction_model(str(tmpdir))
+
+    plate_partitioner = pygplates.PlatePartitioner(
+        reconstruction_model['static_polygon_filename'],
+        pygplates.RotationModel(reconstruction_model['rotation_filenames']))
+    for lon, plate_id in ((-170, pybacktrack.testing.SYNTHETIC_WEST_PLATE_ID), (-30, pybacktrack.testing.SYNTHETIC_WEST_PLATE_ID),
+                          (30, pybacktrack.testing.SYNTHETIC_EAST_PLATE_ID), (170, pybacktrack.testing.SYNTHETIC_EAST_PLATE_ID)):
+        assert plate_partitioner.partition_point(pygplates.PointOnSphere(20, lon)).get_feature().get_reconstruction_plate_id() == plate_id
+
+    # Oceanic crust on the eastern plate was created at the mid-ocean ridge (where the western plate's crust of the same age is).
+    rotation_model = pygplates.RotationModel(reconstruction_model['rotation_filenames'])
+    half_age = pybacktrack.testing.SYNTHETIC_MAX_OCEANIC_AGE / 2
+    half_lon = pybacktrack.testing.SYNTHETIC_OCEAN_HALF_WIDTH / 2
+    _, reconstructed_lon = (rotation_model.get_rotation(half_age, pybacktrack.testing.SYNTHETIC_EAST_PLATE_ID) *
+                            pygplates.PointOnSphere(0, half_lon)).to_lat_lon()
+    assert reconstructed_lon == pytest.approx(-half_lon)
+
+    # The dynamic topography grids can be loaded as a dynamic topography model.
+    dynamic_topography_model = pybacktrack.testing.write_synthetic_dynamic_topography_model(
+        str(tmpdir), grid_spacing_degrees=5.0, oldest_time=50.0, time_increment=10.0)
+    dynamic_topography = pybacktrack.DynamicTopography(*dynamic_topography_model, longitude=30.0, latitude=20.0)
+    assert [age for age, _ in dynamic_topography.interpolate_dynamic_topography.grids.grid_ages_and_filenames] == [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+    assert dynamic_topography.reconstruction_plate_id == [pybacktrack.testing.SYNTHETIC_EAST_PLATE_ID]
+    assert dynamic_topography.age == pybacktrack.testing.SYNTHETIC_MAX_OCEANIC_AGE
+
+
+def test_synthetic_well():
+    """Test pybacktrack.testing.create_synthetic_well."""
+
+    well = pybacktrack.testing.create_synthetic_well(
+        20, lithology_names=('Shale', 'Sand'), max_lithology_components=2, water_depth_range=(0.0, 500.0), seed=1)
+    assert len(well.stratigraphic_units) == 20
+    assert well.stratigraphic_units[0].top_age == 0.0 and well.stratigraphic_units[0].top_depth == 0.0
+    for unit in well.stratigraphic_units:
+        assert 10.0 <= unit.bottom_depth - unit.top_depth <= 100.0
+        assert {name for name, _ in unit.lithology_components} <= {'Shale', 'Sand'}
+        assert sum(fraction for _, fraction in unit.lithology_components) == pytest.approx(1.0)
+        assert 0.0 <= unit.min_water_depth <= unit.max_water_depth <= 500.0
+
+    # The same seed creates the same well.
+    same_well = pybacktrack.testing.create_synthetic_well(
+        20, lithology_names=('Shale', 'Sand'), max_lithology_components=2, water_depth_range=(0.0, 500.0), seed=1)
+    assert ([(unit.bottom_age, unit.bottom_depth, unit.lithology_components) for unit in well.stratigraphic_units] ==
+            [(unit.bottom_age, unit.bottom_depth, unit.lithology_components) for unit in same_well.stratigraphic_units])
+
+    with pytest.raises(ValueError):
+        pybacktrack.testing.create_synthetic_well(0)
+    with pytest.raises(ValueError):
+        pybacktrack.testing.create_synthetic_well(10, lithology_names=('Shale',), max_lithology_components=2)
@@ -0,0 +1,251 @@
+import pytest
+import pybacktrack
+import py
+
+
+# Test data directory is inside the pybacktrack module.
+TEST_DATA_DIR = py.path.local(__file__).dirpath('test_data')
+
+
+def test_decompact_ensemble():
+    """Test Well.decompact_ensemble gives the same results as Well.decompact when nothing is perturbed."""
+    
+    lithologies = pybacktrack.read_lithologies_files(pybacktrack.BUNDLE_LITHOLOGY_FILENAMES)
+    
+    for well_filename in ('ODP-114-699-Lithology.txt', 'DSDP-36-327-Lithology.txt'):
+        well = pybacktrack.read_well_file(
+            str(TEST_DATA_DIR.join(well_filename)),
+            lithologies,
+            well_attributes={})
+        
+        decompacted_wells = well.decompact()
+        ages = [decompacted_well.get_age() for decompacted_well in decompacted_wells]
+        
+        num_samples = 3
+        total_decompacted_thicknesses, average_decompacted_densities, sediment_isostatic_corrections = well.decompact_ensemble(
+            ages, num_samples)
+        
+        assert total_decompacted_thicknesses.shape == (num_samples, len(ages))
+        assert average_decompacted_densities.shape == (num_samples, len(ages))
+        assert sediment_isostatic_corrections.shape == (num_samples, len(ages))
+        
+        for sample_index in range(num_samples):
+            for age_index, decompacted_well in enumerate(decompacted_wells):
+                assert total_decompacted_thicknesses[sample_index, age_index] == pytest.approx(
+                    decompacted_well.total_decompacted_thickness, abs=1e-3)
+                assert average_decompacted_densities[sample_index, age_index] == pytest.approx(
+                    decompacted_well.get_average_decompacted_density(), abs=1e-3)
+                assert sediment_isostatic_corrections[sample_index, age_index] == pytest.approx(
+                    decompacted_well.get_sediment_isostatic_correction(), abs=1e-3)
+    
+    # Perturbing the total sediment thickness changes the decompacted thickness at present day by the same amount.
+    total_decompacted_thicknesses, _, _ = well.decompact_ensemble(
+        [0.0],
+        2,
+        total_sediment_thickness_offsets=[-100.0, 100.0])
+    present_day_total_thickness = well.decompact(0.0).total_decompacted_thickness
+    assert total_decompacted_thicknesses[0, 0] == pytest.approx(present_day_total_thickness - 100.0, abs=1e-3)
+    assert total_decompacted_thicknesses[1, 0] == pytest.approx(present_day_total_thickness + 100.0, abs=1e-3)
+
+
+def test_well_arrays():
+    """Test WellArrays decompacts the same as Well, and converts to and from Well and DecompactedWell."""
+    
+    lithologies = pybacktrack.read_lithologies_files(pybacktrack.BUNDLE_LITHOLOGY_FILENAMES)
+    
+    well = pybacktrack.read_well_file(
+        str(TEST_DATA_DIR.join('ODP-114-699-Lithology.txt')),
+        lithologies,
+        well_attributes={})
+    well.longitude = -30.3
+    # Add extra unit attributes (like backstripping does).
+    for unit_index, unit in enumerate(well.stratigraphic_units):
+        unit.min_water_depth = 100.0 * unit_index
+        unit.max_water_depth = 100.0 * unit_index + 50.0
+    
+    well_arrays = pybacktrack.WellArrays.create_from_well(well)
+    assert len(well_arrays) == len(well.stratigraphic_units)
+    assert well_arrays.well_attributes['longitude'] == -30.3
+    for unit_index, unit in enumerate(well.stratigraphic_units):
+        assert well_arrays.top_depths[unit_index] == unit.top_depth
+        assert well_arrays.porosity_decays[unit_index] == unit.lithology.porosity_decay
+        assert well_arrays.decompacted_bottom_depths[unit_index] == pytest.approx(unit.decompacted_bottom_depth)
+        assert well_arrays.unit_attributes['min_water_depth'][unit_index] == unit.min_water_depth
+    
+    # Decompact at the top age of each unit.
+    decompacted_wells = well.decompact()
+    decompacted_well_arrays = well_arrays.decompact()
+    assert decompacted_well_arrays.decompacted_thicknesses.shape == (len(decompacted_wells), len(well_arrays))
+    for age_index, decompacted_well in enumerate(decompacted_wells):
+        assert decompacted_well_arrays.ages[age_index] == decompacted_well.get_age()
+        assert decompacted_well_arrays.total_decompacted_thicknesses[age_index] == pytest.approx(
+            decompacted_well.total_decompacted_thickness, abs=1e-3)
+        assert decompacted_well_arrays.get_sediment_isostatic_corrections()[age_index] == pytest.approx(
+            decompacted_well.get_sediment_isostatic_correction(), abs=1e-3)
+        assert decompacted_well_arrays.attributes['max_water_depth'][age_index] == decompacted_well.max_water_depth
+    
+    # Decompact at ages younger than the surface, inside units and older than the bottom of the well.
+    bottom_age = well.stratigraphic_units[-1].bottom_age
+    ages = [0.0, 10.5, 33.3, bottom_age, bottom_age + 10.0]
+    decompacted_well_arrays = well_arrays.decompact(ages)
+    for age_index, age in enumerate(ages):
+        decompacted_well = well.decompact(age)
+        assert decompacted_well_arrays.total_compacted_thicknesses[age_index] == pytest.approx(
+            decompacted_well.total_compacted_thickness, abs=1e-3)
+        assert decompacted_well_arrays.total_decompacted_thicknesses[age_index] == pytest.approx(
+            decompacted_well.total_decompacted_thickness, abs=1e-3)
+        assert decompacted_well_arrays.average_decompacted_densities[age_index] == pytest.approx(
+            decompacted_well.get_average_decompacted_density(), abs=1e-3)
+    
+    # Convert to decompacted wells and back.
+    decompacted_wells = decompacted_well_arrays.create_decompacted_wells()
+    assert [decompacted_well.get_age() for decompacted_well in decompacted_wells] == ages
+    for decompacted_well in decompacted_wells:
+        decompacted_well.tectonic_subsidence = 1000.0
+    converted_decompacted_well_arrays = pybacktrack.DecompactedWellArrays.create_from_decompacted_wells(well_arrays, decompacted_wells)
+    assert list(converted_decompacted_well_arrays.surface_unit_indices) == list(decompacted_well_arrays.surface_unit_indices)
+    assert converted_decompacted_well_arrays.decompacted_thicknesses == pytest.approx(decompacted_well_arrays.decompacted_thicknesses)
+    assert list(converted_decompacted_well_arrays.attributes['tectonic_subsidence']) == [1000.0] * len(ages)
+    
+    # Convert back to a well.
+    converted_well = well_arrays.create_well()
+    assert converted_well.longitude == -30.3
+    assert len(converted_well.stratigraphic_units) == len(well.stratigraphic_units)
+    for converted_unit, unit in zip(converted_well.stratigraphic_units, well.stratigraphic_units):
+        assert (converted_unit.top_age, converted_unit.bottom_depth) == (unit.top_age, unit.bottom_depth)
+        assert converted_unit.lithology == unit.lithology
+        assert converted_unit.lithology_components == unit.lithology_components
+        assert converted_unit.min_water_depth == unit.min_water_depth
+    
+    with pytest.raises(ValueError):
+        pybacktrack.WellArrays([0.0, 1.0], [1.0, 2.0], [0.0, 10.0], [10.0], [2000.0] * 2, [0.5] * 2, [1000.0] * 2)
+
+
+def test_read_well_arrays_file(tmpdir):
+    """Test read_well_arrays_file reads the same well as read_well_file, and the binary well file round trip."""
+    
+    lithologies = pybacktrack.read_lithologies_files(pybacktrack.BUNDLE_LITHOLOGY_FILENAMES)
+    
+    # Read a well with extra (water depth) columns and multiple lithology components per unit.
+    well_filename = str(TEST_DATA_DIR.join('sunrise_lithology.txt'))
+    read_kwargs = {
+        'lithology_column': 4,
+        'other_columns': {'min_water_depth': 2, 'max_water_depth': 3},
+        'well_attributes': {'SiteLongitude': ('longitude', float), 'SiteLatitude': ('latitude', float)}}
+    well_arrays = pybacktrack.WellArrays.create_from_well(pybacktrack.read_well_file(well_filename, lithologies, **read_kwargs))
+    
+    read_well_arrays = pybacktrack.read_well_arrays_file(well_filename, lithologies, **read_kwargs)
+    
+    def _assert_same_well_arrays(well_arrays_1, well_arrays_2):
+        assert len(well_arrays_1) == len(well_arrays_2)
+        for array_name in ('top_ages', 'bottom_ages', 'top_depths', 'bottom_depths',
+                           'densities', 'surface_porosities', 'porosity_decays', 'decompacted_bottom_depths'):
+            assert list(getattr(well_arrays_1, array_name)) == list(getattr(well_arrays_2, array_name))
+        assert well_arrays_1.lithology_components == well_arrays_2.lithology_components
+        assert sorted(well_arrays_1.unit_attributes) == sorted(well_arrays_2.unit_attributes)
+        for name in well_arrays_1.unit_attributes:
+            assert list(well_arrays_1.unit_attributes[name]) == list(well_arrays_2.unit_attributes[name])
+        assert well_arrays_1.well_attributes == well_arrays_2.well_attributes
+    
+    _assert_same_well_arrays(read_well_arrays, well_arrays)
+    
+    # Invalid lines are ignored (with a warning) like read_well_file.
+    invalid_well_filename = tmpdir.join('invalid_well.txt')
+    invalid_well_filename.write(
+        '# SurfaceAge = 1.5\n'
+        '10 100 Shale 1\n'
+        '20 xyz Sand 1\n'
+        '30 300 Sand 0.5 Shale\n'
+        '40 400 Sand 0.5 Shale 0.5\n')
+    with pytest.warns(UserWarning):
+        invalid_well_arrays = pybacktrack.read_well_arrays_file(str(invalid_well_filename), lithologies)
+    assert list(invalid_well_arrays.top_ages) == [1.5, 10.0]
+    assert list(invalid_well_arrays.bottom_depths) == [100.0, 400.0]
+    assert invalid_well_arrays.lithology_components[1] == [('Sand', 0.5), ('Shale', 0.5)]
+    
+    # Write and read a binary well file (from a WellArrays and from a Well).
+    binary_well_filename = str(tmpdir.join('sunrise.well'))
+    pybacktrack.write_well_arrays_binary_file(read_well_arrays, binary_well_filename)
+    _assert_same_well_arrays(pybacktrack.read_well_arrays_binary_file(binary_well_filename), well_arrays)
+    pybacktrack.write_well_arrays_binary_file(well_arrays.create_well(), binary_well_filename)
+    _assert_same_well_arrays(pybacktrack.read_well_arrays_binary_file(binary_well_filename), well_arrays)
+    
+    # A well text file, and truncated or empty binary well files, are not binary well files.
+    with pytest.raises(ValueError, match='not a binary well file'):
+        pybacktrack.read_well_arrays_binary_file(well_filename)
+    binary_well_data = py.path.local(binary_well_filename).read_binary()
+    for truncated_size in (len(binary_well_data) // 2, 10, 0):
+        truncated_well_filename = tmpdir.join('truncated.well')
+        truncated_well_filename.write_binary(binary_well_data[:truncated_size])
+        with pytest.raises(ValueError, match='not a binary well file'):
+            pybacktrack.read_well_arrays_binary_file(str(truncated_well_filename))
+    
+    # A missing file is not reported as an invalid binary well file.
+    with pytest.raises(FileNotFoundError):
+        pybacktrack.read_well_arrays_binary_file(str(tmpdir.join('missing.well')))
+
+
+def test_decompact_multiple_ages():
+    """Test Well.decompact_multiple_ages (which starts each age with the previous age's decompacted thicknesses) matches Well.decompact."""
+    
+    lithologies = pybacktrack.read_lithologies_files(pybacktrack.BUNDLE_LITHOLOGY_FILENAMES)
+    
+    well = pybacktrack.read_well_file(
+        str(TEST_DATA_DIR.join('DSDP-36-327-Lithology.txt')),
+        lithologies,
+        well_attributes={})
+    
+    # Densely sampled ages (including ages older than the bottom of the well).
+    bottom_age = well.stratigraphic_units[-1].bottom_age
+    ages = [0.5 * index for index in range(int(2 * bottom_age) + 10)]
+    
+    decompacted_wells = well.decompact_multiple_ages(ages)
+    assert len(decompacted_wells) == len(ages)
+    for age, decompacted_well in zip(ages, decompacted_wells):
+        expected_decompacted_well = well.decompact(age)
+        assert decompacted_well.get_age() == age
+        assert len(decompacted_well.decompacted_stratigraphic_units) == len(expected_decompacted_well.decompacted_stratigraphic_units)
+        assert decompacted_well.total_decompacted_thickness == pytest.approx(expected_decompacted_well.total_decompacted_thickness, abs=1e-4)
+        assert decompacted_well.get_sediment_isostatic_correction() == pytest.approx(
+            expected_decompacted_well.get_sediment_isostatic_correction(), abs=1e-4)
+    
+    # An initial estimate converges to the same decompacted thickness.
+    unit = well.stratigraphic_units[-1]
+    decompacted_thickness = unit.calc_decompacted_thickness(100.0)
+    assert unit.calc_decompacted_thickness(100.0, initial_decompacted_thickness=decompacted_thickness + 10.0) == pytest.approx(
+        decompacted_thickness, abs=1e-4)
+
+
+def test_decompact_at_times():
+    """Test Well.decompact_at_times matches Well.decompact at arbitrary (unsorted) times."""
+    
+    lithologies = pybacktrack.read_lithologies_files(pybacktrack.BUNDLE_LITHOLOGY_FILENAMES)
+    
+    well = pybacktrack.read_well_file(
+        str(TEST_DATA_DIR.join('ODP-114-699-Lithology.txt')),
+        lithologies,
+        well_attributes={})
+    
+    # Unsorted times including unit boundaries, times inside units and times older than the bottom of the well.
+    bottom_age = well.stratigraphic_units[-1].bottom_age
+    times = [bottom_age + 5.0, 0.0, 12.3, well.stratigraphic_units[1].top_age, bottom_age, 0.05, 40.0]
+    
+    decompacted_well_arrays = well.decompact_at_times(times)
+    assert list(decompacted_well_arrays.ages) == times
+    sediment_isostatic_corrections = decompacted_well_arrays.get_sediment_isostatic_corrections()
+    for time_index, time in enumerate(times):
+        decompacted_well = well.decompact(time)
+        assert decompacted_well_arrays.total_decompacted_thicknesses[time_index] == pytest.approx(
+            decompacted_well.total_decompacted_thickness, abs=1e-4)
+        assert decompacted_well_arrays.average_decompacted_densities[time_index] == pytest.approx(
+            decompacted_well.get_average_decompacted_density(), abs=1e-4)
+        assert sediment_isostatic_corrections[time_index] == pytest.approx(
+            decompacted_well.get_sediment_isostatic_correction(), abs=1e-4)
+    
+    # Converting to decompacted wells (referencing the well's units) matches too.
+    for time, decompacted_well in zip(times, decompacted_well_arrays.create_decompacted_wells(well)):
+        expected_decompacted_well = well.decompact(time)
+        assert decompacted_well.get_age() == time
+        assert decompacted_well.surface_unit.top_depth == pytest.approx(expected_decompacted_well.surface_unit.top_depth, abs=1e-4)
+        assert decompacted_well.get_sediment_isostatic_correction() == pytest.approx(
+            expected_decompacted_well.get_sediment_isostatic_correction(), abs=1e-4)
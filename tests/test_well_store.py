@@ -0,0 +1,135 @@
+import py
+import pybacktrack
+import pytest
+
+
+# Test data directory is inside the pybacktrack module.
+TEST_DATA_DIR = py.path.local(__file__).dirpath('test_data')
+
+# Lithologies of the test wells.
+LITHOLOGY_FILENAMES = [pybacktrack.PRIMARY_BUNDLE_LITHOLOGY_FILENAME, pybacktrack.EXTENDED_BUNDLE_LITHOLOGY_FILENAME]
+
+
+def _assert_units_equal(well, expected_well):
+    assert len(well.stratigraphic_units) == len(expected_well.stratigraphic_units)
+    for unit, expected_unit in zip(well.stratigraphic_units, expected_well.stratigraphic_units):
+        assert unit.top_age == expected_unit.top_age
+        assert unit.bottom_age == expected_unit.bottom_age
+        assert unit.top_depth == expected_unit.top_depth
+        assert unit.bottom_depth == expected_unit.bottom_depth
+        assert list(unit.lithology_components) == list(expected_unit.lithology_components)
+        assert unit.lithology == expected_unit.lithology
+
+
+def test_well_store_query(tmpdir):
+    """Test importing well files into a WellStore and querying them by location, bottom age and bottom depth."""
+    
+    well_filenames = [str(TEST_DATA_DIR.join(well_basename)) for well_basename in (
+        'ODP-114-699-Lithology.txt',  # SiteLongitude = -30.677, SiteLatitude = -51.542
+        'DSDP-36-327-Lithology.txt')]  # SiteLongitude = -46.7837, SiteLatitude = -50.8713
+    
+    database_filename = str(tmpdir.join('wells.sqlite'))
+    with pybacktrack.WellStore(database_filename, LITHOLOGY_FILENAMES) as well_store:
+        well_ids = well_store.import_well_files(well_filenames)
+        assert len(well_ids) == 2
+        assert len(well_store) == 2
+        
+        # Re-importing a well (with the same name) replaces it.
+        well_store.import_well_files(well_filenames[:1])
+        assert len(well_store) == 2
+    
+    # Re-open the database.
+    with pybacktrack.WellStore(database_filename, LITHOLOGY_FILENAMES) as well_store:
+        wells = well_store.query_wells()
+        assert [well.name for well in wells] == ['DSDP-36-327-Lithology', 'ODP-114-699-Lithology']
+        
+        dsdp_well = wells[0]
+        assert dsdp_well.longitude == pytest.approx(-46.7837)
+        assert dsdp_well.latitude == pytest.approx(-50.8713)
+        assert dsdp_well.rift_start_age == pytest.approx(160)
+        assert dsdp_well.rift_end_age == pytest.approx(120)
+        assert wells[1].rift_start_age is None
+        
+        lithologies = pybacktrack.read_lithologies_files(LITHOLOGY_FILENAMES)
+        _assert_units_equal(dsdp_well, pybacktrack.read_well_file(
+            well_filenames[1], lithologies, well_attributes={}))
+        
+        odp_bottom_age = wells[1].stratigraphic_units[-1].bottom_age
+        odp_bottom_depth = wells[1].stratigraphic_units[-1].bottom_depth
+        
+        # Query by region.
+        assert [well.name for well in well_store.query_wells(region=(-40, -20, -60, -40))] == ['ODP-114-699-Lithology']
+        assert well_store.query_wells(region=(170, -170, -60, -40)) == []
+        assert len(well_store.query_well_ids(region=(-50, -20, -60, -40))) == 2
+        # Query by bottom age and depth.
+        assert well_store.query_well_ids(min_bottom_age=odp_bottom_age) == \
+            [well.well_id for well in wells if well.stratigraphic_units[-1].bottom_age >= odp_bottom_age]
+        assert well_store.query_well_ids(max_bottom_age=odp_bottom_age - 1e-6) == \
+            [well.well_id for well in wells if well.stratigraphic_units[-1].bottom_age < odp_bottom_age]
+        assert well_store.query_well_ids(min_bottom_depth=odp_bottom_depth, max_bottom_depth=odp_bottom_depth) == \
+            [well.well_id for well in wells if well.stratigraphic_units[-1].bottom_depth == odp_bottom_depth]
+        
+        assert well_store.get_well(dsdp_well.well_id).name == dsdp_well.name
+        with pytest.raises(KeyError):
+            well_store.get_well(-1)
+        
+        well_store.remove_wells([dsdp_well.well_id])
+        assert [well.name for well in well_store.query_wells()] == ['ODP-114-699-Lithology']
+
+
+def test_well_store_backstrip_wells():
+    """Test backstripping wells queried from a WellStore gives the same results as backstripping their well files."""
+    
+    well_filename = str(TEST_DATA_DIR.join('sunrise_lithology.txt'))
+    
+    with pybacktrack.WellStore(lithology_filenames=LITHOLOGY_FILENAMES) as well_store:
+        # Import the min/max water depth columns (needed for backstripping).
+        well_store.import_well_files(
+            [well_filename],
+            well_min_water_depth_column=2,
+            well_max_water_depth_column=3,
+            well_lithology_column=4)
+        
+        wells = well_store.query_wells(region=(120, 130, -10, -9))
+        assert len(wells) == 1
+        
+        # Ignore the total sediment thickness grid (so GMT is not needed).
+        store_results = list(pybacktrack.backstrip_wells(
+            wells, lithology_filenames=LITHOLOGY_FILENAMES, total_sediment_thickness_filename=None))
+        file_results = list(pybacktrack.backstrip_wells(
+            [well_filename], lithology_filenames=LITHOLOGY_FILENAMES, total_sediment_thickness_filename=None))
+        
+        for (store_well, store_decompacted_wells), (file_well, file_decompacted_wells) in zip(store_results, file_results):
+            _assert_units_equal(store_well, file_well)
+            assert len(store_decompacted_wells) == len(file_decompacted_wells)
+            for store_decompacted_well, file_decompacted_well in zip(store_decompacted_wells, file_decompacted_wells):
+                assert store_decompacted_well.get_age() == file_decompacted_well.get_age()
+                assert store_decompacted_well.total_decompacted_thickness == pytest.approx(file_decompacted_well.total_decompacted_thickness)
+                assert store_decompacted_well.get_min_max_tectonic_subsidence() == pytest.approx(
+                    file_decompacted_well.get_min_max_tectonic_subsidence())
+        
+        # Wells imported without min/max water depths cannot be backstripped.
+        well_store.import_well_files([well_filename], well_lithology_column=4)
+        with pytest.raises(ValueError):
+            list(pybacktrack.backstrip_wells(well_store.query_wells(), lithology_filenames=LITHOLOGY_FILENAMES, total_sediment_thickness_filename=None))
+
+
+def test_well_store_query_dateline(tmpdir):
+    """Test querying regions with longitudes outside [-180, 180), and regions crossing the dateline."""
+    
+    # A well east of the dateline with a longitude greater than 180 degrees.
+    well_lines = TEST_DATA_DIR.join('ODP-114-699-Lithology.txt').readlines()
+    well_filename = tmpdir.join('dateline.txt')
+    well_filename.write(''.join(
+        '# SiteLongitude = 190\n' if well_line.startswith('# SiteLongitude') else well_line for well_line in well_lines))
+    
+    with pybacktrack.WellStore(lithology_filenames=LITHOLOGY_FILENAMES) as well_store:
+        well_store.import_well_files([str(well_filename)])
+        
+        # The returned longitude is the same as in the well file.
+        assert well_store.query_wells()[0].longitude == pytest.approx(190)
+        
+        for region in ((170, 200, -60, -40), (185, 195, -60, -40), (170, -160, -60, -40), (-175, -165, -60, -40), (-180, 180, -60, -40)):
+            assert len(well_store.query_well_ids(region=region)) == 1, region
+        for region in ((150, 185, -60, -40), (-160, 170, -60, -40), (195, 200, -60, -40)):
+            assert well_store.query_well_ids(region=region) == [], region